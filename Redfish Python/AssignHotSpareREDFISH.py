@@ -15,9 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse
-
-from datetime import datetime
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -56,7 +54,7 @@ elif args["v"]:
     
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellRaidService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellRaidService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -66,7 +64,7 @@ def check_supported_idrac_version():
 
 
 def get_storage_controllers():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- Server controller(s) detected -\n")
     controller_list=[]
@@ -77,7 +75,7 @@ def get_storage_controllers():
             print(controller)
     if args["c"] == "yy":
         for i in controller_list:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             print("\n - Detailed controller information for %s -\n" % i)
             for i in data.items():
@@ -87,7 +85,7 @@ def get_storage_controllers():
 def get_pdisks():
     disk_used_created_vds=[]
     available_disks=[]
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     drive_list=[]
     try:
@@ -103,7 +101,7 @@ def get_pdisks():
                     print(disk)
         if args["dd"]:
           for i in drive_list:
-              response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+              response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
               data = response.json()
               
               print("\n - Detailed drive information for %s -\n" % i)
@@ -121,7 +119,7 @@ def get_pdisks():
 
 def get_pdisks_hot_spare_type():
     test_valid_controller_FQDD_string(controller)
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     drive_list=[]
     if data[u'Drives'] == []:
@@ -135,7 +133,7 @@ def get_pdisks_hot_spare_type():
     print("\n- Drive FQDDs/Hot Spare Type for Controller %s -\n" % controller)
     if args["H"]:
       for i in drive_list:
-          response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+          response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
           data = response.json()
           for ii in data.items():
               if ii[0] == "HotspareType":
@@ -143,7 +141,7 @@ def get_pdisks_hot_spare_type():
 
 def get_virtual_disks():
     test_valid_controller_FQDD_string(args["v"])
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, args["v"]),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, args["v"]),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     vd_list=[]
     if data[u'Members'] == []:
@@ -156,7 +154,7 @@ def get_virtual_disks():
                 vd_list.append(vd)
     print("\n- Volume(s) detected for %s controller -\n" % args["v"])
     for ii in vd_list:
-        response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
         data = response.json()
         for i in data.items():
             if i[0] == "VolumeType":
@@ -165,7 +163,7 @@ def get_virtual_disks():
 
 def get_virtual_disk_details():
     test_valid_controller_FQDD_string(args["vv"])
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, args["vv"]),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, args["vv"]),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     vd_list=[]
     if data[u'Members'] == []:
@@ -179,7 +177,7 @@ def get_virtual_disk_details():
                 vd_list.append(vd)
                 print(vd)
     for ii in vd_list:
-        response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
         data = response.json()
         print("\n - Detailed Volume information for %s -\n" % ii)
         for i in data.items():
@@ -195,7 +193,7 @@ def assign_spare():
         payload={"TargetFQDD":args["a"]}
     elif args["t"].lower() == "dedicated":
         payload={"TargetFQDD":args["a"],"VirtualDiskArray":[args["V"]]}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 202:
         print("\n-PASS: POST command passed to set disk \"%s\" as \"%s\" hot spare" % (args["a"], args["t"]))
@@ -212,25 +210,22 @@ def assign_spare():
         sys.exit()
 
 def loop_job_status():
-    start_time=datetime.now()
+    deadline = RedfishJobState.deadline(2 * 60 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=3)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "2:00:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 2 hours has been hit, script stopped\n")
             sys.exit()
-        elif "Fail" in data[u'Message'] or "fail" in data[u'Message'] or data[u'JobState'] == "Failed":
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
             print("- FAIL: job ID %s failed, failed message is: %s" % (job_id, data[u'Message']))
             sys.exit()
-        elif data[u'JobState'] == "Completed":
+        elif RedfishJobState.succeeded(data):
             print("\n--- PASS, Final Detailed Job Status Results ---\n")
             for i in data.items():
                 if "odata" in i[0] or "MessageArgs" in i[0] or "TargetSettingsURI" in i[0]:
@@ -240,10 +235,9 @@ def loop_job_status():
             break
         else:
             print("- WARNING, JobStatus not completed, current status: \"%s\", percent complete: \"%s\"" % (data[u'Message'],data[u'PercentComplete']))
-            time.sleep(3)
 
 def test_valid_controller_FQDD_string(x):
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, x),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, x),verify=False,auth=(idrac_username, idrac_password))
     if response.status_code != 200:
         print("\n- FAIL, either controller FQDD does not exist or typo in FQDD string name (FQDD controller string value is case sensitive)")
         sys.exit()
@@ -251,7 +245,7 @@ def test_valid_controller_FQDD_string(x):
         pass
 
 def get_pdisk_hot_spare_final_status():
-      response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, args["a"]),verify=False,auth=(idrac_username, idrac_password))
+      response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, args["a"]),verify=False,auth=(idrac_username, idrac_password))
       data = response.json()
       for i in data.items():
           if i[0] == "HotspareType":
@@ -15,9 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse
-
-from datetime import datetime
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -49,7 +47,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Dell/Managers/iDRAC.Embedded.1/DellLCService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Dell/Managers/iDRAC.Embedded.1/DellLCService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -100,7 +98,7 @@ def backup_restore_image():
     for i in payload.items():
           print("%s: %s" % (i[0],i[1]))
 
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 202:
         print("\n- PASS: POST command passed for %s method, status code 202 returned" % method)
@@ -118,71 +116,38 @@ def backup_restore_image():
     
 
 def loop_job_status():
-    start_time=datetime.now()
+    deadline = RedfishJobState.deadline(2 * 60 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
         try:
-            req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        except:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=5)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
+            sys.exit()
+        except Exception:
             if method == "RestoreImage":
                 print("- WARNING, either iDRAC reset due to restore job getting marked completed or lost iDRAC network connection. Check the overall job queue for the job ID status")
                 sys.exit()
             else:
                 print("- WARNING, lost iDRAC network connection. Check the overall job queue for the job ID status")
                 sys.exit()
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            try:
-                print("Extended Info Message: {0}".format(req.json()))
-                sys.exit()
-            except:
-                if method == "RestoreImage":
-                    print("- WARNING, either iDRAC reset due to restore job getting marked completed or lost iDRAC network connection. Check the overall job queue for the job ID status")
-                    sys.exit()
-                else:
-                    print("- WARNING, lost iDRAC network connection. Check the overall job queue for the job ID status")
-                    sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "2:00:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 2 hours has been hit, script stopped\n")
             sys.exit()
-        if data[u'JobState'] == "Failed" or "Fail" in data[u'Message'] or "Unable" in data[u'Message'] or "Invalid" in data[u'Message'] or "fail" in data[u'Message'] or "Cannot" in data[u'Message'] or "cannot" in data[u'Message']:
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
             print("- FAIL: job ID %s failed, failed message is: %s" % (job_id, data[u'Message']))
             sys.exit()
-        if method == "BackupImage":
-            if data[u'Message'] == "Export System Profile completed." and data[u'JobState'] == "Completed":
-                print("\n--- PASS, Final Detailed Job Status Results ---\n")
-                for i in data.items():
-                    if "odata" in i[0] or "MessageArgs" in i[0] or "TargetSettingsURI" in i[0]:
-                        pass
-                    else:
-                        print("%s: %s" % (i[0],i[1]))
-                break
-            else:
-                pass
-        else:
-            print("- WARNING, JobStatus not completed, current status: \"%s\", percent complete: \"%s\"" % (data[u'Message'],data[u'PercentComplete']))
-            time.sleep(5)
-            continue
-        if method == "RestoreImage":
-            if data[u'Message'] == "Import System Profile Complete, restarting Integrated Remote Access Controller." and data[u'JobState'] == "Completed":
-                print("\n--- PASS, Final Detailed Job Status Results ---\n")
-                for i in data.items():
-                    if "odata" in i[0] or "MessageArgs" in i[0] or "TargetSettingsURI" in i[0]:
-                        pass
-                    else:
-                        print("%s: %s" % (i[0],i[1]))
-                break
-            else:
-                pass
-                
+        elif RedfishJobState.succeeded(data):
+            print("\n--- PASS, Final Detailed Job Status Results ---\n")
+            for i in data.items():
+                if "odata" in i[0] or "MessageArgs" in i[0] or "TargetSettingsURI" in i[0]:
+                    pass
+                else:
+                    print("%s: %s" % (i[0],i[1]))
+            break
         else:
             print("- WARNING, JobStatus not completed, current status: \"%s\", percent complete: \"%s\"" % (data[u'Message'],data[u'PercentComplete']))
-            time.sleep(5)
-            continue
         
     
 
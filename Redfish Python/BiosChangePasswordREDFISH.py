@@ -16,9 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, os, argparse
-
-from datetime import datetime
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, os, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -37,7 +35,7 @@ idrac_username=args["u"]
 idrac_password=args["p"]
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -65,7 +63,7 @@ def change_bios_password():
         payload = {"PasswordName":password_name,"OldPassword":args["o"],"NewPassword":args["n"]}
         print("- WARNING, changing BIOS %s" % password_name)
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.__dict__
     statusCode = response.status_code
     if statusCode == 200:
@@ -78,11 +76,11 @@ def change_bios_password():
     
 def create_bios_config_job():
     global job_id
-    global start_time
+    global deadline
     url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % idrac_ip
     payload = {"TargetSettingsURI":"/redfish/v1/Systems/System.Embedded.1/Bios/Settings"}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     if statusCode == 200:
         print("- PASS: POST command passed to create target config job, status code %s returned." % statusCode)
@@ -95,36 +93,36 @@ def create_bios_config_job():
     z=re.search("JID_.+?,",d).group()
     job_id=re.sub("[,']","",z)
     print("- WARNING: %s job ID successfully created" % job_id)
-    start_time=datetime.now()
+    deadline = RedfishJobState.deadline(30 * 60)
 
 def check_schedule_job_status():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-            time.sleep(10)
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=10)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if data[u'Message'] == "Task successfully scheduled.":
+        if RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             print("- PASS, %s job id successfully scheduled, rebooting the server to apply config changes" % job_id)
             break
+        elif RedfishJobState.failed(data):
+            print("- FAIL: %s failed, failed message is: %s" % (job_id, data[u'Message']))
+            sys.exit()
         else:
             print("- WARNING: JobStatus not scheduled, current status is: %s" % data[u'Message'])
     
                                                                           
 def reboot_server():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, Current server power state is: %s" % data[u'PowerState'])
     if data[u'PowerState'] == "On":
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'GracefulShutdown'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to gracefully power OFF server, status code return is %s" % statusCode)
@@ -134,7 +132,7 @@ def reboot_server():
             print("Extended Info Message: {0}".format(response.json()))
             sys.exit()
         while True:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             if data[u'PowerState'] == "Off":
                 print("- PASS, GET command passed to verify server is in OFF state")
@@ -144,7 +142,7 @@ def reboot_server():
             
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, status code return is %s" % statusCode)
@@ -156,7 +154,7 @@ def reboot_server():
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -170,24 +168,21 @@ def reboot_server():
 
 
 def check_job_status_final():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=30)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "0:30:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, script stopped\n")
             sys.exit()
-        elif "Fail" in data[u'Message'] or "fail" in data[u'Message']:
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
             print("- FAIL: %s failed" % job_id)
             sys.exit()
-        elif data[u'Message'] == "Job completed successfully.":
+        elif RedfishJobState.succeeded(data):
             print("\n- Final detailed job results -")
             print("\n JobID = "+data[u'Id'])
             print(" Name = "+data[u'Name'])
@@ -196,7 +191,6 @@ def check_job_status_final():
             break
         else:
             print("- WARNING, JobStatus not completed, current status is: \"%s\"" % data[u'Message'])
-            time.sleep(30)
 
 
 
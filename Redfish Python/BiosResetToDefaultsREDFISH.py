@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, os, argparse
+import RedfishTransport, json, sys, re, time, warnings, os, argparse
 
 from datetime import datetime
 
@@ -33,7 +33,7 @@ idrac_username=args["u"]
 idrac_password=args["p"]
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -46,7 +46,7 @@ def reset_bios():
     url = "https://%s/redfish/v1/Systems/System.Embedded.1/Bios/Actions/Bios.ResetBios" % idrac_ip
     payload = {}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.__dict__
     message_search = str(data['_content'])
     statusCode = response.status_code
@@ -62,14 +62,14 @@ def reset_bios():
 
                                                                           
 def reboot_server():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, Current server power state is: %s" % data[u'PowerState'])
     if data[u'PowerState'] == "On":
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'GracefulShutdown'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to gracefully power OFF server, status code return is %s" % statusCode)
@@ -79,7 +79,7 @@ def reboot_server():
             print("Extended Info Message: {0}".format(response.json()))
             sys.exit()
         while True:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             if data[u'PowerState'] == "Off":
                 print("- PASS, GET command passed to verify server is in OFF state")
@@ -89,7 +89,7 @@ def reboot_server():
             
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, status code return is %s" % statusCode)
@@ -101,7 +101,7 @@ def reboot_server():
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -20,9 +20,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
-
-from datetime import datetime
+import RedfishTransport, RedfishJson, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -44,7 +42,7 @@ idrac_password=args["p"]
 ### Function to check if current iDRAC version detected is supported by Redfish
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -64,19 +62,17 @@ def set_bios_attribute():
     for i,ii in zip(attribute_names, attribute_values):
         payload["Attributes"][i] = ii
 
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
-    data = response.json()
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password), cache=True)
+    registry = RedfishJson.registry_index(response, [u'Type'])
     for i in payload["Attributes"].items():
-        for ii in data[u'RegistryEntries']['Attributes']:
-            if i[0] in ii.values():
-                if ii[u'Type'] == "Integer":
-                    payload['Attributes'][i[0]] = int(i[1])
+        if registry.get(i[0], {}).get(u'Type') == "Integer":
+            payload['Attributes'][i[0]] = int(i[1])
     print("\n- WARNING, script will be setting BIOS attributes -\n")
     for i in payload["Attributes"].items():
         print("Attribute Name: %s, setting new value to: %s" % (i[0], i[1]))
     
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     if statusCode == 200:
         print("\n- PASS: PATCH command passed to set BIOS attribute pending values")
@@ -91,11 +87,11 @@ def set_bios_attribute():
 
 def create_bios_config_job():
     global job_id
-    global start_time
+    global deadline
     url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % idrac_ip
     payload = {"TargetSettingsURI":"/redfish/v1/Systems/System.Embedded.1/Bios/Settings"}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     if statusCode == 200:
         print("- PASS: Command passed to create target config job, status code 200 returned.")
@@ -108,40 +104,39 @@ def create_bios_config_job():
     z=re.search("JID_.+?,",d).group()
     job_id=re.sub("[,']","",z)
     print("- WARNING: %s job ID successfully created" % job_id)
-    start_time=datetime.now()
+    deadline = RedfishJobState.deadline(30 * 60)
     
 ### Function to verify job is marked as scheduled before rebooting the server
     
 def get_job_status():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-            #print("- PASS, Command passed to check job status, code 200 returned")
-            time.sleep(10)
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=10)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if data[u'Message'] == "Task successfully scheduled.":
+        if RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             print("- PASS, %s job id successfully scheduled, rebooting the server to apply config changes" % job_id)
             break
+        elif RedfishJobState.failed(data):
+            print("- FAIL: %s failed, failed message is: %s" % (job_id, data[u'Message']))
+            sys.exit()
         else:
             print("- WARNING: JobStatus not scheduled, current status is: %s" % data[u'Message'])
 
 ### Function to reboot the server                                                                        
 
 def reboot_server():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, Current server power state is: %s" % data[u'PowerState'])
     if data[u'PowerState'] == "On":
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'GracefulShutdown'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to gracefully power OFF server, code return is %s" % statusCode)
@@ -151,7 +146,7 @@ def reboot_server():
             print("Extended Info Message: {0}".format(response.json()))
             sys.exit()
         while True:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             if data[u'PowerState'] == "Off":
                 print("- PASS, GET command passed to verify server is in OFF state")
@@ -161,7 +156,7 @@ def reboot_server():
             
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -173,7 +168,7 @@ def reboot_server():
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -189,22 +184,18 @@ def reboot_server():
 ### Function to loop checking the job status until marked completed or failed    
 
 def loop_job_status():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-            #print("\n- PASS, Command passed to check job status, code 200 returned\n")
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=30)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "0:30:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, script stopped\n")
             sys.exit()
-        elif "Fail" in data[u'Message'] or "fail" in data[u'Message'] or "error" in data[u'Message'] or "Error" in data[u'Message']:
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
             print("- FAIL: %s failed" % job_id)
             print("\n- Final detailed job results -")
             print("\n JobID = "+data[u'Id'])
@@ -212,7 +203,7 @@ def loop_job_status():
             print(" Message = "+data[u'Message'])
             print(" PercentComplete = "+str(data[u'PercentComplete'])+"\n")
             sys.exit()
-        elif data[u'Message'] == "Job completed successfully.":
+        elif RedfishJobState.succeeded(data):
             print("\n- Final detailed job results -")
             print("\n JobID = "+data[u'Id'])
             print(" Name = "+data[u'Name'])
@@ -221,12 +212,11 @@ def loop_job_status():
             break
         else:
             print("- WARNING, JobStatus not completed, current status is: \"%s\"" % data[u'Message'])
-            time.sleep(30)
 
 
 def get_new_attribute_values():
     print("- WARNING, checking new attribute values - \n")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     new_attributes_dict=data[u'Attributes']
     new_attribute_values = {"Attributes":{}}
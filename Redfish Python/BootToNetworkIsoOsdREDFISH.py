@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, RedfishJobState, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -47,7 +47,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellOSDeploymentService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellOSDeploymentService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -63,7 +63,7 @@ def get_attach_status():
     url = 'https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellOSDeploymentService/Actions/DellOSDeploymentService.GetAttachStatus' % (idrac_ip)
     headers = {'content-type': 'application/json'}
     payload={}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 200:
         print("\n- PASS: POST command passed to get ISO attach status, status code 200 returned")
@@ -99,7 +99,7 @@ def boot_to_network_iso():
     print("\n- WARNING, arguments and values used to %s on network share\n" % method)
     for i in payload.items():
           print("%s: %s" % (i[0],i[1]))
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 202:
         print("\n- PASS: POST command passed for %s method, status code %s returned" % (method, response.status_code))
@@ -116,7 +116,7 @@ def detach_network_iso():
     url = 'https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellOSDeploymentService/Actions/DellOSDeploymentService.DetachISOImage' % (idrac_ip)
     headers = {'content-type': 'application/json'}
     payload={}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 200:
         print("\n- PASS: POST command passed to detach ISO image, status code 200 returned")
@@ -129,9 +129,11 @@ def detach_network_iso():
 
     
 def check_concrete_job_status():
+    # The concrete job is a task (TaskService/Tasks/OSDeployment), not a job of the job queue RedfishJobWatcher reads
     start_time=datetime.now()
+    deadline = RedfishJobState.deadline(30 * 60)
     while True:
-        req = requests.get('https://%s%s' % (idrac_ip, concrete_job_uri), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s%s' % (idrac_ip, concrete_job_uri), auth=(idrac_username, idrac_password), verify=False)
         current_time=str((datetime.now()-start_time))[0:7]
         statusCode = req.status_code
         if statusCode == 200 or statusCode == 202:
@@ -141,7 +143,7 @@ def check_concrete_job_status():
             print("Extended Info Message: {0}".format(req.json()))
             sys.exit()
         data= req.json()
-        if str(current_time)[0:7] >= "0:30:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, script stopped\n")
             sys.exit()
         elif data[u'TaskState'] == "Completed":
@@ -184,7 +186,7 @@ def check_attach_status(x):
     url = 'https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellOSDeploymentService/Actions/DellOSDeploymentService.GetAttachStatus' % (idrac_ip)
     headers = {'content-type': 'application/json'}
     payload={}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 200:
         pass
@@ -15,9 +15,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
-
-from datetime import datetime
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -37,7 +35,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootOptions' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootOptions' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -46,10 +44,10 @@ def check_supported_idrac_version():
         pass
 
 def get_current_boot_order():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     current_boot_mode=data[u'Attributes']['BootMode']
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootOptions' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootOptions' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     boot_device_display_name = ""
     boot_device_id = ""
@@ -57,7 +55,7 @@ def get_current_boot_order():
     print("\n- Current boot order detected for BIOS boot mode \"%s\" -\n" % current_boot_mode) 
     for i in data[u'Members']:
         for ii in i.items():
-            response = requests.get('https://%s%s' % (idrac_ip, ii[1]),verify=False,auth=(idrac_username,idrac_password))
+            response = RedfishTransport.get('https://%s%s' % (idrac_ip, ii[1]),verify=False,auth=(idrac_username,idrac_password))
             data = response.json()
             for i in data.items():
                 if i[0] == "DisplayName":
@@ -72,7 +70,7 @@ def get_current_boot_order():
     
 def change_boot_order():
     global job_id
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     current_boot_mode=data[u'Attributes']['BootMode']
     url = 'https://%s/redfish/v1/Systems/System.Embedded.1' % idrac_ip
@@ -82,7 +80,7 @@ def change_boot_order():
         boot_order_ids = [args["c"]]
     payload = {"Boot":{"BootOrder":boot_order_ids}}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     status_code = response.status_code
     data = response.json()
     if status_code == 200 or status_code == 202:
@@ -100,32 +98,34 @@ def change_boot_order():
     print("- PASS, job ID \"%s\" successfully created to change %s boot order sequence" % (job_id, current_boot_mode))
     
 def get_job_status_scheduled():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-            time.sleep(10)
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=10)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if data[u'Message'] == "Task successfully scheduled.":
+        if RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             print("- PASS, %s job id successfully scheduled, rebooting the server to apply config changes" % job_id)
             break
+        elif RedfishJobState.failed(data):
+            print("- FAIL: %s failed, failed message is: %s" % (job_id, data[u'Message']))
+            sys.exit()
         else:
-            print("- WARNING: JobStatus not scheduled, current status is: %s" % data[u'Message'])                                                                      
+            print("- WARNING: JobStatus not scheduled, current status is: %s" % data[u'Message'])
+
+   
 
 def reboot_server():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, Current server power state is: %s" % data[u'PowerState'])
     if data[u'PowerState'] == "On":
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'GracefulShutdown'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to gracefully power OFF server, code return is %s" % statusCode)
@@ -135,7 +135,7 @@ def reboot_server():
             print("Extended Info Message: {0}".format(response.json()))
             sys.exit()
         while True:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             if data[u'PowerState'] == "Off":
                 print("- PASS, GET command passed to verify server is in OFF state")
@@ -145,7 +145,7 @@ def reboot_server():
             
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -157,7 +157,7 @@ def reboot_server():
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -173,25 +173,22 @@ def reboot_server():
    
 
 def loop_job_status_final():
-    start_time=datetime.now()
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    deadline = RedfishJobState.deadline(30 * 60)
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=30)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "0:30:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, script stopped\n")
             sys.exit()
-        elif "Fail" in data[u'Message'] or "fail" in data[u'Message']:
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
             print("- FAIL: %s failed" % job_id)
             sys.exit()
-        elif data[u'Message'] == "Job completed successfully.":
+        elif RedfishJobState.succeeded(data):
             print("\n- Final detailed job results -")
             print("\n JobID = "+data[u'Id'])
             print(" Name = "+data[u'Name'])
@@ -200,7 +197,6 @@ def loop_job_status_final():
             break
         else:
             print("- WARNING, JobStatus not completed, current status is: \"%s\"" % data[u'Message'])
-            time.sleep(30)
 
 
 if __name__ == "__main__":
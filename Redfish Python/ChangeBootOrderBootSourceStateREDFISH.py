@@ -38,7 +38,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, pickle, argparse
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, pickle, argparse
 
 from datetime import datetime
 
@@ -59,7 +59,7 @@ idrac_password=args["p"]
 ### Function to check if iDRAC version detected is supported for this feature using Redfish
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -71,7 +71,7 @@ def check_supported_idrac_version():
 
 def get_bios_boot_mode():
     global current_boot_mode
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     current_boot_mode = data[u'Attributes']["BootMode"]
     print("\n- Current boot mode is %s" % current_boot_mode)
@@ -81,7 +81,7 @@ def get_bios_boot_mode():
 def get_bios_boot_source_state():
     global boot_seq
     global boot_device_list_from_file
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if data[u'Attributes'] == {}:
         print("\n- WARNING, no %s boot order devices detected for iDRAC IP %s" % (current_boot_mode,idrac_ip))
@@ -134,7 +134,7 @@ def set_bios_boot_source_state():
     url = 'https://%s/redfish/v1/Systems/System.Embedded.1/BootSources/Settings' % idrac_ip
     payload = {'Attributes': {boot_seq:boot_device_list_from_file}}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     data=response.json()
     statusCode = response.status_code
     if statusCode == 200:
@@ -152,7 +152,7 @@ def create_bios_config_job():
     url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % idrac_ip
     payload = {"TargetSettingsURI":"/redfish/v1/Systems/System.Embedded.1/Bios/Settings"}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     
     if statusCode == 200:
@@ -170,34 +170,34 @@ def create_bios_config_job():
 ### Function to verify job is marked as scheduled before rebooting the server
     
 def get_job_status():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        if statusCode == 200:
-            print("- PASS, Command passed to check job status, code 200 returned")
-            time.sleep(20)
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=20)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if data[u'Message'] == "Task successfully scheduled.":
+        if RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             print("- PASS, job id %s successfully scheduled" % job_id)
             break
+        elif RedfishJobState.failed(data):
+            print("- FAIL: %s failed, failed message is: %s" % (job_id, data[u'Message']))
+            sys.exit()
         else:
             print("- WARNING: JobStatus not scheduled, current status is: %s" % data[u'Message'])
 
 ### Function to reboot the server
                                                                           
 def reboot_server():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, Current server power state is: %s" % data[u'PowerState'])
     if data[u'PowerState'] == "On":
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'ForceOff'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power OFF server, code return is %s" % statusCode)
@@ -206,7 +206,7 @@ def reboot_server():
             print("Extended Info Message: {0}".format(response.json()))
             sys.exit()
         while True:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             if data[u'PowerState'] == "Off":
                 print("- PASS, GET command passed to verify server is in OFF state")
@@ -216,7 +216,7 @@ def reboot_server():
             
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -228,7 +228,7 @@ def reboot_server():
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -245,36 +245,34 @@ def reboot_server():
 def loop_job_status():
     print("\n- WARNING, script will now poll the job status ever 30 seconds until marked completed\n")
     start_time=datetime.now()
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    deadline = RedfishJobState.deadline(30 * 60)
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 200:
-            print("- PASS, Command passed to check job status, code 200 returned")
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=30)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "0:30:00":
+        current_time=(datetime.now()-start_time)
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, script stopped\n")
             sys.exit()
-        elif "Fail" in data[u'Message'] or "fail" in data[u'Message'] or "error" in data[u'Message']:
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
             print("- FAIL: %s failed" % job_id)
             sys.exit()
-        elif data[u'Message'] == "Job completed successfully.":
+        elif RedfishJobState.succeeded(data):
             print("- PASS, job id %s successfully marked as completed" % job_id)
             print("  Job completed in: %s\n" % str(current_time)[0:7])
             break
         else:
             print("- WARNING, JobStatus not completed, current status is: \"%s\"\n" % data[u'Message'])
-            time.sleep(30)
 
 
 ### Function to check boot device boot source state new status
 
 def get_boot_source_new_state():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     get_boot_source_devices=data[u'Attributes'][boot_seq]
     print("- New status of boot order devices and their boot source state:\n")
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings
+import RedfishTransport, json, sys, re, time, warnings
 
 from datetime import datetime
 
@@ -42,7 +42,7 @@ def set_idrac_user_password():
     
     payload = {'Password': idrac_new_password}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
 
     statusCode = response.status_code
     if statusCode == 200:
@@ -51,7 +51,7 @@ def set_idrac_user_password():
         print("\n- FAIL, status code %s returned, password was not changed") % statusCode
         sys.exit()
     time.sleep(5)
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, idrac_account_id),verify=False,auth=(idrac_username, idrac_new_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, idrac_account_id),verify=False,auth=(idrac_username, idrac_new_password))
     
     statusCode = response.status_code
     if statusCode == 200:
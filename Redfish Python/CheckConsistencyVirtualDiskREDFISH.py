@@ -14,9 +14,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
-
-from datetime import datetime
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -44,7 +42,7 @@ if args["cc"]:
 
 
 def get_storage_controllers():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- Server controller(s) detected -\n")
     controller_list=[]
@@ -53,7 +51,7 @@ def get_storage_controllers():
         print(i[u'@odata.id'].split("/")[-1])
     if args["c"] =="yy":
         for i in controller_list:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             print("\n - Detailed controller information for %s -\n" % i)
             for i in data.items():
@@ -61,7 +59,7 @@ def get_storage_controllers():
     
 
 def get_virtual_disks():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     vd_list=[]
     
@@ -78,7 +76,7 @@ def get_virtual_disks():
             vd_list.append(i[u'@odata.id'].split("/")[-1])
     print("\n- Volume(s) detected for %s controller -\n" % controller)
     for ii in vd_list:
-        response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
         data = response.json()
         for i in data.items():
             if i[0] == "VolumeType":
@@ -86,7 +84,7 @@ def get_virtual_disks():
     sys.exit()
 
 def get_virtual_disks_details():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     vd_list=[]
     if data[u'Members'] == []:
@@ -98,7 +96,7 @@ def get_virtual_disks_details():
             vd_list.append(i[u'@odata.id'].split("/")[-1])
             print(i[u'@odata.id'].split("/")[-1])
     for ii in vd_list:
-        response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
         data = response.json()
         print("\n- Detailed Volume information for %s -\n" % ii)
         for i in data.items():
@@ -108,7 +106,7 @@ def get_virtual_disks_details():
 
 def get_config_job_type():
     global job_type
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     for i in data[u'StorageControllers']:
         for ii in i.items():
@@ -122,7 +120,7 @@ def get_config_job_type():
 def check_consistency_vd():
     global job_id
     global job_type
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, virtual_disk),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, virtual_disk),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     for i in data.items():
         if i[0] == "Operations":
@@ -132,7 +130,7 @@ def check_consistency_vd():
                     sys.exit()
     url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s/Actions/Volume.CheckConsistency' % (idrac_ip, virtual_disk)
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
     if response.status_code == 202:
         print("\n- PASS: POST command passed to check consistency \"%s\" virtual disk, status code 202 returned" % (virtual_disk))
     else:
@@ -147,7 +145,7 @@ def check_consistency_vd():
         print("\n- FAIL, unable to create job ID")
         sys.exit()
         
-    req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
     data = req.json()
     if data[u'JobType'] == "RAIDConfiguration":
         job_type="staged"
@@ -156,27 +154,24 @@ def check_consistency_vd():
     print("\n- PASS, \"%s\" %s jid successfully created for check consistency virtual disk\n" % (job_type, job_id))
 
 
-start_time=datetime.now()
+deadline = RedfishJobState.deadline(30 * 60)
 
 def loop_job_status():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=1)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "0:30:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, script stopped\n")
             sys.exit()
-        elif "Fail" in data[u'Message'] or "fail" in data[u'Message']:
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
             print("- FAIL: %s failed" % job_id)
             sys.exit()
-        elif data[u'Message'] == "Job completed successfully.":
+        elif RedfishJobState.succeeded(data):
             print("\n--- PASS, Final Detailed Job Status Results ---\n")
             for i in data.items():
                 if "odata" in i[0] or "MessageArgs" in i[0] or "TargetSettingsURI" in i[0]:
@@ -186,23 +181,22 @@ def loop_job_status():
             break
         else:
             print("- WARNING, JobStatus not completed, current status is: \"%s\", percent completion is: \"%s\"" % (data[u'Message'],data[u'PercentComplete']))
-            time.sleep(1)
 
 def get_job_status():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        if statusCode == 200:
-            time.sleep(5)
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=5)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if data[u'Message'] == "Task successfully scheduled.":
+        if RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             print("\n- WARNING, staged config job marked as scheduled, rebooting the system\n")
             break
+        elif RedfishJobState.failed(data):
+            print("- FAIL: %s failed, failed message is: %s" % (job_id, data[u'Message']))
+            sys.exit()
         else:
             print("\n- WARNING: JobStatus not scheduled, current status is: %s\n" % data[u'Message'])
 
@@ -211,7 +205,7 @@ def reboot_server():
     url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
     payload = {'ResetType': 'ForceOff'}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
     statusCode = response.status_code
     if statusCode == 204:
         print("\n- PASS, Command passed to power OFF server, code return is %s\n" % statusCode)
@@ -222,7 +216,7 @@ def reboot_server():
     time.sleep(10)
     payload = {'ResetType': 'On'}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=('root','calvin'))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=('root','calvin'))
     statusCode = response.status_code
     if statusCode == 204:
         print("\n- PASS, Command passed to power ON server, code return is %s\n" % statusCode)
@@ -15,9 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse
-
-from datetime import datetime
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -40,7 +38,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellRaidService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellRaidService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -50,7 +48,7 @@ def check_supported_idrac_version():
 
 
 def get_storage_controllers():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- Server controller(s) detected -\n")
     controller_list=[]
@@ -64,7 +62,7 @@ def get_pdisks_check_raidstatus():
     test_valid_controller_FQDD_string(args["d"])
     disk_used_created_vds=[]
     available_disks=[]
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, args["d"]),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, args["d"]),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     drive_list=[]
     if data[u'Drives'] == []:
@@ -76,7 +74,7 @@ def get_pdisks_check_raidstatus():
     print("\n- Drives detected for controller \"%s\" and RaidStatus\n" % args["d"])
     foreign_disks_detected=[]
     for i in drive_list:
-      response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+      response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
       data = response.json()
       
       print(" - Disk %s, Raidstatus %s" % (i, data[u'Oem'][u'Dell'][u'DellPhysicalDisk'][u'RaidStatus']))
@@ -93,7 +91,7 @@ def get_pdisks_check_raidstatus():
 
 def get_virtual_disks():
     test_valid_controller_FQDD_string(args["v"])
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, args["v"]),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s/Volumes' % (idrac_ip, args["v"]),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     vd_list=[]
     if data[u'Members'] == []:
@@ -104,7 +102,7 @@ def get_virtual_disks():
             vd_list.append(i[u'@odata.id'].split("/")[-1])
     print("\n- Volume(s) detected for %s controller -\n" % args["v"])
     for ii in vd_list:
-        response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Volumes/%s' % (idrac_ip, ii),verify=False,auth=(idrac_username, idrac_password))
         data = response.json()
         for i in data.items():
             if i[0] == "VolumeType":
@@ -121,7 +119,7 @@ def clear_foreign_config():
     url = 'https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellRaidService/Actions/DellRaidService.ClearForeignConfig' % (idrac_ip)
     headers = {'content-type': 'application/json'}
     payload={"TargetFQDD": args["f"]}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 202:
         print("\n- PASS: POST command passed to clear foreign configuration for controller %s, status code %s returned" % (args["f"], response.status_code))
@@ -138,25 +136,22 @@ def clear_foreign_config():
         sys.exit()
     
 def loop_job_status():
-    start_time=datetime.now()
+    deadline = RedfishJobState.deadline(2 * 60 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=3)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "2:00:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 2 hours has been hit, script stopped\n")
             sys.exit()
-        elif "Fail" in data[u'Message'] or "fail" in data[u'Message'] or data[u'JobState'] == "Failed":
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
             print("- FAIL: job ID %s failed, failed message is: %s" % (job_id, data[u'Message']))
             sys.exit()
-        elif data[u'JobState'] == "Completed":
+        elif RedfishJobState.succeeded(data):
             print("\n--- PASS, Final Detailed Job Status Results ---\n")
             for i in data.items():
                 if "odata" in i[0] or "MessageArgs" in i[0] or "TargetSettingsURI" in i[0]:
@@ -166,10 +161,9 @@ def loop_job_status():
             break
         else:
             print("- WARNING, JobStatus not completed, current status: \"%s\", percent complete: \"%s\"" % (data[u'Message'],data[u'PercentComplete']))
-            time.sleep(3)
 
 def test_valid_controller_FQDD_string(x):
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, x),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, x),verify=False,auth=(idrac_username, idrac_password))
     if response.status_code != 200:
         print("\n- FAIL, either controller FQDD does not exist or typo in FQDD string name (FQDD controller string value is case sensitive)")
         sys.exit()
@@ -177,7 +171,7 @@ def test_valid_controller_FQDD_string(x):
         pass
 
 def check_foreign_cleared():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, args["f"]),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, args["f"]),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("- FAIL, GET command failed, detailed error results: %s" % data)
@@ -193,7 +187,7 @@ def check_foreign_cleared():
             drive_list.append(i[u'@odata.id'][53:])
     foreign_disks_detected=[]
     for i in drive_list:
-      response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+      response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
       data = response.json()
       if data[u'Oem'][u'Dell'][u'DellPhysicalDisk'][u'RaidStatus'] == "Foreign":
           foreign_disks_detected.append(i)
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -55,7 +55,7 @@ if args["C"]:
             
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -64,7 +64,7 @@ def check_supported_idrac_version():
         pass
 
 def get_idrac_user_settings(x):
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, x),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, x),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, current iDRAC user settings for account ID \"%s\"\n" % x)
     for i in data.items():
@@ -77,7 +77,7 @@ def create_idrac_user():
     url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, args["C"])
     payload = {'UserName':new_idrac_username,'Password': new_idrac_password,'Enabled':new_idrac_user_enable,'RoleId':new_idrac_user_role}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     if statusCode == 200:
         print("\n- PASS, status code %s returned for PATCH command to create new iDRAC user for account ID %s" % (statusCode, args["C"])) 
@@ -89,10 +89,10 @@ def delete_idrac_user():
     url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, args["D"])
     payload = {'Enabled':False,'RoleId':'None'}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
     payload = {'UserName':'','Password': ''}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
     print("\n- PASS, iDRAC user cleared for account ID %s" % (args["D"])) 
     
     
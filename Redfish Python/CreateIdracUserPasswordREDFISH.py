@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -77,7 +77,7 @@ def create_idrac_user_password():
     
    
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
 
     statusCode = response.status_code
     if statusCode == 200:
@@ -87,7 +87,7 @@ def create_idrac_user_password():
         sys.exit()
 
 def verify_idrac_user_created():
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, args["id"]),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, args["id"]),verify=False,auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     if statusCode != 200:
         print("\n- FAIL, status code %s returned for GET command") % statusCode
@@ -105,7 +105,7 @@ def delete_idrac_user():
     url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, args["d"])
     payload = {"Enabled":False,"RoleId":"None"}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     data = response.json()
     if statusCode == 200:
@@ -114,7 +114,7 @@ def delete_idrac_user():
         print("\n- FAIL, status code %s returned, iDRAC user not deleted. Detailed error results %s" % (statusCode, data))
         sys.exit()
     payload = {"UserName":""}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     data = response.json()
     if statusCode == 200:
@@ -122,7 +122,7 @@ def delete_idrac_user():
     else:
         print("\n- FAIL, status code %s returned, iDRAC user not deleted. Detailed error results %s" % (statusCode, data))
         sys.exit()
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, args["d"]),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, args["d"]),verify=False,auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     if statusCode != 200:
         print("\n- FAIL, status code %s returned for GET command") % statusCode
@@ -139,7 +139,7 @@ def delete_idrac_user():
 def get_current_iDRAC_user_information():
     if args["id"]:
         print("\n- Current iDRAC account user information for id %s" % args["id"])
-        response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, args["id"]),verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, args["id"]),verify=False,auth=(idrac_username, idrac_password))
         statusCode = response.status_code
         if statusCode != 200:
             print("\n- FAIL, status code %s returned for GET command") % statusCode
@@ -157,7 +157,7 @@ def get_current_iDRAC_user_information():
     else:
         print("\n- Current iDRAC account user information -")
         for i in range(2,17):
-            response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Accounts/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
             statusCode = response.status_code
             if statusCode != 200:
                 print("\n- FAIL, status code %s returned for GET command") % statusCode
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 
 from datetime import datetime
@@ -45,7 +45,7 @@ ETag=args["E"]
 # Function to get any Available entries for DELETE payload
 
 def get_available_entries():
-    req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False, cache=True)
     statusCode = req.status_code
     data = req.json()
     l=[]
@@ -66,7 +66,7 @@ def get_available_entries():
 # Function to get ETag for AVAILABLE URI 
 
 def get_etag():
-    req = requests.get('https://%s%s' % (idrac_ip, available_uri), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s%s' % (idrac_ip, available_uri), auth=(idrac_username, idrac_password), verify=False)
     statusCode = req.status_code
     data = req.json()
     ETag = req.headers['ETag']
@@ -78,7 +78,7 @@ def get_etag():
 def delete_payload():
     url = 'https://%s%s' % (idrac_ip, available_uri_delete)
     headers = {"if-match": ETag}
-    response = requests.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 200:
         print("\n- PASS, Successfully deleted payload for URI %s" % available_uri_delete)
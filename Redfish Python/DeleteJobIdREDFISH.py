@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, os, warnings, argparse
+import RedfishTransport, json, sys, re, time, os, warnings, argparse
 
 from datetime import datetime
 
@@ -46,7 +46,7 @@ def script_examples():
 # Function to get current iDRAC job queue
 
 def get_job_queue_job_ids():
-    req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
     statusCode = req.status_code
     data = req.json()
     data = str(data)
@@ -60,14 +60,14 @@ def get_job_queue_job_ids():
         jobstore.append(i)
     print("\n- Current job IDs in the job queue for iDRAC %s:\n" % idrac_ip)
     for i in jobstore:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip,i), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip,i), auth=(idrac_username, idrac_password), verify=False)
         data = req.json()
         print("Job ID: %s, Job Type: %s" % (i,data[u'Name']))
         
 # Function to clear job queue
 
 def clear_job_queue():
-    req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
     statusCode = req.status_code
     data = req.json()
     data = str(data)
@@ -80,8 +80,8 @@ def clear_job_queue():
         i=i.strip("'")
         url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, i)
         headers = {'content-type': 'application/json'}
-        response = requests.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
-    req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+        response = RedfishTransport.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
     statusCode = req.status_code
     data = req.json()
     data = str(data)
@@ -98,7 +98,7 @@ def clear_job_queue():
 def delete_jobID():
     url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, args["j"])
     headers = {'content-type': 'application/json'}
-    response = requests.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
     if response.status_code == 200:
         print("\n- PASS: DELETE command passed to clear job ID \"%s\", status code 200 returned" % args["j"])
     else:
@@ -106,7 +106,7 @@ def delete_jobID():
         data = response.json()
         print("\n- POST command failure is:\n %s" % data)
         sys.exit()
-    req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip,args["j"]), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip,args["j"]), auth=(idrac_username, idrac_password), verify=False)
     if req.status_code != 404:
         print("\n- FAIL, job id %s still exists in the job queue" % args["j"])
         sys.exit()
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, subprocess, argparse, os
+import RedfishTransport, RedfishUpload, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, subprocess, argparse, os
 
 
 from datetime import datetime
@@ -54,7 +54,7 @@ start_time=datetime.now()
 # Function to check if current iDRAC version supports Redfish firmware features
 
 def check_idrac_fw_support():
-    req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False, cache=True)
     statusCode = req.status_code
     if statusCode == 400:
         print("\n- WARNING, current server iDRAC version does not support Redfish firmware features. Refer to Dell online Redfish documentation for information on which iDRAC version supports firmware features.")
@@ -66,7 +66,7 @@ def check_idrac_fw_support():
 
 def get_FW_inventory():
     print("\n- WARNING, current devices detected with firmware version and updateable status -\n")
-    req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False, cache=True)
     statusCode = req.status_code
     data = req.json()
     installed_devices=[]
@@ -75,7 +75,7 @@ def get_FW_inventory():
             if "Installed" in ii[1]:
                 installed_devices.append(ii[1])
     for i in installed_devices:
-        req = requests.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
         statusCode = req.status_code
         data = req.json()
         updateable_status = data[u'Updateable']
@@ -92,7 +92,7 @@ def download_image_payload():
     global new_FW_version
     global dup_version
     global ETag
-    req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False, cache=True)
     statusCode = req.status_code
     data = req.json()
     filename = file_image_name.lower()
@@ -100,9 +100,9 @@ def download_image_payload():
     ImagePath = os.path.join(ImageLocation, filename)
     ETag = req.headers['ETag']
     url = 'https://%s/redfish/v1/UpdateService/FirmwareInventory' % (idrac_ip)
-    files = {'file': (filename, open(ImagePath, 'rb'), 'multipart/form-data')}
-    headers = {"if-match": ETag}
-    response = requests.post(url, files=files, auth = (idrac_username, idrac_password), verify=False, headers=headers)
+    with RedfishUpload.MultipartImage(ImagePath, filename) as body:
+        headers = {"if-match": ETag, "content-type": body.content_type}
+        response = RedfishTransport.post(url, data=body, auth = (idrac_username, idrac_password), verify=False, headers=headers)
     d = response.__dict__
     s=str(d['_content'])
     if response.status_code == 201:
@@ -130,7 +130,7 @@ def install_image_payload():
     InstallOption = install_option
     payload = "{\"SoftwareIdentityURIs\":[\"" + Location + "\"],\"InstallUpon\":\""+ InstallOption +"\"}"
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=payload, auth = (idrac_username, idrac_password), verify=False, headers=headers)
+    response = RedfishTransport.post(url, data=payload, auth = (idrac_username, idrac_password), verify=False, headers=headers)
     d=str(response.__dict__)
     job_id_location = response.headers['Location']
     job_id = re.search("JID_.+",job_id_location).group()
@@ -144,9 +144,9 @@ def check_new_FW_version():
     else:
         print("\n- WARNING, checking new firmware version installed for updated device")
         try:
-            req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/%s' % (idrac_ip, new_FW_version), auth=(idrac_username, idrac_password), verify=False)
+            req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/%s' % (idrac_ip, new_FW_version), auth=(idrac_username, idrac_password), verify=False, cache=True)
         except:
-            req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/%s' % (idrac_ip, new_FW_version), auth=(idrac_username, idrac_password), verify=False)
+            req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/%s' % (idrac_ip, new_FW_version), auth=(idrac_username, idrac_password), verify=False, cache=True)
         statusCode = req.status_code
         data = req.json()
         if dup_version == data[u'Version']:
@@ -185,9 +185,9 @@ def check_idrac_connection():
                     time.sleep(120)
                     break
             try:
-                req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
+                req = RedfishTransport.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
             except:
-                req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
+                req = RedfishTransport.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
                 
             statusCode = req.status_code
             data = req.json()
@@ -206,15 +206,19 @@ def check_idrac_connection():
 
 def check_job_status_host_reboot():
     start_time=datetime.now()
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
         check_idrac_connection()
         try:
-            req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        except:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=1)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("Query job ID command failed, error code is: %s" % error.status_code)
+            sys.exit()
+        except Exception:
             print("- WARNING, iDRAC network connection lost due to slow network response or iDRAC reset to apply firmware update. Waiting 6 minutes to access iDRAC again")
             time.sleep(360)
-            req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-            statusCode = req.status_code
+            req = RedfishTransport.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
             data = req.json()
             if data[u"TaskState"] == "Completed":
                 print("\n- PASS, job ID %s successfuly marked completed, detailed final job status results:\n" % data[u"Id"])
@@ -226,22 +230,11 @@ def check_job_status_host_reboot():
                 print("\n- FAIL, job ID %s is not marked completed, current job status is: %s" % (job_id, data[u"TaskState"]))
             sys.exit()
         current_time = str(datetime.now()-start_time)[0:7]   
-        statusCode = req.status_code
-        data = req.json()
-        message_string=data[u"Messages"]
-        #current_time=(datetime.now()-start_time)
-        if statusCode == 202 or statusCode == 200:
-            pass
-        else:
-            print("Query job ID command failed, error code is: %s" % statusCode)
-            sys.exit()
-        if "failed" in data[u"Messages"] or "completed with errors" in data[u"Messages"] or "Failed" in data[u"Messages"]:
-            print("- FAIL: Job failed, current message is: %s" % data[u"Messages"])
-            sys.exit()
-        elif data[u"TaskState"] == "Completed":
+        if RedfishJobState.succeeded(data):
             print("\n- PASS, job ID %s successfully marked completed, detailed final job status results:\n" % data[u"Id"])
-            for i in data[u'Oem'][u'Dell'].items():
-                print("%s: %s" % (i[0],i[1]))
+            for i in data.items():
+                if "odata" not in i[0]:
+                    print("%s: %s" % (i[0],i[1]))
             print("\n- %s completed in: %s" % (job_id, str(current_time)[0:7]))
             if data[u"Name"] == "Firmware Update: iDRAC":
                 print("\n- WARNING, iDRAC update performed. Script will wait 6 minutes for iDRAC to reset and come back up before checking new firmware version")
@@ -263,72 +256,54 @@ def check_job_status_host_reboot():
                         return
             else:
                 break
-        elif data[u"TaskState"] == "Completed with Errors" or data[u"TaskState"] == "Failed":
+        elif RedfishJobState.finished(data):
             print("\n- Job ID = "+data[u"Id"])
             print("- Name = "+data[u"Name"])
-            try:
-                print("- Message = "+message_string[0][u"Message"])
-            except:
-                print("- "+data[u"Messages"][0][u"Message"])
-            print("- JobStatus = "+data[u"TaskState"])
+            print("- Message = "+data[u"Message"])
+            print("- JobStatus = "+data[u"JobState"])
             print("\n- %s completed in: %s" % (job_id, str(current_time)[0:7]))
             sys.exit()
         else:
             if "d9" in file_image_name or "d8" in file_image_name or "d7" in file_image_name:
                 print("- Message: Downloading package \"%s\"" % file_image_name)
             else:
-                print("- Message: %s, current job execution time is: %s" % (message_string[0][u"Message"], current_time))
-            time.sleep(1)
-            continue
+                print("- Message: %s, current job execution time is: %s" % (data[u"Message"], current_time))
 
 # Function to check job status for next manual reboot
 
 def check_job_status(): 
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        data = req.json()
-        message_string=data[u"Messages"]
-        current_time=(datetime.now()-start_time)
-        if statusCode == 202 or statusCode == 200:
-            time.sleep(10)
-        else:
-            print("Query job ID command failed, error code is: %s" % statusCode)
-            sys.exit()
-        if "failed" in data[u"Messages"] or "completed with errors" in data[u"Messages"]:
-            print("- FAIL: Job failed, current message is: %s" % data[u"Messages"])
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=10)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("Query job ID command failed, error code is: %s" % error.status_code)
             sys.exit()
-        elif data[u"TaskState"] == "Pending":
+        current_time=(datetime.now()-start_time)
+        if RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             print("\n- Job ID = "+data[u"Id"])
             print("- Name = "+data[u"Name"])
-            try:
-                print("- Message = "+message_string[0][u"Message"])
-            except:
-                print("- Message = "+data[u"Messages"][0][u"Message"])
-            print("- JobStatus = "+data[u"TaskState"])
+            print("- Message = "+data[u"Message"])
+            print("- JobStatus = "+data[u"JobState"])
             print("\n- %s scheduled in: %s" % (job_id, str(current_time)[0:7]))
             print("\n- WARNING, Host manual reboot is now needed to complete the process of applying the firmware image.\n")
             break
-        elif data[u"TaskState"] == "Completed":
+        elif RedfishJobState.succeeded(data):
             print("\n- WARNING, device selected is immediate update, incorrect install option passed in.")
             print("- %s still marked completed and firmware updated" % (job_id))
             break
-        elif data[u"TaskState"] == "Completed with Errors" or data[u"TaskState"] == "Failed":
+        elif RedfishJobState.finished(data):
             print("\n- Job ID = "+data[u"Id"])
             print("- Name = "+data[u"Name"])
-            try:
-                print("- Message = "+message_string[0][u"Message"])
-            except:
-                print("- "+data[u"Messages"][0][u"Message"])
-            print("- JobStatus = "+data[u"TaskState"])
+            print("- Message = "+data[u"Message"])
+            print("- JobStatus = "+data[u"JobState"])
             print("\n- %s completed in: %s" % (job_id, str(current_time)[0:7]))
             sys.exit()
         else:
-            print("- Job not marked completed, current status is: %s" % data[u"TaskState"])
-            print("- Message: %s\n" % message_string[0][u"Message"])
+            print("- Job not marked completed, current status is: %s" % data[u"JobState"])
+            print("- Message: %s\n" % data[u"Message"])
             print("- Current job execution time is: %s\n" % str(current_time)[0:7])
-            time.sleep(1)
-            continue
 
 
 # Run code
@@ -1,6 +1,10 @@
 #
 # DeviceFirmwareSimpleUpdateREDFISH. Python script using Redfish API to update a device firmware with DMTF action SimpleUpdate. Supported file image types are Windows DUPs, d7/d9 image or pm files.
 #
+# NOTE: The SHA-256 of the image and the ComponentID and Version of the package are kept in a local image index file (-x, see RedfishImageIndex).
+# When the iDRAC repository already has an AVAILABLE entry with the same ComponentID and Version, the update job is created from that entry
+# instead of downloading the image again. Pass in --upload to always download the image.
+#
 # _author_ = Texas Roemer <Texas_Roemer@Dell.com>
 # _version_ = 7.0
 #
@@ -14,7 +18,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse, os
+import RedfishTransport, RedfishUpload, RedfishJobWatcher, RedfishJobState, RedfishFirmwareUpdate, RedfishImageIndex, RedfishOperations, json, sys, re, time, warnings, argparse, os
 
 from datetime import datetime
 
@@ -30,6 +34,8 @@ parser.add_argument('script_examples',action="store_true",help='DeviceFirmwareSi
 parser.add_argument('-g', help='Get current supported devices for firmware updates and their current firmware versions, pass in \"y\"', required=False)
 parser.add_argument('-l', help='Pass in the local directory location of the firmware image', required=False)
 parser.add_argument('-f', help='Pass in the firmware image name', required=False)
+parser.add_argument('-x', help='Image index file with the SHA-256, ComponentID and Version of downloaded images, default is \"firmware_image_index.json\" in the current directory', required=False)
+parser.add_argument('--upload', help='Always download the image, even when the iDRAC repository already has it', action="store_true", required=False)
 
 
 args=vars(parser.parse_args())
@@ -39,7 +45,7 @@ idrac_username=args["u"]
 idrac_password=args["p"]
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password), cache=True)
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -49,7 +55,7 @@ def check_supported_idrac_version():
     
 def get_FW_inventory():
     print("\n- WARNING, current devices detected with firmware version and updateable status -\n")
-    req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False, cache=True)
     statusCode = req.status_code
     installed_devices=[]
     data = req.json()
@@ -63,7 +69,7 @@ def get_FW_inventory():
     else:
         print("-"*80)
     for i in installed_devices:
-        req = requests.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
         statusCode = req.status_code
         data = req.json()
         componentID = data[u'Oem'][u'Dell'][u'DellSoftwareInventory'][u'ComponentID']
@@ -78,21 +84,41 @@ def get_FW_inventory():
 def download_image_payload():
     global available_entry
     global http_push_uri
+    ImageLocation = args["l"]
+    filename = args["f"]
+    ImagePath = os.path.join(ImageLocation, filename)
+    image_index = None
+    identity = None
+    if not args["upload"]:
+        try:
+            image_index = RedfishImageIndex.ImageIndex(args["x"] or "firmware_image_index.json")
+            identity = image_index.identity(ImagePath)
+        except (IOError, ValueError) as error:
+            print("- FAIL, unable to use image index file \"%s\": %s" % (args["x"] or "firmware_image_index.json", error))
+            sys.exit()
+    if identity:
+        try:
+            available_entry = RedfishFirmwareUpdate.find_available_entry(idrac_ip, (idrac_username, idrac_password), *identity)
+            if available_entry:
+                http_push_uri = RedfishFirmwareUpdate.get_http_push_uri(idrac_ip, (idrac_username, idrac_password))
+        except RedfishOperations.RedfishOperationError as error:
+            print("\n%s" % error)
+            sys.exit()
+        if available_entry:
+            print("\n- PASS, iDRAC already has image \"%s\" (ComponentID %s, Version %s) as AVAILABLE entry \"%s\", skipping the download" % (filename, identity[0], identity[1], available_entry))
+            return
     print("\n- WARNING, downloading \"%s\" image, this may take a few minutes depending on the size of the image" % args["f"])
-    req = requests.get('https://%s/redfish/v1/UpdateService/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
     data = req.json()
     http_push_uri = data[u'HttpPushUri']
-    req = requests.get('https://%s%s' % (idrac_ip, http_push_uri), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s%s' % (idrac_ip, http_push_uri), auth=(idrac_username, idrac_password), verify=False)
     statusCode = req.status_code
     data = req.json()
-    ImageLocation = args["l"]
-    filename = args["f"]
-    ImagePath = os.path.join(ImageLocation, filename)
     ETag = req.headers['ETag']
     url = 'https://%s%s' % (idrac_ip, http_push_uri)
-    files = {'file': (filename, open(ImagePath, 'rb'), 'multipart/form-data')}
-    headers = {"if-match": ETag}
-    response = requests.post(url, files=files, auth = (idrac_username, idrac_password), verify=False, headers=headers)
+    with RedfishUpload.MultipartImage(ImagePath, filename) as body:
+        headers = {"if-match": ETag, "content-type": body.content_type}
+        response = RedfishTransport.post(url, data=body, auth = (idrac_username, idrac_password), verify=False, headers=headers)
     post_command_response_output=response.json()
     if response.status_code == 201:
         print("\n- PASS: POST command passed successfully to download image, status code %s returned" % response.status_code)
@@ -102,6 +128,14 @@ def download_image_payload():
         sys.exit()
     available_entry = post_command_response_output[u'Id']
     print("- WARNING, AVAILABLE entry created for download image \"%s\" is \"%s\"" % (filename, available_entry))
+    if image_index:
+        # Remember ComponentID and Version of the image, the next run against an iDRAC which has this entry skips the download
+        try:
+            component_id, version = RedfishFirmwareUpdate.available_entry(idrac_ip, (idrac_username, idrac_password), http_push_uri, available_entry)
+        except RedfishOperations.RedfishOperationError:
+            component_id, version = None, None
+        if component_id and version:
+            image_index.remember(ImagePath, component_id, version)
     
 
     
@@ -111,7 +145,7 @@ def install_image_payload():
     url = 'https://%s/redfish/v1/UpdateService/Actions/UpdateService.SimpleUpdate' % (idrac_ip)
     payload = {"ImageURI":"%s/%s" % (http_push_uri, available_entry)}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     if response.status_code == 202 or response.status_code == 200:
             pass
     else:
@@ -126,56 +160,47 @@ def install_image_payload():
 def check_job_status():
     global start_time
     start_time=datetime.now()
+    deadline = RedfishJobState.deadline(30 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        data = req.json()
-        if data[u"TaskState"] == "Completed":
-            print("\n- PASS, job ID %s successfuly marked completed, detailed final job status results:\n" % data[u"Id"])
-            for i in data[u'Oem'][u'Dell'].items():
-                print("%s: %s" % (i[0],i[1]))
-            print("\n- JOB ID %s completed in %s" % (job_id, current_time))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=1)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("Query job ID command failed, error code is: %s" % error.status_code)
             sys.exit()
         current_time = str(datetime.now()-start_time)[0:7]   
-        statusCode = req.status_code
-        data = req.json()
-        message_string=data[u"Messages"]
-        if statusCode == 202 or statusCode == 200:
-            pass
-        else:
-            print("Query job ID command failed, error code is: %s" % statusCode)
-            sys.exit()
-        if str(current_time)[0:7] >= "0:30:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, update job should of already been marked completed. Check the iDRAC job queue and LC logs to debug the issue\n")
             sys.exit()
-        elif "failed" in data[u'Oem'][u'Dell'][u'Message'] or "completed with errors" in data[u'Oem'][u'Dell'][u'Message'] or "Failed" in data[u'Oem'][u'Dell'][u'Message']:
-            print("- FAIL: Job failed, current message is: %s" % data[u"Messages"])
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
+            print("- FAIL: Job failed, current message is: %s" % data[u"Message"])
             sys.exit()
-        elif "scheduled" in data[u'Oem'][u'Dell'][u'Message']:
+        elif RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             print("\n- PASS, job ID %s successfully marked as scheduled, powering on or rebooting the server to apply the update" % data[u"Id"])
             break
-        elif "completed successfully" in data[u'Oem'][u'Dell'][u'Message']:
-            print("\n- PASS, job ID %s successfully marked completed, detailed final job status results:\n" % data[u"Id"])
-            for i in data[u'Oem'][u'Dell'].items():
-                print("%s: %s" % (i[0],i[1]))
-            print("\n- %s completed in: %s" % (job_id, str(current_time)[0:7]))
+        elif RedfishJobState.succeeded(data):
+            print("\n- PASS, job ID %s successfuly marked completed, detailed final job status results:\n" % data[u"Id"])
+            for i in data.items():
+                if "odata" not in i[0]:
+                    print("%s: %s" % (i[0],i[1]))
+            print("\n- JOB ID %s completed in %s" % (job_id, current_time))
+            sys.exit()
         else:
             if "d9" in args["f"] or "d8" in args["f"] or "d7" in args["f"]:
                 print("- Message: Downloading package \"%s\"" % args["f"])
             else:
-                print("- Message: %s, current job execution time is: %s" % (message_string[0][u"Message"], current_time))
-            time.sleep(1)
-            continue
+                print("- Message: %s, current job execution time is: %s" % (data[u"Message"], current_time))
 
 def reboot_server():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, Current server power state is: %s" % data[u'PowerState'])
     if data[u'PowerState'] == "On":
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'GracefulShutdown'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to gracefully power OFF server, code return is %s" % statusCode)
@@ -186,7 +211,7 @@ def reboot_server():
             sys.exit()
         count = 0
         while True:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             if data[u'PowerState'] == "Off":
                 print("- PASS, GET command passed to verify server is in OFF state")
@@ -196,7 +221,7 @@ def reboot_server():
                 url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
                 payload = {'ResetType': 'ForceOff'}
                 headers = {'content-type': 'application/json'}
-                response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+                response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
                 statusCode = response.status_code
                 if statusCode == 204:
                     print("- PASS, Command passed to forcefully power OFF server, code return is %s" % statusCode)
@@ -214,7 +239,7 @@ def reboot_server():
             
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -226,7 +251,7 @@ def reboot_server():
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -241,35 +266,32 @@ def reboot_server():
 
 def loop_check_final_job_status():
     start_time=datetime.now()
+    deadline = RedfishJobState.deadline(2 * 60 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=str((datetime.now()-start_time))[0:7]
-        statusCode = req.status_code
-        if statusCode == 202 or statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=20)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        #print data
-        if str(current_time)[0:7] >= "2:00:00":
+        current_time=str((datetime.now()-start_time))[0:7]
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 2 hours has been hit, update job should of already been marked completed. Check the iDRAC job queue and LC logs to debug the issue\n")
             sys.exit()
-        elif "Fail" in data[u'Oem'][u'Dell'][u'Message'] or "fail" in data[u'Oem'][u'Dell'][u'Message']:
-            print("- FAIL: %s failed" % job_id)
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
+            print("- FAIL: %s failed, job state is %s, detailed error message is: %s" % (job_id, data[u'JobState'], data[u'Message']))
             sys.exit()
         
-        elif "completed successfully" in data[u'Oem'][u'Dell'][u'Message']:
+        elif RedfishJobState.succeeded(data):
             print("\n- PASS, job ID %s successfully marked completed" % job_id)
             print("\n- Final detailed job results -\n")
-            for i in data[u'Oem'][u'Dell'].items():
+            for i in data.items():
                 print("%s: %s" % (i[0], i[1]))
             print("\n- JOB ID %s completed in %s" % (job_id, current_time))
             sys.exit()
         else:
-            print("- WARNING, JobStatus not completed, current status is: \"%s\", job execution time is \"%s\"" % (data[u'Oem'][u'Dell'][u'Message'], current_time))
-            time.sleep(20)
+            print("- WARNING, JobStatus not completed, current status is: \"%s\", job execution time is \"%s\"" % (data[u'Message'], current_time))
 
 
 if __name__ == "__main__":
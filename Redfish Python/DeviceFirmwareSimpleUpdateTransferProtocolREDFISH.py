@@ -14,7 +14,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse, os, subprocess
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, argparse, os, subprocess
 
 from datetime import datetime
 
@@ -41,7 +41,7 @@ idrac_username=args["u"]
 idrac_password=args["p"]
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/UpdateService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/UpdateService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     try:
         for i in data[u'Actions'][u'#UpdateService.SimpleUpdate'][u'TransferProtocol@Redfish.AllowableValues']:
@@ -64,7 +64,7 @@ def check_idrac_lost_connection():
     
 def get_FW_inventory():
     print("\n- WARNING, current devices detected with firmware version and updateable status -\n")
-    req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False, cache=True)
     statusCode = req.status_code
     installed_devices=[]
     data = req.json()
@@ -73,7 +73,7 @@ def get_FW_inventory():
             if "Installed" in ii[1]:
                 installed_devices.append(ii[1])
     for i in installed_devices:
-        req = requests.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
         statusCode = req.status_code
         data = req.json()
         updateable_status = data[u'Updateable']
@@ -83,7 +83,7 @@ def get_FW_inventory():
     sys.exit()
 
 def get_supported_protocols():
-    req = requests.get('https://%s/redfish/v1/UpdateService' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
     statusCode = req.status_code
     installed_devices=[]
     data = req.json()
@@ -100,7 +100,7 @@ def install_image_payload():
     url = 'https://%s/redfish/v1/UpdateService/Actions/UpdateService.SimpleUpdate' % (idrac_ip)
     payload = {"ImageURI":args["uri"], "TransferProtocol":args["t"]}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     if response.status_code == 202 or response.status_code == 200:
             pass
     else:
@@ -115,56 +115,45 @@ def install_image_payload():
 def check_job_status():
     global start_time
     start_time=datetime.now()
+    deadline = RedfishJobState.deadline(30 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        data = req.json()
-        if data[u"TaskState"] == "Completed":
-            print("\n- PASS, job ID %s successfuly marked completed, detailed final job status results:\n" % data[u"Id"])
-            for i in data[u'Oem'][u'Dell'].items():
-                print("%s: %s" % (i[0],i[1]))
-            print("\n- JOB ID %s completed in %s" % (job_id, current_time))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=1)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("Query job ID command failed, error code is: %s" % error.status_code)
             sys.exit()
         current_time = str(datetime.now()-start_time)[0:7]   
-        statusCode = req.status_code
-        data = req.json()
-        message_string=data[u"Messages"]
-        if statusCode == 202 or statusCode == 200:
-            pass
-        else:
-            print("Query job ID command failed, error code is: %s" % statusCode)
-            sys.exit()
-        if str(current_time)[0:7] >= "0:30:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, update job should of already been marked completed. Check the iDRAC job queue and LC logs to debug the issue\n")
             sys.exit()
-        elif "failed" in data[u'Oem'][u'Dell'][u'Message'] or "completed with errors" in data[u'Oem'][u'Dell'][u'Message'] or "Failed" in data[u'Oem'][u'Dell'][u'Message'] or "internal error" in data[u'Oem'][u'Dell'][u'Message']:
-            print("- FAIL: Job failed, current message is: %s" % data[u"Messages"])
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
+            print("- FAIL: Job failed, current message is: %s" % data[u"Message"])
             sys.exit()
-        elif "scheduled" in data[u'Oem'][u'Dell'][u'Message']:
+        elif RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             break
-        elif "completed successfully" in data[u'Oem'][u'Dell'][u'Message']:
+        elif RedfishJobState.succeeded(data):
             print("\n- PASS, job ID %s successfully marked completed, detailed final job status results:\n" % data[u"Id"])
-            for i in data[u'Oem'][u'Dell'].items():
-                if i[0] == "Name":
+            for i in data.items():
+                if i[0] == "Name" or "odata" in i[0]:
                     pass
                 else:
                     print("%s: %s" % (i[0],i[1]))
             print("\n- %s completed in: %s" % (job_id, str(current_time)[0:7]))
             sys.exit()
         else:
-            print("- Message: %s, current job execution time is: %s" % (message_string[0][u"Message"], current_time))
-            time.sleep(1)
-            continue
+            print("- Message: %s, current job execution time is: %s" % (data[u"Message"], current_time))
 
 def reboot_server():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, Current server power state is: %s" % data[u'PowerState'])
     if data[u'PowerState'] == "On":
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'GracefulShutdown'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to gracefully power OFF server, code return is %s" % statusCode)
@@ -175,7 +164,7 @@ def reboot_server():
             sys.exit()
         count = 0
         while True:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             if data[u'PowerState'] == "Off":
                 print("- PASS, GET command passed to verify server is in OFF state")
@@ -185,7 +174,7 @@ def reboot_server():
                 url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
                 payload = {'ResetType': 'ForceOff'}
                 headers = {'content-type': 'application/json'}
-                response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+                response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
                 statusCode = response.status_code
                 if statusCode == 204:
                     print("- PASS, Command passed to forcefully power OFF server, code return is %s" % statusCode)
@@ -203,7 +192,7 @@ def reboot_server():
             
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -215,7 +204,7 @@ def reboot_server():
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -230,35 +219,34 @@ def reboot_server():
 
 
 def loop_check_final_job_status():
+    deadline = RedfishJobState.deadline(2 * 60 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
         check_idrac_lost_connection()
-        req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=str((datetime.now()-start_time))[0:7]
-        statusCode = req.status_code
-        if statusCode == 202 or statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=10)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "2:00:00":
+        current_time=str((datetime.now()-start_time))[0:7]
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 2 hours has been hit, update job should of already been marked completed. Check the iDRAC job queue and LC logs to debug the issue\n")
             sys.exit()
-        elif "Fail" in data[u'Oem'][u'Dell'][u'Message'] or "fail" in data[u'Oem'][u'Dell'][u'Message'] or "Unable" in data[u'Oem'][u'Dell'][u'Message']:
-            print("- FAIL: %s failed, error message: %s" % (job_id, data[u'Oem'][u'Dell'][u'Message']))
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
+            print("- FAIL: %s failed, error message: %s" % (job_id, data[u'Message']))
             sys.exit()
         
-        elif "completed successfully" in data[u'Oem'][u'Dell'][u'Message']:
+        elif RedfishJobState.succeeded(data):
             print("\n- PASS, job ID %s successfully marked completed" % job_id)
             print("\n- Final detailed job results -\n")
-            for i in data[u'Oem'][u'Dell'].items():
-                print("%s: %s" % (i[0], i[1]))
+            for i in data.items():
+                if "odata" not in i[0]:
+                    print("%s: %s" % (i[0], i[1]))
             print("\n- JOB ID %s completed in %s" % (job_id, current_time))
             sys.exit()
         else:
-            print("- WARNING, JobStatus not completed, current status is: \"%s\", job execution time is \"%s\"" % (data[u'Oem'][u'Dell'][u'Message'], current_time))
-            time.sleep(10)
+            print("- WARNING, JobStatus not completed, current status is: \"%s\", job execution time is \"%s\"" % (data[u'Message'], current_time))
 
 
 if __name__ == "__main__":
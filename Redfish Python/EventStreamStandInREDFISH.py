@@ -0,0 +1,232 @@
+#
+# EventStreamStandInREDFISH. Python script running a local stand-in iDRAC with a Redfish Server-Sent Events stream, to try RedfishEventStream,
+# GetEventStreamREDFISH and the event stream option of the fleet scripts without an iDRAC.
+#
+# NOTE: The stand-in serves the EventService (ServerSentEventUri), the SSE stream, the PowerState and ComputerSystem.Reset of the system and the
+# job queue. POST ComputerSystem.Reset changes the power state after -pd seconds, POST to the Jobs collection creates a job which moves
+# through Scheduled, Running and Completed every -jd seconds. Every change is sent as a Redfish event on the stream (power changes with
+# OriginOfCondition the system, job changes with JCP MessageIds) and printed. Any username and password is accepted.
+#
+# NOTE: Each event has an id and the last 1000 events are kept, a client reconnecting with Last-Event-ID gets the events it missed first, a new
+# client only the events sent after it connected. Pass in -dc to close every stream after that many seconds to try the reconnect of the client.
+#
+# NOTE: An HTTPS certificate and key file are required, a self-signed certificate is enough, for example:
+#     openssl req -x509 -newkey rsa:2048 -nodes -days 365 -subj /CN=localhost -keyout standin.key -out standin.crt
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import collections, json, ssl, sys, threading, time, argparse
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlsplit
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlsplit
+
+parser=argparse.ArgumentParser(description="Python script running a local stand-in iDRAC with a Redfish Server-Sent Events stream, simulated job and power events")
+parser.add_argument('script_examples',action="store_true",help='EventStreamStandInREDFISH.py -P 8443 -c standin.crt -k standin.key, this example will run the stand-in on port 8443, then \"GetEventStreamREDFISH.py -ip 127.0.0.1:8443 -u root -p calvin\" prints its events. EventStreamStandInREDFISH.py -P 8443 -c standin.crt -k standin.key -dc 30 -jd 5, this example will close every event stream after 30 seconds and move jobs to the next state every 5 seconds.')
+parser.add_argument('-P', help='Local port of the stand-in, default is 8443', required=False)
+parser.add_argument('-c', help='HTTPS certificate file', required=True)
+parser.add_argument('-k', help='HTTPS private key file', required=True)
+parser.add_argument('-jd', help='Seconds between two job state changes, default is 3', required=False)
+parser.add_argument('-pd', help='Seconds a power state change takes, default is 5', required=False)
+parser.add_argument('-dc', help='Close every event stream after this many seconds, default is to keep streams open', required=False)
+
+args=vars(parser.parse_args())
+
+SYSTEM_URI = "/redfish/v1/Systems/System.Embedded.1"
+RESET_URI = SYSTEM_URI + "/Actions/ComputerSystem.Reset"
+JOBS_URI = "/redfish/v1/Managers/iDRAC.Embedded.1/Jobs"
+SSE_URI = "/redfish/v1/SSE"
+KEEP_ALIVE = 15
+EVENT_BUFFER = 1000
+
+# Job steps: JobState, Message, PercentComplete, MessageId
+JOB_STEPS = [("Scheduled", "Task successfully scheduled.", 0, "JCP001"),
+             ("Running", "Job in progress.", 50, "JCP007"),
+             ("Completed", "Job completed successfully.", 100, "JCP007")]
+# PowerState reached by each ResetType, MessageId and Message of the event
+RESET_STATES = {"On": ("On", "SYS1000", "System is turning on."), "ForceOff": ("Off", "SYS1001", "System is turning off."),
+                "GracefulShutdown": ("Off", "SYS1001", "System is turning off."), "ForceRestart": ("On", "SYS1003", "System CPU Resetting."),
+                "GracefulRestart": ("On", "SYS1003", "System CPU Resetting."), "PowerCycle": ("On", "SYS1003", "System CPU Resetting.")}
+
+condition = threading.Condition()
+events = collections.deque(maxlen=EVENT_BUFFER)
+state = {"PowerState": "On", "next_event_id": 1, "next_job_id": 1}
+jobs = {}
+
+
+def send_event(message_id, message, origin, event_type="Alert"):
+    with condition:
+        event_id = state["next_event_id"]
+        state["next_event_id"] += 1
+        record = {"EventType": event_type, "EventId": str(event_id), "MessageId": "IDRAC.2.8.%s" % message_id, "Message": message,
+                  "OriginOfCondition": {"@odata.id": origin}, "EventTimestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+        events.append((event_id, {"@odata.type": "#Event.v1_3_0.Event", "Id": str(event_id), "Name": "Event Array", "Events": [record]}))
+        condition.notify_all()
+    print("- INFO, event %s: %s %s (%s)" % (event_id, message_id, message, origin))
+
+
+def change_power_state(reset_type):
+    power_state, message_id, message = RESET_STATES[reset_type]
+    time.sleep(float(args["pd"] or 5))
+    with condition:
+        state["PowerState"] = power_state
+    send_event(message_id, message, SYSTEM_URI, "StatusChange")
+
+
+def run_job(job_id):
+    for job_state, message, percent, message_id in JOB_STEPS:
+        time.sleep(float(args["jd"] or 3))
+        with condition:
+            jobs[job_id].update({"JobState": job_state, "Message": message, "PercentComplete": percent, "MessageId": message_id})
+        send_event(message_id, message, "%s/%s" % (JOBS_URI, job_id))
+
+
+def start(target, *arguments):
+    thread = threading.Thread(target=target, args=arguments)
+    thread.daemon = True
+    thread.start()
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def send_json(self, status_code, data=None, headers=None):
+        body = json.dumps(data).encode("utf-8") if data is not None else b""
+        self.send_response(status_code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if data is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/")
+        if path == "/redfish/v1/EventService":
+            return self.send_json(200, {"@odata.id": path, "Id": "EventService", "ServiceEnabled": True, "ServerSentEventUri": SSE_URI})
+        if path == SSE_URI:
+            return self.stream_events()
+        if path == SYSTEM_URI:
+            with condition:
+                power_state = state["PowerState"]
+            return self.send_json(200, {"@odata.id": SYSTEM_URI, "Id": "System.Embedded.1", "PowerState": power_state, "Actions": {"#ComputerSystem.Reset": {
+                "target": RESET_URI, "ResetType@Redfish.AllowableValues": sorted(RESET_STATES)}}})
+        if path == JOBS_URI:
+            with condition:
+                documents = [dict(job) for job_id, job in sorted(jobs.items())]
+            members = documents if "$expand" in parts.query else [{"@odata.id": job["@odata.id"]} for job in documents]
+            return self.send_json(200, {"@odata.id": JOBS_URI, "Members": members, "Members@odata.count": len(members)})
+        if path.startswith(JOBS_URI + "/"):
+            with condition:
+                job = jobs.get(path.rsplit("/", 1)[1])
+                job = dict(job) if job is not None else None
+            if job is not None:
+                return self.send_json(200, job)
+        self.send_json(404, {"error": {"message": "%s not found" % path}})
+
+    def do_POST(self):
+        data = self.read_body()
+        path = urlsplit(self.path).path.rstrip("/")
+        if path == RESET_URI:
+            reset_type = json.loads(data.decode("utf-8") or "{}").get("ResetType")
+            if reset_type not in RESET_STATES:
+                return self.send_json(400, {"error": {"message": "unsupported ResetType %s" % reset_type}})
+            start(change_power_state, reset_type)
+            return self.send_json(204)
+        if path == JOBS_URI:
+            with condition:
+                job_id = "JID_%012d" % state["next_job_id"]
+                state["next_job_id"] += 1
+                jobs[job_id] = {"@odata.id": "%s/%s" % (JOBS_URI, job_id), "Id": job_id, "JobState": "New", "Message": "Job created.",
+                                "PercentComplete": 0, "MessageId": "JCP000"}
+            start(run_job, job_id)
+            return self.send_json(200, None, {"Location": "%s/%s" % (JOBS_URI, job_id)})
+        self.send_json(404, {"error": {"message": "%s not found" % path}})
+
+    def write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(("%x\r\n" % len(data)).encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def stream_events(self):
+        try:
+            last_event_id = int(self.headers.get("Last-Event-ID") or 0)
+        except ValueError:
+            last_event_id = 0
+        if not last_event_id:
+            # A new client only gets events sent from now on
+            with condition:
+                last_event_id = state["next_event_id"] - 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        print("- INFO, event stream opened by %s, Last-Event-ID %s" % (self.client_address[0], last_event_id or "not set"))
+        close_time = time.time() + float(args["dc"]) if args["dc"] else None
+        try:
+            self.write_chunk("retry: 2000\n\n")
+            while True:
+                with condition:
+                    pending = [(event_id, event) for event_id, event in events if event_id > last_event_id]
+                    if not pending:
+                        wait = KEEP_ALIVE if close_time is None else max(0, min(KEEP_ALIVE, close_time - time.time()))
+                        condition.wait(wait)
+                        pending = [(event_id, event) for event_id, event in events if event_id > last_event_id]
+                for event_id, event in pending:
+                    self.write_chunk("id: %s\ndata: %s\n\n" % (event_id, json.dumps(event)))
+                    last_event_id = event_id
+                if close_time is not None and time.time() >= close_time:
+                    print("- INFO, closing event stream of %s after %s seconds" % (self.client_address[0], args["dc"]))
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.close_connection = True
+                    return
+                if not pending:
+                    self.write_chunk(": keep-alive\n\n")
+        except (IOError, OSError):
+            # Client went away
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_stand_in():
+    port = int(args["P"] or 8443)
+    try:
+        server = ThreadingHTTPServer(("", port), StandInHandler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER) if hasattr(ssl, "PROTOCOL_TLS_SERVER") else ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+        context.load_cert_chain(args["c"], args["k"])
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    except (IOError, OSError, ssl.SSLError) as error:
+        print("- FAIL, unable to start the stand-in on port %s: %s" % (port, error))
+        sys.exit()
+    print("- INFO, stand-in iDRAC listening on port %s, event stream URI %s, press Ctrl+C to stop" % (port, SSE_URI))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    run_stand_in()
@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse, os
+import RedfishTransport, json, sys, re, time, warnings, argparse, os
 
 from datetime import datetime
 
@@ -42,7 +42,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Dell/Managers/iDRAC.Embedded.1/DelliDRACCardService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Dell/Managers/iDRAC.Embedded.1/DelliDRACCardService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -68,7 +68,7 @@ def export_SSL_cert():
         sys.exit()
     headers = {'content-type': 'application/json'}
     payload={"SSLCertType":cert_type}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 200:
         print("\n- PASS: POST command passed for %s method, status code 202 returned\n" % method)
@@ -112,7 +112,7 @@ def import_SSL_cert():
     read_file = re.search("-----B.+",read_file).group()
     f.close()
     payload={"CertificateType":cert_type,"SSLCertificateFile":read_file}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 200:
         print("\n- PASS: POST command passed for %s method, status code 202 returned\n" % method)
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, warnings, argparse
 
 from datetime import datetime
 
@@ -50,7 +50,7 @@ if args["i"]:
         payload["IncludeInExport"] = "IncludeReadOnly,IncludePasswordHashValues"
 
 headers = {'content-type': 'application/json'}
-response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
 
 if response.status_code != 202:
     print("- FAIL, status code not 202, code is: %s" % response.status_code)
@@ -69,13 +69,23 @@ except:
     sys.exit()
 
 print(success_job_status % job_id)
-start_time=datetime.now()
+deadline = RedfishJobState.deadline(10 * 60)
+job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+data = None
 
 while True:
-    current_time=(datetime.now()-start_time)
-    req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-    d=req.__dict__
-    if "<SystemConfiguration Model" in str(d):
+    try:
+        data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=1)
+    except RedfishJobWatcher.JobWatchError as error:
+        print("Execute job ID command failed, error code is: %s" % error.status_code)
+        sys.exit()
+    if RedfishJobState.finished(data):
+        # The exported attributes are returned by the task URI of the finished job
+        req = RedfishTransport.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
+        d=req.__dict__
+        if "<SystemConfiguration Model" not in str(d):
+            print("\n- FAIL, job ID %s finished without exported attributes, final job status: %s" % (job_id, data[u'Message']))
+            sys.exit()
         print("\n- Export locally job ID %s successfully completed. Attributes exported:\n" % job_id)
         zz=re.search("<SystemConfiguration.+</SystemConfiguration>",str(d)).group()
         try:
@@ -112,7 +122,7 @@ while True:
             print(i)
 
         print("\n")
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
         
         data = req.json()
         print("- WARNING, final detailed job status results for job ID %s -\n" % job_id)
@@ -120,34 +130,13 @@ while True:
             print("%s: %s" % (i[0],i[1]))
         print("\n Exported attributes also saved in file: %s" % filename)
         sys.exit()
-    else:
-        pass
-        
-    statusCode = req.status_code
-    data = req.json()
-    try:
-        message_string=data[u"Messages"]
-    except:
-        print(statusCode)
-        print(data)
-        sys.exit()
-    current_time=(datetime.now()-start_time)
 
-    if statusCode == 202 or statusCode == 200:
-        time.sleep(1)
-        pass
-    else:
-        print("Execute job ID command failed, error code is: %s" % statusCode)
-        sys.exit()
-    if str(current_time)[0:7] >= "0:10:00":
+    if RedfishJobState.expired(deadline):
         print("\n-FAIL, Timeout of 10 minutes has been reached before marking the job completed.")
         sys.exit()
 
     else:
-        print("- WARNING, JobStatus not completed, current status: \"%s\", percent complete: \"%s\"" % (data[u'Oem'][u'Dell'][u'Message'],data[u'Oem'][u'Dell'][u'PercentComplete']))
-        #print(data)
-        time.sleep(1)
-        continue
+        print("- WARNING, JobStatus not completed, current status: \"%s\", percent complete: \"%s\"" % (data[u'Message'],data[u'PercentComplete']))
 
 
        
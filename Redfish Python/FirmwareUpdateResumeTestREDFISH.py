@@ -0,0 +1,145 @@
+#
+# FirmwareUpdateResumeTestREDFISH. Python script checking that RedfishFirmwareUpdate.update_host() resumes a host journaled as failed from the
+# step which failed, without creating a second update job next to one still in progress and without resetting a server whose reboot was
+# already requested.
+#
+# NOTE: The test is a simulation, no iDRAC is needed. The steps of RedfishFirmwareUpdate which talk to the iDRAC (upload, SimpleUpdate, job
+# queue reads and waits, reboot) are replaced by a simulated iDRAC with an Available entry and a job queue. For each case a journal entry
+# failed in one step is written to a temporary journal, update_host() is run once and the SimpleUpdate POSTs and server reboots it sent are
+# compared with the expected ones. Scheduled jobs complete on the next reboot of the simulated server.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishFirmwareUpdate, RedfishJournal, os, sys, shutil, tempfile, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+parser=argparse.ArgumentParser(description="Python script checking that a firmware update journaled as failed resumes from the failed step without duplicate jobs or reboots, no iDRAC needed")
+parser.add_argument('script_examples',action="store_true",help='FirmwareUpdateResumeTestREDFISH.py, this example will run every resume case and print PASS or FAIL for each. FirmwareUpdateResumeTestREDFISH.py -v, this example will also print the messages of update_host() for every case.')
+parser.add_argument('-v', help='Print the messages of update_host() for every case', action="store_true", required=False)
+
+args=vars(parser.parse_args())
+
+IMAGE = "BIOS_TEST_1.0.0.EXE"
+HTTP_PUSH_URI = "/redfish/v1/UpdateService/FirmwareInventory"
+AVAILABLE_ID = "Available-159-1.0.0"
+OLD_JOB = "JID_000000000001"
+
+# (failed step, JobState of OLD_JOB in the job queue or None when it is not there, OLD_JOB journaled as the job of the host,
+#  expected last step, expected SimpleUpdate POSTs, expected reboots). A job still Scheduled after the reboot was requested is not reset again,
+#  waiting for it times out
+CASES = [
+    ("uploaded", None, False, "completed", 1, 1),
+    ("job_requested", None, False, "completed", 1, 1),
+    ("job_requested", "Scheduled", False, "completed", 0, 1),
+    ("job_created", "Scheduled", True, "completed", 0, 1),
+    ("job_created", "Running", True, "completed", 0, 0),
+    ("job_created", None, True, "completed", 1, 1),
+    ("job_scheduled", "Scheduled", True, "completed", 0, 1),
+    ("job_scheduled", "Completed", True, "completed", 0, 0),
+    ("reboot_requested", "Scheduled", True, "failed", 0, 0),
+    ("reboot_requested", "Running", True, "completed", 0, 0),
+    ("reboot_issued", "Scheduled", True, "failed", 0, 0),
+    ("reboot_issued", "Running", True, "completed", 0, 0),
+    ("reboot_issued", "Failed", True, "completed", 1, 1),
+]
+
+
+class SimulatedIdrac(object):
+    """Job queue and repository of one simulated iDRAC, jobs maps job ID to JobState."""
+
+    def __init__(self, old_job_state):
+        self.jobs = {OLD_JOB: old_job_state} if old_job_state else {}
+        self.simple_updates = 0
+        self.reboots = 0
+
+    def available_entry_exists(self, idrac_ip, auth, http_push_uri, available_id):
+        return available_id == AVAILABLE_ID
+
+    def upload_image(self, idrac_ip, auth, image_path, progress=None):
+        return HTTP_PUSH_URI, AVAILABLE_ID
+
+    def active_update_jobs(self, idrac_ip, auth):
+        return [job_id for job_id, state in sorted(self.jobs.items()) if state in RedfishFirmwareUpdate.ACTIVE_JOB_STATES]
+
+    def simple_update(self, idrac_ip, auth, http_push_uri, available_id):
+        self.simple_updates += 1
+        job_id = "JID_%012d" % (len(self.jobs) + 2)
+        self.jobs[job_id] = "Scheduled"
+        return job_id
+
+    def read_job(self, idrac_ip, auth, job_id):
+        if job_id not in self.jobs:
+            return None, "job not found in the job queue"
+        return RedfishFirmwareUpdate._job_document_status({u'JobState': self.jobs[job_id], u'Message': self.jobs[job_id]})
+
+    def wait_for_job(self, idrac_ip, auth, job_id, statuses, timeout, interval):
+        status, message = self.read_job(idrac_ip, auth, job_id)
+        if status == RedfishFirmwareUpdate.RUNNING and RedfishFirmwareUpdate.COMPLETED in statuses:
+            # A running job of the simulation is applying the update, it completes while it is waited for
+            self.jobs[job_id] = "Completed"
+            status = RedfishFirmwareUpdate.COMPLETED
+        if status not in statuses:
+            raise RedfishFirmwareUpdate.FirmwareUpdateError("- FAIL, job %s is %s, not %s" % (job_id, status, " or ".join(statuses)))
+        return status, message
+
+    def reboot_server(self, idrac_ip, auth):
+        self.reboots += 1
+        for job_id, state in self.jobs.items():
+            if state == "Scheduled":
+                self.jobs[job_id] = "Completed"
+
+
+def journal_failed_host(journal, host, failed_step, journaled_job):
+    # The steps a run records up to failed_step, then the failure
+    steps = ["uploaded", "job_requested", "job_created", "job_scheduled", "reboot_requested", "reboot_issued"]
+    values = {"uploaded": {"image": IMAGE, "http_push_uri": HTTP_PUSH_URI, "available_id": AVAILABLE_ID}, "job_requested": {"job_id": None, "previous_jobs": []},
+              "job_created": {"job_id": OLD_JOB}}
+    for step in steps[:steps.index(failed_step) + 1]:
+        if step == "job_created" and not journaled_job:
+            break
+        journal.record(host, step, **values.get(step, {}))
+    journal.record(host, RedfishFirmwareUpdate.FAILED, failed_step=failed_step, error="simulated failure")
+
+
+def log(message):
+    print("  %s" % message)
+
+
+def run_case(journal, failed_step, old_job_state, journaled_job, expected_step, expected_updates, expected_reboots):
+    host = "%s-%s" % (failed_step, old_job_state or "nojob")
+    journal_failed_host(journal, host, failed_step, journaled_job)
+    idrac = SimulatedIdrac(old_job_state)
+    for name in ("available_entry_exists", "upload_image", "active_update_jobs", "simple_update", "read_job", "wait_for_job", "reboot_server"):
+        setattr(RedfishFirmwareUpdate, name, getattr(idrac, name))
+    try:
+        RedfishFirmwareUpdate.update_host(host, None, IMAGE, journal, log=log if args["v"] else None)
+    except RedfishFirmwareUpdate.FirmwareUpdateError:
+        pass
+    step = journal.state(host)["step"]
+    passed = (step, idrac.simple_updates, idrac.reboots) == (expected_step, expected_updates, expected_reboots)
+    print("- %s, failed in %s with job %s: %s, %s SimpleUpdate POST(s), %s reboot(s), expected %s, %s and %s" % ("PASS" if passed else "FAIL", failed_step,
+          old_job_state or "not in the job queue", step, idrac.simple_updates, idrac.reboots, expected_step, expected_updates, expected_reboots))
+    return passed
+
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    try:
+        journal = RedfishJournal.Journal(os.path.join(directory, "resume_test.journal"))
+        try:
+            failures = len([case for case in CASES if not run_case(journal, *case)])
+        finally:
+            journal.close()
+    finally:
+        shutil.rmtree(directory)
+    if failures:
+        print("\n- FAIL, %s of %s resume case(s) failed" % (failures, len(CASES)))
+        sys.exit(1)
+    print("\n- PASS, all %s resume cases passed" % len(CASES))
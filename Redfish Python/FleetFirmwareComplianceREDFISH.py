@@ -0,0 +1,85 @@
+#
+# FleetFirmwareComplianceREDFISH. Python script using Redfish API to check installed firmware of every iDRAC of an inventory file against a firmware baseline.
+#
+# NOTE: Reads the firmware inventory of all iDRACs concurrently (one $expand GET of FirmwareInventory plus one $select GET of the system model per
+# iDRAC) and compares every installed component against the baseline file, see RedfishCompliance for the baseline format. The compliance matrix
+# (one row per server, one column per baseline component, "<" marking versions below the baseline) is written as CSV to the -m file, the details of
+# each iDRAC as NDJSON to the screen or the -o file.
+#
+# NOTE: For thousands of iDRACs raise -w, for example -w 256, each iDRAC only needs two requests so the run is bound by the number of iDRACs in
+# progress at the same time.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishFleet, RedfishCompliance, csv, sys, threading, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+parser=argparse.ArgumentParser(description="Python script using Redfish API to check installed firmware of every iDRAC of an inventory file against a firmware baseline and write a compliance matrix")
+parser.add_argument('-i', help='Inventory file, CSV with header row (host, username, password, credential columns) or YAML', required=True)
+parser.add_argument('-u', help='Default iDRAC username for hosts without credentials in the inventory', required=False)
+parser.add_argument('-p', help='Default iDRAC password for hosts without credentials in the inventory', required=False)
+parser.add_argument('-c', help='Credentials file (YAML or JSON) with the named credentials referenced by the inventory \"credential\" column', required=False)
+parser.add_argument('script_examples',action="store_true",help='FleetFirmwareComplianceREDFISH.py -i hosts.csv -u root -p calvin -b baseline.csv, this example will check every iDRAC in hosts.csv against baseline.csv and write the compliance matrix to firmware_compliance.csv. FleetFirmwareComplianceREDFISH.py -i hosts.csv -c creds.yaml -b baseline.csv -w 256 -m r740_matrix.csv -o r740.ndjson, this example will check 256 iDRACs at the same time, write the matrix to r740_matrix.csv and the details of each iDRAC to r740.ndjson.')
+parser.add_argument('-b', help='Baseline file, CSV with header row (component_id, version, optional model and name columns) or JSON', required=True)
+parser.add_argument('-m', help='Compliance matrix CSV file, default is \"firmware_compliance.csv\"', required=False)
+parser.add_argument('-w', help='Number of iDRACs processed at the same time, default is %s' % RedfishFleet.MAX_WORKERS, required=False)
+parser.add_argument('-o', help='Write the NDJSON results to this file instead of the screen', required=False)
+
+args=vars(parser.parse_args())
+
+
+def check_compliance():
+    try:
+        baseline = RedfishCompliance.load_baseline(args["b"])
+        hosts = RedfishFleet.load_inventory(args["i"], args["u"], args["p"], args["c"])
+    except (RedfishCompliance.BaselineError, RedfishFleet.InventoryError, IOError, ValueError) as error:
+        print(error)
+        sys.exit()
+    if hosts == []:
+        print("- WARNING, no hosts found in inventory file \"%s\"" % args["i"])
+        sys.exit()
+    results = dict((host["host"], None) for host in hosts)
+    lock = threading.Lock()
+
+    def operation(idrac_ip, auth):
+        result = RedfishCompliance.firmware_compliance(idrac_ip, auth, baseline)
+        with lock:
+            results[idrac_ip] = result
+        return result
+
+    sys.stderr.write("- INFO, checking firmware of %s iDRAC(s) against %s baseline component(s)\n" % (len(hosts), len(baseline.index)))
+    workers = int(args["w"]) if args["w"] else None
+    output = open(args["o"], "w") if args["o"] else None
+    try:
+        summary = RedfishFleet.run(hosts, operation, "firmware_compliance", workers, output)
+    finally:
+        if output is not None:
+            output.close()
+    matrix_path = args["m"] or "firmware_compliance.csv"
+    with open(matrix_path, "w") as f:
+        csv.writer(f).writerows(RedfishCompliance.matrix_rows(baseline, list(results.items())))
+    summary.print_summary()
+    checked = [i for i in results.values() if i is not None]
+    below = {}
+    for result in checked:
+        for component in result["Components"]:
+            if component["Status"] == RedfishCompliance.BELOW:
+                key = (component["Name"], component["ComponentID"], component["Baseline"])
+                below[key] = below.get(key, 0) + 1
+    sys.stderr.write("- INFO, %s of %s checked server(s) compliant with the baseline\n" % (len([i for i in checked if i["Compliant"]]), len(checked)))
+    for (name, component_id, version), count in sorted(below.items(), key=lambda i: -i[1]):
+        sys.stderr.write("- WARNING, %s server(s) below baseline version %s for %s (ComponentID %s)\n" % (count, version, name, component_id))
+    print("\n- Compliance matrix is captured in \"%s\" file" % matrix_path)
+    if args["o"]:
+        print("- Results are captured in \"%s\" file" % args["o"])
+
+
+if __name__ == "__main__":
+    check_compliance()
@@ -0,0 +1,204 @@
+#
+# FleetFirmwareUpdateREDFISH. Python script using Redfish API to update firmware of every iDRAC of an inventory file with one image, resumable.
+#
+# NOTE: Each iDRAC goes through the same steps as DeviceFirmwareSimpleUpdateREDFISH: upload the image, create the update job with SimpleUpdate,
+# wait for the job to be scheduled, reboot the server and wait for the job to complete. Every step is recorded per iDRAC in a journal file (-j)
+# with fsync, see RedfishJournal.
+#
+# NOTE: If the run stops (crash, Ctrl+C, laptop sleep, network loss), run the same command again with --resume. iDRACs which completed are
+# skipped, an image still in the iDRAC repository is not uploaded again, existing update jobs are polled instead of creating duplicate jobs, and
+# servers whose reboot was already issued are not rebooted again. iDRACs which failed are tried again from their last good step.
+#
+# NOTE: Pass in "-r n" to only create and schedule the update jobs, the jobs run at the next server reboot. Running the command again later
+# with --resume and without "-r n" reboots the servers and waits for the jobs to complete.
+#
+# NOTE: Pass in -cw to update in rolling waves (see RedfishWaves): a canary wave of -cw iDRACs first, then waves growing by factor -gf up to -w
+# iDRACs. The run pauses before the next wave when a canary iDRAC fails or when the failed iDRACs exceed the failure budget -fb, continue it
+# with --resume. Timing stats of every wave are printed at the end.
+#
+# NOTE: The SHA-256 of the image and the ComponentID and Version of the package are kept in a local image index file (-x, see RedfishImageIndex).
+# Once an image was uploaded to one iDRAC, iDRACs which already have an Available entry with the same ComponentID and Version are updated from
+# that entry without uploading the image again. Pass in --upload to always upload the image.
+#
+# NOTE: Images are streamed from one shared read-only mapping of the file (see RedfishUpload), so memory use does not grow with the image size
+# or the number of uploads in progress. Pass in -bw to cap the total upload bandwidth, for example on a shared management network.
+#
+# NOTE: Pass in -ev with a free local port to wait on update jobs with Redfish events instead of polling every few seconds (see
+# RedfishEventReceiver). Each iDRAC is subscribed to events for the time of its update, a job status change wakes its job watcher right away and
+# job status is only polled once a minute as a safety net. Events need a certificate and key file (-ec, -ek) for the HTTPS listener and the
+# iDRACs must be able to reach this system on that port, iDRACs which don't deliver the test event are polled as before.
+#
+# NOTE: Pass in --sse to use the Server-Sent Events stream of each iDRAC instead (see RedfishEventStream, iDRAC9 firmware 4.00 or later). The
+# iDRAC keeps the stream open to this system, so no listener port or certificate is needed. Job and power events wake up the waits for the
+# update job and for the server to power off.
+#
+# NOTE: Pass in -jh with a job history file to poll each update job when it is likely to change (see RedfishJobHistory). The time update jobs
+# stay Scheduled, Running and so on is learned per job, server model and iDRAC firmware, later runs poll sparsely early and densely around the
+# usual change time. The file can be shared with the other scripts with environment variable REDFISH_JOB_HISTORY.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishFleet, RedfishFirmwareUpdate, RedfishJournal, RedfishWaves, RedfishImageIndex, RedfishUpload, RedfishEventReceiver, RedfishEventStream, RedfishJobHistory, sys, os, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+parser=argparse.ArgumentParser(description="Python script using Redfish API to update firmware of every iDRAC of an inventory file, recording each step in a journal file so the update can be resumed")
+parser.add_argument('-i', help='Inventory file, CSV with header row (host, username, password, credential columns) or YAML', required=True)
+parser.add_argument('-u', help='Default iDRAC username for hosts without credentials in the inventory', required=False)
+parser.add_argument('-p', help='Default iDRAC password for hosts without credentials in the inventory', required=False)
+parser.add_argument('-c', help='Credentials file (YAML or JSON) with the named credentials referenced by the inventory \"credential\" column', required=False)
+parser.add_argument('script_examples',action="store_true",help='FleetFirmwareUpdateREDFISH.py -i hosts.csv -u root -p calvin -l C:\\Users\\administrator\\Downloads -f BIOS_8MRPC_C6420_WN64_2.2.8.EXE -j bios_update.journal, this example will update BIOS of every iDRAC in hosts.csv, rebooting each server. FleetFirmwareUpdateREDFISH.py -i hosts.csv -u root -p calvin -l C:\\Users\\administrator\\Downloads -f BIOS_8MRPC_C6420_WN64_2.2.8.EXE -j bios_update.journal --resume, this example will continue the same update after it was interrupted. FleetFirmwareUpdateREDFISH.py -i hosts.csv -u root -p calvin -l C:\\Users\\administrator\\Downloads -f BIOS_8MRPC_C6420_WN64_2.2.8.EXE -j bios_update.journal -cw 2 -w 32 -fb 0.02, this example will update 2 canary servers first, then waves of 4, 8, 16 and 32 servers, pausing when more than 2%% of the servers failed. FleetFirmwareUpdateREDFISH.py -i hosts.csv -u root -p calvin -l C:\\Users\\administrator\\Downloads -f BIOS_8MRPC_C6420_WN64_2.2.8.EXE -j bios_update.journal -ev 8443 -ec events.crt -ek events.key, this example will update BIOS of every iDRAC in hosts.csv, waiting on the update jobs with Redfish events received on port 8443.')
+parser.add_argument('-l', help='Pass in the full directory path location of the firmware image', required=True)
+parser.add_argument('-f', help='Pass in the firmware image name', required=True)
+parser.add_argument('-j', help='Journal file recording each update step per iDRAC, default is <image name>.journal in the current directory', required=False)
+parser.add_argument('--resume', help='Continue the update recorded in the journal file, required when the journal file already exists', action="store_true", required=False)
+parser.add_argument('-r', help='Reboot the servers to apply the update, pass in \"y\" or \"n\". Default is \"y\", with \"n\" the update jobs are only scheduled', required=False)
+parser.add_argument('-w', help='Number of iDRACs updated at the same time (largest wave with -cw), default is %s' % RedfishFleet.MAX_WORKERS, required=False)
+parser.add_argument('-cw', help='Update in waves, starting with a canary wave of this many iDRACs', required=False)
+parser.add_argument('-gf', help='Growth factor of the wave size after the canary wave, default is %s' % RedfishWaves.GROWTH, required=False)
+parser.add_argument('-fb', help='Failure budget, pause before the next wave when more iDRACs failed. A number of iDRACs or a fraction below 1 of all iDRACs, default is %s' % RedfishWaves.FAILURE_BUDGET, required=False)
+parser.add_argument('-st', help='Seconds to wait for each update job to be scheduled, default is %s' % RedfishFirmwareUpdate.SCHEDULE_TIMEOUT, required=False)
+parser.add_argument('-ct', help='Seconds to wait for each update job to complete after the reboot, default is %s' % RedfishFirmwareUpdate.COMPLETE_TIMEOUT, required=False)
+parser.add_argument('-x', help='Image index file with the SHA-256, ComponentID and Version of uploaded images, default is \"firmware_image_index.json\" in the current directory', required=False)
+parser.add_argument('-bw', help='Cap the total upload bandwidth of all image uploads to this many MB per second, default is no cap', required=False)
+parser.add_argument('-ev', help='Wait on update jobs with Redfish events, pass in the local port of the HTTPS event listener', required=False)
+parser.add_argument('-ec', help='Certificate file of the HTTPS event listener, required with -ev', required=False)
+parser.add_argument('-ek', help='Private key file of the HTTPS event listener, required with -ev', required=False)
+parser.add_argument('-ea', help='Event destination address sent to the iDRACs, default is the local address used to reach each iDRAC', required=False)
+parser.add_argument('--sse', help='Wait on update jobs and power state with the Server-Sent Events stream of each iDRAC', action="store_true", required=False)
+parser.add_argument('-jh', help='Job history file used to plan the job status polls, default is environment variable REDFISH_JOB_HISTORY or no history', required=False)
+parser.add_argument('--upload', help='Always upload the image, even when the iDRAC repository already has it', action="store_true", required=False)
+parser.add_argument('-o', help='Write the NDJSON results to this file instead of the screen', required=False)
+
+args=vars(parser.parse_args())
+
+
+def log(message):
+    sys.stderr.write(message + "\n")
+
+
+def update_fleet():
+    image_path = os.path.join(args["l"], args["f"])
+    if not os.path.isfile(image_path):
+        print("- FAIL, firmware image \"%s\" not found" % image_path)
+        sys.exit()
+    if args["r"] not in (None, "y", "n"):
+        print("- FAIL, invalid value passed in for -r, supported values are \"y\" and \"n\"")
+        sys.exit()
+    journal_path = args["j"] or args["f"] + ".journal"
+    if os.path.exists(journal_path) and os.path.getsize(journal_path) and not args["resume"]:
+        print("- FAIL, journal file \"%s\" already exists, pass in --resume to continue that update or -j with a new journal file" % journal_path)
+        sys.exit()
+    try:
+        hosts = RedfishFleet.load_inventory(args["i"], args["u"], args["p"], args["c"])
+    except (RedfishFleet.InventoryError, IOError, ValueError) as error:
+        print(error)
+        sys.exit()
+    if hosts == []:
+        print("- WARNING, no hosts found in inventory file \"%s\"" % args["i"])
+        sys.exit()
+    image_index = None
+    if not args["upload"]:
+        try:
+            image_index = RedfishImageIndex.ImageIndex(args["x"] or "firmware_image_index.json")
+            identity = image_index.identity(image_path)
+        except (IOError, ValueError) as error:
+            print("- FAIL, unable to use image index file \"%s\": %s" % (args["x"] or "firmware_image_index.json", error))
+            sys.exit()
+        if identity:
+            log("- INFO, image %s is ComponentID %s Version %s, iDRACs which already have it skip the upload" % (args["f"], identity[0], identity[1]))
+    journal = RedfishJournal.Journal(journal_path)
+    if journal.ignored_lines:
+        log("- WARNING, %s incomplete line(s) in journal file \"%s\" ignored" % (journal.ignored_lines, journal_path))
+    if args["resume"]:
+        steps = journal.steps()
+        log("- INFO, resuming update from journal \"%s\": %s" % (journal_path, ", ".join("%s %s" % (count, step) for step, count in sorted(steps.items())) or "no steps recorded"))
+    if args["bw"]:
+        RedfishUpload.set_bandwidth_limit(float(args["bw"]))
+    if args["jh"]:
+        try:
+            RedfishJobHistory.set_history_path(args["jh"])
+        except (IOError, ValueError) as error:
+            print("- FAIL, unable to use job history file \"%s\": %s" % (args["jh"], error))
+            sys.exit()
+    reboot = args["r"] != "n"
+    schedule_timeout = int(args["st"]) if args["st"] else None
+    complete_timeout = int(args["ct"]) if args["ct"] else None
+    receiver = None
+    if args["ev"] and args["sse"]:
+        print("- FAIL, pass in either -ev or --sse")
+        sys.exit()
+    if args["ev"]:
+        if not args["ec"] or not args["ek"]:
+            print("- FAIL, -ec and -ek are required with -ev")
+            sys.exit()
+        try:
+            receiver = RedfishEventReceiver.EventReceiver(int(args["ev"]), args["ec"], args["ek"], args["ea"], log)
+        except RedfishEventReceiver.EventReceiverError as error:
+            print(error)
+            sys.exit()
+
+    def operation(idrac_ip, auth):
+        # Completed iDRACs only check the journal, no subscription or event stream needed
+        pending = journal.state(idrac_ip).get("step") != RedfishFirmwareUpdate.COMPLETED
+        if pending and receiver is not None:
+            receiver.attach(idrac_ip, auth)
+        if pending and args["sse"]:
+            RedfishEventStream.open_stream(idrac_ip, auth, log)
+        try:
+            return RedfishFirmwareUpdate.update_host(idrac_ip, auth, image_path, journal, reboot, log, schedule_timeout, complete_timeout, image_index)
+        finally:
+            if pending and receiver is not None:
+                receiver.detach(idrac_ip, auth)
+            if pending and args["sse"]:
+                RedfishEventStream.close_stream(idrac_ip)
+
+    output = open(args["o"], "w") if args["o"] else None
+    workers = int(args["w"]) if args["w"] else None
+    log("- INFO, updating %s iDRAC(s) with image %s, journal file \"%s\"" % (len(hosts), args["f"], journal_path))
+    try:
+        if args["cw"]:
+            # Completed iDRACs don't take a place in the waves of a resumed run
+            pending = [host for host in hosts if journal.state(host["host"]).get("step") != RedfishFirmwareUpdate.COMPLETED]
+            if len(pending) < len(hosts):
+                log("- INFO, %s iDRAC(s) already completed, skipped" % (len(hosts) - len(pending)))
+            result = RedfishWaves.run_waves(pending, operation, "firmware_update", int(args["cw"]), float(args["gf"]) if args["gf"] else RedfishWaves.GROWTH, workers,
+                                            float(args["fb"]) if args["fb"] else RedfishWaves.FAILURE_BUDGET, output, log)
+            failed = result.failed or result.paused
+        else:
+            summary = RedfishFleet.run(hosts, operation, "firmware_update", workers, output)
+            failed = summary.failed
+    finally:
+        if output is not None:
+            output.close()
+        journal.close()
+        if receiver is not None:
+            receiver.close()
+    if args["cw"]:
+        RedfishWaves.print_wave_stats(result)
+    else:
+        summary.print_summary()
+    RedfishUpload.print_stats()
+    if receiver is not None:
+        receiver.print_stats()
+    if args["sse"]:
+        counts = RedfishEventStream.stats()
+        log("- INFO, event streams opened %s time(s), %s job event(s) and %s power event(s) received" % (counts["connects"], counts["job"], counts["power"]))
+    if RedfishJobHistory.history() is not None:
+        RedfishJobHistory.print_stats()
+    steps = journal.steps()
+    log("- INFO, journal step of each iDRAC: %s" % ", ".join("%s %s" % (count, step) for step, count in sorted(steps.items())))
+    if failed or steps.get("job_scheduled"):
+        log("- INFO, run the same command with --resume to retry failed iDRACs and continue unfinished updates")
+    if args["o"]:
+        print("\n- Results are captured in \"%s\" file" % args["o"])
+
+
+if __name__ == "__main__":
+    update_fleet()
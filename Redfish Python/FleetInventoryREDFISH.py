@@ -0,0 +1,107 @@
+#
+# FleetInventoryREDFISH. Python script using Redfish API to collect hardware inventory of every iDRAC of an inventory file into a SQLite database, and to query it.
+#
+# NOTE: Collects the same data as GetSystemHWInventoryREDFISH -a (system, memory, CPU, fans, power supplies, storage, drives, network) plus the
+# firmware inventory from all iDRACs concurrently and stores one row per component in the database file passed in with -db, see
+# RedfishInventoryStore for the tables. Each run updates the rows of the iDRACs it collected, other iDRACs in the database are left as they are.
+#
+# NOTE: Runs after the first one are incremental: every document is revalidated with the ETag stored by the previous run and only documents
+# which changed are downloaded. Added, removed and modified components (drives, DIMMs, firmware versions, ...) are written to the "changes"
+# table and to the NDJSON result line of the iDRAC. Pass in --full to download every document again.
+#
+# NOTE: Queries (-f, -q) only read the database, no iDRAC is contacted. -f finds every component or server with a part number or model, -q runs
+# any SQL SELECT statement.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishFleet, RedfishOperations, RedfishInventoryStore, sqlite3, sys, threading, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+parser=argparse.ArgumentParser(description="Python script using Redfish API to collect hardware inventory of every iDRAC of an inventory file into a SQLite database and query it")
+parser.add_argument('-i', help='Inventory file, CSV with header row (host, username, password, credential columns) or YAML. Not needed for queries', required=False)
+parser.add_argument('-u', help='Default iDRAC username for hosts without credentials in the inventory', required=False)
+parser.add_argument('-p', help='Default iDRAC password for hosts without credentials in the inventory', required=False)
+parser.add_argument('-c', help='Credentials file (YAML or JSON) with the named credentials referenced by the inventory \"credential\" column', required=False)
+parser.add_argument('script_examples',action="store_true",help='FleetInventoryREDFISH.py -i hosts.csv -u root -p calvin -db inventory.sqlite, this example will collect hardware inventory of every iDRAC in hosts.csv into inventory.sqlite. FleetInventoryREDFISH.py -db inventory.sqlite -f M393A2K43CB2-CTD, this example will return every server and DIMM with part number M393A2K43CB2-CTD. FleetInventoryREDFISH.py -db inventory.sqlite -q \"SELECT model, COUNT(*) FROM hosts GROUP BY model\", this example will return the number of servers of each model.')
+parser.add_argument('-db', help='SQLite database file, default is \"fleet_inventory.sqlite\"', required=False)
+parser.add_argument('-f', help='Find components and servers with this part number or model in the database', required=False)
+parser.add_argument('-q', help='Run this SQL SELECT statement on the database', required=False)
+parser.add_argument('--full', help='Download every document again instead of revalidating the documents stored by the previous run', action="store_true", required=False)
+parser.add_argument('-w', help='Number of iDRACs processed at the same time, default is %s' % RedfishFleet.MAX_WORKERS, required=False)
+parser.add_argument('-o', help='Write the NDJSON result line of each iDRAC (rows per table and changes) to this file instead of the screen', required=False)
+
+args=vars(parser.parse_args())
+
+
+def collect_inventory(store):
+    try:
+        hosts = RedfishFleet.load_inventory(args["i"], args["u"], args["p"], args["c"])
+    except (RedfishFleet.InventoryError, IOError, ValueError) as error:
+        print(error)
+        sys.exit()
+    if hosts == []:
+        print("- WARNING, no hosts found in inventory file \"%s\"" % args["i"])
+        sys.exit()
+
+    change_counts = {}
+    lock = threading.Lock()
+
+    def operation(idrac_ip, auth):
+        snapshot = RedfishInventoryStore.SnapshotCache() if args["full"] else store.snapshot(idrac_ip)
+        counts, changes = store.store(idrac_ip, RedfishOperations.inventory_snapshot(idrac_ip, auth, snapshot), snapshot)
+        with lock:
+            for change in changes:
+                change_counts[change["change"]] = change_counts.get(change["change"], 0) + 1
+        return {"rows": counts, "changes": changes, "documents_unchanged": snapshot.revalidated, "documents_downloaded": snapshot.downloaded}
+
+    sys.stderr.write("- INFO, collecting %s hardware inventory of %s iDRAC(s) into \"%s\"\n" % ("full" if args["full"] else "incremental", len(hosts), store.path))
+    workers = int(args["w"]) if args["w"] else None
+    output = open(args["o"], "w") if args["o"] else None
+    try:
+        summary = RedfishFleet.run(hosts, operation, "hw_inventory", workers, output)
+    finally:
+        if output is not None:
+            output.close()
+    summary.print_summary()
+    sys.stderr.write("- INFO, change log: %s\n" % (", ".join("%s %s" % (count, change) for change, count in sorted(change_counts.items())) or "no changes"))
+    if args["o"]:
+        print("\n- Results are captured in \"%s\" file" % args["o"])
+
+
+def print_rows(columns, rows):
+    print("\t".join(columns))
+    for row in rows:
+        print("\t".join("" if i is None else str(i) for i in row))
+    sys.stderr.write("- INFO, %s row(s) returned\n" % len(rows))
+
+
+def query_inventory(store):
+    try:
+        if args["f"]:
+            print_rows(["table", "host", "id", "matched column"], store.find(args["f"]))
+        if args["q"]:
+            print_rows(*store.query(args["q"]))
+    except sqlite3.Error as error:
+        print("- FAIL, query failed: %s" % error)
+        sys.exit()
+
+
+if __name__ == "__main__":
+    if not args["i"] and not args["f"] and not args["q"]:
+        print("- FAIL, pass in -i to collect inventory, or -f / -q to query the database")
+        sys.exit()
+    store = RedfishInventoryStore.InventoryStore(args["db"] or "fleet_inventory.sqlite")
+    try:
+        if args["i"]:
+            collect_inventory(store)
+        if args["f"] or args["q"]:
+            query_inventory(store)
+    finally:
+        store.close()
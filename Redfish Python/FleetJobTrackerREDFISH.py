@@ -0,0 +1,123 @@
+#
+# FleetJobTrackerREDFISH. Python script using Redfish API to track iDRAC jobs of every iDRAC of an inventory file until they are finished.
+#
+# NOTE: By default every job of each iDRAC which is not finished yet is tracked, pass in -j to track given job IDs instead. All jobs are tracked
+# from one process by RedfishJobTracker: one scheduler thread with a heap of check times, the jobs of one iDRAC which are due are read with one
+# GET of the Jobs collection ($expand). Thousands of jobs only need the worker threads of -w, not one thread per job.
+#
+# NOTE: Job status is taken from the JobState of each job (see RedfishJobState), a job is done once its JobState is Completed,
+# CompletedWithErrors, Failed, RebootFailed, Cancelled or Exception. Each job has its own timeout (-t) on the monotonic clock. Every state
+# change is printed, the final state of each job is written as one NDJSON line to the screen or the -o file.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishFleet, RedfishCollection, RedfishJobTracker, RedfishJobState, RedfishJobWatcher, json, os, sys, threading, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+parser=argparse.ArgumentParser(description="Python script using Redfish API to track iDRAC jobs of every iDRAC of an inventory file until they are finished")
+parser.add_argument('-i', help='Inventory file, CSV with header row (host, username, password, credential columns) or YAML', required=True)
+parser.add_argument('-u', help='Default iDRAC username for hosts without credentials in the inventory', required=False)
+parser.add_argument('-p', help='Default iDRAC password for hosts without credentials in the inventory', required=False)
+parser.add_argument('-c', help='Credentials file (YAML or JSON) with the named credentials referenced by the inventory \"credential\" column', required=False)
+parser.add_argument('script_examples',action="store_true",help='FleetJobTrackerREDFISH.py -i hosts.csv -u root -p calvin, this example will track every unfinished job of every iDRAC in hosts.csv until it is finished. FleetJobTrackerREDFISH.py -i hosts.csv -u root -p calvin -j JID_470165485283 -t 3600 -o jobs.ndjson, this example will track job JID_470165485283 on every iDRAC for at most 1 hour and write the final state of each job to jobs.ndjson.')
+parser.add_argument('-j', help='Job IDs to track on every iDRAC, pass in a comma separated list. Default is every job which is not finished yet', required=False)
+parser.add_argument('-t', help='Seconds to track each job before it is reported as timed out, default is 7200', required=False)
+parser.add_argument('-pi', help='Seconds between two status checks of a job, default is %s' % RedfishJobTracker.POLL_INTERVAL, required=False)
+parser.add_argument('-w', help='Number of iDRACs read at the same time, default is %s' % RedfishJobTracker.MAX_WORKERS, required=False)
+parser.add_argument('-o', help='Write the NDJSON results to this file instead of the screen', required=False)
+
+args=vars(parser.parse_args())
+
+
+def log(message):
+    sys.stderr.write(message + "\n")
+
+
+def unfinished_jobs(idrac_ip, auth):
+    response, jobs = RedfishCollection.get_collection(idrac_ip, auth, RedfishJobWatcher.JOBS_URI)
+    if response.status_code != 200:
+        raise RedfishJobWatcher.JobWatchError("- FAIL, GET command failed for URI %s, status code %s returned" % (RedfishJobWatcher.JOBS_URI, response.status_code),
+                                              response.status_code)
+    return [job[u'Id'] for job in jobs if u'Id' in job and not RedfishJobState.finished(job)]
+
+
+def track_jobs():
+    try:
+        hosts = RedfishFleet.load_inventory(args["i"], args["u"], args["p"], args["c"])
+    except (RedfishFleet.InventoryError, IOError, ValueError) as error:
+        print(error)
+        sys.exit()
+    if hosts == []:
+        print("- WARNING, no hosts found in inventory file \"%s\"" % args["i"])
+        sys.exit()
+    workers = int(args["w"]) if args["w"] else None
+    if args["j"]:
+        jobs = dict((host["host"], [i.strip() for i in args["j"].split(",") if i.strip()]) for host in hosts)
+    else:
+        jobs = {}
+
+        def operation(idrac_ip, auth):
+            jobs[idrac_ip] = unfinished_jobs(idrac_ip, auth)
+            return {"jobs": jobs[idrac_ip]}
+
+        log("- INFO, reading the job queue of %s iDRAC(s)" % len(hosts))
+        with open(os.devnull, "w") as devnull:
+            summary = RedfishFleet.run(hosts, operation, "list_jobs", workers, devnull)
+        if summary.failed:
+            log("- WARNING, job queue of %s iDRAC(s) could not be read, their jobs are not tracked" % summary.failed)
+    auth = dict((host["host"], (host["username"], host["password"])) for host in hosts)
+    output = open(args["o"], "w") if args["o"] else sys.stdout
+    output_lock = threading.Lock()
+    final_states = {}
+
+    def on_change(tracked):
+        job = tracked.job
+        log("- INFO, %s %s: %s, %s, percent complete %s" % (tracked.idrac_ip, tracked.job_id, job.get(u'JobState'), job.get(u'Message'), job.get(u'PercentComplete')))
+
+    def on_done(tracked):
+        if tracked.error is not None:
+            state = "TimedOut" if isinstance(tracked.error, RedfishJobTracker.JobTrackError) else "Error"
+        else:
+            state = tracked.state
+        record = {"host": tracked.idrac_ip, "job_id": tracked.job_id, "ok": tracked.error is None and RedfishJobState.succeeded(tracked.job), "job_state": state,
+                  "message": (tracked.job or {}).get(u'Message'), "checks": tracked.checks}
+        if tracked.error is not None:
+            record["error"] = str(tracked.error)
+        with output_lock:
+            final_states[state] = final_states.get(state, 0) + 1
+            output.write(json.dumps(record, sort_keys=True) + "\n")
+            output.flush()
+
+    tracker = RedfishJobTracker.JobTracker(workers)
+    timeout = float(args["t"]) if args["t"] else 2 * 60 * 60
+    interval = float(args["pi"]) if args["pi"] else RedfishJobTracker.POLL_INTERVAL
+    count = 0
+    try:
+        for idrac_ip, job_ids in jobs.items():
+            for job_id in job_ids:
+                tracker.track(idrac_ip, auth[idrac_ip], job_id, timeout, interval, on_change=on_change, on_done=on_done)
+                count += 1
+        log("- INFO, tracking %s job(s) of %s iDRAC(s)" % (count, len([i for i in jobs.values() if i])))
+        # Short waits so Ctrl+C is seen
+        while not tracker.wait_all(1):
+            pass
+    except KeyboardInterrupt:
+        log("\n- WARNING, tracking interrupted, %s job(s) were still tracked" % tracker.active)
+    finally:
+        tracker.close()
+        if args["o"]:
+            output.close()
+    log("\n- INFO, %s job(s) tracked with %s job status GET(s): %s" % (count, tracker.requests, ", ".join("%s %s" % (number, state) for state, number in sorted(final_states.items())) or "none finished"))
+    if args["o"]:
+        print("\n- Results are captured in \"%s\" file" % args["o"])
+
+
+if __name__ == "__main__":
+    track_jobs()
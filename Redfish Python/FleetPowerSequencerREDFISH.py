@@ -0,0 +1,98 @@
+#
+# FleetPowerSequencerREDFISH. Python script using Redfish API to power on, power off or power cycle every server of an inventory file, powering on in staggered waves per PDU / rack group.
+#
+# NOTE: Put the PDU (or rack, circuit) of each server in an inventory column, default column name is "pdu" (-g to use another column). At most
+# -m servers per group power on at the same time, at least -d seconds apart, and the next server of a group only starts once the previous one
+# reports PowerState On. Groups power on in parallel, so a data hall cold start takes about (servers per group / -m) x power-on time. See
+# RedfishPowerSequencer for details and RedfishFleet for the CSV / YAML inventory format.
+#
+# NOTE: -r Cycle gracefully shuts down every server (ForceOff when still on after -t seconds, same as reboot_server() of the scripts) and then
+# powers them on in staggered waves. ForceOff and GracefulShutdown are not staggered.
+#
+# NOTE: Pass in --sse to confirm power state changes with the Server-Sent Events stream of each iDRAC (see RedfishEventStream, iDRAC9 firmware
+# 4.00 or later) instead of polling PowerState every 2 seconds, a power event frees the group slot of the server right away.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishFleet, RedfishPowerSequencer, RedfishEventStream, sys, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+RESET_TYPES = ("On", "ForceOff", "GracefulShutdown", "Cycle")
+
+parser=argparse.ArgumentParser(description="Python script using Redfish API to change the power state of every server of an inventory file, powering on in staggered waves per PDU / rack group")
+parser.add_argument('-i', help='Inventory file, CSV with header row (host, username, password, credential, pdu columns) or YAML', required=True)
+parser.add_argument('-u', help='Default iDRAC username for hosts without credentials in the inventory', required=False)
+parser.add_argument('-p', help='Default iDRAC password for hosts without credentials in the inventory', required=False)
+parser.add_argument('-c', help='Credentials file (YAML or JSON) with the named credentials referenced by the inventory \"credential\" column', required=False)
+parser.add_argument('script_examples',action="store_true",help='FleetPowerSequencerREDFISH.py -i hosts.csv -u root -p calvin -r On, this example will power on every server of hosts.csv, 2 servers per PDU at a time 5 seconds apart. FleetPowerSequencerREDFISH.py -i hosts.csv -u root -p calvin -r Cycle -g rack -m 4 -d 10 -o cycle.ndjson, this example will shut down every server, then power on 4 servers per rack at a time 10 seconds apart and write the results to cycle.ndjson.')
+parser.add_argument('-r', help='Power action, supported values are: %s' % ", ".join(RESET_TYPES), required=True)
+parser.add_argument('-g', help='Inventory column with the PDU / rack group of each server, default is \"%s\". Servers without a value are one group' % RedfishPowerSequencer.GROUP_COLUMN, required=False)
+parser.add_argument('-m', help='Maximum number of servers of one group powering on at the same time, default is %s' % RedfishPowerSequencer.MAX_PER_GROUP, required=False)
+parser.add_argument('-d', help='Minimum delay in seconds between two power-ons of the same group, default is %s' % RedfishPowerSequencer.STAGGER_SECONDS, required=False)
+parser.add_argument('-t', help='Seconds to wait for each server to reach the new power state, default is %s' % RedfishPowerSequencer.CONFIRM_TIMEOUT, required=False)
+parser.add_argument('-w', help='Maximum number of iDRACs in progress at the same time over all groups, default is %s' % RedfishFleet.MAX_WORKERS, required=False)
+parser.add_argument('-o', help='Write the NDJSON results to this file instead of the screen', required=False)
+parser.add_argument('--sse', help='Confirm power state changes with the Server-Sent Events stream of each iDRAC instead of polling', action="store_true", required=False)
+
+args=vars(parser.parse_args())
+
+
+def log(message):
+    sys.stderr.write(message + "\n")
+
+
+def sequence_power():
+    if args["r"] not in RESET_TYPES:
+        print("- FAIL, invalid value passed in for -r, supported values are: %s" % ", ".join(RESET_TYPES))
+        sys.exit()
+    try:
+        hosts = RedfishFleet.load_inventory(args["i"], args["u"], args["p"], args["c"])
+    except (RedfishFleet.InventoryError, IOError, ValueError) as error:
+        print(error)
+        sys.exit()
+    if hosts == []:
+        print("- WARNING, no hosts found in inventory file \"%s\"" % args["i"])
+        sys.exit()
+    group_column = args["g"] or RedfishPowerSequencer.GROUP_COLUMN
+    max_per_group = int(args["m"]) if args["m"] else RedfishPowerSequencer.MAX_PER_GROUP
+    stagger = float(args["d"]) if args["d"] else RedfishPowerSequencer.STAGGER_SECONDS
+    timeout = int(args["t"]) if args["t"] else RedfishPowerSequencer.CONFIRM_TIMEOUT
+    workers = int(args["w"]) if args["w"] else None
+    output = open(args["o"], "w") if args["o"] else None
+    try:
+        if args["r"] in ("ForceOff", "GracefulShutdown", "Cycle"):
+            reset_type = "GracefulShutdown" if args["r"] == "Cycle" else args["r"]
+            log("- INFO, %s on %s server(s)" % (reset_type, len(hosts)))
+            summary, powered_off = RedfishPowerSequencer.power_off(hosts, reset_type, timeout, args["r"] == "Cycle", workers, output, events=args["sse"])
+            summary.print_summary()
+        if args["r"] in ("On", "Cycle"):
+            if args["r"] == "Cycle":
+                # Only power on servers which were confirmed off, the others are still running or unreachable
+                if summary.failed:
+                    log("- WARNING, %s server(s) did not power off and are left out of the power on" % summary.failed)
+                hosts = [host for host in hosts if host["host"] in powered_off]
+            groups = RedfishPowerSequencer.group_hosts(hosts, group_column)
+            log("- INFO, %s on %s server(s) in %s group(s) by column \"%s\", %s per group at a time, %s second(s) apart" % (args["r"] if args["r"] != "Cycle" else "On",
+                len(hosts), len(groups), group_column, max_per_group, stagger))
+            summary = RedfishPowerSequencer.sequence_power_on(hosts, "On" if args["r"] == "Cycle" else args["r"], group_column, max_per_group, stagger, timeout,
+                                                              workers, output, log=log, events=args["sse"])
+            summary.print_summary()
+    finally:
+        if output is not None:
+            output.close()
+    if args["sse"]:
+        counts = RedfishEventStream.stats()
+        log("- INFO, event streams opened %s time(s), %s power event(s) received" % (counts["connects"], counts["power"]))
+    if args["o"]:
+        print("\n- Results are captured in \"%s\" file" % args["o"])
+
+
+if __name__ == "__main__":
+    sequence_power()
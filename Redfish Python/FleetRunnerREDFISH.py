@@ -0,0 +1,105 @@
+#
+# FleetRunnerREDFISH. Python script using Redfish API to run one read operation (power state, firmware inventory, job queue) on every iDRAC of an inventory file.
+#
+# NOTE: Instead of running a script once per iDRAC from a shell loop, this script runs the operation on all iDRACs of the inventory concurrently
+# in one Python process (default 64 iDRACs at the same time, -w to change it). See RedfishFleet for the CSV / YAML inventory format.
+#
+# NOTE: Results are written as NDJSON, one JSON line per iDRAC as soon as it is done, to the screen or to the file passed in with -o. A throughput
+# and latency summary is printed at the end.
+#
+# NOTE: For thousands of iDRACs pass in -np to split the run across that many worker processes (one per CPU core is a good start), hosts are
+# handed out in batches from a SQLite work queue file (-q, a temporary file when not passed in). To use several machines, put the queue file on a
+# share every machine can open and run the script on each machine with the same -q file, the inventory only needs to be passed in once.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishFleet, RedfishOperations, RedfishWorkQueue, sys, os, tempfile, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+parser=argparse.ArgumentParser(description="Python script using Redfish API to run one read operation on every iDRAC of an inventory file concurrently, results are written as NDJSON")
+parser.add_argument('-i', help='Inventory file, CSV with header row (host, username, password, credential columns) or YAML. Optional when joining an existing work queue with -q', required=False)
+parser.add_argument('-u', help='Default iDRAC username for hosts without credentials in the inventory', required=False)
+parser.add_argument('-p', help='Default iDRAC password for hosts without credentials in the inventory', required=False)
+parser.add_argument('-c', help='Credentials file (YAML or JSON) with the named credentials referenced by the inventory \"credential\" column', required=False)
+parser.add_argument('script_examples',action="store_true",help='FleetRunnerREDFISH.py -i hosts.csv -u root -p calvin -op power_state, this example will get the power state of every iDRAC in hosts.csv. FleetRunnerREDFISH.py -i hosts.yaml -c creds.yaml -op firmware_inventory -w 200 -o fw.ndjson, this example will get firmware inventory of every iDRAC with 200 iDRACs in progress at the same time and write the results to fw.ndjson. FleetRunnerREDFISH.py -i hosts.csv -c creds.yaml -op hw_inventory -np 8 -q /mnt/share/hw.sqlite, this example will collect hardware inventory with 8 worker processes, running the same command without -i on other machines adds their workers to the run.')
+parser.add_argument('-op', help='Operation to run, supported values are: %s' % ", ".join(sorted(RedfishOperations.OPERATIONS)), required=True)
+parser.add_argument('-w', help='Number of iDRACs processed at the same time, default is %s' % RedfishFleet.MAX_WORKERS, required=False)
+parser.add_argument('-o', help='Write the NDJSON results to this file instead of the screen', required=False)
+parser.add_argument('-np', help='Number of worker processes, hosts are handed out to the processes from a work queue file', required=False)
+parser.add_argument('-q', help='Work queue file (SQLite) shared by the worker processes, pass in the same file on every machine to run on several machines', required=False)
+parser.add_argument('-b', help='Maximum number of hosts a worker process leases from the work queue at a time, a worker leases hosts whenever threads are free. Default is the -w value', required=False)
+parser.add_argument('-l', help='Lease time in seconds, hosts of a worker which stopped renewing its lease for this long are handed to other workers. Default is %s' % RedfishFleet.LEASE_SECONDS, required=False)
+parser.add_argument('-ht', help='Seconds a worker process may spend on one host before its lease is no longer renewed and other workers take the host over, default is %s' % RedfishFleet.HOST_SECONDS, required=False)
+
+args=vars(parser.parse_args())
+
+
+def run_queue(workers, output):
+    queue_path = args["q"] or os.path.join(tempfile.mkdtemp(), "fleet_queue.sqlite")
+    credentials = {}
+    try:
+        if args["c"]:
+            credentials.update(RedfishFleet.read_credentials(args["c"]))
+        queue = RedfishWorkQueue.WorkQueue(queue_path)
+        if args["i"]:
+            rows, inventory_credentials = RedfishFleet.read_inventory(args["i"])
+            credentials.update(inventory_credentials)
+            # Resolve every host once up front so a typo in the inventory fails now instead of on every worker
+            for row in rows:
+                RedfishFleet.resolve_credentials(row, credentials, args["u"], args["p"])
+            added = queue.add(rows, args["op"])
+            sys.stderr.write("- INFO, added %s of %s inventory host(s) to work queue \"%s\"\n" % (added, len(rows), queue_path))
+        elif queue.operation() != args["op"]:
+            print("- FAIL, work queue \"%s\" was created for operation %s, not %s" % (queue_path, queue.operation(), args["op"]))
+            sys.exit()
+        counts = queue.counts()
+        queue.close()
+    except (RedfishFleet.InventoryError, RedfishWorkQueue.WorkQueueError, IOError, ValueError) as error:
+        print(error)
+        sys.exit()
+    processes = int(args["np"]) if args["np"] else 1
+    sys.stderr.write("- INFO, running %s with %s worker process(es), %s host(s) pending in the work queue\n" % (args["op"], processes, counts["pending"] + counts["leased"]))
+    return RedfishFleet.run_sharded(queue_path, args["op"], processes, workers, int(args["b"]) if args["b"] else None, int(args["l"]) if args["l"] else RedfishFleet.LEASE_SECONDS,
+                                    credentials, args["u"], args["p"], output=output, host_seconds=int(args["ht"]) if args["ht"] else RedfishFleet.HOST_SECONDS)
+
+
+def run_fleet():
+    if args["op"] not in RedfishOperations.OPERATIONS:
+        print("- FAIL, invalid value passed in for -op, supported values are: %s" % ", ".join(sorted(RedfishOperations.OPERATIONS)))
+        sys.exit()
+    if not args["i"] and not args["q"]:
+        print("- FAIL, pass in the inventory file with -i, or an existing work queue file with -q")
+        sys.exit()
+    workers = int(args["w"]) if args["w"] else None
+    output = open(args["o"], "w") if args["o"] else None
+    try:
+        if args["np"] or args["q"]:
+            summary = run_queue(workers, output)
+        else:
+            try:
+                hosts = RedfishFleet.load_inventory(args["i"], args["u"], args["p"], args["c"])
+            except (RedfishFleet.InventoryError, IOError, ValueError) as error:
+                print(error)
+                sys.exit()
+            if hosts == []:
+                print("- WARNING, no hosts found in inventory file \"%s\"" % args["i"])
+                sys.exit()
+            sys.stderr.write("- INFO, running %s on %s iDRAC(s)\n" % (args["op"], len(hosts)))
+            summary = RedfishFleet.run(hosts, RedfishOperations.OPERATIONS[args["op"]], args["op"], workers, output)
+    finally:
+        if output is not None:
+            output.close()
+    summary.print_summary()
+    if args["o"]:
+        print("\n- Results are captured in \"%s\" file" % args["o"])
+
+
+if __name__ == "__main__":
+    run_fleet()
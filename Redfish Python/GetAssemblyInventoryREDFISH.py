@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse, os
+import RedfishTransport, RedfishCollection, json, sys, re, time, warnings, argparse, os
 
 from datetime import datetime
 
@@ -50,7 +50,7 @@ f.writelines(current_date_time)
 f.close()
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Chassis/System.Embedded.1/Assembly' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Chassis/System.Embedded.1/Assembly' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -60,7 +60,7 @@ def check_supported_idrac_version():
 
 
 def get_assembly_uris():
-    response = requests.get('https://%s/redfish/v1/Chassis/System.Embedded.1/Assembly' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Chassis/System.Embedded.1/Assembly' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -75,14 +75,18 @@ def get_assembly_uris():
                 print(ii[1])
                 assembly_uris.append(ii[1])
     if args["A"]:
+        response, assemblies = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), '/redfish/v1/Chassis/System.Embedded.1/Assembly', u'Assemblies')
+        if response.status_code != 200:
+            print("\n- FAIL, get command failed, error is: %s" % response.json())
+            sys.exit()
+        assembly_data = dict((i[u'@odata.id'], i) for i in assemblies)
         f=open("assembly_inventory.txt","a")
         for i in assembly_uris:
             message = "\n- Detailed information for URI %s -\n" % i
             f.writelines(message)
             f.writelines("\n")
             print(message)
-            response = requests.get('https://%s%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
-            data = response.json()
+            data = assembly_data[i]
             for ii in data.items():
                 if ii[0] == u'@odata.id' or ii[0] == u'@odata.context' or ii[0] == u'Metrics' or ii[0] == u'Links' or ii[0] ==  u'@odata.type':
                     pass
@@ -100,7 +104,7 @@ def get_assembly_uris():
     
 
 def get_specific_uri_info():
-    response = requests.get('https://%s%s' % (idrac_ip, args["s"]),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s%s' % (idrac_ip, args["s"]),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -37,7 +37,7 @@ idrac_password=args["p"]
 ### Function to check if iDRAC version detected is supported for this feature using Redfish
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -49,7 +49,7 @@ def check_supported_idrac_version():
 
 def get_bios_boot_mode():
     global current_boot_mode
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     current_boot_mode = data[u'Attributes']["BootMode"]
     print("\n- Current boot mode is %s" % current_boot_mode)
@@ -58,7 +58,7 @@ def get_bios_boot_mode():
 
 def get_bios_boot_source_state():
     global boot_seq
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/BootSources' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if data[u'Attributes'] == {}:
         print("\n- WARNING, no %s boot order devices detected for iDRAC IP %s" % (current_boot_mode,idrac_ip))
@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, RedfishCollection, json, sys, time, warnings, argparse
 
 from datetime import datetime
 
@@ -38,7 +38,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Dell/Managers/iDRAC.Embedded.1/DellJobService/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Dell/Managers/iDRAC.Embedded.1/DellJobService/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -47,29 +47,24 @@ def check_supported_idrac_version():
         pass
 
 def get_job_queue_job_ids():
-    req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req, jobs = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), '/redfish/v1/Managers/iDRAC.Embedded.1/Jobs')
     statusCode = req.status_code
-    data = req.json()
-    data = str(data)
-    jobid_search=re.findall("JID_.+?'",data)
-    if jobid_search == []:
+    if statusCode != 200:
+        print("\n- FAIL, GET command failed to get job IDs in the job queue, status code is %s. Detailed error message is: %s\n" % (statusCode, req.json()))
+        sys.exit()
+    jobstore = [i for i in jobs if i[u'Id'].startswith("JID_")]
+    if jobstore == []:
         print("\n- WARNING, job queue empty, no current job IDs detected for iDRAC %s" % idrac_ip)
         sys.exit()
-    jobstore=[]
-    for i in jobid_search:
-        i=i.strip("'")
-        jobstore.append(i)
     print("\n- Current job IDs in the job queue for iDRAC %s:\n" % idrac_ip)
-    for i in jobstore:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip,i), auth=(idrac_username, idrac_password), verify=False)
-        data = req.json()
-        print("Job ID: %s, Job Type: %s, Job Message: %s" % (i,data[u'Name'], data[u'Message']))
+    for data in jobstore:
+        print("Job ID: %s, Job Type: %s, Job Message: %s" % (data[u'Id'],data[u'Name'], data[u'Message']))
 
 def get_job_id_details():
     try:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip,args["j"]), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip,args["j"]), auth=(idrac_username, idrac_password), verify=False)
     except:
-        req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, args["j"]), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, args["j"]), auth=(idrac_username, idrac_password), verify=False)
     data = req.json()
     print("\n- Detailed results for job ID %s\n" % args["j"])
     for i in data.items():
@@ -81,7 +76,7 @@ def delete_job_queue():
     method = "DeleteJobQueue"
     payload = {"JobID":args["d"]}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     data = response.json()
     if statusCode == 200:
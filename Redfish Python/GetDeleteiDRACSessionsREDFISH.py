@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse, subprocess
+import RedfishTransport, json, sys, re, time, warnings, argparse, subprocess
 
 from datetime import datetime
 
@@ -38,7 +38,7 @@ idrac_password=args["p"]
 # Function to check supported iDRAC firmware version
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Sessions' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Sessions' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -49,7 +49,7 @@ def check_supported_idrac_version():
 # Function to get current iDRAC sessions 
 
 def get_current_iDRAC_sessions():
-    response = requests.get('https://%s/redfish/v1/Sessions' % (idrac_ip),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Sessions' % (idrac_ip),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     session_uris = []
     print("\n- Current running session(s) detected for iDRAC %s -\n" % idrac_ip) 
@@ -59,7 +59,7 @@ def get_current_iDRAC_sessions():
             session_uris.append(ii[1])
     for i in session_uris:
         print("\n- Detailed information for session URI \"%s\" -\n" % i)
-        response = requests.get('https://%s%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get('https://%s%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
         data = response.json()
         for i in data.items():
             print("%s: %s" % (i[0],i[1]))
@@ -80,10 +80,10 @@ def get_session_id_RACADM():
 def delete_session():
     url = 'https://%s/redfish/v1/Sessions/%s' % (idrac_ip, args["d"])
     headers = {'content-type': 'application/json'}
-    response = requests.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
     if response.status_code == 202 or response.status_code == 200:
         print("\n- PASS: DELETE command passed to delete session id \"%s\", status code %s returned" % (args["d"],response.status_code))
-        response = requests.get('https://%s/redfish/v1/Sessions/%s' % (idrac_ip,args["d"]),verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get('https://%s/redfish/v1/Sessions/%s' % (idrac_ip,args["d"]),verify=False,auth=(idrac_username, idrac_password))
         if response.status_code == 404:
             print("- PASS, validation passed to confirm session %s has been deleted" % args["d"])
         else:
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -45,7 +45,7 @@ if args["s"]:
 
 
 def get_ethernet_interfaces():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if args["e"] == "y":
         print("\n- Ethernet FQDDs detected -\n")
@@ -59,7 +59,7 @@ def get_ethernet_interfaces():
             else:
                 pass        
             if args["e"] == "yy":
-                response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, fqdd),verify=False,auth=(idrac_username, idrac_password))
+                response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, fqdd),verify=False,auth=(idrac_username, idrac_password))
                 data = response.json()
                 print("\n- Detailed Ethernet Information for FQDD %s -\n" % fqdd)
                 for i in data.items():
@@ -68,14 +68,14 @@ def get_ethernet_interfaces():
                 pass
 
 def get_specific_ethernet_property_old():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n"),
     correct_value=0
     for i in data[u'Members']:
         for ii in i.items():
             fqdd = (ii[1].split("/")[-1])
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, fqdd),verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, fqdd),verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             #print("\n- Property %s for FQDD %s -\n" % (specific_property,fqdd))
             for i in data.items():
@@ -91,7 +91,7 @@ def get_specific_ethernet_property_old():
 
 
 def get_specific_ethernet_property():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     nic_fqdds = []
     for i in data[u'Members']:
@@ -99,7 +99,7 @@ def get_specific_ethernet_property():
             fqdd = (ii[1].split("/")[-1])
             nic_fqdds.append(fqdd)
     for i in nic_fqdds:
-        response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
         data = response.json()
         print("\n- Specific properties for FQDD %s -\n" % i)
         for ii in specific_property:
@@ -110,7 +110,7 @@ def get_specific_ethernet_property():
                 
 
 def get_FQDD_details():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, fqdd),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, fqdd),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- Detailed Ethernet Information for FQDD %s -\n" % fqdd)
     for i in data.items():
@@ -0,0 +1,70 @@
+#
+# GetEventStreamREDFISH. Python script using Redfish API to print the Server-Sent Events (SSE) stream of the iDRAC as events arrive.
+#
+# NOTE: The stream is read with RedfishEventStream, when it drops it is opened again with Last-Event-ID so events sent in between are not lost.
+# iDRAC9 firmware 4.00 or later is needed for the SSE stream. Use EventStreamStandInREDFISH to try the script without an iDRAC.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishEventStream, sys, time, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+parser=argparse.ArgumentParser(description="Python script using Redfish API to print the Server-Sent Events stream of the iDRAC as events arrive")
+parser.add_argument('-ip',help='iDRAC IP address', required=True)
+parser.add_argument('-u', help='iDRAC username', required=True)
+parser.add_argument('-p', help='iDRAC password', required=True)
+parser.add_argument('script_examples',action="store_true",help='GetEventStreamREDFISH.py -ip 192.168.0.120 -u root -p calvin, this example will print every event of the iDRAC until Ctrl+C is pressed. GetEventStreamREDFISH.py -ip 192.168.0.120 -u root -p calvin -t 600 -r y, this example will print the raw JSON of every event for 10 minutes.')
+parser.add_argument('-t', help='Stop after this many seconds, default is to run until Ctrl+C is pressed', required=False)
+parser.add_argument('-r', help='Print the raw JSON of each event, pass in \"y\"', required=False)
+
+args=vars(parser.parse_args())
+
+idrac_ip=args["ip"]
+idrac_username=args["u"]
+idrac_password=args["p"]
+
+
+def log(message):
+    sys.stderr.write(message + "\n")
+
+
+def print_event(event):
+    if args["r"] == "y":
+        print(event.data)
+        return
+    try:
+        records = event.json().get(u'Events') or []
+    except (ValueError, AttributeError):
+        print("- INFO, event %s: %s" % (event.id, event.data))
+        return
+    for record in records:
+        origin = record.get(u'OriginOfCondition') or {}
+        print("- INFO, event %s, %s %s: %s (%s)" % (event.id, record.get(u'EventTimestamp', ""), record.get(u'MessageId'), record.get(u'Message'),
+                                                   origin.get(u'@odata.id') if isinstance(origin, dict) else origin))
+    sys.stdout.flush()
+
+
+def get_event_stream():
+    stream = RedfishEventStream.EventStream(idrac_ip, (idrac_username, idrac_password), print_event, log).start()
+    if stream.wait_connected(RedfishEventStream.CONNECT_WAIT):
+        print("\n- INFO, event stream of iDRAC %s open, waiting for events\n" % idrac_ip)
+    deadline = time.time() + float(args["t"]) if args["t"] else None
+    try:
+        while deadline is None or time.time() < deadline:
+            time.sleep(1 if deadline is None else max(0, min(1, deadline - time.time())))
+    except KeyboardInterrupt:
+        pass
+    stream.close()
+    print("\n- INFO, %s job event(s), %s power event(s), %s other event(s) received, stream opened %s time(s)" % (stream.counts["job"], stream.counts["power"],
+          stream.counts["other"], stream.connects))
+
+
+if __name__ == "__main__":
+    get_event_stream()
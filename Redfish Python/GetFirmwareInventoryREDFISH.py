@@ -18,9 +18,9 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, os, argparse
+import RedfishTransport, json, sys, re, time, warnings, os, argparse
 
-import requests, json, sys, re, time, os, warnings, argparse
+import RedfishTransport, json, sys, re, time, os, warnings, argparse
 
 from datetime import datetime
 
@@ -41,7 +41,7 @@ idrac_password=args["p"]
 
 
 def check_idrac_fw_support():
-    req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False, cache=True)
     statusCode = req.status_code
     if statusCode == 400:
         print("\n- WARNING, current server iDRAC version does not support Redfish firmware features. Refer to Dell online Redfish documentation for information on which iDRAC version support firmware features.")
@@ -62,7 +62,7 @@ def get_FW_inventory():
     current_date_time="- Data collection timestamp: %s-%s-%s  %s:%s:%s\n" % (d.month,d.day,d.year, d.hour,d.minute,d.second)
     f.writelines(current_date_time)
     f.writelines("\n\n")
-    req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory?$expand=*($levels=1)' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory?$expand=*($levels=1)' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False, cache=True)
     statusCode = req.status_code
     data = req.json()
     for i in data[u'Members']:
@@ -14,7 +14,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, os, warnings, argparse
+import RedfishTransport, json, sys, re, time, os, warnings, argparse
 
 from datetime import datetime
 
@@ -44,7 +44,7 @@ def get_LC_logs():
     current_date_time="- Data collection timestamp: %s-%s-%s  %s:%s:%s\n" % (d.month,d.day,d.year, d.hour,d.minute,d.second)
     f.writelines(current_date_time)
     f.writelines("\n\n")
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Logs/Lclog' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Logs/Lclog' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     for i in data[u'Members']:
         for ii in i.items():
@@ -57,7 +57,7 @@ def get_LC_logs():
     if args["c"]:
         number_list=[i for i in range (1,100001) if i % 50 == 0]
         for seq in number_list:
-            response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Logs/Lclog?$skip=%s' % (idrac_ip, seq) ,verify=False,auth=(idrac_username,idrac_password))
+            response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Logs/Lclog?$skip=%s' % (idrac_ip, seq) ,verify=False,auth=(idrac_username,idrac_password))
             data = response.json()
             if "Members" in data:
                 pass
@@ -14,7 +14,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse, os
+import RedfishTransport, json, sys, re, time, warnings, argparse, os
 
 from datetime import datetime
 
@@ -39,12 +39,12 @@ def get_NVDIMM_information():
     except:
         pass
     f=open("NVDIMM_inventory.txt","a")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Memory' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Memory' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     nvdimm_uris = []
     for i in data[u'Members']:
         for ii in i.items():
-            response = requests.get('https://%s%s' % (idrac_ip, ii[1]),verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get('https://%s%s' % (idrac_ip, ii[1]),verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             try:
                 if "NVDIMM" in data[u'MemoryType']:
@@ -61,7 +61,7 @@ def get_NVDIMM_information():
             print(i)
         print("\n")
         for i in nvdimm_uris:
-            response = requests.get('https://%s%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get('https://%s%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             message = "\n- Detailed NVDIMM information for URI \"%s\" -\n" % i
             f.writelines("\n")
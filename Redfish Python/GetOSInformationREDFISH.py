@@ -16,9 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
-
-from datetime import datetime
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -37,7 +35,7 @@ payload = {"ExportFormat":"XML","IncludeInExport":"IncludeReadOnly","ShareParame
 
 
 headers = {'content-type': 'application/json'}
-response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
 
 if response.status_code != 202:
     print("- FAIL, status code not 202, code is: %s" % response.status_code)
@@ -56,52 +54,32 @@ except:
     sys.exit()
 
 print("\n- WARNING, getting Operation System information for iDRAC IP %s using Server Configuration Profile feature" % idrac_ip)
-start_time=datetime.now()
-
+deadline = RedfishJobState.deadline(10 * 60)
+job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+data = None
 while True:
-    current_time=(datetime.now()-start_time)
-    req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-    d=req.__dict__
-    if "<SystemConfiguration Model" in str(d):
-        print("\n- PASS, Operation System Information for iDRAC %s -\n" % idrac_ip)
-        zz=re.search("<SystemConfiguration.+</SystemConfiguration>",str(d)).group()
-        z=re.findall("ServerOS.+?->",str(d))
-        for i in z:
-            i=i.replace("</Attribute> -->","")
-            print(i.replace(">"," = "))
-        break
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        
-        data = req.json()
-        print("- WARNING, final detailed job status results for job ID %s -\n" % job_id)
-        for i in data.items():
-            print("%s: %s" % (i[0],i[1]))
-        print("\n Exported attributes also saved in file: %s" % filename)
-        sys.exit()
-    else:
-        pass
-        
-    statusCode = req.status_code
-    data = req.json()
     try:
-        message_string=data[u"Messages"]
-    except:
-        print(statusCode)
-        print(data)
-        sys.exit()
-    current_time=(datetime.now()-start_time)
-
-    if statusCode == 202 or statusCode == 200:
-        time.sleep(1)
-        pass
-    else:
-        print("Execute job ID command failed, error code is: %s" % statusCode)
+        data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=1)
+    except RedfishJobWatcher.JobWatchError as error:
+        print("Execute job ID command failed, error code is: %s" % error.status_code)
         sys.exit()
-    if str(current_time)[0:7] >= "0:10:00":
+    if RedfishJobState.expired(deadline):
         print("\n-FAIL, Timeout of 10 minutes has been reached before marking the job completed.")
         sys.exit()
-    else:
-        continue
-
+    elif RedfishJobState.failed(data):
+        print("- FAIL: job ID %s failed, failed message is: %s" % (job_id, data[u'Message']))
+        sys.exit()
+    elif RedfishJobState.finished(data):
+        break
 
-       
+# The exported profile is only returned by the task of the job
+req = RedfishTransport.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
+d=req.__dict__
+if "<SystemConfiguration Model" in str(d):
+    print("\n- PASS, Operation System Information for iDRAC %s -\n" % idrac_ip)
+    z=re.findall("ServerOS.+?->",str(d))
+    for i in z:
+        i=i.replace("</Attribute> -->","")
+        print(i.replace(">"," = "))
+else:
+    print("- FAIL, Server Configuration Profile not returned for job ID %s, status code %s returned" % (job_id, req.status_code))
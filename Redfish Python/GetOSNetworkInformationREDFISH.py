@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -56,7 +56,7 @@ def get_OS_network_devices():
     d=datetime.now()
     current_date_time="- Data collection timestamp: %s-%s-%s  %s:%s:%s\n" % (d.month,d.day,d.year, d.hour,d.minute,d.second)
     f.writelines(current_date_time)
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     valid_network_devices=[]
     for i in data[u'Members']:
@@ -71,7 +71,7 @@ def get_OS_network_devices():
         print(i)
     if args["g"] == "yy":
         for i in valid_network_devices:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, i),verify=False,auth=(idrac_username,idrac_password))
+            response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, i),verify=False,auth=(idrac_username,idrac_password))
             data = response.json()
             print("\n- Detailed information for network device %s -\n") % i
             for ii in data.items():
@@ -80,14 +80,14 @@ def get_OS_network_devices():
         
 
 def get_individual_network_device_info():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, args["n"]),verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, args["n"]),verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     print("\n- Detailed information for network device %s -\n") % args["n"]
     for ii in data.items():
         print("%s: %s" % (ii[0], ii[1]))
 
 def get_property_value_only():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, args["i"]),verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces/%s' % (idrac_ip, args["i"]),verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     count=0
     for i in data.items():
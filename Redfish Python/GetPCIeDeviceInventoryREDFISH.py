@@ -14,7 +14,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse, os
+import RedfishCollection, json, sys, re, time, warnings, argparse, os
 
 from datetime import datetime
 
@@ -35,36 +35,35 @@ idrac_ip=args["ip"]
 idrac_username=args["u"]
 idrac_password=args["p"]
 
-def check_idrac_fw_support():
-    req = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
-    statusCode = req.status_code
-    data = req.json()
-    if u'PCIeDevices' in data.keys():
+def check_idrac_fw_support(data, link_property):
+    if link_property in data.keys():
         pass
     else:
         print("\n- WARNING, current iDRAC version does not support getting server PCIe Device information")
         sys.exit()
 
 def get_pcie_device_inventory():
+        # One GET of System.Embedded.1 ($expand inlines the devices), the device URIs are read from the same response
+        req, devices = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), '/redfish/v1/Systems/System.Embedded.1', u'PCIeDevices', fetch_members=args["d"] == "yy")
+        if req.status_code != 200:
+            print("\n- FAIL, GET command failed to get PCIe devices for iDRAC %s, status code %s returned" % (idrac_ip, req.status_code))
+            print(req.json())
+            sys.exit()
+        check_idrac_fw_support(req.json(), u'PCIeDevices')
         print("\n- WARNING, server PCIe Device URIs for iDRAC %s\n" % idrac_ip)
-        req = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        data = req.json()
         pcie_devices=[]
         try:
             os.remove("pcie_devices.txt")
         except:
             pass
         f=open("pcie_devices.txt","a")
-        for i in data[u'PCIeDevices']:
-            for ii in i.items():
-                print(ii[1])
-                pcie_devices.append(ii[1])
+        for i in devices:
+            print(i[u'@odata.id'])
+            pcie_devices.append(i[u'@odata.id'])
         if args["d"] == "yy":
+            device_data = dict((i[u'@odata.id'], i) for i in devices)
             for i in pcie_devices:
-                req = requests.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
-                statusCode = req.status_code
-                data = req.json()
+                data = device_data[i]
                 message = "\n\n- Detailed information for URI \"%s\"\n\n" % i
                 print(message)
                 f.writelines(message)
@@ -80,25 +79,26 @@ def get_pcie_device_inventory():
         sys.exit()
 
 def get_pcie_function_inventory():
+        req, functions = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), '/redfish/v1/Systems/System.Embedded.1', u'PCIeFunctions', fetch_members=args["f"] == "yy")
+        if req.status_code != 200:
+            print("\n- FAIL, GET command failed to get PCIe functions for iDRAC %s, status code %s returned" % (idrac_ip, req.status_code))
+            print(req.json())
+            sys.exit()
+        check_idrac_fw_support(req.json(), u'PCIeFunctions')
         print("\n- WARNING, server PCIe Function URIs for iDRAC %s\n" % idrac_ip)
-        req = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        data = req.json()
         pcie_devices=[]
         try:
             os.remove("pcie_function.txt")
         except:
             pass
         f=open("pcie_function.txt","a")
-        for i in data[u'PCIeFunctions']:
-            for ii in i.items():
-                print(ii[1])
-                pcie_devices.append(ii[1])
+        for i in functions:
+            print(i[u'@odata.id'])
+            pcie_devices.append(i[u'@odata.id'])
         if args["f"] == "yy":
+            function_data = dict((i[u'@odata.id'], i) for i in functions)
             for i in pcie_devices:
-                req = requests.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
-                statusCode = req.status_code
-                data = req.json()
+                data = function_data[i]
                 message = "\n\n- Detailed information for URI \"%s\"\n\n" % i
                 print(message)
                 f.writelines(message)
@@ -116,7 +116,6 @@ def get_pcie_function_inventory():
 
 
 if __name__ == "__main__":
-    check_idrac_fw_support()
     if args["d"] == "y" or args["d"] == "yy":
         get_pcie_device_inventory()
     elif args["f"]:
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings
+import RedfishTransport, json, sys, re, time, warnings
 
 warnings.filterwarnings("ignore")
 
@@ -31,7 +31,7 @@ except:
 
 
 
-response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState", "Actions"],verify=False,auth=(idrac_username, idrac_password))
 data = response.json()
 print("\n- WARNING, Current server power state is: %s\n" % data[u'PowerState'])
 
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, os, warnings, argparse
+import RedfishTransport, json, sys, re, time, os, warnings, argparse
 
 from datetime import datetime
 
@@ -35,7 +35,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/PrivilegeRegistry' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/PrivilegeRegistry' % idrac_ip,verify=False,auth=(idrac_username, idrac_password), cache=True)
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -50,7 +50,7 @@ def get_privileges():
     except:
         pass
     f=open("privileges.txt","a")
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/PrivilegeRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/PrivilegeRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password), cache=True)
     data = response.json()
     for i in data[u'Mappings']:
         for ii in i.items():
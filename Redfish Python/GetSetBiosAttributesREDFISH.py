@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse, os
+import RedfishTransport, RedfishJson, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, argparse, os
 
 from datetime import datetime
 
@@ -60,8 +60,7 @@ if args["r"] and args["an"] and args["av"]:
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
-    data = response.json()
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
         sys.exit()
@@ -74,7 +73,7 @@ def get_bios_attributes():
     except:
         pass
     f=open("bios_attributes.txt","a")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     d=datetime.now()
     current_date_time="- Data collection timestamp: %s-%s-%s  %s:%s:%s\n" % (d.year,d.month,d.day, d.hour,d.minute,d.second)
@@ -93,7 +92,7 @@ def get_bios_attributes():
     f.close()
 
 def get_specific_bios_attribute():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     for i in data[u'Attributes'].items():
         if i[0] == args["A"]:
@@ -108,7 +107,7 @@ def bios_registry():
     except:
         pass
     f=open("bios_attribute_registry.txt","a")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password), cache=True)
     data = response.json()
     for i in data[u'RegistryEntries']['Attributes']:
         for ii in i.items():
@@ -125,7 +124,7 @@ def bios_registry():
 
 def bios_registry_get_specific_attribute():
     print("\n- WARNING, searching BIOS registry for attribute \"%s\"" % args["s"])
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password), cache=True)
     data = response.json()
     found = ""
     for i in data[u'RegistryEntries']['Attributes']:
@@ -145,13 +144,11 @@ def create_bios_attribute_dict():
     attribute_values = args["av"].split(",")
     for i,ii in zip(attribute_names, attribute_values):
         bios_attribute_payload["Attributes"][i] = ii
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
-    data = response.json()
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry' % idrac_ip,verify=False,auth=(idrac_username,idrac_password), cache=True)
+    registry = RedfishJson.registry_index(response, [u'Type'])
     for i in bios_attribute_payload["Attributes"].items():
-        for ii in data[u'RegistryEntries']['Attributes']:
-            if i[0] in ii.values():
-                if ii[u'Type'] == "Integer":
-                    bios_attribute_payload['Attributes'][i[0]] = int(i[1])
+        if registry.get(i[0], {}).get(u'Type') == "Integer":
+            bios_attribute_payload['Attributes'][i[0]] = int(i[1])
     print("\n- WARNING, script will be setting BIOS attributes -\n")
     for i in bios_attribute_payload["Attributes"].items():
         print("Attribute Name: %s, setting new value to: %s" % (i[0], i[1]))
@@ -163,8 +160,7 @@ def create_next_boot_config_job():
     payload = {"@Redfish.SettingsApplyTime":{"ApplyTime":"OnReset"}}
     payload.update(bios_attribute_payload)
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
-    statusCode = response.status_code
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     if response.status_code == 202:
         print("\n- PASS: PATCH command passed to set BIOS attribute pending values and create next reboot config job, status code %s returned" % response.status_code)
     else:
@@ -192,8 +188,7 @@ def create_schedule_config_job():
         sys.exit()
     payload.update(bios_attribute_payload)
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
-    statusCode = response.status_code
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     if response.status_code == 202:
         print("\n- PASS: PATCH command passed to set BIOS attribute pending values and create maintenance window config job, status code %s returned" % response.status_code)
     else:
@@ -208,7 +203,7 @@ def create_schedule_config_job():
         print("\n- FAIL, unable to create job ID")
         sys.exit()
 
-    req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
     data = req.json()
     time.sleep(5)
     print("\n--- PASS, Detailed Job Status Results ---\n")
@@ -221,42 +216,40 @@ def create_schedule_config_job():
         print("\n- PASS, %s maintenance window config jid successfully created.\n\nJob will go to scheduled state once start time has elapsed. You will need to schedule a seperate server reboot during the maintenance windows for the config job to execute.\n" % (job_id))
     elif args["mt"] == "n":
         print("\n- PASS %s maintenance window config jid successfully created.\n\nJob will go to scheduled state once start time has elapsed and automatically reboot the server to apply the configuration job" % job_id) 
-start_time=datetime.now()
 
 
 
 def check_job_status_schedule():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        if statusCode == 202 or statusCode == 200:
-            pass
-            #print("- PASS, Command passed to check job status, code 200 returned")
-            time.sleep(10)
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=10)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if data[u'Messages'][0][u'Message'] == "Task successfully scheduled.":
+        if RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             if args["r"] == "l":
                 print("- PASS, %s job id successfully scheduled, next server manual reboot the job will execute" % job_id)
                 break
             elif args["r"] == "n":
                 print("- PASS, %s job id successfully scheduled, rebooting the server to apply boot option changes" % job_id)
                 break
+        elif RedfishJobState.failed(data):
+            print("- FAIL: %s failed, failed message is: %s" % (job_id, data[u'Message']))
+            sys.exit()
         else:
-            print("- WARNING: JobStatus not scheduled, current status is: %s" % data[u'Messages'][0][u'Message'])
+            print("- WARNING: JobStatus not scheduled, current status is: %s" % data[u'Message'])
 
 def reboot_server():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, Current server power state is: %s" % data[u'PowerState'])
     if data[u'PowerState'] == "On":
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'GracefulShutdown'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, POST command passed to gracefully power OFF server, status code return is %s" % statusCode)
@@ -268,7 +261,7 @@ def reboot_server():
             print("Extended Info Message: {0}".format(response.json()))
             sys.exit()
         while True:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             current_time = str(datetime.now() - start_time)[0:7]
             if data[u'PowerState'] == "Off":
@@ -278,12 +271,12 @@ def reboot_server():
                 print("- WARNING, unable to perform graceful shutdown, server will now perform forced shutdown")
                 payload = {'ResetType': 'ForceOff'}
                 headers = {'content-type': 'application/json'}
-                response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+                response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
                 statusCode = response.status_code
                 if statusCode == 204:
                     print("- PASS, POST command passed to perform forced shutdown, status code return is %s" % statusCode)
                     time.sleep(15)
-                    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+                    response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
                     data = response.json()
                     if data[u'PowerState'] == "Off":
                         print("- PASS, GET command passed to verify forced shutdown was successful and server is in OFF state")
@@ -296,7 +289,7 @@ def reboot_server():
             
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, status code return is %s" % statusCode)
@@ -308,7 +301,7 @@ def reboot_server():
         url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
         payload = {'ResetType': 'On'}
         headers = {'content-type': 'application/json'}
-        response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+        response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
         statusCode = response.status_code
         if statusCode == 204:
             print("- PASS, Command passed to power ON server, code return is %s" % statusCode)
@@ -321,47 +314,41 @@ def reboot_server():
         sys.exit()
 
 def check_job_status_final():
-    start_time=datetime.now()
+    deadline = RedfishJobState.deadline(30 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
+    count = 1
     while True:
-        count = 1
-        while True:
-            if count == 5:
-                print("- FAIL, unable to get job status after 5 attempts, script will exit")
-                sys.exit()
-            try:
-                req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-                break
-            except Exception, error_message:
-                print("- FAIL, requests command failed to GET job status, detailed error information: \n%s" % error_message)
-                time.sleep(10)
-                print("- WARNING, script will now attempt to get job status again")
-                count+=1
-                continue
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 202 or statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        if count == 5:
+            print("- FAIL, unable to get job status after 5 attempts, script will exit")
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "0:30:00":
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=20)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
+            sys.exit()
+        except Exception as error_message:
+            print("- FAIL, requests command failed to GET job status, detailed error information: \n%s" % error_message)
+            time.sleep(10)
+            print("- WARNING, script will now attempt to get job status again")
+            count+=1
+            continue
+        count = 1
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, script stopped\n")
             sys.exit()
-        elif "Complete" in data[u'Messages'][0][u'Message'] or "complete" in data[u'Messages'][0][u'Message']:
+        elif RedfishJobState.succeeded(data):
             print("- PASS, %s job id successfully completed" % job_id)
             break
-        elif "fail" in data[u'Messages'][0][u'Message'] or "Fail" in data[u'Messages'][0][u'Message']:
+        elif RedfishJobState.finished(data):
             print("- FAIL, %s job id marked as failed" % job_id)
             sys.exit()
         else:
-            print("- WARNING: JobStatus not marked completed, current status is: %s" % data[u'Messages'][0][u'Message'])
-            time.sleep(20)
+            print("- WARNING: JobStatus not marked completed, current status is: %s" % data[u'Message'])
 
 def get_new_attribute_values():
     print("- WARNING, checking new attribute values - \n")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Bios' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     new_attributes_dict=data[u'Attributes']
     for i in new_attributes_dict.items():
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, os, warnings, argparse
+import RedfishTransport, RedfishCollection, json, sys, re, time, os, warnings, argparse
 
 from datetime import datetime
 
@@ -44,7 +44,7 @@ idrac_password=args["p"]
     
 
 def get_storage_controllers():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- Server controller(s) detected -\n")
     controller_list=[]
@@ -52,8 +52,10 @@ def get_storage_controllers():
         controller_list.append(i[u'@odata.id'][46:])
         print(i[u'@odata.id'][46:])
     if args["c"] == "yy":
+        controller_uris = ['/redfish/v1/Systems/System.Embedded.1/Storage/%s' % i for i in controller_list]
+        controller_responses = dict(zip(controller_list, RedfishCollection.get_many(idrac_ip, (idrac_username, idrac_password), controller_uris)))
         for i in controller_list:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+            response = controller_responses[i]
             data = response.json()
             print("\n - Detailed controller information for %s -\n" % i)
             for i in data.items():
@@ -61,7 +63,10 @@ def get_storage_controllers():
 
     
 def get_storage_disks():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
+    if args["dd"]:
+        response, drives = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), '/redfish/v1/Systems/System.Embedded.1/Storage/%s' % controller, u'Drives')
+    else:
+        response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, controller),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     drive_list=[]
     if response.status_code == 200 or response.status_code == 202:
@@ -76,20 +81,18 @@ def get_storage_disks():
         print("\n- Drive(s) detected for %s -\n" % controller)
         for i in data[u'Drives']:
             drive_list.append(i[u'@odata.id'].split("/")[-1])
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i[u'@odata.id'].split("/")[-1]),verify=False,auth=(idrac_username, idrac_password))
-            data = response.json()
             print(i[u'@odata.id'].split("/")[-1])
     if args["dd"]:
+      drive_data = dict((i[u'@odata.id'].split("/")[-1], i) for i in drives)
       for i in drive_list:
-          response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
-          data = response.json()
+          data = drive_data[i]
           print("\n - Detailed drive information for %s -\n" % i)
           for ii in data.items():
               print("%s: %s" % (ii[0],ii[1]))
                 
 
 def get_backplanes():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/SimpleStorage/Controllers/%s' % (idrac_ip, args["b"]),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/SimpleStorage/Controllers/%s' % (idrac_ip, args["b"]),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     backplane_dict = {}
     try:
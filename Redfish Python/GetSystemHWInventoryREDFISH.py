@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse, os
+import RedfishTransport, RedfishCollection, json, sys, re, time, warnings, argparse, os
 
 from datetime import datetime
 
@@ -64,7 +64,7 @@ def script_examples():
     
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -75,7 +75,7 @@ def check_supported_idrac_version():
 
 def get_system_information():
     f=open("hw_inventory.txt","a")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -117,7 +117,7 @@ def get_system_information():
 
 def get_memory_information():
     f=open("hw_inventory.txt","a")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Memory' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response, members = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), '/redfish/v1/Systems/System.Embedded.1/Memory')
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -127,46 +127,40 @@ def get_memory_information():
         f.writelines(message)
         f.writelines("\n")
         print(message)
-    for i in data[u'Members']:
-        dimm = i[u'@odata.id'].split("/")[-1]
+    for sub_data in members:
+        dimm = sub_data[u'@odata.id'].split("/")[-1]
         try:
             dimm_slot = re.search("DIMM.+",dimm).group()
         except:
             print("\n- FAIL, unable to get dimm slot info")
             sys.exit()
-        response = requests.get('https://%s%s' % (idrac_ip, i[u'@odata.id']),verify=False,auth=(idrac_username, idrac_password))
-        sub_data = response.json()
-        if response.status_code != 200:
-            print("\n- FAIL, get command failed, error is: %s" % sub_data)
-            sys.exit()
-        else:
-            message = "\n- Memory details for %s -\n" % dimm_slot
-            f.writelines(message)
-            f.writelines("\n")
-            print(message)
-            for ii in sub_data.items():
-                if ii[0] == u'@odata.id' or ii[0] == u'@odata.context' or ii[0] == u'Metrics' or ii[0] == u'Links':
-                    pass
-                elif ii[0] == u'Oem':
-                    for iii in ii[1][u'Dell'][u'DellMemory'].items():
-                        if iii[0] == u'@odata.context' or iii[0] == u'@odata.type':
-                            pass
-                        else:
-                            message = "%s: %s" % (iii[0], iii[1])
-                            f.writelines(message)
-                            f.writelines("\n")
-                            print(message)
-                else:
-                    message = "%s: %s" % (ii[0], ii[1])
-                    f.writelines(message)
-                    f.writelines("\n")
-                    print(message)
+        message = "\n- Memory details for %s -\n" % dimm_slot
+        f.writelines(message)
+        f.writelines("\n")
+        print(message)
+        for ii in sub_data.items():
+            if ii[0] == u'@odata.id' or ii[0] == u'@odata.context' or ii[0] == u'Metrics' or ii[0] == u'Links':
+                pass
+            elif ii[0] == u'Oem':
+                for iii in ii[1][u'Dell'][u'DellMemory'].items():
+                    if iii[0] == u'@odata.context' or iii[0] == u'@odata.type':
+                        pass
+                    else:
+                        message = "%s: %s" % (iii[0], iii[1])
+                        f.writelines(message)
+                        f.writelines("\n")
+                        print(message)
+            else:
+                message = "%s: %s" % (ii[0], ii[1])
+                f.writelines(message)
+                f.writelines("\n")
+                print(message)
     f.close()
     
 
 def get_cpu_information():
     f=open("hw_inventory.txt","a")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Processors' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response, members = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), '/redfish/v1/Systems/System.Embedded.1/Processors')
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -176,41 +170,35 @@ def get_cpu_information():
         f.writelines(message)
         f.writelines("\n")
         print(message)
-    for i in data[u'Members']:
-        cpu = i[u'@odata.id'].split("/")[-1]
-        response = requests.get('https://%s%s' % (idrac_ip, i[u'@odata.id']),verify=False,auth=(idrac_username, idrac_password))
-        sub_data = response.json()
-        if response.status_code != 200:
-            print("\n- FAIL, get command failed, error is: %s" % sub_data)
-            sys.exit()
-        else:
-            message = "\n- Processor details for %s -\n" % cpu
-            f.writelines(message)
-            f.writelines("\n")
-            print(message)
-            for ii in sub_data.items():
-                if ii[0] == u'@odata.id' or ii[0] == u'@odata.context' or ii[0] == u'Metrics' or ii[0] == u'Links' or ii[0] == u'Description' or ii[0] == u'@odata.type':
-                    pass
-                elif ii[0] == u'Oem':
-                    for iii in ii[1][u'Dell'][u'DellProcessor'].items():
-                        if iii[0] == u'@odata.context' or iii[0] == u'@odata.type':
-                            pass
-                        else:
-                            message = "%s: %s" % (iii[0], iii[1])
-                            f.writelines(message)
-                            f.writelines("\n")
-                            print(message)
-                else:
-                    message = "%s: %s" % (ii[0], ii[1])
-                    f.writelines(message)
-                    f.writelines("\n")
-                    print(message)
+    for sub_data in members:
+        cpu = sub_data[u'@odata.id'].split("/")[-1]
+        message = "\n- Processor details for %s -\n" % cpu
+        f.writelines(message)
+        f.writelines("\n")
+        print(message)
+        for ii in sub_data.items():
+            if ii[0] == u'@odata.id' or ii[0] == u'@odata.context' or ii[0] == u'Metrics' or ii[0] == u'Links' or ii[0] == u'Description' or ii[0] == u'@odata.type':
+                pass
+            elif ii[0] == u'Oem':
+                for iii in ii[1][u'Dell'][u'DellProcessor'].items():
+                    if iii[0] == u'@odata.context' or iii[0] == u'@odata.type':
+                        pass
+                    else:
+                        message = "%s: %s" % (iii[0], iii[1])
+                        f.writelines(message)
+                        f.writelines("\n")
+                        print(message)
+            else:
+                message = "%s: %s" % (ii[0], ii[1])
+                f.writelines(message)
+                f.writelines("\n")
+                print(message)
     f.close()
     
 
 def get_fan_information():
     f=open("hw_inventory.txt","a")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -224,8 +212,10 @@ def get_fan_information():
         print("- WARNING, no fans detected for system")
         
     else:
+        fan_uris = [i[u'@odata.id'] for i in data[u'Links'][u'CooledBy']]
+        fan_responses = dict(zip(fan_uris, RedfishCollection.get_many(idrac_ip, (idrac_username, idrac_password), fan_uris)))
         for i in data[u'Links'][u'CooledBy']:
-            response = requests.get('https://%s%s' % (idrac_ip, i[u'@odata.id']),verify=False,auth=(idrac_username, idrac_password))
+            response = fan_responses[i[u'@odata.id']]
             data = response.json()
             if response.status_code != 200:
                 print("\n- FAIL, get command failed, error is: %s" % data)
@@ -256,7 +246,7 @@ def get_fan_information():
 
 def get_ps_information():
     f=open("hw_inventory.txt","a")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -270,8 +260,10 @@ def get_ps_information():
         print("- WARNING, no power supplies detected for system")
         
     else:
+        ps_uris = [i[u'@odata.id'] for i in data[u'Links'][u'PoweredBy']]
+        ps_responses = dict(zip(ps_uris, RedfishCollection.get_many(idrac_ip, (idrac_username, idrac_password), ps_uris)))
         for i in data[u'Links'][u'PoweredBy']:
-            response = requests.get('https://%s%s' % (idrac_ip, i[u'@odata.id']),verify=False,auth=(idrac_username, idrac_password))
+            response = ps_responses[i[u'@odata.id']]
             data = response.json()
             if response.status_code != 200:
                 print("\n- FAIL, get command failed, error is: %s" % data)
@@ -312,7 +304,7 @@ def get_ps_information():
 def get_storage_controller_information():
     f=open("hw_inventory.txt","a")
     global controller_list
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -324,8 +316,10 @@ def get_storage_controller_information():
     controller_list=[]
     for i in data[u'Members']:
         controller_list.append(i[u'@odata.id'][46:])
+    controller_uris = ['/redfish/v1/Systems/System.Embedded.1/Storage/%s' % i for i in controller_list]
+    controller_responses = dict(zip(controller_list, RedfishCollection.get_many(idrac_ip, (idrac_username, idrac_password), controller_uris)))
     for i in controller_list:
-        response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+        response = controller_responses[i]
         data = response.json()
         if response.status_code != 200:
             print("\n- FAIL, get command failed, error is: %s" % data)
@@ -357,7 +351,7 @@ def get_storage_controller_information():
 def get_storage_disks_information():
     f=open("hw_inventory.txt","a")
     for i in controller_list:
-        response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+        response, drives = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), '/redfish/v1/Systems/System.Embedded.1/Storage/%s' % i, u'Drives')
         data = response.json()
         if response.status_code != 200:
             print("\n- FAIL, get command failed, error is: %s" % data)
@@ -376,12 +370,9 @@ def get_storage_disks_information():
             pass
             for ii in data[u'Drives']:
                 drive_list.append(ii[u'@odata.id'][53:])        
+        drive_data = dict(zip(drive_list, drives))
         for iii in drive_list:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/Drives/%s' % (idrac_ip, iii),verify=False,auth=(idrac_username, idrac_password))
-            data = response.json()
-            if response.status_code != 200:
-                print("\n- FAIL, get command failed, error is: %s" % data)
-                sys.exit()  
+            data = drive_data[iii]
             message = "\n- Detailed drive information for %s -\n" % iii
             f.writelines(message)
             f.writelines("\n")
@@ -411,7 +402,7 @@ def get_storage_disks_information():
                 
 def get_backplane_information():
     f=open("hw_inventory.txt","a")
-    response = requests.get('https://%s/redfish/v1/Chassis' % (idrac_ip),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Chassis' % (idrac_ip),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -431,8 +422,9 @@ def get_backplane_information():
         f.writelines("\n")
         print(message)
         sys.exit()
+    backplane_responses = dict(zip(backplane_URI_list, RedfishCollection.get_many(idrac_ip, (idrac_username, idrac_password), backplane_URI_list)))
     for i in backplane_URI_list:
-        response = requests.get('https://%s%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+        response = backplane_responses[i]
         data = response.json()
         message = "\n- Detailed backplane information for %s -\n" % i.split("/")[-1]
         f.writelines(message)
@@ -451,7 +443,7 @@ def get_backplane_information():
 
 def get_network_information():
     f=open("hw_inventory.txt","a")
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/NetworkInterfaces' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/NetworkInterfaces' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- FAIL, get command failed, error is: %s" % data)
@@ -469,30 +461,32 @@ def get_network_information():
         f.writelines(message)
         f.writelines("\n")
         print(message)
+    response, adapters = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), '/redfish/v1/Systems/System.Embedded.1/NetworkAdapters')
+    if response.status_code != 200:
+        print("\n- FAIL, get command failed, error is: %s" % response.json())
+        sys.exit()
+    adapter_data = dict((i[u'@odata.id'], i) for i in adapters)
     for i in network_URI_list:
         message = "\n- Network device details for %s -\n" % i.split("/")[-1]
         f.writelines(message)
         f.writelines("\n")
         print(message)
         i=i.replace("Interfaces","Adapters")
-        response = requests.get('https://%s%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
-        data = response.json()
-        if response.status_code != 200:
-            print("\n- FAIL, get command failed, error is: %s" % data)
-            sys.exit()
+        data = adapter_data[i]
         for ii in data.items():
             if ii[0] == u'NetworkPorts':
                 network_port_urls = []
                 url_port = ii[1][u'@odata.id']
-                response = requests.get('https://%s%s' % (idrac_ip, url_port),verify=False,auth=(idrac_username, idrac_password))
+                response, ports = RedfishCollection.get_collection(idrac_ip, (idrac_username, idrac_password), url_port)
                 data = response.json()
                 if response.status_code != 200:
                     print("\n- FAIL, get command failed, error is: %s" % data)
                     sys.exit()
                 else:
                     port_uri_list = []
-                    for i in data[u'Members']:
+                    for i in ports:
                         port_uri_list.append(i[u'@odata.id'])
+                    port_data = dict(zip(port_uri_list, ports))
             if ii[0] == u'@odata.id' or ii[0] == u'@odata.context' or ii[0] == u'Metrics' or ii[0] == u'Links' or ii[0] == u'@odata.type' or ii[0] == u'NetworkDeviceFunctions' or ii[0] == u'NetworkPorts':
                 pass
             elif ii[0] == "Controllers":
@@ -509,36 +503,31 @@ def get_network_information():
                 f.writelines("\n")
                 print(message)
         for z in port_uri_list:
-            response = requests.get('https://%s%s' % (idrac_ip, z),verify=False,auth=(idrac_username, idrac_password))
-            data = response.json()
-            if response.status_code != 200:
-                print("\n- FAIL, get command failed, error is: %s" % data)
-                sys.exit()
-            else:
-                message = "\n- Network port details for %s -\n" % z.split("/")[-1]
-                f.writelines(message)
-                f.writelines("\n")
-                print(message)
-                for ii in data.items():
-                    if ii[0] == u'@odata.id' or ii[0] == u'@odata.context' or ii[0] == u'Metrics' or ii[0] == u'Links' or ii[0] == u'@odata.type':
+            data = port_data[z]
+            message = "\n- Network port details for %s -\n" % z.split("/")[-1]
+            f.writelines(message)
+            f.writelines("\n")
+            print(message)
+            for ii in data.items():
+                if ii[0] == u'@odata.id' or ii[0] == u'@odata.context' or ii[0] == u'Metrics' or ii[0] == u'Links' or ii[0] == u'@odata.type':
+                    pass
+                elif ii[0] == u'Oem':
+                    try:
+                        for iii in ii[1][u'Dell'][u'DellSwitchConnection'].items():
+                            if iii[0] == u'@odata.context' or iii[0] == u'@odata.type':
+                                pass
+                            else:
+                                message = "%s: %s" % (iii[0], iii[1])
+                                f.writelines(message)
+                                f.writelines("\n")
+                                print(message)
+                    except:
                         pass
-                    elif ii[0] == u'Oem':
-                        try:
-                            for iii in ii[1][u'Dell'][u'DellSwitchConnection'].items():
-                                if iii[0] == u'@odata.context' or iii[0] == u'@odata.type':
-                                    pass
-                                else:
-                                    message = "%s: %s" % (iii[0], iii[1])
-                                    f.writelines(message)
-                                    f.writelines("\n")
-                                    print(message)
-                        except:
-                            pass
-                    else:
-                        message = "%s: %s" % (ii[0], ii[1])
-                        f.writelines(message)
-                        f.writelines("\n")
-                        print(message)
+                else:
+                    message = "%s: %s" % (ii[0], ii[1])
+                    f.writelines(message)
+                    f.writelines("\n")
+                    print(message)
     f.close()
                 
             
@@ -14,7 +14,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, warnings, argparse
 
 from datetime import datetime
 
@@ -59,7 +59,7 @@ if args["e"]:
 
 payload["ImportBuffer"]=xml_string
 headers = {'content-type': 'application/json'}
-response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username, idrac_password))
+response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username, idrac_password))
 
 #print('\n- Response status code is: %s' % response.status_code)
 
@@ -86,18 +86,25 @@ job_id=re.search("JID_.+",job_id).group()
 
 
 start_time=datetime.now()
+job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+job = None
 while True:
-    req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-    statusCode = req.status_code
-    data = req.json()
+    try:
+        job = job_watcher.wait_for_change(job_id, job, timeout=60, interval=3)
+    except RedfishJobWatcher.JobWatchError as error:
+        print("Query job ID command failed, error code is: %s" % error.status_code)
+        sys.exit()
     current_time=(datetime.now()-start_time)
-    if statusCode == 202 or statusCode == 200:
-        pass
-        time.sleep(3)
-    else:
-        print("Query job ID command failed, error code is: %s" % statusCode)
+    if not RedfishJobState.finished(job):
+        print("- WARNING, JobStatus not completed, current status: \"%s\", percent complete: \"%s\"" % (job[u'Message'],job[u'PercentComplete']))
+        continue
+    # The config results are only in the messages of the task
+    req = RedfishTransport.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
+    if req.status_code != 200:
+        print("Query job ID command failed, error code is: %s" % req.status_code)
         sys.exit()
-    if "failed" in data[u'Oem'][u'Dell'][u'Message'] or "completed with errors" in data[u'Oem'][u'Dell'][u'Message'] or "Not one" in data[u'Oem'][u'Dell'][u'Message'] or "not compliant" in data[u'Oem'][u'Dell'][u'Message'] or "Unable" in data[u'Oem'][u'Dell'][u'Message'] or "The system could not be shut down" in data[u'Oem'][u'Dell'][u'Message'] or "No device configuration" in data[u'Oem'][u'Dell'][u'Message']:
+    data = req.json()
+    if not RedfishJobState.succeeded(job):
         print("- FAIL, Job ID %s marked as %s but detected issue(s). See detailed job results below for more information on failure\n" % (job_id, data[u'Oem'][u'Dell'][u'JobState']))
         print("- Detailed job results for job ID %s\n" % job_id)
         for i in data['Oem']['Dell'].items():
@@ -112,13 +119,19 @@ while True:
                     else:
                         pass
         sys.exit()
-    elif "No reboot Server" in data[u'Oem'][u'Dell'][u'Message']:
+    elif "No reboot Server" in job[u'Message']:
         print("- PASS, job ID %s successfully marked completed. NoReboot value detected and config changes will not be applied until next manual server reboot\n" % job_id)
         print("\n- Detailed job results for job ID %s\n" % job_id)
         for i in data['Oem']['Dell'].items():
             print("%s: %s" % (i[0], i[1]))
         sys.exit()
-    elif "Successfully imported" in data[u'Oem'][u'Dell'][u'Message'] or "completed with errors" in data[u'Oem'][u'Dell'][u'Message'] or "Successfully imported" in data[u'Oem'][u'Dell'][u'Message']:
+    elif "No changes" in job[u'Message'] or "No configuration changes" in job[u'Message']:
+        print("\n- PASS, job ID %s marked completed\n" % job_id)
+        print("- Detailed job results for job ID %s\n" % job_id)
+        for i in data['Oem']['Dell'].items():
+            print("%s: %s" % (i[0], i[1]))
+        sys.exit()
+    else:
         print("- PASS, job ID %s successfully marked completed\n" % job_id)
         print("- Detailed job results for job ID %s\n" % job_id)
         for i in data['Oem']['Dell'].items():
@@ -135,15 +148,4 @@ while True:
                         pass
 
         sys.exit()
-    elif "No changes" in data[u'Oem'][u'Dell'][u'Message'] or "No configuration changes" in data[u'Oem'][u'Dell'][u'Message']:
-        print("\n- PASS, job ID %s marked completed\n" % job_id)
-        print("- Detailed job results for job ID %s\n" % job_id)
-        for i in data['Oem']['Dell'].items():
-            print("%s: %s" % (i[0], i[1]))
-        sys.exit()
-    else:
-        print("- WARNING, JobStatus not completed, current status: \"%s\", percent complete: \"%s\"" % (data[u'Oem'][u'Dell'][u'Message'],data[u'Oem'][u'Dell'][u'PercentComplete']))
-        time.sleep(1)
-        continue
-    
 
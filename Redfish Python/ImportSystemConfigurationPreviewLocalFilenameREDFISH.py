@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, re, sys, time, warnings, argparse
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, re, sys, warnings, argparse
 
 from datetime import datetime
 
@@ -55,7 +55,7 @@ payload = {"ImportBuffer":"","ShareParameters":{"Target":"ALL"}}
 
 payload["ImportBuffer"]=xml_string
 headers = {'content-type': 'application/json'}
-response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username, idrac_password))
+response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username, idrac_password))
 
 d=str(response.__dict__)
 
@@ -77,30 +77,44 @@ response_output=response.__dict__
 job_id=response_output["headers"]["Location"]
 job_id=re.search("JID_.+",job_id).group()
 start_time=datetime.now()
-
+job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+job = None
 while True:
-    req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-    statusCode = req.status_code
-    data = req.json()
-    message_string=data[u"Messages"]
-    final_message_string=str(message_string)
+    try:
+        job = job_watcher.wait_for_change(job_id, job, timeout=60, interval=3)
+    except RedfishJobWatcher.JobWatchError as error:
+        print("Query job ID command failed, error code is: %s" % error.status_code)
+        sys.exit()
     current_time=(datetime.now()-start_time)
-    if statusCode == 202 or statusCode == 200:
-        pass
-        time.sleep(3)
-    else:
-        print("Query job ID command failed, error code is: %s" % statusCode)
+    if not RedfishJobState.finished(job):
+        print("- WARNING, JobStatus not completed, current status: \"%s\", percent complete: \"%s\"" % (job[u'Message'],job[u'PercentComplete']))
+        continue
+    # The config results are only in the messages of the task
+    req = RedfishTransport.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
+    if req.status_code != 200:
+        print("Query job ID command failed, error code is: %s" % req.status_code)
         sys.exit()
-    if "failed" in final_message_string or "completed with errors" in final_message_string or "Not one" in final_message_string or "not compliant" in final_message_string or "Unable to complete" in final_message_string or "The system could not be shut down" in final_message_string or "timed out" in final_message_string:
+    data = req.json()
+    message_string=data[u"Messages"]
+    if not RedfishJobState.succeeded(job):
         print("\n- FAIL, detailed job message is: %s" % data[u"Messages"])
         sys.exit()
-    elif "No reboot Server" in final_message_string:
+    elif "No reboot Server" in job[u'Message']:
         try:
             print("- Message = "+message_string[0][u"Message"])
         except:
             print("- Message = %s" % message_string[len(message_string)-1][u"Message"])
         sys.exit()
-    elif "Successfully imported" in final_message_string or "completed with errors" in final_message_string or "Successfully previewed" in final_message_string or data[u"TaskState"] == "Completed":
+    elif "No changes" in job[u'Message'] or "No configuration changes" in job[u'Message']:
+        print("- Job ID = "+data[u"Id"])
+        print("- Name = "+data[u"Name"])
+        try:
+            print("- Message = "+message_string[0][u"Message"])
+        except:
+            print("- Message = %s" % message_string[len(message_string)-1][u"Message"])
+        print("\n- %s completed in: %s" % (job_id, str(current_time)[0:7]))
+        sys.exit()
+    else:
         print("- PASS, job ID %s successfully marked completed\n" % job_id)
         print("\n- Detailed job results for job ID %s\n" % job_id)
         for i in data['Oem']['Dell'].items():
@@ -111,26 +125,4 @@ while True:
             for ii in i.items():
                 print("%s: %s" % (ii[0], ii[1]))
         sys.exit()
-    elif "No changes" in final_message_string or "No configuration changes" in final_message_string:
-        print("- Job ID = "+data[u"Id"])
-        print("- Name = "+data[u"Name"])
-        try:
-            print("- Message = "+message_string[0][u"Message"])
-        except:
-            print("- Message = %s" % message_string[len(message_string)-1][u"Message"])
-        print("\n- %s completed in: %s" % (job_id, str(current_time)[0:7]))
-        sys.exit()
-    else:
-        print("- Job not marked completed, current status is: %s" % data[u"TaskState"])
-        print("- Message: %s\n" % message_string[0][u"Message"])
-        time.sleep(1)
-        continue
-        
-
-
-    
-
-
-
-
 
@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -40,7 +40,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/VirtualMedia/CD' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/VirtualMedia/CD' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     try:
         data = response.json()
     except:
@@ -59,7 +59,7 @@ def check_supported_idrac_version():
 
 def get_virtual_media_info():
     virtual_media_uris = []
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/VirtualMedia' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/VirtualMedia' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     print("\n - Virtual Media URIs detected \n")
     for i in data[u'Members']:
@@ -68,7 +68,7 @@ def get_virtual_media_info():
             virtual_media_uris.append(ii[1])
     for i in virtual_media_uris:
         print("\n- Detailed information for URI \"%s\" \n" % i)
-        response = requests.get('https://%s%s' % (idrac_ip, i),verify=False,auth=(idrac_username,idrac_password))
+        response = RedfishTransport.get('https://%s%s' % (idrac_ip, i),verify=False,auth=(idrac_username,idrac_password))
         data = response.json()
         for i in data.items():
             if "@odata" in i[0] or "Actions" in i[0]:
@@ -90,7 +90,7 @@ def insert_virtual_media():
     print("\n - WARNING, insert(attached) \"%s\" virtual media device \"%s\"" % (media_device, args["i"]))
     payload = {'Image': args["i"], 'Inserted':True,'WriteProtected':True}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
     data = response.__dict__
     if response.status_code != 204:
         print("\n- FAIL, POST command InsertMedia action failed, detailed error message: %s" % response._content)
@@ -111,7 +111,7 @@ def eject_virtual_media():
     print("\n - WARNING, eject(unattached) \"%s\" virtual media device" % (media_device))
     payload = {}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
     data = response.__dict__
     if response.status_code != 204:
         print("\n- FAIL, POST command EjectMedia action failed, detailed error message: %s" % response._content)
@@ -127,7 +127,7 @@ def validate_media_status():
     elif args["d"] == "2":
         url = "/redfish/v1/Managers/iDRAC.Embedded.1/VirtualMedia/RemovableDisk"
         media_device = "Removable Disk"
-    response = requests.get('https://%s%s' % (idrac_ip, url),verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s%s' % (idrac_ip, url),verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     attach_status = data["Inserted"]
     if args["o"] == "1":
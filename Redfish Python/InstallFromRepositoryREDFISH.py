@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse, os
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, argparse, os
 
 from datetime import datetime
 
@@ -49,7 +49,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellSoftwareInstallationService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellSoftwareInstallationService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -63,7 +63,7 @@ def script_examples():
 
 def get_FW_inventory():
     print("\n- WARNING, current devices detected with firmware version and updateable status -\n")
-    req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/UpdateService/FirmwareInventory/' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False, cache=True)
     statusCode = req.status_code
     data = req.json()
     installed_devices=[]
@@ -72,7 +72,7 @@ def get_FW_inventory():
             if "Installed" in ii[1]:
                 installed_devices.append(ii[1])
     for i in installed_devices:
-        req = requests.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s%s' % (idrac_ip, i), auth=(idrac_username, idrac_password), verify=False)
         statusCode = req.status_code
         data = req.json()
         updateable_status = data[u'Updateable']
@@ -94,7 +94,7 @@ def get_repo_based_update_list():
     headers = {'content-type': 'application/json'}
    
     payload={}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 200:
         print("\n-PASS: POST command passed to get repo update list, status code 200 returned")
@@ -113,7 +113,7 @@ def get_repo_based_update_list():
 def install_from_repository():
     global current_jobstore_job_ids
     global repo_job_id
-    req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
     statusCode = req.status_code
     data = req.json()
     data = str(data)
@@ -159,7 +159,7 @@ def install_from_repository():
         else:
             print("%s: %s" % (i[0],i[1]))
     
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 202:
         print("\n- PASS: POST command passed for method \"%s\", status code %s returned" % (method, response.status_code))
@@ -178,7 +178,7 @@ def get_update_job_ids():
     headers = {'content-type': 'application/json'}
    
     payload={}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 200:
         pass
@@ -191,7 +191,7 @@ def get_update_job_ids():
             data = response.json()
             print("\n-POST command failure results:\n %s" % data)
             sys.exit()
-    req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
+    req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs' % (idrac_ip), auth=(idrac_username, idrac_password), verify=False)
     statusCode = req.status_code
     data = req.json()
     data = str(data)
@@ -215,27 +215,26 @@ def get_update_job_ids():
 
 def loop_job_status(x):
     start_time=datetime.now()
+    deadline = RedfishJobState.deadline(2 * 60 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, x), auth=(idrac_username, idrac_password), verify=False)
-        current_time=str((datetime.now()-start_time))[0:7]
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(x, data, timeout=60, interval=5)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "2:00:00":
+        current_time=str((datetime.now()-start_time))[0:7]
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 2 hours has been reached, script stopped\n")
             sys.exit()
-        elif "Fail" in data[u'Message'] or "fail" in data[u'Message'] or "invalid" in data[u'Message'] or "unable" in data[u'Message'] or "Unable" in data[u'Message'] or "not" in data[u'Message'] or "cancel" in data[u'Message'] or "Cancel" in data[u'Message']:
-            print("- FAIL: Job ID %s failed, detailed error message is: %s" % (x, data[u'Message']))
-            sys.exit()
         elif data[u'Message'] == "Job for this device is already present.":
             break
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
+            print("- FAIL: Job ID %s failed, detailed error message is: %s" % (x, data[u'Message']))
+            sys.exit()
         
-        elif "completed successfully" in data[u'Message']:
+        elif RedfishJobState.succeeded(data):
             print("\n- PASS, job ID %s successfully marked completed" % x)
             print("\n- Final detailed job results -\n")
             for i in data.items():
@@ -252,12 +251,11 @@ def loop_job_status(x):
                 break
         else:
             print("- WARNING, Job ID %s not marked completed, current status: \"%s\", job polling time: \"%s\"" % (x, data[u'Message'], current_time))
-            time.sleep(5)
 
 def check_schedule_update_job():
     count = 0
     for x in new_job_ids:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, x), auth=(idrac_username, idrac_password), verify=False)
+        req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, x), auth=(idrac_username, idrac_password), verify=False)
         statusCode = req.status_code
         if statusCode == 200:
             pass
@@ -275,7 +273,7 @@ def check_schedule_update_job():
         print("\n- WARNING, scheduled update job ID detected but \"RebootNeeded\" = False or RebootNeeded argument not passed in. Scheduled update jobs will not be applied until next manual server reboot")
         print("\n- Current update jobs created for repo update -\n")
         for x in new_job_ids:
-            req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, x), auth=(idrac_username, idrac_password), verify=False)
+            req = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, x), auth=(idrac_username, idrac_password), verify=False)
             data = req.json()
             print("Job ID: %s, Job Name: %s, Job Message: %s" % (x,data[u'Name'],data[u'Message']))
         sys.exit()
@@ -297,6 +295,8 @@ if __name__ == "__main__":
         loop_job_status(repo_job_id)
         get_update_job_ids()
         check_schedule_update_job()
+        # Every update job is read by the same poll while the script waits on them one after the other
+        RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password)).watch(new_job_ids)
         for i in new_job_ids:
             loop_job_status(i)
     else:
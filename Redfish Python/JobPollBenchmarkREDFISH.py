@@ -0,0 +1,99 @@
+#
+# JobPollBenchmarkREDFISH. Python script comparing job status polling at a fixed interval with the polls planned from the job history of
+# RedfishJobHistory, in requests per job and detection lag.
+#
+# NOTE: The benchmark is a simulation, no iDRAC is needed. Each simulated job stays in its JobState for a duration read from a job history file
+# (-f, durations of all keys or of the keys containing -k) or generated (-g, log-normal around -m seconds). For each poll interval (-i) the job
+# is polled at the fixed interval like the script loops do (first poll right away, then every interval) and with RedfishJobHistory.next_poll_delay()
+# learning from the jobs simulated before it, the same way RedfishJobWatcher records durations (half way between the last two polls).
+#
+# NOTE: Requests per job is the number of job status GETs until the change was seen, detection lag the time between the change and the poll
+# which saw it. The first MIN_SAMPLES jobs of the history method are polled at the fixed interval, as they are with an empty history file.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishJobHistory, json, sys, math, random, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+parser=argparse.ArgumentParser(description="Python script comparing job status polling at a fixed interval with polls planned from the job history, requests per job and detection lag")
+parser.add_argument('script_examples',action="store_true",help='JobPollBenchmarkREDFISH.py -g 500, this example will simulate 500 jobs of about 300 seconds polled every 1, 5 and 20 seconds. JobPollBenchmarkREDFISH.py -f job_history.json -k FirmwareUpdate -i 20, this example will replay the firmware update job durations of a job history file polled every 20 seconds.')
+parser.add_argument('-f', help='Job history file to read the job durations from, see RedfishJobHistory', required=False)
+parser.add_argument('-k', help='Only use the durations of job history keys containing this string, default is every key', required=False)
+parser.add_argument('-g', help='Simulate this many jobs with generated durations instead of a job history file', required=False)
+parser.add_argument('-m', help='Median duration in seconds of the generated jobs, default is 300', required=False, default="300")
+parser.add_argument('-s', help='Spread (sigma of the log-normal distribution) of the generated job durations, default is 0.3', required=False, default="0.3")
+parser.add_argument('-n', help='Number of jobs simulated with -f, drawn from the durations of the file. Default is 500', required=False, default="500")
+parser.add_argument('-i', help='Poll intervals in seconds to compare, pass in a comma separated list. Default is 1,5,20', required=False, default="1,5,20")
+parser.add_argument('-sd', help='Random seed, pass in a number to get the same jobs on every run', required=False)
+
+args=vars(parser.parse_args())
+
+
+def fixed_polls(duration, interval):
+    # Returns (requests, lag): polls at 0, interval, 2 * interval ... until the first poll at or after the change
+    polls = int(math.ceil(duration / float(interval)))
+    return polls + 1, polls * interval - duration
+
+
+def history_polls(duration, interval, durations):
+    # Same as fixed_polls() with the delay between polls from next_poll_delay(), returns (requests, lag, recorded duration)
+    elapsed, previous, requests = 0.0, 0.0, 1
+    while elapsed < duration:
+        previous = elapsed
+        elapsed += RedfishJobHistory.next_poll_delay(durations, elapsed, interval)
+        requests += 1
+    return requests, elapsed - duration, (previous + elapsed) / 2.0
+
+
+def job_durations():
+    if args["g"]:
+        median, sigma = float(args["m"]), float(args["s"])
+        return [median * math.exp(random.gauss(0, sigma)) for i in range(int(args["g"]))]
+    try:
+        with open(args["f"]) as f:
+            history = json.load(f).get("durations", {})
+    except (IOError, ValueError) as error:
+        print("- FAIL, unable to read job history file \"%s\": %s" % (args["f"], error))
+        sys.exit()
+    samples = [seconds for key, values in history.items() if not args["k"] or args["k"] in key for seconds in values]
+    if not samples:
+        print("- FAIL, no job durations found in job history file \"%s\"%s" % (args["f"], " for keys containing \"%s\"" % args["k"] if args["k"] else ""))
+        sys.exit()
+    return [random.choice(samples) for i in range(int(args["n"]))]
+
+
+def benchmark():
+    if args["sd"]:
+        random.seed(int(args["sd"]))
+    jobs = job_durations()
+    print("- INFO, %s simulated job(s), duration median %.1f seconds, 10th percentile %.1f, 90th percentile %.1f\n" % (len(jobs), RedfishJobHistory.percentile(jobs, 50),
+          RedfishJobHistory.percentile(jobs, 10), RedfishJobHistory.percentile(jobs, 90)))
+    print("%-10s %-10s %14s %16s %16s" % ("Interval", "Method", "Requests/job", "Mean lag (s)", "p90 lag (s)"))
+    for interval in [float(i) for i in args["i"].split(",")]:
+        results = {"fixed": [], "history": []}
+        durations = []
+        for duration in jobs:
+            results["fixed"].append(fixed_polls(duration, interval))
+            requests, lag, recorded = history_polls(duration, interval, durations)
+            results["history"].append((requests, lag))
+            durations.append(round(recorded, 1))
+            del durations[:-RedfishJobHistory.MAX_SAMPLES]
+        for method in ("fixed", "history"):
+            requests = [i[0] for i in results[method]]
+            lags = [i[1] for i in results[method]]
+            print("%-10s %-10s %14.1f %16.1f %16.1f" % ("%g s" % interval, method, sum(requests) / float(len(requests)), sum(lags) / len(lags),
+                                                       RedfishJobHistory.percentile(lags, 90)))
+
+
+if __name__ == "__main__":
+    if not args["f"] and not args["g"]:
+        print("- FAIL, pass in -f with a job history file or -g to simulate generated jobs")
+        sys.exit()
+    benchmark()
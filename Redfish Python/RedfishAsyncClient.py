@@ -0,0 +1,99 @@
+#
+# RedfishAsyncClient. Python module using asyncio to GET Redfish collection members concurrently instead of one serial GET per member.
+#
+# NOTE: Each request is sent through RedfishTransport (pooled keep-alive connections, session auth) from a worker thread, asyncio schedules the
+# requests and caps how many are in flight against one iDRAC at the same time (default 8, set REDFISH_ASYNC_CONCURRENCY to change it).
+# Scripts which are not asyncio based use the get_many() / get_collection_members() helpers which run the event loop for them.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, asyncio, functools, os, threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_CONCURRENCY = int(os.environ.get("REDFISH_ASYNC_CONCURRENCY", "8"))
+MAX_WORKERS = int(os.environ.get("REDFISH_ASYNC_WORKERS", "64"))
+
+_lock = threading.Lock()
+_executor = None
+
+# asyncio.get_running_loop() is Python 3.7 and later, get_event_loop() returns the running loop as well inside a coroutine on older Python
+_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+def _get_executor():
+    # Shared by the event loops of every thread (fleet runs call get_many() from many threads), created once on first use
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        return _executor
+
+
+class RedfishAsyncClient(object):
+    """asyncio client for one iDRAC. At most max_concurrency requests from this client are in flight against the iDRAC at any time."""
+
+    def __init__(self, idrac_ip, auth, max_concurrency=None, scheme="https"):
+        self.idrac_ip = idrac_ip
+        self.auth = auth
+        self.scheme = scheme
+        self.max_concurrency = max_concurrency or MAX_CONCURRENCY
+        self._semaphore = None
+
+    def url(self, uri):
+        if uri.startswith("http"):
+            return uri
+        return "%s://%s%s" % (self.scheme, self.idrac_ip, uri)
+
+    async def request(self, method, uri, **kwargs):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        kwargs.setdefault("auth", self.auth)
+        kwargs.setdefault("verify", False)
+        call = functools.partial(RedfishTransport.request, method, self.url(uri), **kwargs)
+        async with self._semaphore:
+            return await _running_loop().run_in_executor(_get_executor(), call)
+
+    async def get(self, uri, **kwargs):
+        return await self.request("GET", uri, **kwargs)
+
+    async def get_many(self, uris, **kwargs):
+        """GET every URI concurrently, responses are returned in the same order as the URIs."""
+        return await asyncio.gather(*[self.get(uri, **kwargs) for uri in uris])
+
+    async def get_collection_members(self, collection_uri, **kwargs):
+        """GET a collection then all of its Members concurrently. Returns (collection response, list of member responses)."""
+        response = await self.get(collection_uri, **kwargs)
+        if response.status_code != 200:
+            return response, []
+        member_uris = [i[u'@odata.id'] for i in response.json().get(u'Members', [])]
+        return response, await self.get_many(member_uris, **kwargs)
+
+
+def run(coroutine):
+    """Run a coroutine to completion from synchronous script code."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def get_many(idrac_ip, auth, uris, max_concurrency=None, **kwargs):
+    """Synchronous helper, GET every URI on one iDRAC concurrently and return the responses in URI order."""
+    if not uris:
+        return []
+    client = RedfishAsyncClient(idrac_ip, auth, max_concurrency)
+    return run(client.get_many(list(uris), **kwargs))
+
+
+def get_collection_members(idrac_ip, auth, collection_uri, max_concurrency=None, **kwargs):
+    """Synchronous helper, GET a collection and all of its Members concurrently. Returns (collection response, list of member responses)."""
+    client = RedfishAsyncClient(idrac_ip, auth, max_concurrency)
+    return run(client.get_collection_members(collection_uri, **kwargs))
@@ -0,0 +1,211 @@
+#
+# RedfishAuth. Python module used by RedfishTransport to authenticate with an iDRAC X-Auth-Token session instead of HTTP basic auth on every request.
+#
+# NOTE: Set environment variable REDFISH_AUTH=session to enable session authentication for any script. The first request to an iDRAC POSTs to
+# /redfish/v1/Sessions, every following request reuses the returned X-Auth-Token and the session is deleted when the script exits.
+#
+# NOTE: Set REDFISH_TOKEN_CACHE=y (or to a directory path) to also keep the token in an encrypted on-disk cache so back to back script runs against the
+# same iDRAC skip the login. Cached tokens expire after REDFISH_TOKEN_CACHE_TTL seconds (default 600, keep it below the iDRAC session timeout).
+# The cache is encrypted with a key derived from the iDRAC password and requires the Python "cryptography" module, without it the cache is disabled.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import json, sys, os, time, threading, hashlib, base64
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+except ImportError:
+    Fernet = None
+    InvalidToken = ValueError
+
+AUTH_MODE = os.environ.get("REDFISH_AUTH", "basic").lower()
+TOKEN_CACHE = os.environ.get("REDFISH_TOKEN_CACHE", "")
+TOKEN_CACHE_TTL = int(os.environ.get("REDFISH_TOKEN_CACHE_TTL", "600"))
+
+_lock = threading.Lock()
+_key_locks = {}
+_sessions = {}
+_cache_warning_printed = False
+
+
+def set_auth_mode(mode):
+    """Select "basic" or "session" authentication for every request sent after this call."""
+    global AUTH_MODE
+    if mode not in ("basic", "session"):
+        raise ValueError("unsupported Redfish auth mode %r, supported values are basic and session" % mode)
+    AUTH_MODE = mode
+
+
+def session_auth_enabled():
+    return AUTH_MODE == "session"
+
+
+def _key_lock(key):
+    with _lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def _cache_dir():
+    if TOKEN_CACHE.lower() in ("", "n", "no", "0", "false"):
+        return None
+    if TOKEN_CACHE.lower() in ("y", "yes", "1", "true"):
+        return os.path.join(os.path.expanduser("~"), ".redfish_token_cache")
+    return TOKEN_CACHE
+
+
+def _cache_enabled():
+    global _cache_warning_printed
+    if _cache_dir() is None:
+        return False
+    if Fernet is None:
+        if not _cache_warning_printed:
+            sys.stderr.write("- WARNING, Python \"cryptography\" module is not installed, X-Auth-Token on-disk cache is disabled\n")
+            _cache_warning_printed = True
+        return False
+    return True
+
+
+def _cache_path(host, username):
+    name = hashlib.sha256(("%s|%s" % (host, username)).encode("utf-8")).hexdigest()
+    return os.path.join(_cache_dir(), name + ".json")
+
+
+def _fernet(password, salt):
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100000)
+    return Fernet(base64.urlsafe_b64encode(kdf.derive(password.encode("utf-8"))))
+
+
+def _load_cached(host, username, password):
+    """Return (entry, expired) for the cached session of this iDRAC user, entry is None when nothing usable is cached."""
+    try:
+        with open(_cache_path(host, username)) as f:
+            stored = json.load(f)
+        salt = base64.b64decode(stored["salt"])
+        entry = json.loads(_fernet(password, salt).decrypt(stored["data"].encode("ascii")).decode("utf-8"))
+    except (IOError, OSError, ValueError, KeyError, InvalidToken):
+        return None, False
+    return entry, entry["expires"] <= time.time()
+
+
+def _store_cached(host, username, password, entry):
+    cache_dir = _cache_dir()
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir, 0o700)
+        salt = os.urandom(16)
+        data = _fernet(password, salt).encrypt(json.dumps(entry).encode("utf-8")).decode("ascii")
+        path = _cache_path(host, username)
+        tmp_path = path + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"salt": base64.b64encode(salt).decode("ascii"), "data": data}, f)
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as error_message:
+        sys.stderr.write("- WARNING, unable to write X-Auth-Token cache file, detailed error: %s\n" % error_message)
+
+
+def _remove_cached(host, username):
+    try:
+        os.remove(_cache_path(host, username))
+    except (IOError, OSError):
+        pass
+
+
+def _login(session, scheme, host, username, password):
+    url = "%s://%s/redfish/v1/Sessions" % (scheme, host)
+    payload = {"UserName": username, "Password": password}
+    response = session.post(url, data=json.dumps(payload), headers={"content-type": "application/json"}, verify=False)
+    if response.status_code not in (200, 201) or "X-Auth-Token" not in response.headers:
+        raise RuntimeError("- FAIL, POST command to create iDRAC session failed, status code %s returned" % response.status_code)
+    location = response.headers.get("Location", "")
+    if location.startswith("http"):
+        location = "/" + location.split("/", 3)[3]
+    return {"token": response.headers["X-Auth-Token"], "location": location, "scheme": scheme, "expires": time.time() + TOKEN_CACHE_TTL}
+
+
+def _logout(session, host, entry):
+    if not entry.get("location"):
+        return
+    try:
+        session.delete("%s://%s%s" % (entry["scheme"], host, entry["location"]), headers={"X-Auth-Token": entry["token"]}, verify=False)
+    except Exception:
+        pass
+
+
+def get_token(session, scheme, host, username, password):
+    """Return the X-Auth-Token for this iDRAC user, logging in (or loading it from the on-disk cache) the first time it is needed."""
+    key = (host, username)
+    with _key_lock(key):
+        entry = _sessions.get(key)
+        if entry is not None:
+            return entry["token"]
+        if _cache_enabled():
+            entry, expired = _load_cached(host, username, password)
+            if entry is not None and expired:
+                _logout(session, host, entry)
+                _remove_cached(host, username)
+                entry = None
+        if entry is None:
+            entry = _login(session, scheme, host, username, password)
+            if _cache_enabled():
+                _store_cached(host, username, password, entry)
+        entry["session"] = session
+        _sessions[key] = entry
+        return entry["token"]
+
+
+def invalidate(host, username, token):
+    """Forget a token the iDRAC rejected with 401 so the next request logs in again."""
+    key = (host, username)
+    with _key_lock(key):
+        entry = _sessions.get(key)
+        if entry is not None and entry["token"] == token:
+            del _sessions[key]
+            if _cache_enabled():
+                _remove_cached(host, username)
+
+
+def apply(session, scheme, host, kwargs):
+    """Replace a basic auth=(username, password) keyword argument with the X-Auth-Token header. Returns (kwargs, username, token)."""
+    auth = kwargs.get("auth")
+    if not session_auth_enabled() or not isinstance(auth, tuple) or len(auth) != 2:
+        return kwargs, None, None
+    username, password = auth
+    token = get_token(session, scheme, host, username, password)
+    kwargs = dict(kwargs)
+    del kwargs["auth"]
+    headers = dict(kwargs.get("headers") or {})
+    headers["X-Auth-Token"] = token
+    kwargs["headers"] = headers
+    return kwargs, username, token
+
+
+def logout(host):
+    """Delete the sessions this process created on one iDRAC, used by fleet tooling once it is done with a host."""
+    with _lock:
+        items = [(key, entry) for key, entry in _sessions.items() if key[0] == host]
+        for key, entry in items:
+            del _sessions[key]
+    if _cache_enabled():
+        return
+    for (host, username), entry in items:
+        _logout(entry["session"], host, entry)
+
+
+def logout_all():
+    """Delete every iDRAC session this process created. Sessions kept in the on-disk cache are left open so the next run can reuse them."""
+    with _lock:
+        items = list(_sessions.items())
+        _sessions.clear()
+    if _cache_enabled():
+        return
+    for (host, username), entry in items:
+        _logout(entry["session"], host, entry)
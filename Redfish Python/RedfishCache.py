@@ -0,0 +1,138 @@
+#
+# RedfishCache. Python module used by RedfishTransport to keep a persistent ETag cache of large, rarely changing Redfish resources.
+#
+# NOTE: GET requests sent with cache=True (for example Bios/BiosRegistry, the manager attribute registry, PrivilegeRegistry or FirmwareInventory)
+# are stored with the ETag returned by the iDRAC. The next GET for the same iDRAC and URI sends If-None-Match and a 304 Not Modified answer is
+# served from the cache, so the document is only downloaded again when it changed.
+#
+# NOTE: The cache is a SQLite file, default is ".redfish_http_cache.sqlite" in the user home directory. Set REDFISH_HTTP_CACHE to another file path
+# to move it or to "n" to disable it. REDFISH_HTTP_CACHE_MAX_MB caps the cache size (default 256), least recently used entries are evicted first.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import json, os, sqlite3, threading, time
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+HTTP_CACHE = os.environ.get("REDFISH_HTTP_CACHE", "y")
+MAX_BYTES = int(float(os.environ.get("REDFISH_HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+_lock = threading.Lock()
+_connection = None
+_stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "bytes_saved": 0}
+
+
+def cache_path():
+    if HTTP_CACHE.lower() in ("n", "no", "0", "false"):
+        return None
+    if HTTP_CACHE.lower() in ("", "y", "yes", "1", "true"):
+        return os.path.join(os.path.expanduser("~"), ".redfish_http_cache.sqlite")
+    return HTTP_CACHE
+
+
+def enabled():
+    return cache_path() is not None
+
+
+def _db():
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(cache_path(), timeout=30, check_same_thread=False)
+        _connection.execute("CREATE TABLE IF NOT EXISTS entries (host TEXT, uri TEXT, etag TEXT, headers TEXT, body BLOB, size INTEGER, last_used REAL, PRIMARY KEY (host, uri))")
+        _connection.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        _evict(_connection)
+        _connection.commit()
+    return _connection
+
+
+def _evict(db):
+    # Drop least recently used entries until the cache fits under the size cap, caller holds _lock
+    total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    while total > MAX_BYTES:
+        row = db.execute("SELECT host, uri, size FROM entries ORDER BY last_used LIMIT 1").fetchone()
+        if row is None:
+            break
+        db.execute("DELETE FROM entries WHERE host = ? AND uri = ?", (row[0], row[1]))
+        _stats["evicted"] += 1
+        total -= row[2]
+
+
+def lookup(host, uri):
+    """Return the cached entry dict (etag, headers, body) for this iDRAC URI, or None."""
+    with _lock:
+        row = _db().execute("SELECT etag, headers, body FROM entries WHERE host = ? AND uri = ?", (host, uri)).fetchone()
+    if row is None:
+        return None
+    return {"etag": row[0], "headers": json.loads(row[1]), "body": bytes(row[2])}
+
+
+def entry_from_response(response):
+    """Return the cache entry dict (etag, headers, body) of a 200 GET response, None when the response has no ETag."""
+    etag = response.headers.get("ETag")
+    if not etag:
+        return None
+    headers = dict((key, value) for key, value in response.headers.items() if key.lower() not in ("content-encoding", "content-length", "transfer-encoding"))
+    return {"etag": etag, "headers": headers, "body": response.content}
+
+
+def response_from_entry(entry, not_modified):
+    """Build a 200 response from a cache entry and the 304 Not Modified response of the revalidation request."""
+    response = Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["body"]
+    response.url = not_modified.url
+    response.request = not_modified.request
+    response.elapsed = not_modified.elapsed
+    response.encoding = "utf-8"
+    response.from_cache = True
+    return response
+
+
+def store(host, uri, response):
+    """Count a cache miss and store the 200 GET response when it carries an ETag, evicting least recently used entries above the size cap."""
+    with _lock:
+        _stats["misses"] += 1
+    entry = entry_from_response(response)
+    if entry is None or len(entry["body"]) > MAX_BYTES:
+        return
+    with _lock:
+        db = _db()
+        db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", (host, uri, entry["etag"], json.dumps(entry["headers"]), sqlite3.Binary(entry["body"]),
+                                                                                 len(entry["body"]), time.time()))
+        _stats["stored"] += 1
+        _evict(db)
+        db.commit()
+
+
+def cached_response(host, uri, entry, not_modified):
+    """Build the response returned to the script from a cached entry after the iDRAC answered 304 Not Modified."""
+    with _lock:
+        db = _db()
+        db.execute("UPDATE entries SET last_used = ? WHERE host = ? AND uri = ?", (time.time(), host, uri))
+        db.commit()
+        _stats["hits"] += 1
+        _stats["bytes_saved"] += len(entry["body"])
+    return response_from_entry(entry, not_modified)
+
+
+def stats():
+    with _lock:
+        result = dict(_stats)
+    lookups = result["hits"] + result["misses"]
+    result["hit_ratio"] = float(result["hits"]) / lookups if lookups else 0.0
+    return result
+
+
+def clear():
+    with _lock:
+        _db().execute("DELETE FROM entries")
+        _db().commit()
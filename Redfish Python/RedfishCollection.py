@@ -0,0 +1,133 @@
+#
+# RedfishCollection. Python module to read a Redfish collection and all of its members, using OData $expand to get everything in one GET.
+#
+# NOTE: The collection is first requested with ?$expand=*($levels=1). When the iDRAC rejects $expand (older iDRAC firmware), or returns members
+# which were not inlined, the missing members are fetched with concurrent per-member GETs using RedfishAsyncClient. An iDRAC which rejected
+# $expand once is remembered for the rest of the script so later collections go straight to the per-member GETs.
+#
+# NOTE: RedfishAsyncClient needs Python 3.5 or later (asyncio, async def), it is only imported when members have to be fetched. On older Python
+# get_many() sends the GETs from a few threads instead, at most REDFISH_ASYNC_CONCURRENCY at the same time as well.
+#
+# NOTE: Besides "Members" of a collection, any array of links in a resource can be read the same way by passing in member_property, for example the
+# "Drives" array of a Storage controller, "PCIeDevices" of a ComputerSystem or "Assemblies" of the Chassis Assembly resource.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, os, threading
+
+EXPAND_QUERY = "$expand=*($levels=1)"
+MAX_CONCURRENCY = int(os.environ.get("REDFISH_ASYNC_CONCURRENCY", "8"))
+
+_lock = threading.Lock()
+_expand_unsupported = set()
+
+
+def expand_supported(idrac_ip):
+    with _lock:
+        return idrac_ip not in _expand_unsupported
+
+
+def _mark_expand_unsupported(idrac_ip):
+    with _lock:
+        _expand_unsupported.add(idrac_ip)
+
+
+def _is_expanded(member):
+    # A member which was not inlined only contains its @odata.id link
+    return isinstance(member, dict) and any(key != u'@odata.id' for key in member)
+
+
+def _add_query(uri, query):
+    if "?" in uri:
+        return "%s&%s" % (uri, query)
+    return "%s?%s" % (uri, query)
+
+
+def _async_client():
+    try:
+        import RedfishAsyncClient
+    except (ImportError, SyntaxError):
+        return None
+    return RedfishAsyncClient
+
+
+def _get_many_threaded(idrac_ip, auth, uris, max_concurrency, scheme, **kwargs):
+    responses = [None] * len(uris)
+    errors = []
+    indexes = iter(range(len(uris)))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                index = next(indexes, None)
+            if index is None or errors:
+                return
+            try:
+                responses[index] = RedfishTransport.get("%s://%s%s" % (scheme, idrac_ip, uris[index]), verify=False, auth=auth, **kwargs)
+            except Exception as error:
+                errors.append(error)
+                return
+
+    threads = [threading.Thread(target=worker) for i in range(min(max_concurrency or MAX_CONCURRENCY, len(uris)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return responses
+
+
+def get_many(idrac_ip, auth, uris, max_concurrency=None, scheme="https", **kwargs):
+    """GET every URI on one iDRAC concurrently and return the responses in URI order, with RedfishAsyncClient or threads on older Python."""
+    uris = list(uris)
+    if not uris:
+        return []
+    async_client = _async_client()
+    if async_client is None:
+        return _get_many_threaded(idrac_ip, auth, uris, max_concurrency, scheme, **kwargs)
+    client = async_client.RedfishAsyncClient(idrac_ip, auth, max_concurrency, scheme)
+    return async_client.run(client.get_many(uris, **kwargs))
+
+
+def get_collection(idrac_ip, auth, uri, member_property=u'Members', max_concurrency=None, scheme="https", fetch_members=True, **kwargs):
+    """Read a collection (or link array) and every member. Returns (response, members), members is a list of member dicts in collection order.
+    Extra keyword arguments (for example cache) are passed on to every GET. With fetch_members=False members which were not inlined by $expand
+    are returned as their {"@odata.id": ...} link instead of being fetched.
+
+    response is the collection GET response, when its status code is not 200 members is an empty list and the caller reports the error."""
+    response = None
+    if expand_supported(idrac_ip):
+        response = RedfishTransport.get("%s://%s%s" % (scheme, idrac_ip, _add_query(uri, EXPAND_QUERY)), verify=False, auth=auth, **kwargs)
+        if response.status_code in (400, 405, 501):
+            _mark_expand_unsupported(idrac_ip)
+            response = None
+    if response is None:
+        response = RedfishTransport.get("%s://%s%s" % (scheme, idrac_ip, uri), verify=False, auth=auth, **kwargs)
+    if response.status_code != 200:
+        return response, []
+    data = response.json()
+    links = data.get(member_property) or []
+    if isinstance(links, dict):
+        # Navigation property pointing at a collection (for example Volumes), members live in the inlined collection or one level below
+        if u'Members' in links:
+            links = links[u'Members']
+        else:
+            return get_collection(idrac_ip, auth, links[u'@odata.id'], u'Members', max_concurrency, scheme, fetch_members, **kwargs)
+    members = list(links)
+    missing = [index for index, member in enumerate(members) if not _is_expanded(member)]
+    if missing and fetch_members:
+        missing_uris = [members[index][u'@odata.id'] for index in missing]
+        responses = get_many(idrac_ip, auth, missing_uris, max_concurrency, scheme, **kwargs)
+        for index, member_response in zip(missing, responses):
+            if member_response.status_code != 200:
+                return member_response, []
+            members[index] = member_response.json()
+    return response, members
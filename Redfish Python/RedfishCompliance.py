@@ -0,0 +1,121 @@
+#
+# RedfishCompliance. Python module used by FleetFirmwareComplianceREDFISH to compare installed firmware of many iDRACs against a firmware baseline.
+#
+# NOTE: The baseline is a CSV file with header row (or a JSON list of objects) with columns "component_id", "version" and optional "model" and
+# "name". component_id is the DellSoftwareInventory ComponentID of the device (GetFirmwareInventoryREDFISH prints it), version is the minimum
+# version. A row with a model only applies to servers of that model (for example "PowerEdge R740"), a row without model applies to every model
+# which has no row of its own for the component. The rows are loaded once into a dict keyed by (component_id, model), so checking a host is one
+# dict lookup per installed component.
+#
+# NOTE: Versions are compared part by part, numeric parts as numbers ("2.10.0" is newer than "2.9.3") and other parts as text ("A10" vs "A09").
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, RedfishOperations, csv, json, re
+
+COMPLIANT = "compliant"
+BELOW = "below"
+ABOVE = "above"
+NO_BASELINE = "no_baseline"
+
+
+class BaselineError(Exception):
+    """Raised when the baseline file can't be used."""
+
+
+def version_key(version):
+    """Sort key of a firmware version string, numeric parts compare as numbers."""
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.findall(r"[0-9]+|[A-Za-z]+", version or ""))
+
+
+class Baseline(object):
+    """Firmware baseline indexed by (component_id, model), model None for rows which apply to every model."""
+
+    def __init__(self, entries):
+        self.index = {}
+        self.names = {}
+        for entry in entries:
+            component_id = str(entry.get("component_id") or "").strip()
+            version = str(entry.get("version") or "").strip()
+            if not component_id or not version:
+                raise BaselineError("- FAIL, baseline entry %s needs component_id and version" % entry)
+            model = (entry.get("model") or "").strip() or None
+            self.index[(component_id, model)] = {"version": version, "key": version_key(version)}
+            self.names.setdefault(component_id, (entry.get("name") or "").strip() or None)
+
+    def lookup(self, component_id, model):
+        return self.index.get((component_id, model)) or self.index.get((component_id, None))
+
+    def component_ids(self):
+        return sorted(self.names, key=lambda i: (self.names[i] or "", i))
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            if path.lower().endswith(".json"):
+                entries = json.load(f)
+            else:
+                entries = [row for row in csv.DictReader(f) if any(row.values())]
+    except ValueError as error:
+        raise BaselineError("- FAIL, unable to read baseline file \"%s\": %s" % (path, error))
+    return Baseline(entries)
+
+
+def check_firmware(baseline, model, firmware):
+    """Compare installed firmware (firmware_inventory() entries) with the baseline. Returns the list of component results."""
+    components = []
+    for entry in firmware:
+        if not (entry["Id"] or "").startswith("Installed"):
+            continue
+        component_id = entry["ComponentID"]
+        wanted = baseline.lookup(component_id, model)
+        result = {"ComponentID": component_id, "Name": entry["Name"], "Version": entry["Version"], "Baseline": wanted["version"] if wanted else None}
+        if wanted is None:
+            result["Status"] = NO_BASELINE
+        else:
+            installed = version_key(entry["Version"])
+            result["Status"] = BELOW if installed < wanted["key"] else ABOVE if installed > wanted["key"] else COMPLIANT
+        components.append(result)
+    return components
+
+
+def firmware_compliance(idrac_ip, auth, baseline):
+    """Model, service tag and the component results of check_firmware() for one iDRAC."""
+    uri = RedfishOperations.SYSTEM_URI
+    response = RedfishTransport.get_select("https://%s%s" % (idrac_ip, uri), ["Model", "SKU"], verify=False, auth=auth)
+    if response.status_code != 200:
+        raise RedfishOperations.RedfishOperationError("- FAIL, GET command failed for URI %s, status code %s returned" % (uri, response.status_code), response.status_code)
+    system = response.json()
+    model = system.get(u'Model')
+    components = check_firmware(baseline, model, RedfishOperations.firmware_inventory(idrac_ip, auth)["Firmware"])
+    below = [i for i in components if i["Status"] == BELOW]
+    return {"Model": model, "ServiceTag": system.get(u'SKU'), "Compliant": not below, "Below": len(below), "Components": components}
+
+
+def matrix_rows(baseline, results):
+    """Rows of the compliance matrix: one row per host, one column per baseline component with the installed version, "<" marks a version below
+    the baseline. results is a list of (host, firmware_compliance() result or None when the host failed)."""
+    component_ids = baseline.component_ids()
+    header = ["host", "model", "service_tag", "compliant", "below"] + ["%s (%s)" % (baseline.names[i], i) if baseline.names[i] else i for i in component_ids]
+    rows = [header]
+    for host, result in sorted(results, key=lambda i: i[0]):
+        if result is None:
+            rows.append([host, "", "", "error", ""] + [""] * len(component_ids))
+            continue
+        cells = dict((i, []) for i in component_ids)
+        for component in result["Components"]:
+            if component["ComponentID"] in cells:
+                version = component["Version"]
+                if component["Status"] == BELOW:
+                    version = "%s < %s" % (version, component["Baseline"])
+                cells[component["ComponentID"]].append(version)
+        rows.append([host, result["Model"] or "", result["ServiceTag"] or "", "yes" if result["Compliant"] else "no", result["Below"]] +
+                    [" / ".join(cells[i]) for i in component_ids])
+    return rows
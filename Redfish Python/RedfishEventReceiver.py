@@ -0,0 +1,172 @@
+#
+# RedfishEventReceiver. Python module with a local HTTPS Redfish event listener which subscribes iDRACs to events, so job waits finish when the
+# iDRAC reports a change instead of after the next polling interval.
+#
+# NOTE: EventReceiver runs an HTTPS server on the local port passed in, with a certificate and key file (the iDRAC only sends events to HTTPS
+# destinations). A self-signed certificate is enough, for example:
+#     openssl req -x509 -newkey rsa:2048 -nodes -days 365 -subj /CN=redfish-events -keyout events.key -out events.crt
+#
+# NOTE: attach() creates an EventService subscription on the iDRAC for EVENT_TYPES with the iDRAC address as Context, then checks delivery with
+# SubmitTestEvent. When the test event arrives within VERIFY_TIMEOUT seconds the RedfishJobWatcher of the iDRAC becomes event driven: every event
+# wakes it up for an immediate poll and regular polls slow down to RedfishJobWatcher.EVENT_POLL_INTERVAL. When no test event arrives (firewall,
+# wrong destination address, alerts disabled on the iDRAC) the watcher keeps polling at the usual interval. detach() deletes the subscription.
+#
+# NOTE: The destination address sent to the iDRAC is the local address used to reach that iDRAC, pass in address to override it (NAT).
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, RedfishJobWatcher, json, socket, ssl, sys, threading, time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+SUBSCRIPTIONS_URI = "/redfish/v1/EventService/Subscriptions"
+SUBMIT_TEST_EVENT_URI = "/redfish/v1/EventService/Actions/EventService.SubmitTestEvent"
+EVENT_TYPES = ["StatusChange", "Alert"]
+TEST_MESSAGE_ID = "TMP0118"
+VERIFY_TIMEOUT = 10
+
+
+class EventReceiverError(Exception):
+    """Raised when the event listener can't be started."""
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _EventHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        # Answer first, the iDRAC resends events which are not acknowledged quickly
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except ValueError:
+            return
+        self.server.receiver.dispatch(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class EventReceiver(object):
+    """HTTPS listener for Redfish events. received counts the events of each iDRAC (by subscription Context), verified holds the iDRACs whose
+    test event arrived."""
+
+    def __init__(self, port, certfile, keyfile, address=None, log=None):
+        self.port = port
+        self.address = address
+        self.log = log or (lambda message: None)
+        self.lock = threading.Condition()
+        self.received = {}
+        self.subscriptions = {}
+        self.verified = set()
+        try:
+            self.server = _ThreadingHTTPServer(("", port), _EventHandler)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER) if hasattr(ssl, "PROTOCOL_TLS_SERVER") else ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+            context.load_cert_chain(certfile, keyfile)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        except (IOError, OSError, ssl.SSLError) as error:
+            raise EventReceiverError("- FAIL, unable to start event listener on port %s: %s" % (port, error))
+        self.server.receiver = self
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def dispatch(self, data):
+        """Hand one event POST to the job watcher of the iDRAC it came from."""
+        contexts = set(event.get(u'Context') for event in data.get(u'Events') or [] if event.get(u'Context'))
+        if data.get(u'Context'):
+            contexts.add(data[u'Context'])
+        for context in contexts:
+            with self.lock:
+                self.received[context] = self.received.get(context, 0) + 1
+                self.lock.notify_all()
+                attached = context in self.subscriptions
+            if attached:
+                RedfishJobWatcher.watcher_for(context, None).wake()
+
+    def destination(self, idrac_ip):
+        address = self.address
+        if address is None:
+            # Local address of the route to the iDRAC, no packet is sent
+            probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                probe.connect((idrac_ip.rsplit(":", 1)[0] if idrac_ip.count(":") == 1 else idrac_ip, 443))
+                address = probe.getsockname()[0]
+            finally:
+                probe.close()
+        return "https://%s:%s/" % (address, self.port)
+
+    def _wait_for_event(self, idrac_ip, count, timeout):
+        deadline = time.time() + timeout
+        with self.lock:
+            while self.received.get(idrac_ip, 0) <= count:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self.lock.wait(remaining)
+        return True
+
+    def attach(self, idrac_ip, auth):
+        """Subscribe the iDRAC to events and verify delivery with a test event. Returns True when the job watcher of the iDRAC is event driven."""
+        # Created before the subscription so dispatch() never creates a watcher without credentials
+        watcher = RedfishJobWatcher.watcher_for(idrac_ip, auth)
+        destination = self.destination(idrac_ip)
+        payload = {"Destination": destination, "EventTypes": EVENT_TYPES, "Context": idrac_ip, "Protocol": "Redfish"}
+        headers = {'content-type': 'application/json'}
+        response = RedfishTransport.post("https://%s%s" % (idrac_ip, SUBSCRIPTIONS_URI), data=json.dumps(payload), headers=headers, verify=False, auth=auth)
+        if response.status_code != 201:
+            self.log("- WARNING, %s event subscription failed, status code %s returned, polling job status instead" % (idrac_ip, response.status_code))
+            return False
+        with self.lock:
+            self.subscriptions[idrac_ip] = response.headers.get('Location')
+            count = self.received.get(idrac_ip, 0)
+        payload = {"Destination": destination, "EventTypes": "Alert", "Context": idrac_ip, "Protocol": "Redfish", "MessageId": TEST_MESSAGE_ID}
+        response = RedfishTransport.post("https://%s%s" % (idrac_ip, SUBMIT_TEST_EVENT_URI), data=json.dumps(payload), headers=headers, verify=False, auth=auth)
+        if response.status_code not in (200, 201, 202, 204) or not self._wait_for_event(idrac_ip, count, VERIFY_TIMEOUT):
+            self.log("- WARNING, %s test event not received at %s, polling job status instead" % (idrac_ip, destination))
+            return False
+        with self.lock:
+            self.verified.add(idrac_ip)
+        watcher.set_event_driven(True)
+        return True
+
+    def detach(self, idrac_ip, auth):
+        """Delete the subscription of the iDRAC, the job watcher goes back to polling."""
+        with self.lock:
+            uri = self.subscriptions.pop(idrac_ip, None)
+        RedfishJobWatcher.watcher_for(idrac_ip, auth).set_event_driven(False)
+        if uri:
+            if uri.startswith("http"):
+                uri = "/" + uri.split("/", 3)[3]
+            response = RedfishTransport.delete("https://%s%s" % (idrac_ip, uri), verify=False, auth=auth)
+            if response.status_code not in (200, 204):
+                self.log("- WARNING, %s failed to delete event subscription %s, status code %s returned" % (idrac_ip, uri, response.status_code))
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def print_stats(self, stream=None):
+        stream = stream or sys.stderr
+        with self.lock:
+            verified = sorted(self.verified)
+            received = sum(self.received.get(idrac_ip, 0) for idrac_ip in verified)
+        watchers = [RedfishJobWatcher.watcher_for(idrac_ip, None) for idrac_ip in verified]
+        stream.write("- INFO, events: %s iDRAC(s) event driven, %s event(s) received, %s job status GET(s), %s iDRAC(s) went back to polling after a lost event\n" % (
+                     len(verified), received, sum(watcher.requests for watcher in watchers), sum(1 for watcher in watchers if watcher.missed_events)))
@@ -0,0 +1,391 @@
+#
+# RedfishEventStream. Python module reading the Redfish Server-Sent Events (SSE) stream of an iDRAC, so job and power state changes are pushed to
+# the script instead of being found by polling.
+#
+# NOTE: EventStream keeps one long-lived GET of the ServerSentEventUri of the EventService (iDRAC9 firmware 4.00 or later) open per iDRAC in a
+# background thread. The stream is parsed as it arrives (SSEParser), every event is handed to the waiters of the script: job events wake the
+# RedfishJobWatcher of the iDRAC for an immediate poll, power events wake the threads waiting on a power state change (wait_power_event). The
+# Jobs and System resources stay the source of truth, an event only tells the waiters to read them now.
+#
+# NOTE: When the stream drops (iDRAC reset, network loss, read timeout) it is opened again after the retry delay the iDRAC sent (doubling up to
+# MAX_RECONNECT_DELAY while it keeps failing), with the Last-Event-ID header set to the id of the last event received so the iDRAC can resend
+# the events missed in between. While the stream is down the waiters poll at their usual interval.
+#
+# NOTE: EventStreamStandInREDFISH is a local stand-in iDRAC serving an SSE stream with simulated job and power events, to try the stream without
+# an iDRAC. GetEventStreamREDFISH prints the events of an iDRAC as they arrive.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, RedfishJobWatcher, RedfishOperations, codecs, json, re, socket, threading, time
+
+EVENT_SERVICE_URI = "/redfish/v1/EventService"
+SSE_URI = "/redfish/v1/SSE"
+RECONNECT_DELAY = 2
+MAX_RECONNECT_DELAY = 60
+# No keep-alive from the iDRAC for this long means a dead connection, the stream is opened again (resumed with Last-Event-ID)
+READ_TIMEOUT = 300
+READ_SIZE = 4096
+CONNECT_WAIT = 5
+# Seconds between PowerState polls while the stream is up, a safety net in case a power event is not sent
+POWER_EVENT_POLL_INTERVAL = 15
+# Status codes of an iDRAC without an SSE stream (firmware before 4.00), the stream is not opened again
+UNSUPPORTED_STATUS_CODES = (400, 404, 405, 501)
+
+JOB_MESSAGE_PREFIXES = ("JCP", "SUP", "RED", "LC")
+POWER_MESSAGE_PREFIXES = ("SYS", "PWR")
+
+_LINE_END = re.compile(u"\r\n|\r|\n")
+
+_lock = threading.Lock()
+_streams = {}
+_closed_stats = {"connects": 0, "job": 0, "power": 0, "other": 0}
+
+
+class ServerSentEvent(object):
+    """One event of the stream: id (last event id, kept from earlier events when the event has none), event type and data."""
+
+    def __init__(self, id, event, data):
+        self.id = id
+        self.event = event
+        self.data = data
+
+    def json(self):
+        return json.loads(self.data)
+
+
+class SSEParser(object):
+    """Incremental text/event-stream parser (WHATWG Server-Sent Events). feed() takes the bytes read so far, in pieces of any size, and returns
+    the events completed by them. retry holds the reconnect delay in milliseconds sent by the server, None when none was sent."""
+
+    def __init__(self, last_event_id=None):
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.buffer = u""
+        self.skip_lf = False
+        self.first = True
+        self.last_event_id = last_event_id
+        self.retry = None
+        self.event_type = u""
+        self.data = []
+
+    def feed(self, chunk):
+        text = self.decoder.decode(chunk)
+        if self.first and text:
+            # Byte order mark at the start of the stream is not part of the first line
+            self.first = False
+            if text.startswith(u"\ufeff"):
+                text = text[1:]
+        if self.skip_lf and text.startswith(u"\n"):
+            text = text[1:]
+        self.skip_lf = False
+        events = []
+        self.buffer += text
+        start = 0
+        for match in _LINE_END.finditer(self.buffer):
+            # CRLF, CR and LF all end a line, a CR at the end of the chunk may be followed by the LF of the next one
+            if match.group() == u"\r" and match.end() == len(self.buffer):
+                self.skip_lf = True
+            event = self._line(self.buffer[start:match.start()])
+            start = match.end()
+            if event is not None:
+                events.append(event)
+        self.buffer = self.buffer[start:]
+        return events
+
+    def _line(self, line):
+        if line == u"":
+            return self._dispatch()
+        if line.startswith(u":"):
+            # Comment, used by servers as keep-alive
+            return None
+        field, colon, value = line.partition(u":")
+        if value.startswith(u" "):
+            value = value[1:]
+        if field == u"data":
+            self.data.append(value)
+        elif field == u"event":
+            self.event_type = value
+        elif field == u"id":
+            if u"\0" not in value:
+                self.last_event_id = value
+        elif field == u"retry":
+            if value.isdigit():
+                self.retry = int(value)
+        return None
+
+    def _dispatch(self):
+        data, event_type = self.data, self.event_type
+        self.data, self.event_type = [], u""
+        if not data:
+            return None
+        return ServerSentEvent(self.last_event_id, event_type or u"message", u"\n".join(data))
+
+
+def _message_id(record):
+    # iDRAC9 MessageIds carry the registry prefix, for example "IDRAC.2.8.JCP001"
+    return (record.get(u'MessageId') or u"").split(u".")[-1]
+
+
+def event_kind(record):
+    """Return "job", "power" or None for one record of the Events array of a Redfish event."""
+    origin = (record.get(u'OriginOfCondition') or {})
+    origin = origin.get(u'@odata.id', u"") if isinstance(origin, dict) else origin
+    message_id = _message_id(record)
+    if origin.startswith(RedfishJobWatcher.JOBS_URI) or message_id.startswith(JOB_MESSAGE_PREFIXES):
+        return "job"
+    if origin.startswith(RedfishOperations.SYSTEM_URI) or message_id.startswith(POWER_MESSAGE_PREFIXES):
+        return "power"
+    return None
+
+
+def _chunks(response):
+    # read1() returns what the socket has, chunked or not, instead of waiting for READ_SIZE bytes (urllib3 1.x has no read1)
+    raw = response.raw
+    if hasattr(raw, "read1"):
+        while True:
+            data = raw.read1(READ_SIZE)
+            if not data:
+                return
+            yield data
+    else:
+        for data in response.iter_content(chunk_size=1):
+            yield data
+
+
+def _shutdown(response):
+    # Closing the response waits for the read in progress, shutting the socket down ends that read first (the stream thread closes the response)
+    sock = getattr(getattr(response.raw, "_connection", None), "sock", None)
+    if sock is None:
+        response.close()
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except (OSError, socket.error):
+        pass
+
+
+class EventStream(object):
+    """SSE stream of one iDRAC read in a background thread. on_event is called with each ServerSentEvent. counts holds the number of events
+    received by kind ("job", "power", "other"), connects the number of times the stream was opened. retry is the reconnect delay in seconds
+    sent by the iDRAC."""
+
+    def __init__(self, idrac_ip, auth, on_event=None, log=None):
+        self.idrac_ip = idrac_ip
+        self.auth = auth
+        self.on_event = on_event
+        self.log = log or (lambda message: None)
+        self.condition = threading.Condition()
+        self.connected = False
+        self.closed = False
+        self.response = None
+        self.last_event_id = None
+        self.retry = None
+        self.counts = {"job": 0, "power": 0, "other": 0}
+        self.connects = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def uri(self):
+        """ServerSentEventUri of the EventService, SSE_URI when the iDRAC does not report one."""
+        response = RedfishTransport.get("https://%s%s" % (self.idrac_ip, EVENT_SERVICE_URI), verify=False, auth=self.auth)
+        if response.status_code != 200:
+            return SSE_URI
+        return response.json().get(u'ServerSentEventUri') or SSE_URI
+
+    def _set_connected(self, connected):
+        with self.condition:
+            self.connected = connected
+            self.condition.notify_all()
+        RedfishJobWatcher.watcher_for(self.idrac_ip, self.auth).set_event_driven(connected)
+
+    def _run(self):
+        delay = None
+        uri = None
+        while not self.closed:
+            connects = self.connects
+            error = None
+            try:
+                if uri is None:
+                    uri = self.uri()
+                self._read(uri)
+            except Exception as exception:
+                error = self.error = exception
+            finally:
+                self._set_connected(False)
+            if self.closed:
+                break
+            if getattr(error, "status_code", None) in UNSUPPORTED_STATUS_CODES:
+                self.log("- WARNING, %s has no event stream (status code %s returned for URI %s), polling instead" % (self.idrac_ip, error.status_code, uri))
+                break
+            if delay is None or self.connects > connects:
+                # First attempt or the stream was up, start again from the delay the iDRAC asked for
+                delay = self.retry if self.retry is not None else RECONNECT_DELAY
+            else:
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            if error is not None:
+                self.log("- WARNING, %s event stream dropped: %s, reconnecting in %s seconds" % (self.idrac_ip, error, delay))
+            else:
+                self.log("- INFO, %s event stream closed by the iDRAC, reconnecting in %s seconds" % (self.idrac_ip, delay))
+            with self.condition:
+                if not self.closed:
+                    self.condition.wait(delay)
+
+    def _read(self, uri):
+        headers = {"Accept": "text/event-stream", "Cache-Control": "no-cache"}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+        response = RedfishTransport.get("https://%s%s" % (self.idrac_ip, uri), headers=headers, stream=True, verify=False, auth=self.auth,
+                                        timeout=(RedfishTransport.CONNECT_TIMEOUT, READ_TIMEOUT), retry=False)
+        if response.status_code != 200:
+            response.close()
+            raise RedfishOperations.RedfishOperationError("- FAIL, GET command failed for URI %s, status code %s returned" % (uri, response.status_code), response.status_code)
+        with self.condition:
+            if self.closed:
+                response.close()
+                return
+            self.response = response
+            self.connects += 1
+            self.error = None
+        self._set_connected(True)
+        parser = SSEParser(self.last_event_id)
+        try:
+            for chunk in _chunks(response):
+                for event in parser.feed(chunk):
+                    self.last_event_id = event.id
+                    self._dispatch(event)
+                if parser.retry is not None:
+                    self.retry = parser.retry / 1000.0
+        finally:
+            with self.condition:
+                self.response = None
+            response.close()
+
+    def _dispatch(self, event):
+        try:
+            records = event.json().get(u'Events') or []
+        except (ValueError, AttributeError):
+            records = []
+        kinds = set(event_kind(record) for record in records if isinstance(record, dict))
+        kinds.discard(None)
+        with self.condition:
+            for kind in kinds or ["other"]:
+                self.counts[kind] += 1
+            self.condition.notify_all()
+        if "job" in kinds:
+            RedfishJobWatcher.watcher_for(self.idrac_ip, self.auth).wake()
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def wait_connected(self, timeout):
+        """Wait until the stream is open or the first attempt failed, returns True when it is open."""
+        deadline = time.time() + timeout
+        with self.condition:
+            while not self.connected and self.error is None and not self.closed:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            return self.connected
+
+    def wait_power_event(self, mark, timeout):
+        """Wait until a power event newer than mark (counts["power"] read before the last PowerState GET) arrived, at most timeout seconds.
+        Returns True when one arrived."""
+        deadline = time.time() + timeout
+        with self.condition:
+            while self.counts["power"] <= mark:
+                remaining = deadline - time.time()
+                if remaining <= 0 or self.closed:
+                    return False
+                self.condition.wait(remaining)
+            return True
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            response = self.response
+            self.condition.notify_all()
+        if response is not None:
+            _shutdown(response)
+        self.thread.join(1)
+        self._set_connected(False)
+
+
+def open_stream(idrac_ip, auth, log=None):
+    """Start the event stream of the iDRAC (or return the one already running) and wait up to CONNECT_WAIT seconds for it to connect."""
+    with _lock:
+        stream = _streams.get(idrac_ip)
+        if stream is None:
+            stream = _streams[idrac_ip] = EventStream(idrac_ip, auth, log=log).start()
+    stream.wait_connected(CONNECT_WAIT)
+    return stream
+
+
+def close_stream(idrac_ip):
+    with _lock:
+        stream = _streams.pop(idrac_ip, None)
+    if stream is not None:
+        stream.close()
+        with _lock:
+            _closed_stats["connects"] += stream.connects
+            for kind, count in stream.counts.items():
+                _closed_stats[kind] += count
+    return stream
+
+
+def stream_for(idrac_ip):
+    """Return the running event stream of the iDRAC, None when none was opened."""
+    with _lock:
+        return _streams.get(idrac_ip)
+
+
+def power_mark(idrac_ip):
+    """Number of power events of the iDRAC received so far, read before polling PowerState and passed to wait_power_event()."""
+    stream = stream_for(idrac_ip)
+    return stream.counts["power"] if stream is not None else 0
+
+
+def wait_power_event(idrac_ip, mark, interval, deadline=None):
+    """Drop-in for time.sleep(interval) between two PowerState polls. With a connected event stream the wait ends early on a power event and
+    lasts up to POWER_EVENT_POLL_INTERVAL otherwise, without one it sleeps interval seconds. Never waits past deadline (time.time() value)."""
+    stream = stream_for(idrac_ip)
+    connected = stream is not None and stream.connected
+    wait = max(interval, POWER_EVENT_POLL_INTERVAL) if connected else interval
+    if deadline is not None:
+        wait = max(0, min(wait, deadline - time.time()))
+    if not connected:
+        time.sleep(wait)
+        return False
+    return stream.wait_power_event(mark, wait)
+
+
+def with_event_stream(operation, log=None):
+    """Wrap a fleet operation(idrac_ip, auth) so the event stream of the iDRAC is open while the operation runs."""
+    def streamed(idrac_ip, auth):
+        open_stream(idrac_ip, auth, log)
+        try:
+            return operation(idrac_ip, auth)
+        finally:
+            close_stream(idrac_ip)
+    return streamed
+
+
+def stats():
+    """Return {streams, connects, job, power, other}: running streams and the counts of every stream opened so far."""
+    with _lock:
+        streams = list(_streams.values())
+        totals = dict(_closed_stats, streams=len(streams))
+    for stream in streams:
+        totals["connects"] += stream.connects
+        for kind, count in stream.counts.items():
+            totals[kind] += count
+    return totals
@@ -0,0 +1,304 @@
+#
+# RedfishFirmwareUpdate. Python module with the steps of DeviceFirmwareSimpleUpdateREDFISH (upload image, SimpleUpdate, poll job, reboot, poll job)
+# as functions, plus update_host() which runs them for one iDRAC recording every step in a RedfishJournal so a fleet update can resume.
+#
+# NOTE: When update_host() is called for a host which already has steps in the journal it continues from the last step: an image which is still
+# in the iDRAC repository (Available entry) is not uploaded again, an existing update job is polled instead of creating a new one, and a server
+# whose reboot was requested is not rebooted again (the step is journaled before the reset is sent). Before the SimpleUpdate POST the firmware
+# update jobs already in the iDRAC job queue are journaled, when the run stops after the POST but before the job ID was recorded, the next run
+# adopts the one new firmware update job still in progress. Jobs which were in the queue before, or several new ones, are never adopted.
+#
+# NOTE: A host which failed is resumed from the step which failed. When an update job was already created it is read first: a job still in
+# progress is waited for (and the server is only rebooted when the failed step came before the reboot), a completed job completes the host, and
+# only a failed job, or one no longer in the job queue, makes update_host() create a new job from the Available entry (uploading it again when
+# it is gone).
+#
+# NOTE: With a RedfishImageIndex passed in, update_host() skips the upload when the iDRAC repository already has an Available entry with the
+# ComponentID and Version the index recorded for the SHA-256 of the image, the job is created from that entry instead.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, RedfishCollection, RedfishOperations, RedfishUpload, RedfishJobWatcher, RedfishJobState, RedfishEventStream, json, os, re, time
+
+UPDATE_SERVICE_URI = "/redfish/v1/UpdateService"
+SIMPLE_UPDATE_URI = "/redfish/v1/UpdateService/Actions/UpdateService.SimpleUpdate"
+RESET_URI = "/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset"
+JOBS_URI = "/redfish/v1/Managers/iDRAC.Embedded.1/Jobs"
+
+# Same limits as DeviceFirmwareSimpleUpdateREDFISH
+SCHEDULE_TIMEOUT = 30 * 60
+COMPLETE_TIMEOUT = 2 * 60 * 60
+SCHEDULE_POLL_INTERVAL = 5
+COMPLETE_POLL_INTERVAL = 20
+SHUTDOWN_POLLS = 20
+SHUTDOWN_POLL_INTERVAL = 2
+
+RUNNING = "running"
+SCHEDULED = "scheduled"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Job states of a firmware update job which is still going to run
+JobState = RedfishJobState.JobState
+ACTIVE_JOB_STATES = (JobState.NEW, JobState.SCHEDULING, JobState.SCHEDULED, JobState.DOWNLOADING, JobState.DOWNLOADED, JobState.RUNNING, JobState.WAITING,
+                     JobState.READY_FOR_EXECUTION)
+
+
+class FirmwareUpdateError(RedfishOperations.RedfishOperationError):
+    """Raised when a firmware update step failed or timed out."""
+
+
+def _url(idrac_ip, uri):
+    return "https://%s%s" % (idrac_ip, uri)
+
+
+def get_http_push_uri(idrac_ip, auth):
+    response = RedfishTransport.get(_url(idrac_ip, UPDATE_SERVICE_URI), verify=False, auth=auth)
+    if response.status_code != 200:
+        raise FirmwareUpdateError("- FAIL, GET command failed for URI %s, status code %s returned" % (UPDATE_SERVICE_URI, response.status_code), response.status_code)
+    return response.json()[u'HttpPushUri']
+
+
+def upload_image(idrac_ip, auth, image_path, progress=None):
+    """Upload a firmware image to the iDRAC repository, streamed from the file (see RedfishUpload). Returns (http_push_uri, Available entry Id).
+    progress is called with (bytes sent, total bytes, seconds) while the image is sent."""
+    http_push_uri = get_http_push_uri(idrac_ip, auth)
+    response = RedfishTransport.get(_url(idrac_ip, http_push_uri), verify=False, auth=auth)
+    if response.status_code != 200:
+        raise FirmwareUpdateError("- FAIL, GET command failed for URI %s, status code %s returned" % (http_push_uri, response.status_code), response.status_code)
+    with RedfishUpload.MultipartImage(image_path, progress=progress) as body:
+        headers = {"if-match": response.headers['ETag'], "content-type": body.content_type}
+        response = RedfishTransport.post(_url(idrac_ip, http_push_uri), data=body, headers=headers, verify=False, auth=auth)
+    if response.status_code != 201:
+        raise FirmwareUpdateError("- FAIL, POST command failed to download image payload, status code %s returned" % response.status_code, response.status_code)
+    return http_push_uri, response.json()[u'Id']
+
+
+def available_entry_exists(idrac_ip, auth, http_push_uri, available_id):
+    response = RedfishTransport.get(_url(idrac_ip, "%s/%s" % (http_push_uri, available_id)), verify=False, auth=auth)
+    return response.status_code == 200
+
+
+def available_entry(idrac_ip, auth, http_push_uri, available_id):
+    """Return (ComponentID, Version) of an Available entry."""
+    uri = "%s/%s" % (http_push_uri, available_id)
+    response = RedfishTransport.get(_url(idrac_ip, uri), verify=False, auth=auth)
+    if response.status_code != 200:
+        raise FirmwareUpdateError("- FAIL, GET command failed for URI %s, status code %s returned" % (uri, response.status_code), response.status_code)
+    data = response.json()
+    return data.get(u'Oem', {}).get(u'Dell', {}).get(u'DellSoftwareInventory', {}).get(u'ComponentID'), data.get(u'Version')
+
+
+def find_available_entry(idrac_ip, auth, component_id, version):
+    """Return the Id of the Available entry with this ComponentID and Version, None when the iDRAC repository has no such image."""
+    for entry in RedfishOperations.firmware_inventory(idrac_ip, auth)["Firmware"]:
+        if (entry["Id"] or "").startswith("Available") and entry["ComponentID"] == component_id and entry["Version"] == version:
+            return entry["Id"]
+    return None
+
+
+def simple_update(idrac_ip, auth, http_push_uri, available_id):
+    """Create the update job for an uploaded image. Returns the job ID."""
+    payload = {"ImageURI": "%s/%s" % (http_push_uri, available_id)}
+    response = RedfishTransport.post(_url(idrac_ip, SIMPLE_UPDATE_URI), data=json.dumps(payload), headers={'content-type': 'application/json'}, verify=False, auth=auth)
+    if response.status_code not in (200, 202):
+        raise FirmwareUpdateError("- FAIL, POST command failed for SimpleUpdate action, status code %s returned" % response.status_code, response.status_code)
+    return re.search("JID_.+", response.headers['Location']).group()
+
+
+def active_update_jobs(idrac_ip, auth):
+    """Return the IDs of the firmware update jobs which have not finished yet."""
+    response, jobs = RedfishCollection.get_collection(idrac_ip, auth, JOBS_URI)
+    if response.status_code != 200:
+        raise FirmwareUpdateError("- FAIL, GET command failed for URI %s, status code %s returned" % (JOBS_URI, response.status_code), response.status_code)
+    return [job[u'Id'] for job in jobs if job.get(u'JobType') == "FirmwareUpdate" and job.get(u'JobState') in ACTIVE_JOB_STATES]
+
+
+def active_update_job(idrac_ip, auth, previous_jobs):
+    """Return the ID of the firmware update job created since previous_jobs (active_update_jobs() read right before the SimpleUpdate POST), None
+    when there is no such job or more than one. Job documents don't name the image or ComponentID they update, a job which was already in the
+    queue before the POST belongs to another image or tool and is never returned."""
+    new_jobs = [job_id for job_id in active_update_jobs(idrac_ip, auth) if job_id not in previous_jobs]
+    return new_jobs[0] if len(new_jobs) == 1 else None
+
+
+def read_job(idrac_ip, auth, job_id):
+    """Return (status, message) of a job read once from the job queue, status None when the job is no longer in the job queue."""
+    jobs, errors = RedfishJobWatcher.fetch_jobs(idrac_ip, auth, [job_id])
+    if job_id in errors:
+        if errors[job_id].status_code == 404:
+            return None, "job not found in the job queue"
+        raise FirmwareUpdateError(str(errors[job_id]), errors[job_id].status_code)
+    return _job_document_status(jobs[job_id])
+
+
+def _job_document_status(job):
+    """Return (status, message) of a job document, status is RUNNING, SCHEDULED, COMPLETED or FAILED."""
+    job_state, message = RedfishJobState.job_state(job), job.get(u'Message') or ""
+    if job_state in RedfishJobState.FAILED_JOB_STATES or job_state == JobState.COMPLETED_WITH_ERRORS:
+        return FAILED, message
+    if job_state == JobState.COMPLETED:
+        return COMPLETED, message
+    if job_state == JobState.SCHEDULED:
+        return SCHEDULED, message
+    if job_state != JobState.UNKNOWN:
+        return RUNNING, message
+    # Older iDRAC firmware without a JobState, only the message tells
+    if "failed" in message or "Failed" in message or "completed with errors" in message:
+        return FAILED, message
+    if "completed successfully" in message:
+        return COMPLETED, message
+    if "scheduled" in message:
+        return SCHEDULED, message
+    return RUNNING, message
+
+
+def wait_for_job(idrac_ip, auth, job_id, statuses, timeout, interval):
+    """Wait until the status of a job is one of statuses, polling through the RedfishJobWatcher of the iDRAC. Returns (status, message), raises
+    FirmwareUpdateError when the job failed or timed out. Polls which can't reach the iDRAC (it is unreachable while the server reboots and applies
+    the update) don't fail the wait, the job is polled again until the timeout."""
+    watcher = RedfishJobWatcher.watcher_for(idrac_ip, auth)
+    deadline = RedfishJobState.deadline(timeout)
+    seen = {}
+    while True:
+        try:
+            job = watcher.wait(job_id, lambda job: _job_document_status(job)[0] in statuses + (FAILED,), RedfishJobState.remaining(deadline),
+                               on_change=lambda job: seen.update(job=job), interval=interval)
+            break
+        except RedfishJobWatcher.JobWatchError as error:
+            if RedfishJobState.expired(deadline):
+                raise FirmwareUpdateError("- FAIL, timeout of %s seconds hit waiting for job %s, current message is: %s" % (timeout, job_id, seen.get("job", {}).get(u'Message')))
+            if not isinstance(error, RedfishJobWatcher.JobQueueUnreachable):
+                raise FirmwareUpdateError(str(error), error.status_code)
+    status, message = _job_document_status(job)
+    if status == FAILED:
+        raise FirmwareUpdateError("- FAIL, job %s failed, current message is: %s" % (job_id, message))
+    return status, message
+
+
+def _reset(idrac_ip, auth, reset_type):
+    response = RedfishTransport.post(_url(idrac_ip, RESET_URI), data=json.dumps({'ResetType': reset_type}), headers={'content-type': 'application/json'}, verify=False, auth=auth)
+    if response.status_code != 204:
+        raise FirmwareUpdateError("- FAIL, POST command failed for ComputerSystem.Reset %s, status code %s returned" % (reset_type, response.status_code), response.status_code)
+
+
+def reboot_server(idrac_ip, auth):
+    """Graceful shutdown (forced after about 40 seconds) then power on, or power on when the server is off, same as reboot_server() of the scripts.
+    With an event stream open for the iDRAC (see RedfishEventStream) the power off is noticed as soon as the iDRAC reports it."""
+    if RedfishOperations.power_state(idrac_ip, auth)["PowerState"] == "On":
+        _reset(idrac_ip, auth, 'GracefulShutdown')
+        deadline = time.time() + SHUTDOWN_POLLS * SHUTDOWN_POLL_INTERVAL
+        while True:
+            mark = RedfishEventStream.power_mark(idrac_ip)
+            if RedfishOperations.power_state(idrac_ip, auth)["PowerState"] == "Off":
+                break
+            if time.time() >= deadline:
+                _reset(idrac_ip, auth, 'ForceOff')
+                time.sleep(15)
+                break
+            RedfishEventStream.wait_power_event(idrac_ip, mark, SHUTDOWN_POLL_INTERVAL, deadline)
+    _reset(idrac_ip, auth, 'On')
+
+
+def update_host(idrac_ip, auth, image_path, journal, reboot=True, log=None, schedule_timeout=None, complete_timeout=None, image_index=None):
+    """Run (or resume) the firmware update of one iDRAC. Returns the journal state of the host after the last step.
+
+    schedule_timeout / complete_timeout override SCHEDULE_TIMEOUT / COMPLETE_TIMEOUT (seconds). image_index is a RedfishImageIndex.ImageIndex
+    used to skip uploading an image the iDRAC already has."""
+    log = log or (lambda message: None)
+    state = journal.state(idrac_ip)
+    step = state.get("step")
+    if step == COMPLETED:
+        log("- INFO, %s already completed, job %s" % (idrac_ip, state.get("job_id")))
+        return state
+    image = os.path.basename(image_path)
+    job_id = state.get("job_id")
+    if state.get("image") not in (None, image):
+        raise FirmwareUpdateError("- FAIL, journal of %s is for image %s, not %s" % (idrac_ip, state.get("image"), image))
+    if step == FAILED:
+        # Tried again from the step which failed, the update job (if one was created) may still be running
+        step = state.get("failed_step")
+        log("- INFO, %s failed in step %s, resuming: %s" % (idrac_ip, step, state.get("error")))
+    try:
+        if job_id is not None:
+            # The job of the previous run decides: only a failed (or deleted) job is created again, never a second job next to a running one
+            status, message = read_job(idrac_ip, auth, job_id)
+            if status == COMPLETED:
+                journal.record(idrac_ip, COMPLETED, message=message)
+                log("- INFO, %s job %s completed" % (idrac_ip, job_id))
+                return journal.state(idrac_ip)
+            if status in (FAILED, None):
+                log("- WARNING, %s job %s of the previous run failed (%s), creating a new update job" % (idrac_ip, job_id, message))
+                job_id, step = None, None
+            elif step not in ("job_scheduled", "reboot_requested", "reboot_issued"):
+                step = "job_created"
+        if job_id is None:
+            http_push_uri = state.get("http_push_uri")
+            available_id = state.get("available_id")
+            if available_id and available_entry_exists(idrac_ip, auth, http_push_uri, available_id):
+                log("- INFO, %s image already uploaded as %s, skipping upload" % (idrac_ip, available_id))
+                # The SimpleUpdate POST of the previous run was sent (it may have created the job) when the run stopped or failed in job_requested
+                job_id = active_update_job(idrac_ip, auth, state.get("previous_jobs") or []) if step == "job_requested" else None
+                if job_id is not None:
+                    log("- INFO, %s found update job %s created by the previous run" % (idrac_ip, job_id))
+                    step = "job_created"
+                    journal.record(idrac_ip, step, job_id=job_id, adopted=True)
+            else:
+                step = "uploaded"
+                identity = image_index.identity(image_path) if image_index else None
+                available_id = find_available_entry(idrac_ip, auth, *identity) if identity else None
+                if available_id:
+                    http_push_uri = get_http_push_uri(idrac_ip, auth)
+                    journal.record(idrac_ip, step, image=image, http_push_uri=http_push_uri, available_id=available_id, reused=True)
+                    log("- INFO, %s already has the image as Available entry %s, skipping upload" % (idrac_ip, available_id))
+                else:
+                    progress = lambda sent, total, seconds: log("- INFO, %s uploading image, %s" % (idrac_ip, RedfishUpload.progress_message(sent, total, seconds)))
+                    http_push_uri, available_id = upload_image(idrac_ip, auth, image_path, progress)
+                    journal.record(idrac_ip, step, image=image, http_push_uri=http_push_uri, available_id=available_id)
+                    log("- INFO, %s image uploaded, Available entry %s" % (idrac_ip, available_id))
+                    if image_index and identity is None:
+                        component_id, version = available_entry(idrac_ip, auth, http_push_uri, available_id)
+                        if component_id and version:
+                            image_index.remember(image_path, component_id, version)
+            if job_id is None:
+                step = "job_requested"
+                journal.record(idrac_ip, step, job_id=None, previous_jobs=active_update_jobs(idrac_ip, auth))
+                job_id = simple_update(idrac_ip, auth, http_push_uri, available_id)
+                step = "job_created"
+                journal.record(idrac_ip, step, job_id=job_id)
+                log("- INFO, %s update job %s created" % (idrac_ip, job_id))
+        if step not in ("job_scheduled", "reboot_requested", "reboot_issued"):
+            status, message = wait_for_job(idrac_ip, auth, job_id, (SCHEDULED, COMPLETED), schedule_timeout or SCHEDULE_TIMEOUT, SCHEDULE_POLL_INTERVAL)
+            if status == COMPLETED:
+                journal.record(idrac_ip, COMPLETED, message=message)
+                log("- INFO, %s job %s completed without reboot" % (idrac_ip, job_id))
+                return journal.state(idrac_ip)
+            step = "job_scheduled"
+            journal.record(idrac_ip, step, message=message)
+        if not reboot:
+            log("- INFO, %s job %s scheduled, waiting for the next server reboot" % (idrac_ip, job_id))
+            return journal.state(idrac_ip)
+        if step == "reboot_requested":
+            # The previous run stopped while rebooting the server. Rebooting again could interrupt the update, the job is waited for instead
+            log("- WARNING, %s reboot for job %s was requested by the previous run, not rebooting again" % (idrac_ip, job_id))
+        elif step != "reboot_issued":
+            # Journaled before the reset, so a resume never resets a server which may already be applying the update
+            step = "reboot_requested"
+            journal.record(idrac_ip, step)
+            reboot_server(idrac_ip, auth)
+            step = "reboot_issued"
+            journal.record(idrac_ip, step)
+            log("- INFO, %s server rebooted to apply job %s" % (idrac_ip, job_id))
+        status, message = wait_for_job(idrac_ip, auth, job_id, (COMPLETED,), complete_timeout or COMPLETE_TIMEOUT, COMPLETE_POLL_INTERVAL)
+        journal.record(idrac_ip, COMPLETED, message=message)
+        log("- INFO, %s job %s completed" % (idrac_ip, job_id))
+        return journal.state(idrac_ip)
+    except Exception as error:
+        journal.record(idrac_ip, FAILED, failed_step=step, error=str(error) or error.__class__.__name__)
+        raise
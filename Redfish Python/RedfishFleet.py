@@ -0,0 +1,340 @@
+#
+# RedfishFleet. Python module used by the Fleet Redfish scripts to load an iDRAC inventory file and run an operation on every iDRAC concurrently.
+#
+# NOTE: The inventory is a CSV file with a header row or a YAML file (YAML needs the PyYAML module, pip install pyyaml). The only required column
+# is "host". Credentials come from the "username" / "password" columns, from a named entry of the credentials file referenced by the
+# "credential" column, or from the default username / password passed to the script. A password value "env:NAME" is read from environment
+# variable NAME and "file:PATH" from the first line of file PATH, so the inventory itself does not need to contain passwords. Any other column
+# (for example "group" or "pdu") is kept in the host dict for the calling script.
+#
+# NOTE: A YAML inventory is either a list of host entries or a mapping with "hosts" (list of host entries) and "credentials" (mapping of
+# credential name to username / password). The credentials file passed in separately is a YAML or JSON mapping in the same format.
+#
+# NOTE: run() executes the operation with a bounded pool of worker threads, writes one NDJSON line per iDRAC as soon as it finishes and closes the
+# connections / session of each iDRAC once it is done so thousands of iDRACs can be processed in one run.
+#
+# NOTE: run_sharded() spreads the run over worker processes (and machines) pulling batches of hosts from a RedfishWorkQueue file, one process
+# per CPU core keeps TLS and JSON work from being capped by a single Python process. Credentials are resolved in each worker, the queue file only
+# holds the inventory rows as written (credential names and env: / file: references). A worker only renews the lease of a host while the host is
+# within host_seconds (HOST_SECONDS by default) of its start, a host stuck on an iDRAC which stopped answering is handed to another worker and
+# counts towards MAX_ATTEMPTS of RedfishWorkQueue like a host of a dead worker.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, RedfishWorkQueue, csv, json, multiprocessing, os, socket, sys, threading, time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+MAX_WORKERS = int(os.environ.get("REDFISH_FLEET_WORKERS", "64"))
+LEASE_SECONDS = 300
+# Longest time a worker of run_sharded() keeps the lease of one host it is working on
+HOST_SECONDS = 30 * 60
+
+
+class InventoryError(Exception):
+    """Raised when the inventory or credentials file can't be read or an iDRAC has no usable credentials."""
+
+
+def _load_structured(path):
+    with open(path) as f:
+        text = f.read()
+    if path.lower().endswith((".yml", ".yaml")):
+        if yaml is None:
+            raise InventoryError("- FAIL, PyYAML module is not installed, required to read YAML file \"%s\". Run \"pip install pyyaml\" or use a CSV / JSON file" % path)
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def _resolve_secret(value):
+    if not isinstance(value, str) or ":" not in value:
+        return value
+    kind, reference = value.split(":", 1)
+    if kind == "env":
+        if reference not in os.environ:
+            raise InventoryError("- FAIL, environment variable \"%s\" referenced in the inventory is not set" % reference)
+        return os.environ[reference]
+    if kind == "file":
+        with open(os.path.expanduser(reference)) as f:
+            return f.readline().rstrip("\r\n")
+    return value
+
+
+def read_credentials(path):
+    """Return the named credentials mapping of a YAML or JSON credentials file."""
+    data = _load_structured(path)
+    return data.get("credentials", data) if isinstance(data, dict) else {}
+
+
+def read_inventory(path):
+    """Return (rows, credentials) of a CSV or YAML inventory file. Rows are host dicts whose credentials are not resolved yet."""
+    credentials = {}
+    if path.lower().endswith((".yml", ".yaml", ".json")):
+        data = _load_structured(path)
+        if isinstance(data, dict):
+            credentials.update(data.get("credentials") or {})
+            rows = data.get("hosts") or []
+        else:
+            rows = data or []
+    else:
+        with open(path) as f:
+            rows = [row for row in csv.DictReader(f) if any(row.values())]
+    entries = []
+    for row in rows:
+        if isinstance(row, str):
+            row = {"host": row}
+        entry = dict((key.strip(), value.strip() if isinstance(value, str) else value) for key, value in row.items() if key and value not in (None, ""))
+        if not entry.get("host"):
+            raise InventoryError("- FAIL, inventory entry %s has no host" % row)
+        entries.append(entry)
+    return entries, credentials
+
+
+def resolve_credentials(row, credentials=None, username=None, password=None):
+    """Return a copy of an inventory row with the username / password to use for the host."""
+    entry = dict(row)
+    credential = entry.pop("credential", None)
+    if credential:
+        if credential not in (credentials or {}):
+            raise InventoryError("- FAIL, credential \"%s\" of host %s is not defined in the credentials" % (credential, entry["host"]))
+        entry.setdefault("username", credentials[credential].get("username"))
+        entry.setdefault("password", credentials[credential].get("password"))
+    if not entry.get("username"):
+        entry["username"] = username
+    if not entry.get("password"):
+        entry["password"] = password
+    if not entry["username"] or not entry["password"]:
+        raise InventoryError("- FAIL, no username / password for host %s, add them to the inventory or pass in -u / -p" % entry["host"])
+    entry["username"] = _resolve_secret(entry["username"])
+    entry["password"] = _resolve_secret(entry["password"])
+    return entry
+
+
+def load_inventory(path, username=None, password=None, credentials_path=None):
+    """Return the list of host dicts (host, username, password plus any other inventory column) from a CSV or YAML inventory file."""
+    rows, credentials = read_inventory(path)
+    if credentials_path:
+        credentials.update(read_credentials(credentials_path))
+    return [resolve_credentials(row, credentials, username, password) for row in rows]
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))]
+
+
+class FleetSummary(object):
+    """Collects per-iDRAC results of a fleet run for the throughput / latency summary."""
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.started = time.time()
+        self.finished = None
+        self.ok = 0
+        self.failed = 0
+        self.latencies = []
+        self.requests = 0
+        self.wire_bytes = 0
+        self.errors = {}
+        self.queue_counts = None
+        self.lock = threading.Lock()
+
+    def add(self, record):
+        with self.lock:
+            if record["ok"]:
+                self.ok += 1
+            else:
+                self.failed += 1
+                error = record.get("error_type", "error")
+                self.errors[error] = self.errors.get(error, 0) + 1
+            self.latencies.append(record["elapsed"])
+            self.requests += record.get("requests", 0)
+            self.wire_bytes += record.get("wire_bytes", 0)
+
+    def percentile(self, percent):
+        with self.lock:
+            return _percentile(self.latencies, percent)
+
+    def print_summary(self, stream=None):
+        stream = stream or sys.stderr
+        elapsed = (self.finished or time.time()) - self.started
+        total = self.ok + self.failed
+        stream.write("\n- INFO, fleet %s: %s iDRAC(s), %s passed, %s failed in %.1f seconds\n" % (self.operation, total, self.ok, self.failed, elapsed))
+        if total:
+            stream.write("- INFO, throughput %.1f iDRAC(s)/second, %.1f request(s)/second, %s byte(s) received\n" % (total / max(elapsed, 0.001), self.requests / max(elapsed, 0.001), self.wire_bytes))
+            stream.write("- INFO, per iDRAC latency p50 %.2fs, p90 %.2fs, p99 %.2fs, max %.2fs\n" % (_percentile(self.latencies, 50), _percentile(self.latencies, 90), _percentile(self.latencies, 99), max(self.latencies)))
+        for error, count in sorted(self.errors.items(), key=lambda i: -i[1])[:10]:
+            stream.write("- FAIL, %s iDRAC(s) failed with %s\n" % (count, error))
+        if self.queue_counts is not None:
+            stream.write("- INFO, work queue (all nodes): %s done, %s failed, %s pending, %s leased\n" % (self.queue_counts["done"], self.queue_counts["failed"], self.queue_counts["pending"], self.queue_counts["leased"]))
+
+
+def run_host(host, operation):
+    """Run operation on one host dict and return its NDJSON result record with elapsed time, requests and bytes received."""
+    started = time.time()
+    before = RedfishTransport.stats(host["host"])
+    record = {"host": host["host"]}
+    try:
+        record["result"] = operation(host["host"], (host["username"], host["password"]))
+        record["ok"] = True
+    except Exception as error:
+        record["ok"] = False
+        record["error"] = str(error) or error.__class__.__name__
+        record["error_type"] = error.__class__.__name__
+    finally:
+        RedfishTransport.close_host(host["host"])
+    host_stats = RedfishTransport.stats(host["host"])
+    record["elapsed"] = round(time.time() - started, 3)
+    record["requests"] = host_stats["requests"] - before["requests"]
+    record["wire_bytes"] = host_stats["wire_bytes"] - before["wire_bytes"]
+    return record
+
+
+def run(hosts, operation, operation_name, workers=None, output=None, summary=None):
+    """Run operation(idrac_ip, auth) on every host with at most workers iDRACs in progress, writing one NDJSON line per iDRAC to output.
+
+    Returns the FleetSummary of the run."""
+    output = output or sys.stdout
+    summary = summary or FleetSummary(operation_name)
+    output_lock = threading.Lock()
+    executor = ThreadPoolExecutor(max_workers=workers or MAX_WORKERS)
+    futures = []
+    try:
+        futures = [executor.submit(run_host, host, operation) for host in hosts]
+        for future in as_completed(futures):
+            record = future.result()
+            record["operation"] = operation_name
+            summary.add(record)
+            with output_lock:
+                output.write(json.dumps(record, sort_keys=True) + "\n")
+                output.flush()
+    except KeyboardInterrupt:
+        for future in futures:
+            future.cancel()
+        sys.stderr.write("\n- WARNING, fleet run interrupted, pending iDRAC(s) were not processed\n")
+    finally:
+        executor.shutdown(wait=True)
+        summary.finished = time.time()
+    return summary
+
+
+def _run_queued(row, operation, credentials, username, password):
+    try:
+        host = resolve_credentials(row, credentials, username, password)
+    except (InventoryError, IOError, OSError) as error:
+        return {"host": row["host"], "ok": False, "error": str(error), "error_type": error.__class__.__name__, "elapsed": 0.0, "requests": 0, "wire_bytes": 0}
+    return run_host(host, operation)
+
+
+def queue_worker(queue_path, operation_name, owner, credentials=None, username=None, password=None, workers=None, batch_size=None, lease_seconds=LEASE_SECONDS,
+                 host_seconds=HOST_SECONDS):
+    """Worker process of run_sharded(), leases batches of hosts from the queue and runs the operation on them until the queue is empty."""
+    import RedfishOperations
+    operation = RedfishOperations.OPERATIONS[operation_name]
+    workers = workers or MAX_WORKERS
+    batch_size = batch_size or workers
+    queue = RedfishWorkQueue.WorkQueue(queue_path)
+    stop = threading.Event()
+    # Host of each task in progress and the time it started, read by the heartbeat thread
+    started = {}
+    started_lock = threading.Lock()
+
+    def heartbeat():
+        while not stop.wait(lease_seconds / 3.0):
+            now = time.time()
+            with started_lock:
+                hosts = [host for host, start in started.values() if now - start < host_seconds]
+            queue.renew(owner, lease_seconds, hosts)
+
+    heartbeat_thread = threading.Thread(target=heartbeat)
+    heartbeat_thread.daemon = True
+    heartbeat_thread.start()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    in_progress = set()
+    try:
+        while True:
+            # Lease as many hosts as there are free threads (at most batch_size), so no thread idles while the queue has work and hosts don't sit
+            # leased behind a busy pool while other workers are idle
+            free = workers - len(in_progress)
+            if free > 0:
+                rows = queue.lease(owner, min(batch_size, free), lease_seconds)
+                with started_lock:
+                    running = set(host for host, start in started.values())
+                    for row in rows:
+                        # A host of this worker which ran past host_seconds lost its lease and came back, it is still stuck in its thread. It is
+                        # left leased without renewal until the queue fails it after MAX_ATTEMPTS
+                        if row["host"] in running:
+                            continue
+                        future = executor.submit(_run_queued, row, operation, credentials, username, password)
+                        started[future] = (row["host"], time.time())
+                        in_progress.add(future)
+                if not rows and not in_progress:
+                    if queue.remaining() == 0:
+                        break
+                    # Other workers still hold leases, wait in case one of them dies and its hosts come back
+                    time.sleep(min(5, lease_seconds / 3.0))
+                    continue
+            done, in_progress = wait(in_progress, timeout=1, return_when=FIRST_COMPLETED)
+            for future in done:
+                with started_lock:
+                    del started[future]
+                record = future.result()
+                record["operation"] = operation_name
+                queue.complete(owner, record)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        executor.shutdown(wait=True)
+        queue.close()
+
+
+def run_sharded(queue_path, operation_name, processes, workers=None, batch_size=None, lease_seconds=LEASE_SECONDS, credentials=None,
+                username=None, password=None, node=None, output=None, summary=None, host_seconds=HOST_SECONDS):
+    """Start processes worker processes on this machine pulling hosts from the queue file, writing the NDJSON result line of every host
+    finished by this machine to output. Returns the FleetSummary of this machine."""
+    output = output or sys.stdout
+    summary = summary or FleetSummary(operation_name)
+    node = node or socket.gethostname()
+    queue = RedfishWorkQueue.WorkQueue(queue_path)
+    owner_prefix = "%s:%s:" % (node, os.getpid())
+    worker_processes = []
+    for index in range(processes):
+        worker = multiprocessing.Process(target=queue_worker, args=(queue_path, operation_name, "%s%s" % (owner_prefix, index), credentials, username, password,
+                                                                  workers, batch_size, lease_seconds, host_seconds))
+        worker.start()
+        worker_processes.append(worker)
+    last_id = 0
+    try:
+        while True:
+            running = any(worker.is_alive() for worker in worker_processes)
+            for last_id, record in queue.results_since(last_id, owner_prefix):
+                summary.add(record)
+                output.write(json.dumps(record, sort_keys=True) + "\n")
+            output.flush()
+            if not running:
+                break
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        for worker in worker_processes:
+            worker.terminate()
+        sys.stderr.write("\n- WARNING, fleet run interrupted, leased hosts will be taken over by other workers once the lease expires\n")
+    finally:
+        for worker in worker_processes:
+            worker.join()
+        summary.finished = time.time()
+        summary.queue_counts = queue.counts()
+        queue.close()
+    return summary
@@ -0,0 +1,150 @@
+#
+# RedfishGovernor. Python module used by RedfishTransport to limit how hard one iDRAC is pushed when requests are sent in parallel.
+#
+# NOTE: Every iDRAC gets its own governor with a token bucket (request rate) and an in-flight limit (concurrent requests). The in-flight limit is
+# adjusted with AIMD: each successful request grows it by 1/limit (about +1 per round of requests) up to the maximum, each 503 / 429 answer or
+# dropped connection halves it. A Retry-After header pauses all requests to that iDRAC until the time it asked for has passed.
+#
+# NOTE: Set REDFISH_MAX_INFLIGHT to change the maximum in-flight requests per iDRAC (default 8) and REDFISH_MAX_RATE to change the maximum
+# request rate per iDRAC in requests per second (default 20).
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import os, threading, time, email.utils
+
+MAX_INFLIGHT = int(os.environ.get("REDFISH_MAX_INFLIGHT", "8"))
+MAX_RATE = float(os.environ.get("REDFISH_MAX_RATE", "20"))
+MIN_INFLIGHT = 1
+MAX_RETRY_AFTER = 300
+
+# Only shrink the limit once per this many seconds so a burst of errors from the same overload counts once
+DECREASE_INTERVAL = 1.0
+
+BACKPRESSURE_STATUS_CODES = (429, 503)
+
+_lock = threading.Lock()
+_governors = {}
+
+
+def parse_retry_after(value):
+    """Return the number of seconds a Retry-After header value (delay seconds or HTTP date) asks to wait, None if it can't be parsed."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(int(value), MAX_RETRY_AFTER)
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    return min(max(email.utils.mktime_tz(parsed) - time.time(), 0), MAX_RETRY_AFTER)
+
+
+class HostGovernor(object):
+    """Token bucket plus AIMD in-flight limiter for one iDRAC."""
+
+    def __init__(self, host, max_inflight=None, max_rate=None):
+        self.host = host
+        self.max_inflight = max_inflight or MAX_INFLIGHT
+        self.max_rate = max_rate or MAX_RATE
+        self.limit = float(self.max_inflight)
+        self.in_flight = 0
+        self.tokens = float(self.max_inflight)
+        self.last_refill = time.time()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+        self.counters = {"requests": 0, "backpressure": 0, "errors": 0, "decreases": 0, "wait_seconds": 0.0, "peak_in_flight": 0}
+
+    def _refill(self, now):
+        self.tokens = min(float(self.max_inflight), self.tokens + (now - self.last_refill) * self.max_rate)
+        self.last_refill = now
+
+    def acquire(self):
+        """Block until this iDRAC may receive one more request."""
+        started = time.time()
+        with self.condition:
+            while True:
+                now = time.time()
+                self._refill(now)
+                if now < self.paused_until:
+                    self.condition.wait(self.paused_until - now)
+                elif self.in_flight >= int(self.limit):
+                    self.condition.wait(1.0)
+                elif self.tokens < 1.0:
+                    self.condition.wait((1.0 - self.tokens) / self.max_rate)
+                else:
+                    break
+            self.tokens -= 1.0
+            self.in_flight += 1
+            self.counters["requests"] += 1
+            self.counters["peak_in_flight"] = max(self.counters["peak_in_flight"], self.in_flight)
+            self.counters["wait_seconds"] += time.time() - started
+
+    def release(self, status_code=None, retry_after=None, error=False):
+        """Return the slot taken by acquire() and feed the outcome of the request into the AIMD limit."""
+        with self.condition:
+            now = time.time()
+            self.in_flight -= 1
+            if error or status_code in BACKPRESSURE_STATUS_CODES:
+                if error:
+                    self.counters["errors"] += 1
+                else:
+                    self.counters["backpressure"] += 1
+                if now - self.last_decrease >= DECREASE_INTERVAL:
+                    self.limit = max(float(MIN_INFLIGHT), self.limit / 2.0)
+                    self.last_decrease = now
+                    self.counters["decreases"] += 1
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+            elif status_code is not None and status_code < 500:
+                self.limit = min(float(self.max_inflight), self.limit + 1.0 / self.limit)
+            self.condition.notify_all()
+
+    def pause(self, seconds):
+        """Hold back new requests to this iDRAC for the next seconds."""
+        with self.condition:
+            self.paused_until = max(self.paused_until, time.time() + seconds)
+            self.condition.notify_all()
+
+    def stats(self):
+        with self.condition:
+            result = dict(self.counters)
+            result["limit"] = int(self.limit)
+            result["in_flight"] = self.in_flight
+            result["paused_for"] = max(self.paused_until - time.time(), 0.0)
+        return result
+
+
+def for_host(host):
+    with _lock:
+        governor = _governors.get(host)
+        if governor is None:
+            governor = HostGovernor(host)
+            _governors[host] = governor
+    return governor
+
+
+def configure(host, max_inflight=None, max_rate=None):
+    """Set the in-flight / rate ceiling for one iDRAC, for example from fleet tooling which knows a controller can take more (or less)."""
+    governor = for_host(host)
+    with governor.condition:
+        if max_inflight:
+            governor.max_inflight = max_inflight
+            governor.limit = min(governor.limit, float(max_inflight))
+        if max_rate:
+            governor.max_rate = max_rate
+        governor.condition.notify_all()
+    return governor
+
+
+def stats():
+    """Return governor stats for every iDRAC contacted, keyed by host."""
+    with _lock:
+        governors = list(_governors.values())
+    return dict((governor.host, governor.stats()) for governor in governors)
@@ -0,0 +1,89 @@
+#
+# RedfishImageIndex. Python module with a local index of firmware images (DUPs) by SHA-256, used by RedfishFirmwareUpdate to skip uploading an
+# image the iDRAC already has in its repository.
+#
+# NOTE: The iDRAC does not report a hash of the images in its repository, an Available entry only shows the ComponentID and Version of the
+# package. The index remembers the ComponentID and Version of every image uploaded before (learned from the Available entry the upload created),
+# keyed by the SHA-256 of the image file. Before the next upload the image is hashed and, when the index knows its ComponentID and Version, an
+# Available entry with the same ComponentID and Version on the iDRAC is used instead of uploading the image again.
+#
+# NOTE: The SHA-256 of each file is stored with its size and modification time, an image is only hashed again when one of them changed. The
+# index is a JSON file, written to a temporary file first and then renamed, so a crash never leaves a partial index.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import hashlib, json, os, threading, time
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageIndex(object):
+    """Index of firmware images: "files" maps an image path to its size, modification time and SHA-256, "images" maps a SHA-256 to the
+    ComponentID and Version of the package."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.files = {}
+        self.images = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.images = data.get("images", {})
+
+    def _save(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"files": self.files, "images": self.images}, f, indent=1, sort_keys=True)
+        try:
+            os.rename(temp_path, self.path)
+        except OSError:
+            # Python 2 has no os.replace and os.rename doesn't overwrite an existing file on Windows
+            os.remove(self.path)
+            os.rename(temp_path, self.path)
+
+    def digest(self, image_path):
+        """SHA-256 of an image file, only hashed again when the file changed since it was last hashed."""
+        key = os.path.abspath(image_path)
+        stat = os.stat(key)
+        with self.lock:
+            entry = self.files.get(key)
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                return entry["sha256"]
+        sha256 = sha256_file(key)
+        with self.lock:
+            self.files[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256}
+            self._save()
+        return sha256
+
+    def identity(self, image_path):
+        """Return (ComponentID, Version) of an image uploaded before, None when the index does not know the image."""
+        image = self.images.get(self.digest(image_path))
+        if image is None:
+            return None
+        return image["component_id"], image["version"]
+
+    def remember(self, image_path, component_id, version):
+        """Record ComponentID and Version of an image, read from the Available entry its upload created."""
+        sha256 = self.digest(image_path)
+        with self.lock:
+            if self.images.get(sha256, {}).get("version") == version and self.images[sha256].get("component_id") == component_id:
+                return
+            self.images[sha256] = {"component_id": component_id, "version": version, "name": os.path.basename(image_path),
+                                   "recorded": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            self._save()
@@ -0,0 +1,223 @@
+#
+# RedfishInventoryStore. Python module storing RedfishOperations.inventory_snapshot() results of many iDRACs in normalized SQLite tables for queries.
+#
+# NOTE: There is one table per component type with one row per component (hosts, memory, processors, fans, power_supplies, storage, drives,
+# network_adapters, network_ports, firmware). The columns of TABLES are extracted from the Redfish properties, every row also keeps the complete resource
+# as JSON in the "data" column for properties without a column (use SQLite json_extract() on it). Service tag, model and part number columns are
+# indexed, so questions like "which hosts have DIMM part X" are answered without contacting any iDRAC:
+#
+#   SELECT host, id FROM memory WHERE part_number = 'M393A2K43CB2-CTD'
+#   SELECT h.service_tag, d.id FROM drives d JOIN hosts h ON h.host = d.host WHERE d.model LIKE 'ST1000%'
+#
+# NOTE: store() updates all rows of a host in one transaction, so the tables always hold the last complete inventory of each host. Components are
+# matched to the stored rows by @odata.id, only added, removed and modified components are written and each of them is recorded in the "changes"
+# table (change log). Properties which change on their own (sensor readings, power state, inventory timestamps, see VOLATILE_PROPERTIES) are
+# stored but don't count as a change. The first inventory of a host is recorded as one "added" change of the host.
+#
+# NOTE: Incremental refresh: snapshot(host) returns a SnapshotCache of the documents read from the host last time with their ETags. Passed as
+# cache to inventory_snapshot(), every GET is sent with If-None-Match and a 304 Not Modified answer is served from the snapshot, so unchanged
+# documents are not downloaded or sent again by the iDRAC. The documents of the new run replace the snapshot in the same transaction as the rows.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishCache, json, sqlite3, threading, time, zlib
+
+# table: (hw_inventory key, [(column, Redfish property path)]), a path is a tuple of keys / list indexes
+TABLES = {
+    "memory": ("Memory", [("id", ("Id",)), ("part_number", ("PartNumber",)), ("serial_number", ("SerialNumber",)), ("manufacturer", ("Manufacturer",)),
+                          ("capacity_mib", ("CapacityMiB",)), ("speed_mhz", ("OperatingSpeedMhz",)), ("memory_type", ("MemoryDeviceType",)),
+                          ("health", ("Status", "Health"))]),
+    "processors": ("Processors", [("id", ("Id",)), ("model", ("Model",)), ("manufacturer", ("Manufacturer",)), ("total_cores", ("TotalCores",)),
+                                  ("total_threads", ("TotalThreads",)), ("max_speed_mhz", ("MaxSpeedMHz",)), ("health", ("Status", "Health"))]),
+    "fans": ("Fans", [("id", ("Id",)), ("name", ("Name",)), ("reading", ("Reading",)), ("reading_units", ("ReadingUnits",)), ("health", ("Status", "Health"))]),
+    "power_supplies": ("PowerSupplies", [("id", ("Id",)), ("model", ("Model",)), ("part_number", ("PartNumber",)), ("serial_number", ("SerialNumber",)),
+                                         ("firmware_version", ("FirmwareVersion",)), ("capacity_watts", ("PowerCapacityWatts",)), ("health", ("Status", "Health"))]),
+    "storage": ("Storage", [("id", ("Id",)), ("name", ("Name",)), ("model", ("StorageControllers", 0, "Model")),
+                            ("firmware_version", ("StorageControllers", 0, "FirmwareVersion")), ("health", ("Status", "Health"))]),
+    "drives": ("Drives", [("id", ("Id",)), ("controller", ("Controller",)), ("model", ("Model",)), ("part_number", ("PartNumber",)), ("serial_number", ("SerialNumber",)),
+                          ("capacity_bytes", ("CapacityBytes",)), ("media_type", ("MediaType",)), ("protocol", ("Protocol",)), ("revision", ("Revision",)),
+                          ("health", ("Status", "Health"))]),
+    "network_adapters": ("NetworkAdapters", [("id", ("Id",)), ("model", ("Model",)), ("manufacturer", ("Manufacturer",)), ("part_number", ("PartNumber",)),
+                                             ("serial_number", ("SerialNumber",)), ("firmware_version", ("Controllers", 0, "FirmwarePackageVersion")),
+                                             ("health", ("Status", "Health"))]),
+    "network_ports": ("NetworkPorts", [("id", ("Id",)), ("adapter", ("Adapter",)), ("mac_address", ("AssociatedNetworkAddresses", 0)), ("link_status", ("LinkStatus",)),
+                                       ("speed_mbps", ("CurrentLinkSpeedMbps",)), ("health", ("Status", "Health"))]),
+    "firmware": ("Firmware", [("id", ("Id",)), ("name", ("Name",)), ("version", ("Version",)), ("component_id", ("Oem", "Dell", "DellSoftwareInventory", "ComponentID")),
+                              ("updateable", ("Updateable",))]),
+}
+
+HOST_COLUMNS = [("service_tag", ("SKU",)), ("model", ("Model",)), ("manufacturer", ("Manufacturer",)), ("serial_number", ("SerialNumber",)),
+                ("bios_version", ("BiosVersion",)), ("power_state", ("PowerState",)), ("memory_gib", ("MemorySummary", "TotalSystemMemoryGiB")),
+                ("processor_count", ("ProcessorSummary", "Count")), ("health", ("Status", "Health"))]
+
+INDEXED_COLUMNS = ("service_tag", "model", "part_number", "component_id")
+
+# Properties whose value changes without any hardware or firmware change, not reported in the change log
+VOLATILE_PROPERTIES = (u'Reading', u'PowerState', u'LastPowerOutputWatts', u'LineInputVoltage', u'PowerInputWatts', u'PowerOutputWatts', u'LastSystemInventoryTime',
+                       u'LastUpdateTime', u'@odata.etag')
+
+
+def _value(resource, path):
+    for key in path:
+        try:
+            resource = resource[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    if isinstance(resource, (dict, list)):
+        return json.dumps(resource, sort_keys=True)
+    return resource
+
+
+def _diff(old, new, prefix=""):
+    # {property path: [old value, new value]} of every non volatile property which differs
+    details = {}
+    for key in sorted(set(old) | set(new)):
+        if key in VOLATILE_PROPERTIES:
+            continue
+        old_value, new_value = old.get(key), new.get(key)
+        if old_value == new_value:
+            continue
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            details.update(_diff(old_value, new_value, prefix + key + "."))
+        else:
+            details[prefix + key] = [old_value, new_value]
+    return details
+
+
+class SnapshotCache(object):
+    """ETag cache of the documents read from one host by the previous inventory, passed to RedfishTransport as cache. Collects the documents of
+    the current run for InventoryStore.store()."""
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+        self.documents = {}
+        self.revalidated = 0
+        self.downloaded = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, host, uri):
+        return self.entries.get(uri)
+
+    def store(self, host, uri, response):
+        entry = RedfishCache.entry_from_response(response)
+        with self.lock:
+            self.downloaded += 1
+            if entry is not None:
+                self.documents[uri] = entry
+
+    def cached_response(self, host, uri, entry, not_modified):
+        with self.lock:
+            self.revalidated += 1
+            self.documents[uri] = entry
+        return RedfishCache.response_from_entry(entry, not_modified)
+
+
+class InventoryStore(object):
+    """SQLite store of fleet hardware inventory. One instance can be shared by the threads of a fleet run."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=120, check_same_thread=False, isolation_level=None)
+        with self.lock:
+            self.db.execute("CREATE TABLE IF NOT EXISTS hosts (host TEXT PRIMARY KEY, %s, collected REAL, data TEXT)" % ", ".join(column for column, path in HOST_COLUMNS))
+            for table, (key, columns) in sorted(TABLES.items()):
+                self.db.execute("CREATE TABLE IF NOT EXISTS %s (host TEXT, %s, odata_id TEXT, data TEXT)" % (table, ", ".join(column for column, path in columns)))
+                self.db.execute("CREATE INDEX IF NOT EXISTS %s_host ON %s (host)" % (table, table))
+            for table, columns in [("hosts", HOST_COLUMNS)] + [(table, columns) for table, (key, columns) in sorted(TABLES.items())]:
+                for column, path in columns:
+                    if column in INDEXED_COLUMNS:
+                        self.db.execute("CREATE INDEX IF NOT EXISTS %s_%s ON %s (%s)" % (table, column, table, column))
+            self.db.execute("CREATE TABLE IF NOT EXISTS resources (host TEXT, uri TEXT, etag TEXT, headers TEXT, body BLOB, PRIMARY KEY (host, uri))")
+            self.db.execute("CREATE TABLE IF NOT EXISTS changes (id INTEGER PRIMARY KEY AUTOINCREMENT, host TEXT, changed REAL, table_name TEXT, component TEXT, change TEXT, details TEXT)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS changes_host ON changes (host, changed)")
+
+    def snapshot(self, host):
+        """Return the SnapshotCache of the documents stored for host, empty when the host was not collected before."""
+        with self.lock:
+            rows = self.db.execute("SELECT uri, etag, headers, body FROM resources WHERE host = ?", (host,)).fetchall()
+        return SnapshotCache(dict((uri, {"etag": etag, "headers": json.loads(headers), "body": zlib.decompress(bytes(body))}) for uri, etag, headers, body in rows))
+
+    def store(self, host, inventory, snapshot=None, collected=None):
+        """Update the rows of host to the inventory_snapshot() result inventory, saving the documents of snapshot for the next refresh.
+
+        Returns (counts, changes): {table: number of rows of host} and the list of changes recorded in the change log."""
+        collected = collected or time.time()
+        counts = {}
+        changes = []
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                system = inventory["System"]
+                row = self.db.execute("SELECT data FROM hosts WHERE host = ?", (host,)).fetchone()
+                new_host = row is None
+                if new_host:
+                    changes.append({"table": "hosts", "component": host, "change": "added"})
+                else:
+                    details = _diff(json.loads(row[0]), system)
+                    if details:
+                        changes.append({"table": "hosts", "component": host, "change": "modified", "details": details})
+                self.db.execute("INSERT OR REPLACE INTO hosts VALUES (?, %s, ?, ?)" % ", ".join("?" for column in HOST_COLUMNS),
+                                [host] + [_value(system, path) for column, path in HOST_COLUMNS] + [collected, json.dumps(system, sort_keys=True)])
+                for table, (key, columns) in sorted(TABLES.items()):
+                    if key not in inventory:
+                        continue
+                    existing = {}
+                    for rowid, odata_id, component_id, data in self.db.execute("SELECT rowid, odata_id, id, data FROM %s WHERE host = ?" % table, (host,)):
+                        existing[odata_id or component_id] = (rowid, data)
+                    insert = "INSERT INTO %s VALUES (?, %s, ?, ?)" % (table, ", ".join("?" for column in columns))
+                    for resource in inventory[key]:
+                        component = resource.get(u'@odata.id') or resource.get(u'Id')
+                        data = json.dumps(resource, sort_keys=True)
+                        if component in existing:
+                            rowid, old_data = existing.pop(component)
+                            if old_data == data:
+                                continue
+                            details = _diff(json.loads(old_data), resource)
+                            if details:
+                                changes.append({"table": table, "component": component, "change": "modified", "details": details})
+                            self.db.execute("DELETE FROM %s WHERE rowid = ?" % table, (rowid,))
+                        elif not new_host:
+                            changes.append({"table": table, "component": component, "change": "added"})
+                        self.db.execute(insert, [host] + [_value(resource, path) for column, path in columns] + [resource.get(u'@odata.id'), data])
+                    for component, (rowid, old_data) in existing.items():
+                        changes.append({"table": table, "component": component, "change": "removed"})
+                        self.db.execute("DELETE FROM %s WHERE rowid = ?" % table, (rowid,))
+                    counts[table] = len(inventory[key])
+                self.db.executemany("INSERT INTO changes (host, changed, table_name, component, change, details) VALUES (?, ?, ?, ?, ?, ?)",
+                                    [(host, collected, i["table"], i["component"], i["change"], json.dumps(i.get("details"), sort_keys=True)) for i in changes])
+                if snapshot is not None:
+                    self.db.execute("DELETE FROM resources WHERE host = ?", (host,))
+                    self.db.executemany("INSERT INTO resources VALUES (?, ?, ?, ?, ?)", [(host, uri, entry["etag"], json.dumps(entry["headers"]), sqlite3.Binary(zlib.compress(entry["body"])))
+                                                                                       for uri, entry in snapshot.documents.items()])
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+        return counts, changes
+
+    def query(self, sql, parameters=()):
+        """Run a read query, returns (column names, rows)."""
+        with self.lock:
+            cursor = self.db.execute(sql, parameters)
+            return [i[0] for i in cursor.description or []], cursor.fetchall()
+
+    def find(self, value):
+        """Return [(table, host, id, column)] of every component whose part number or model is value."""
+        matches = []
+        for table, (key, columns) in sorted(TABLES.items()):
+            for column in ("part_number", "model"):
+                if column in [name for name, path in columns]:
+                    matches.extend((table, host, component_id, column) for host, component_id in self.query("SELECT host, id FROM %s WHERE %s = ?" % (table, column), (value,))[1])
+        matches.extend(("hosts", host, service_tag, "model") for host, service_tag in self.query("SELECT host, service_tag FROM hosts WHERE model = ?", (value,))[1])
+        return matches
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,148 @@
+#
+# RedfishJobHistory. Python module keeping a local history of how long iDRAC jobs stay in each JobState, used by RedfishJobWatcher to poll each
+# job when it is likely to change instead of at a fixed interval.
+#
+# NOTE: Each JobState change the watcher sees records how long the job was in the previous state, under a key made of the JobType and Name of the
+# job, the server model, the iDRAC firmware version and that JobState (a firmware job stays Scheduled until the server reboots, then Running for
+# minutes, a configuration export runs for seconds). The change is taken half way between the last poll which saw the old state and the poll
+# which saw the new one, so the poll interval itself does not end up in the history. Changes to a failed state are not recorded and the newest
+# MAX_SAMPLES durations of each key are kept.
+#
+# NOTE: next_poll_delay() plans the polls of a job from the durations of its key: polls are sparse until the fastest 10% of past jobs left the
+# state, dense (DENSE_POLLS polls, at least MIN_INTERVAL apart) between the 10th and 90th percentile whatever the fixed interval of the caller,
+# then the delay doubles from MIN_INTERVAL back to the fixed interval once the job is in the state longer than 90% of past jobs. With fewer than
+# MIN_SAMPLES durations the fixed interval is used.
+#
+# NOTE: The history is a JSON file, set environment variable REDFISH_JOB_HISTORY to its path (default is no history, fixed intervals) or call
+# set_history_path(). It is written to a temporary file first and then renamed, so a crash never leaves a partial history.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, RedfishOperations, json, os, sys, threading
+
+MANAGER_URI = "/redfish/v1/Managers/iDRAC.Embedded.1"
+MAX_SAMPLES = 50
+MIN_SAMPLES = 3
+DENSE_POLLS = 32
+MIN_INTERVAL = 1
+# Longest sparse wait before the fastest jobs finish, as a multiple of the fixed interval of the caller
+SPARSE_FACTOR = 10
+
+_lock = threading.Lock()
+_history = None
+_platforms = {}
+
+
+def percentile(values, percent):
+    """Nearest rank percentile of values, same as RedfishFleet.FleetSummary.percentile."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))]
+
+
+def next_poll_delay(durations, elapsed, interval):
+    """Seconds from now until the next poll of a job in its JobState for elapsed seconds, planned from past durations of the same key."""
+    if len(durations) < MIN_SAMPLES:
+        return interval
+    p10 = percentile(durations, 10)
+    p90 = percentile(durations, 90)
+    shortest = min(MIN_INTERVAL, interval)
+    if elapsed < p10:
+        return max(shortest, min(p10 - elapsed, interval * SPARSE_FACTOR))
+    if elapsed < p90:
+        # Most jobs leave the state in this window, its polls are spread over it whatever the interval (not capped at the interval)
+        return max(MIN_INTERVAL, (p90 - p10) / float(DENSE_POLLS))
+    # Late job, poll again soon and back off doubling the delay (the time since p90) up to the interval
+    return max(shortest, min(elapsed - p90, interval))
+
+
+class JobHistory(object):
+    """Durations in seconds jobs stayed in a JobState by job key, see job_key()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.durations = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.durations = json.load(f).get("durations", {})
+
+    def _save(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"durations": self.durations}, f, indent=1, sort_keys=True)
+        try:
+            os.rename(temp_path, self.path)
+        except OSError:
+            # Python 2 has no os.replace and os.rename doesn't overwrite an existing file on Windows
+            os.remove(self.path)
+            os.rename(temp_path, self.path)
+
+    def samples(self, key):
+        with self.lock:
+            return list(self.durations.get(key, []))
+
+    def record(self, key, seconds):
+        with self.lock:
+            samples = self.durations.setdefault(key, [])
+            samples.append(round(seconds, 1))
+            del samples[:-MAX_SAMPLES]
+            self._save()
+
+
+def set_history_path(path):
+    """Use the job history file at path, None stops using a history."""
+    global _history
+    with _lock:
+        _history = JobHistory(path) if path else None
+
+
+def history():
+    """Return the JobHistory of the script, None when no history file is set."""
+    return _history
+
+
+def print_stats(stream=None):
+    stream = stream or sys.stderr
+    job_history = _history
+    if job_history is None:
+        return
+    with job_history.lock:
+        durations = dict((key, list(samples)) for key, samples in job_history.durations.items())
+    planned = sum(1 for samples in durations.values() if len(samples) >= MIN_SAMPLES)
+    stream.write("- INFO, job history \"%s\": %s job state(s) known, %s with enough samples to plan polls, %s duration(s) recorded\n" % (
+                 job_history.path, len(durations), planned, sum(len(samples) for samples in durations.values())))
+
+
+def platform(idrac_ip, auth):
+    """(Model, iDRAC FirmwareVersion) of the iDRAC, read once per script run."""
+    with _lock:
+        if idrac_ip in _platforms:
+            return _platforms[idrac_ip]
+    model = firmware = None
+    response = RedfishTransport.get_select("https://%s%s" % (idrac_ip, RedfishOperations.SYSTEM_URI), ["Model"], verify=False, auth=auth)
+    if response.status_code == 200:
+        model = response.json().get(u'Model')
+    response = RedfishTransport.get_select("https://%s%s" % (idrac_ip, MANAGER_URI), ["FirmwareVersion"], verify=False, auth=auth)
+    if response.status_code == 200:
+        firmware = response.json().get(u'FirmwareVersion')
+    with _lock:
+        _platforms[idrac_ip] = (model, firmware)
+    return model, firmware
+
+
+def job_key(job, model, firmware, job_state):
+    return "|".join(str(i) for i in (job.get(u'JobType'), job.get(u'Name'), model, firmware, job_state))
+
+
+try:
+    set_history_path(os.environ.get("REDFISH_JOB_HISTORY", ""))
+except (IOError, ValueError) as error:
+    sys.stderr.write("- WARNING, unable to read job history file \"%s\", polling at fixed intervals: %s\n" % (os.environ.get("REDFISH_JOB_HISTORY"), error))
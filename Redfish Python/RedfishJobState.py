@@ -0,0 +1,144 @@
+#
+# RedfishJobState. Python module with the JobState and TaskState values of iDRAC jobs and tasks, and monotonic deadlines for job waits.
+#
+# NOTE: JobState and TaskState hold the state strings of the job documents (JobState.COMPLETED == "Completed"), so job documents need no
+# conversion. job_state() and task_state() read the state of a Jobs document or of a TaskService task (the JobState of a task is under Oem.Dell)
+# and return UNKNOWN for values this module doesn't know. Job status is taken from the state first. Some iDRAC firmware versions only report the
+# outcome in the Message text (JobState missing, unknown, or left at Running), so while the state is not a finished one job_state() falls back
+# to the same Message checks the scripts used before ("fail" / "error", "completed with errors", "completed successfully", "scheduled").
+#
+# NOTE: Deadlines are times of the monotonic clock (time.monotonic), so a wait is not cut short or made longer when the system clock is set
+# (NTP, daylight saving time, laptop resume). Python 2 has no monotonic clock, time.time is used there. deadline() returns None for no timeout,
+# expired() and remaining() accept None.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import time
+
+monotonic = getattr(time, "monotonic", time.time)
+
+
+class JobState(object):
+    """JobState of a Jobs document, DMTF Job states and the iDRAC job states."""
+    NEW = "New"
+    STARTING = "Starting"
+    SCHEDULING = "Scheduling"
+    SCHEDULED = "Scheduled"
+    DOWNLOADING = "Downloading"
+    DOWNLOADED = "Downloaded"
+    WAITING = "Waiting"
+    READY_FOR_EXECUTION = "ReadyForExecution"
+    RUNNING = "Running"
+    PENDING = "Pending"
+    PENDING_ACTIVATION = "PendingActivation"
+    PAUSED = "Paused"
+    SUSPENDED = "Suspended"
+    INTERRUPTED = "Interrupted"
+    STOPPING = "Stopping"
+    REBOOT_PENDING = "RebootPending"
+    REBOOT_COMPLETED = "RebootCompleted"
+    USER_INTERVENTION = "UserIntervention"
+    SERVICE = "Service"
+    CONTINUE = "Continue"
+    COMPLETED = "Completed"
+    COMPLETED_WITH_ERRORS = "CompletedWithErrors"
+    FAILED = "Failed"
+    REBOOT_FAILED = "RebootFailed"
+    CANCELLED = "Cancelled"
+    EXCEPTION = "Exception"
+    UNKNOWN = "Unknown"
+
+
+class TaskState(object):
+    """TaskState of a TaskService task."""
+    NEW = "New"
+    STARTING = "Starting"
+    RUNNING = "Running"
+    PENDING = "Pending"
+    SUSPENDED = "Suspended"
+    INTERRUPTED = "Interrupted"
+    STOPPING = "Stopping"
+    SERVICE = "Service"
+    CANCELLING = "Cancelling"
+    COMPLETED = "Completed"
+    KILLED = "Killed"
+    CANCELLED = "Cancelled"
+    EXCEPTION = "Exception"
+    UNKNOWN = "Unknown"
+
+
+# Finished jobs which did not do what they were created for
+FAILED_JOB_STATES = frozenset([JobState.FAILED, JobState.REBOOT_FAILED, JobState.CANCELLED, JobState.EXCEPTION])
+FINISHED_JOB_STATES = FAILED_JOB_STATES | frozenset([JobState.COMPLETED, JobState.COMPLETED_WITH_ERRORS])
+FINISHED_TASK_STATES = frozenset([TaskState.COMPLETED, TaskState.KILLED, TaskState.CANCELLED, TaskState.EXCEPTION])
+
+_JOB_STATES = frozenset(value for name, value in vars(JobState).items() if name.isupper())
+_TASK_STATES = frozenset(value for name, value in vars(TaskState).items() if name.isupper())
+
+
+def message_state(message, state=JobState.UNKNOWN):
+    """JobState told by the Message of a job whose state is not a finished one, state when the message tells nothing more."""
+    message = (message or "").lower()
+    if "completed with errors" in message:
+        return JobState.COMPLETED_WITH_ERRORS
+    if "fail" in message or "error" in message:
+        return JobState.FAILED
+    if "completed successfully" in message:
+        return JobState.COMPLETED
+    if state == JobState.UNKNOWN and "scheduled" in message:
+        return JobState.SCHEDULED
+    return state
+
+
+def job_state(document):
+    """JobState of a Jobs document or of a task (Oem.Dell.JobState), from the Message when the state is missing, not a known state or not
+    finished and the Message tells the outcome (see message_state), UNKNOWN otherwise."""
+    if not document:
+        return JobState.UNKNOWN
+    dell = document.get(u'Oem', {}).get(u'Dell', {})
+    value = document.get(u'JobState') or dell.get(u'JobState')
+    state = value if value in _JOB_STATES else JobState.UNKNOWN
+    if state in FINISHED_JOB_STATES:
+        return state
+    return message_state(document.get(u'Message') or dell.get(u'Message'), state)
+
+
+def task_state(document):
+    """TaskState of a task, UNKNOWN when missing or not a known state."""
+    if not document:
+        return TaskState.UNKNOWN
+    value = document.get(u'TaskState')
+    return value if value in _TASK_STATES else TaskState.UNKNOWN
+
+
+def finished(document):
+    return job_state(document) in FINISHED_JOB_STATES
+
+
+def failed(document):
+    """True when the job finished without doing its work. CompletedWithErrors is finished but not failed, see succeeded()."""
+    return job_state(document) in FAILED_JOB_STATES
+
+
+def succeeded(document):
+    return job_state(document) == JobState.COMPLETED
+
+
+def deadline(timeout):
+    """Monotonic time timeout seconds from now, None for no timeout."""
+    return monotonic() + timeout if timeout is not None else None
+
+
+def remaining(deadline):
+    """Seconds left until deadline (0 once it passed), None for no deadline."""
+    return max(0.0, deadline - monotonic()) if deadline is not None else None
+
+
+def expired(deadline):
+    return deadline is not None and monotonic() >= deadline
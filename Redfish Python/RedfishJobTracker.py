@@ -0,0 +1,205 @@
+#
+# RedfishJobTracker. Python module tracking many iDRAC jobs at the same time (thousands, across a fleet) from one scheduler thread, without one
+# waiting thread per job.
+#
+# NOTE: Each tracked job has a next check time and a deadline on the monotonic clock (see RedfishJobState). The check times are kept in a heap,
+# the scheduler thread sleeps until the earliest one, so tracking a job costs O(log n) when it is added or checked and nothing while it is not due.
+# The jobs of one iDRAC which are due at the same time are read with one RedfishJobWatcher.fetch_jobs() call (one GET of the Jobs collection with
+# $expand) on a pool of worker threads, so a slow iDRAC does not hold up the checks of the others.
+#
+# NOTE: Job status is taken from the JobState of the job document (RedfishJobState), not from the Message text. A job is done when until(job
+# document) is true, RedfishJobState.finished by default. A job whose deadline passed is done with a JobTrackError without another GET, a job
+# whose iDRAC could not be read is done with the JobWatchError of that GET. When only the GET of one job failed (job deleted from the queue) only
+# that job is done with the error, the other jobs of the iDRAC are tracked on.
+#
+# NOTE: track() returns a TrackedJob right away. Wait for it with result(), or pass in on_change / on_done callbacks which run on the worker
+# threads (keep them short, they delay the other jobs of the same iDRAC).
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishJobWatcher, RedfishJobState, heapq, itertools, threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_INTERVAL = RedfishJobWatcher.POLL_INTERVAL
+MAX_WORKERS = 32
+
+
+class JobTrackError(RedfishJobWatcher.JobWatchError):
+    """Raised by TrackedJob.result() when the job was not done before its deadline."""
+
+
+def _status(job):
+    return RedfishJobState.job_state(job), job.get(u'Message'), job.get(u'PercentComplete')
+
+
+class TrackedJob(object):
+    """One job of a JobTracker. job is the last document read (None before the first check), error the exception the job ended with."""
+    __slots__ = ("idrac_ip", "auth", "job_id", "interval", "deadline", "timeout", "until", "on_change", "on_done", "job", "error", "checks", "cancelled",
+                 "done")
+
+    def __init__(self, idrac_ip, auth, job_id, interval, timeout, until, on_change, on_done):
+        self.idrac_ip = idrac_ip
+        self.auth = auth
+        self.job_id = job_id
+        self.interval = interval
+        self.timeout = timeout
+        self.deadline = RedfishJobState.deadline(timeout)
+        self.until = until
+        self.on_change = on_change
+        self.on_done = on_done
+        self.job = None
+        self.error = None
+        self.checks = 0
+        self.cancelled = False
+        self.done = threading.Event()
+
+    @property
+    def state(self):
+        return RedfishJobState.job_state(self.job)
+
+    def result(self, timeout=None):
+        """Wait until the job is done and return its last document, raises the error the job ended with."""
+        if not self.done.wait(timeout):
+            raise JobTrackError("- FAIL, job %s of %s still tracked after %s seconds" % (self.job_id, self.idrac_ip, timeout))
+        if self.error is not None:
+            raise self.error
+        return self.job
+
+
+class JobTracker(object):
+    """Tracks jobs of any number of iDRACs. fetch(idrac_ip, auth, job_ids, count_request) reads job documents and returns ({job id: document},
+    {job id: error}), RedfishJobWatcher.fetch_jobs by default. requests counts the GETs sent, checks the job checks done."""
+
+    def __init__(self, workers=None, fetch=None):
+        self.fetch = fetch or RedfishJobWatcher.fetch_jobs
+        self.condition = threading.Condition()
+        self.heap = []
+        # Tie breaker of equal check times, TrackedJob objects are not ordered
+        self.sequence = itertools.count()
+        self.active = 0
+        self.requests = 0
+        self.checks = 0
+        self.closed = False
+        self.executor = ThreadPoolExecutor(max_workers=workers or MAX_WORKERS)
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def track(self, idrac_ip, auth, job_id, timeout=None, interval=POLL_INTERVAL, until=RedfishJobState.finished, on_change=None, on_done=None):
+        """Start tracking a job, the first check is right away. Returns the TrackedJob."""
+        tracked = TrackedJob(idrac_ip, auth, job_id, interval, timeout, until, on_change, on_done)
+        with self.condition:
+            self.active += 1
+            self._schedule(tracked, RedfishJobState.monotonic())
+        return tracked
+
+    def cancel(self, tracked):
+        """Stop tracking a job, its heap entry is dropped when it comes up."""
+        with self.condition:
+            if not tracked.cancelled and not tracked.done.is_set():
+                tracked.cancelled = True
+                self.active -= 1
+                self.condition.notify_all()
+
+    def _schedule(self, tracked, due):
+        # Called with the condition held. The scheduler only needs to wake up when the new entry is the earliest one
+        heapq.heappush(self.heap, (due, next(self.sequence), tracked))
+        if self.heap[0][2] is tracked:
+            self.condition.notify_all()
+
+    def _count_request(self):
+        with self.condition:
+            self.requests += 1
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.closed:
+                    now = RedfishJobState.monotonic()
+                    if self.heap and self.heap[0][0] <= now:
+                        break
+                    self.condition.wait(self.heap[0][0] - now if self.heap else None)
+                if self.closed:
+                    return
+                due = {}
+                while self.heap and self.heap[0][0] <= now:
+                    tracked = heapq.heappop(self.heap)[2]
+                    if not tracked.cancelled:
+                        due.setdefault(tracked.idrac_ip, []).append(tracked)
+            for idrac_ip, jobs in due.items():
+                self.executor.submit(self._check, idrac_ip, jobs[0].auth, jobs)
+
+    def _finish(self, tracked, error=None):
+        tracked.error = error
+        with self.condition:
+            if tracked.cancelled:
+                return
+            self.active -= 1
+            self.condition.notify_all()
+        tracked.done.set()
+        if tracked.on_done is not None:
+            tracked.on_done(tracked)
+
+    def _check(self, idrac_ip, auth, jobs):
+        # Runs on a worker thread for the jobs of one iDRAC which are due
+        pending = []
+        for tracked in jobs:
+            if RedfishJobState.expired(tracked.deadline):
+                self._finish(tracked, JobTrackError("- FAIL, timeout of %s seconds hit waiting for job %s of %s, current message is: %s" % (
+                             tracked.timeout, tracked.job_id, idrac_ip, (tracked.job or {}).get(u'Message'))))
+            else:
+                pending.append(tracked)
+        if not pending:
+            return
+        try:
+            documents, errors = self.fetch(idrac_ip, auth, sorted(set(tracked.job_id for tracked in pending)), self._count_request)
+        except Exception as error:
+            for tracked in pending:
+                self._finish(tracked, error)
+            return
+        now = RedfishJobState.monotonic()
+        with self.condition:
+            self.checks += len(pending)
+        for tracked in pending:
+            tracked.checks += 1
+            if tracked.job_id in errors:
+                self._finish(tracked, errors[tracked.job_id])
+                continue
+            job = documents.get(tracked.job_id)
+            if job is not None and (tracked.job is None or _status(job) != _status(tracked.job)):
+                tracked.job = job
+                if tracked.on_change is not None:
+                    tracked.on_change(tracked)
+            if job is not None and tracked.until(job):
+                self._finish(tracked)
+                continue
+            # The deadline gets its own entry, a timeout is reported on time instead of at the next interval
+            due = now + tracked.interval
+            with self.condition:
+                if not tracked.cancelled:
+                    self._schedule(tracked, min(due, tracked.deadline) if tracked.deadline is not None else due)
+
+    def wait_all(self, timeout=None):
+        """Wait until no job is tracked any more, returns False when timeout seconds passed first."""
+        deadline = RedfishJobState.deadline(timeout)
+        with self.condition:
+            while self.active:
+                remaining = RedfishJobState.remaining(deadline)
+                if remaining == 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        self.executor.shutdown(wait=True)
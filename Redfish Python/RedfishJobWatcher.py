@@ -0,0 +1,290 @@
+#
+# RedfishJobWatcher. Python module polling the job queue of an iDRAC once per tick for every job being waited on, instead of one GET per job per
+# tick in each polling loop.
+#
+# NOTE: All threads of the script waiting on jobs of the same iDRAC share one JobWatcher (see watcher_for). The first waiter whose tick is due
+# polls for every job being watched and the other waiters get the job documents of that poll. With more than one job watched the poll is one GET
+# of the Jobs collection with $expand, with one job it is a GET of that job. iDRACs which reject $expand get one GET per watched job.
+#
+# NOTE: wait_for_change() returns as soon as the job state, message or percent complete changed, so a polling loop prints each new status once
+# instead of on every tick. wait() waits until a job is finished (or any other condition) and raises JobWatchError when the poll failed or the
+# timeout was hit. Each waiter passes the poll interval it wants, the watcher polls at the shortest interval of the current waiters. A poll which
+# could not reach the iDRAC (connection error, timeout, open circuit breaker) raises JobQueueUnreachable, a JobWatchError as well.
+#
+# NOTE: With events (see RedfishEventReceiver) wake() is called for every event the iDRAC sends, which polls right away, and the regular poll
+# slows down to EVENT_POLL_INTERVAL as a safety net. When a safety poll finds a job change no event announced, events are considered lost for
+# the iDRAC and the watcher goes back to the interval of the waiters.
+#
+# NOTE: With a job history (see RedfishJobHistory) the watcher learns how long each kind of job stays in each JobState and plans the polls of a
+# job from that instead of the fixed interval of the waiters: sparse while the job is unlikely to change, dense around the usual change time.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, RedfishCollection, RedfishOperations, RedfishJobHistory, RedfishJobState, requests, threading
+
+JOBS_URI = RedfishOperations.JOBS_URI
+POLL_INTERVAL = 5
+EVENT_POLL_INTERVAL = 60
+
+# Job states of a job which will not change any more, see RedfishJobState
+FINISHED_STATES = RedfishJobState.FINISHED_JOB_STATES
+FAILED_STATES = RedfishJobState.FAILED_JOB_STATES
+
+_lock = threading.Lock()
+_watchers = {}
+
+
+class JobWatchError(RedfishOperations.RedfishOperationError):
+    """Raised when the job queue could not be read or a wait timed out."""
+
+
+class JobQueueUnreachable(JobWatchError):
+    """Raised when a poll got no response from the iDRAC, for example while the iDRAC or the server reboots."""
+
+
+def finished(job):
+    return RedfishJobState.finished(job)
+
+
+def _status(job):
+    return job.get(u'JobState'), job.get(u'Message'), job.get(u'PercentComplete')
+
+
+class JobWatcher(object):
+    """Shared poller of the jobs of one iDRAC. jobs holds the last document read of each job, requests the number of GETs sent."""
+
+    def __init__(self, idrac_ip, auth):
+        self.idrac_ip = idrac_ip
+        self.auth = auth
+        self.condition = threading.Condition()
+        self.jobs = {}
+        self.read_time = {}
+        self.watched = {}
+        self.waiters = []
+        self.platform = None
+        self.states = {}
+        self.errors = {}
+        self.polling = False
+        # Monotonic clock times, see RedfishJobState
+        self.last_poll = float("-inf")
+        self.polls = 0
+        self.requests = 0
+        self.event_driven = False
+        self.woken = False
+        self.wake_pending = False
+        self.poll_requested = False
+        self.events = 0
+        self.missed_events = 0
+
+    def watch(self, job_ids):
+        """Include jobs in every poll until unwatch(), for example every job a script is going to wait on one after the other."""
+        with self.condition:
+            for job_id in job_ids:
+                self.watched[job_id] = self.watched.get(job_id, 0) + 1
+
+    def unwatch(self, job_ids):
+        with self.condition:
+            for job_id in job_ids:
+                self.watched[job_id] -= 1
+                if not self.watched[job_id]:
+                    del self.watched[job_id]
+
+    def set_event_driven(self, event_driven):
+        with self.condition:
+            self.event_driven = event_driven
+            self.condition.notify_all()
+
+    def wake(self):
+        """Poll right away, called when the iDRAC sent an event. An event arriving during a poll starts another poll once it finished."""
+        with self.condition:
+            self.events += 1
+            self.woken = True
+            if self.polling:
+                self.wake_pending = True
+            else:
+                self.poll_requested = True
+            self.condition.notify_all()
+
+    def _next_poll(self):
+        # Time of the next poll: the earliest poll one of the waiters wants, planned from the job history or interval after the last poll
+        if self.poll_requested:
+            return 0.0
+        times = []
+        for job_id, interval in self.waiters:
+            state = self.states.get(job_id)
+            if state is not None and state["durations"] and job_id in self.read_time:
+                read_time = self.read_time[job_id]
+                times.append(read_time + RedfishJobHistory.next_poll_delay(state["durations"], read_time - state["start"], interval))
+            else:
+                times.append(self.last_poll + interval)
+        next_poll = min(times) if times else self.last_poll + POLL_INTERVAL
+        return max(next_poll, self.last_poll + EVENT_POLL_INTERVAL) if self.event_driven else next_poll
+
+    def _track_state(self, history, job_id, job, previous_read):
+        # Called with the condition held after each read of a job. The JobState changed between the previous read and this one, so the time in the
+        # previous state ends half way between both reads (the poll interval does not end up in the history). The state a job is in when it is first
+        # read started at an unknown time, it is neither recorded nor planned from the history
+        state = self.states.get(job_id)
+        job_state = job.get(u'JobState')
+        if state is not None and state["state"] == job_state:
+            return
+        now = self.read_time[job_id]
+        known = previous_read is not None and state is not None
+        start = (previous_read + now) / 2.0 if known else now
+        if state is not None and state["known"] and job_state not in FAILED_STATES:
+            history.record(state["key"], start - state["start"])
+        if finished(job):
+            self.states.pop(job_id, None)
+            return
+        key = RedfishJobHistory.job_key(job, self.platform[0], self.platform[1], job_state)
+        self.states[job_id] = {"state": job_state, "start": start, "key": key, "known": known, "durations": history.samples(key) if known else []}
+
+    def _count_request(self):
+        with self.condition:
+            self.requests += 1
+
+    def _fetch(self, job_ids):
+        # Runs without the lock held, returns ({job id: job document}, {job id: JobWatchError})
+        if self.platform is None and RedfishJobHistory.history() is not None:
+            self.platform = RedfishJobHistory.platform(self.idrac_ip, self.auth)
+        return fetch_jobs(self.idrac_ip, self.auth, job_ids, self._count_request)
+
+    def _poll(self):
+        # Called with the condition held, released while the requests are sent so other waiters keep waiting on the condition
+        self.polling = True
+        self.poll_requested = False
+        woken, self.woken = self.woken, False
+        job_ids = sorted(self.watched)
+        jobs, job_errors, error = {}, {}, None
+        self.condition.release()
+        try:
+            jobs, job_errors = self._fetch(job_ids)
+        except JobWatchError as exception:
+            error = exception
+        except requests.exceptions.RequestException as exception:
+            # Includes RedfishRetry.CircuitOpenError
+            error = JobQueueUnreachable("- FAIL, unable to reach iDRAC %s to check job status: %s" % (self.idrac_ip, exception))
+        except Exception as exception:
+            error = JobWatchError("- FAIL, unable to check job status on iDRAC %s: %s" % (self.idrac_ip, exception))
+        finally:
+            self.condition.acquire()
+            self.polling = False
+            self.last_poll = RedfishJobState.monotonic()
+            self.polls += 1
+            # A failed poll is raised to the waiters which were waiting for it, the next poll clears it. When only the GET of one job failed
+            # (job deleted from the queue) only the waiters of that job get the error
+            if error is not None:
+                self.errors = dict((job_id, (self.polls, error)) for job_id in job_ids)
+            else:
+                self.errors = dict((job_id, (self.polls, job_error)) for job_id, job_error in job_errors.items())
+            changed = False
+            history = RedfishJobHistory.history()
+            for job_id, job in jobs.items():
+                changed = changed or (job_id in job_ids and job_id in self.jobs and _status(job) != _status(self.jobs[job_id]))
+                previous_read = self.read_time.get(job_id)
+                self.jobs[job_id] = job
+                self.read_time[job_id] = self.last_poll
+                if history is not None and self.platform is not None and job_id in job_ids:
+                    self._track_state(history, job_id, job, previous_read)
+            if self.event_driven and changed and not woken:
+                # The safety poll saw a change without an event
+                self.event_driven = False
+                self.missed_events += 1
+            if self.wake_pending:
+                self.wake_pending = False
+                self.poll_requested = True
+            self.condition.notify_all()
+
+    def wait_for_change(self, job_id, last=None, timeout=None, interval=POLL_INTERVAL):
+        """Return the job document once its state, message or percent complete differ from the last document passed in (with last None, once a
+        document at most one interval old was read). After timeout seconds the newest document is returned even when nothing changed, JobWatchError
+        is raised when no document of the job was read at all."""
+        start = RedfishJobState.monotonic()
+        deadline = RedfishJobState.deadline(timeout)
+        waiter = (job_id, interval)
+        with self.condition:
+            self.watched[job_id] = self.watched.get(job_id, 0) + 1
+            self.waiters.append(waiter)
+            first_poll = self.polls
+            try:
+                while True:
+                    if job_id in self.errors and self.errors[job_id][0] > first_poll:
+                        raise self.errors[job_id][1]
+                    job = self.jobs.get(job_id)
+                    now = RedfishJobState.monotonic()
+                    if job is not None and (_status(job) != _status(last) if last is not None else self.read_time[job_id] >= start - interval):
+                        return job
+                    if deadline is not None and now >= deadline:
+                        if job is None and last is None:
+                            raise JobWatchError("- FAIL, timeout hit waiting for job %s, job status was never read" % job_id)
+                        return job if job is not None else last
+                    next_poll = self._next_poll()
+                    if not self.polling and now >= next_poll:
+                        self._poll()
+                        continue
+                    # A poll in progress notifies the condition when it is done
+                    wait = next_poll - now if not self.polling else interval
+                    if deadline is not None:
+                        wait = min(wait, deadline - now)
+                    self.condition.wait(max(wait, 0.01))
+            finally:
+                self.waiters.remove(waiter)
+                self.watched[job_id] -= 1
+                if not self.watched[job_id]:
+                    del self.watched[job_id]
+
+    def wait(self, job_id, until=finished, timeout=None, on_change=None, interval=POLL_INTERVAL):
+        """Wait until until(job document) is true, finished by default, and return the job document. on_change is called with every new status."""
+        deadline = RedfishJobState.deadline(timeout)
+        job = None
+        while True:
+            remaining = RedfishJobState.remaining(deadline)
+            if remaining is not None and remaining <= 0:
+                raise JobWatchError("- FAIL, timeout of %s seconds hit waiting for job %s, current message is: %s" % (timeout, job_id, (job or {}).get(u'Message')))
+            current = self.wait_for_change(job_id, job, remaining, interval)
+            if on_change is not None and (job is None or _status(current) != _status(job)):
+                on_change(current)
+            job = current
+            if until(job):
+                return job
+
+
+def fetch_jobs(idrac_ip, auth, job_ids, count_request=None):
+    """GET the job documents of job_ids, returns ({job id: job document}, {job id: JobWatchError}). One GET of the Jobs collection with $expand
+    for more than one job, one GET per job otherwise, when the iDRAC rejects $expand or for jobs missing from the collection. A failed GET of one
+    job only puts that job in the errors, raises JobWatchError when the collection GET failed. count_request is called once per GET sent."""
+    count_request = count_request or (lambda: None)
+    jobs, errors = {}, {}
+    if len(job_ids) > 1 and RedfishCollection.expand_supported(idrac_ip):
+        response, members = RedfishCollection.get_collection(idrac_ip, auth, JOBS_URI, fetch_members=False)
+        count_request()
+        if response.status_code != 200:
+            raise JobWatchError("- FAIL, GET command failed for URI %s, status code %s returned" % (JOBS_URI, response.status_code), response.status_code)
+        jobs = dict((member[u'Id'], member) for member in members if u'Id' in member)
+    for job_id in job_ids:
+        if job_id in jobs:
+            continue
+        uri = "%s/%s" % (JOBS_URI, job_id)
+        response = RedfishTransport.get("https://%s%s" % (idrac_ip, uri), verify=False, auth=auth)
+        count_request()
+        if response.status_code != 200:
+            errors[job_id] = JobWatchError("- FAIL, GET command failed to check job status for %s, status code %s returned" % (job_id, response.status_code),
+                                           response.status_code)
+            continue
+        jobs[job_id] = response.json()
+    return jobs, errors
+
+
+def watcher_for(idrac_ip, auth):
+    """Return the JobWatcher shared by every waiter on jobs of the iDRAC, created on first use."""
+    with _lock:
+        watcher = _watchers.get(idrac_ip)
+        if watcher is None:
+            watcher = _watchers[idrac_ip] = JobWatcher(idrac_ip, auth)
+        return watcher
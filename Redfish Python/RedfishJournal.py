@@ -0,0 +1,86 @@
+#
+# RedfishJournal. Python module with an append-only journal file recording each step of a long fleet operation per iDRAC, so the operation can resume.
+#
+# NOTE: Every step (for example image uploaded, job created, reboot issued, final state) is appended as one JSON line and flushed to disk with
+# fsync before the script goes on, so a crash, kill or laptop sleep loses at most the step that was in progress. Lines are never rewritten. When
+# the journal is opened again the lines are replayed to rebuild the last known state of every host, a partial last line left by a crash is ignored.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import json, os, threading, time
+
+
+class Journal(object):
+    """Append-only journal of per-host steps. state(host) returns every value recorded for the host so far merged together, with "step" being
+    the last step recorded."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.hosts = {}
+        self.ignored_lines = 0
+        complete = True
+        if os.path.exists(path):
+            complete = self._replay()
+        self.file = open(path, "a")
+        if not complete:
+            # Terminate a partial last line so the next step starts on a line of its own
+            self.file.write("\n")
+            self.file.flush()
+
+    def _replay(self):
+        # Returns False when the file does not end with a newline (crash while the last line was written)
+        complete = True
+        with open(self.path) as f:
+            for line in f:
+                complete = line.endswith("\n")
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Line cut short by a crash while it was written
+                    self.ignored_lines += 1
+                    continue
+                self._apply(entry)
+        return complete
+
+    def _apply(self, entry):
+        state = self.hosts.setdefault(entry["host"], {})
+        state.update(entry)
+
+    def record(self, host, step, **values):
+        """Append one step of host to the journal and wait until it is on disk."""
+        entry = dict(values)
+        entry["host"] = host
+        entry["step"] = step
+        entry["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        line = json.dumps(entry, sort_keys=True)
+        with self.lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self._apply(entry)
+
+    def state(self, host):
+        with self.lock:
+            return dict(self.hosts.get(host, {}))
+
+    def steps(self):
+        """Return {step: number of hosts whose last recorded step it is}."""
+        with self.lock:
+            counts = {}
+            for state in self.hosts.values():
+                counts[state["step"]] = counts.get(state["step"], 0) + 1
+        return counts
+
+    def close(self):
+        with self.lock:
+            self.file.close()
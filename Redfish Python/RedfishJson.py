@@ -0,0 +1,116 @@
+#
+# RedfishJson. Python module to decode Redfish JSON responses with a fast backend and to index large attribute registries without loading them whole.
+#
+# NOTE: When the optional orjson module is installed (pip install orjson) it is used to decode every response returned by RedfishTransport,
+# otherwise the standard json module is used. Set REDFISH_JSON_BACKEND=json to force the standard json module.
+#
+# NOTE: registry_index() decodes the RegistryEntries Attributes array of Bios/BiosRegistry or the manager attribute registry one attribute at a
+# time and only keeps the fields the script asked for, keyed by AttributeName. It is an index over the full response text, not a streaming
+# parser: the whole body is downloaded and held in memory as text, what is saved is the decoded object tree of the multi-MB registry (never built
+# as one big dictionary), which cuts decode time and the memory on top of the body, and each lookup is a dictionary get instead of a scan of
+# every attribute.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import json, os, re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if os.environ.get("REDFISH_JSON_BACKEND", "").lower() == "json":
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+REGISTRY_PATH = (u'RegistryEntries', u'Attributes')
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+
+
+def loads(data):
+    """Decode a JSON document (bytes or text) with the fastest available backend."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes) and not isinstance(data, str):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def _text(data):
+    data = getattr(data, "content", data)
+    if isinstance(data, bytes) and not isinstance(data, str):
+        return data.decode("utf-8")
+    if isinstance(data, str) and not isinstance(data, type(u'')):
+        return data.decode("utf-8")
+    return data
+
+
+def _skip(text, index):
+    return _whitespace.match(text, index).end()
+
+
+def _expect(text, index, character):
+    index = _skip(text, index)
+    if text[index:index + 1] != character:
+        raise ValueError("expected %r at position %s of the JSON document" % (character, index))
+    return index + 1
+
+
+def _find_member(text, index, key):
+    # text[index] is the opening brace of an object, return the position of the value stored under key. Values of other members are decoded
+    # one at a time and dropped right away
+    index = _expect(text, index, "{")
+    while True:
+        index = _skip(text, index)
+        if text[index:index + 1] == "}":
+            raise KeyError(key)
+        name, index = _decoder.raw_decode(text, index)
+        index = _skip(text, _expect(text, index, ":"))
+        if name == key:
+            return index
+        _, index = _decoder.raw_decode(text, index)
+        index = _skip(text, index)
+        if text[index:index + 1] == ",":
+            index += 1
+
+
+def iter_array(data, path=REGISTRY_PATH):
+    """Yield the elements of the array found under path (a tuple of object keys) one at a time, without decoding the rest of the document. data
+    (a response, bytes or text) is read whole, only the decoding is done one element at a time."""
+    text = _text(data)
+    index = _skip(text, 0)
+    for key in path:
+        index = _find_member(text, index, key)
+    index = _expect(text, index, "[")
+    while True:
+        index = _skip(text, index)
+        if text[index:index + 1] == "]":
+            return
+        element, index = _decoder.raw_decode(text, index)
+        yield element
+        index = _skip(text, index)
+        if text[index:index + 1] == ",":
+            index += 1
+
+
+def registry_index(data, fields=None, key=u'AttributeName', path=REGISTRY_PATH):
+    """Return {attribute name: attribute entry} for an attribute registry response (or its body), decoded with iter_array() from the full body text.
+
+    fields is a list of the entry properties to keep (for example ["Type"]), all properties are kept when it is not passed in."""
+    index = {}
+    for entry in iter_array(data, path):
+        name = entry.get(key)
+        if name is None:
+            continue
+        if fields is not None:
+            entry = dict((field, entry[field]) for field in fields if field in entry)
+        index[name] = entry
+    return index
@@ -0,0 +1,136 @@
+#
+# RedfishOperations. Python module with the read operations of the Redfish Python scripts as functions returning data, used by fleet tooling.
+#
+# NOTE: Each operation takes the iDRAC IP and auth tuple, sends its requests through RedfishTransport and returns a JSON serializable dict instead
+# of printing. A failed request raises RedfishOperationError with the URI and status code. OPERATIONS maps the operation name used on the
+# FleetRunnerREDFISH command line to the function.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, RedfishCollection
+
+SYSTEM_URI = "/redfish/v1/Systems/System.Embedded.1"
+FIRMWARE_INVENTORY_URI = "/redfish/v1/UpdateService/FirmwareInventory"
+JOBS_URI = "/redfish/v1/Managers/iDRAC.Embedded.1/Jobs"
+
+# Properties left out of hw_inventory resources, they only link to other resources or repeat the schema
+SKIPPED_PROPERTIES = (u'@odata.context', u'@odata.type', u'Links', u'Metrics', u'Actions', u'Assembly', u'RelatedItem', u'Redundancy', u'Certificates')
+
+
+class RedfishOperationError(Exception):
+    """Raised when a request of an operation did not return the expected status code."""
+
+    def __init__(self, message, status_code=None):
+        Exception.__init__(self, message)
+        self.status_code = status_code
+
+
+def _check(response, uri, expected=200):
+    if response.status_code != expected:
+        raise RedfishOperationError("- FAIL, GET command failed for URI %s, status code %s returned" % (uri, response.status_code), response.status_code)
+
+
+def power_state(idrac_ip, auth):
+    """Current server power state, same as GetPowerStateREDFISH."""
+    response = RedfishTransport.get_select("https://%s%s" % (idrac_ip, SYSTEM_URI), ["PowerState"], verify=False, auth=auth)
+    _check(response, SYSTEM_URI)
+    return {"PowerState": response.json()[u'PowerState']}
+
+
+def firmware_inventory(idrac_ip, auth):
+    """Installed and available firmware of every device, same as GetFirmwareInventoryREDFISH."""
+    response, members = RedfishCollection.get_collection(idrac_ip, auth, FIRMWARE_INVENTORY_URI)
+    _check(response, FIRMWARE_INVENTORY_URI)
+    firmware = []
+    for member in members:
+        dell = member.get(u'Oem', {}).get(u'Dell', {}).get(u'DellSoftwareInventory', {})
+        firmware.append({"Id": member.get(u'Id'), "Name": member.get(u'Name'), "Version": member.get(u'Version'), "Updateable": member.get(u'Updateable'),
+                         "ComponentID": dell.get(u'ComponentID')})
+    return {"Firmware": firmware}
+
+
+def job_queue(idrac_ip, auth):
+    """Job IDs in the iDRAC job queue, same as GetDeleteJobQueueREDFISH -g."""
+    response, members = RedfishCollection.get_collection(idrac_ip, auth, JOBS_URI)
+    _check(response, JOBS_URI)
+    jobs = []
+    for member in members:
+        if not member.get(u'Id', "").startswith("JID_"):
+            continue
+        jobs.append({"Id": member[u'Id'], "Name": member.get(u'Name'), "JobState": member.get(u'JobState'), "PercentComplete": member.get(u'PercentComplete'),
+                     "Message": member.get(u'Message')})
+    return {"Jobs": jobs}
+
+
+def _resource(data):
+    return dict((key, value) for key, value in data.items() if key not in SKIPPED_PROPERTIES)
+
+
+def _collection(idrac_ip, auth, uri, member_property=u'Members', cache=False):
+    response, members = RedfishCollection.get_collection(idrac_ip, auth, uri, member_property, cache=cache)
+    _check(response, uri)
+    return members
+
+
+def _linked(idrac_ip, auth, links, cache=False):
+    uris = [i[u'@odata.id'] for i in links]
+    resources = []
+    for uri, response in zip(uris, RedfishCollection.get_many(idrac_ip, auth, uris, cache=cache)):
+        _check(response, uri)
+        resources.append(_resource(response.json()))
+    return resources
+
+
+def hw_inventory(idrac_ip, auth, cache=False):
+    """System, memory, CPU, fan, power supply, storage and network resources, same data as GetSystemHWInventoryREDFISH -a.
+
+    cache is passed to every GET, see RedfishTransport."""
+    response = RedfishTransport.get("https://%s%s" % (idrac_ip, SYSTEM_URI), verify=False, auth=auth, cache=cache)
+    _check(response, SYSTEM_URI)
+    system = response.json()
+    links = system.get(u'Links', {})
+    inventory = {"System": _resource(system)}
+    inventory["Memory"] = [_resource(i) for i in _collection(idrac_ip, auth, SYSTEM_URI + "/Memory", cache=cache)]
+    inventory["Processors"] = [_resource(i) for i in _collection(idrac_ip, auth, SYSTEM_URI + "/Processors", cache=cache)]
+    inventory["Fans"] = _linked(idrac_ip, auth, links.get(u'CooledBy', []), cache)
+    inventory["PowerSupplies"] = _linked(idrac_ip, auth, links.get(u'PoweredBy', []), cache)
+    inventory["Storage"] = []
+    inventory["Drives"] = []
+    for controller in _collection(idrac_ip, auth, SYSTEM_URI + "/Storage", cache=cache):
+        inventory["Storage"].append(_resource(controller))
+        if controller.get(u'Drives'):
+            for drive in _collection(idrac_ip, auth, controller[u'@odata.id'], u'Drives', cache):
+                drive = _resource(drive)
+                drive["Controller"] = controller.get(u'Id')
+                inventory["Drives"].append(drive)
+    inventory["NetworkAdapters"] = []
+    inventory["NetworkPorts"] = []
+    for adapter in _collection(idrac_ip, auth, SYSTEM_URI + "/NetworkAdapters", cache=cache):
+        inventory["NetworkAdapters"].append(_resource(adapter))
+        if u'NetworkPorts' in adapter:
+            for port in _collection(idrac_ip, auth, adapter[u'NetworkPorts'][u'@odata.id'], cache=cache):
+                port = _resource(port)
+                port["Adapter"] = adapter.get(u'Id')
+                inventory["NetworkPorts"].append(port)
+    return inventory
+
+
+def inventory_snapshot(idrac_ip, auth, cache=False):
+    """hw_inventory() plus every FirmwareInventory entry, the data stored by FleetInventoryREDFISH."""
+    inventory = hw_inventory(idrac_ip, auth, cache)
+    inventory["Firmware"] = [_resource(i) for i in _collection(idrac_ip, auth, FIRMWARE_INVENTORY_URI, cache=cache)]
+    return inventory
+
+
+OPERATIONS = {
+    "power_state": power_state,
+    "firmware_inventory": firmware_inventory,
+    "job_queue": job_queue,
+    "hw_inventory": hw_inventory,
+}
@@ -0,0 +1,172 @@
+#
+# RedfishPowerSequencer. Python module used by FleetPowerSequencerREDFISH to power on many servers in staggered waves per PDU / rack group.
+#
+# NOTE: Powering on a whole rack at the same time adds up the inrush current of every power supply on the same circuit and can trip the PDU
+# breaker. sequence_power_on() puts the iDRACs in groups by an inventory column (for example "pdu" or "rack") and starts at most max_per_group
+# power-ons per group at a time, with at least stagger seconds between two power-ons of the same group. A power-on only frees its group slot
+# once the iDRAC reports PowerState On (confirmed transition) or the confirm timeout is hit, so a slow server holds back the next one of its
+# group instead of piling more load on the circuit. Groups are independent of each other and run in parallel.
+#
+# NOTE: Servers already in the requested power state are skipped without sending a reset. Power-off reset types (ForceOff, GracefulShutdown)
+# do not draw inrush current, power_off() runs them on all iDRACs at once and confirms PowerState Off.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishTransport, RedfishOperations, RedfishFleet, RedfishEventStream, collections, json, sys, threading, time
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+RESET_URI = "/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset"
+
+# PowerState each reset type ends in
+TARGET_POWER_STATE = {"On": "On", "ForceOff": "Off", "GracefulShutdown": "Off"}
+
+GROUP_COLUMN = "pdu"
+DEFAULT_GROUP = "default"
+MAX_PER_GROUP = 2
+STAGGER_SECONDS = 5
+CONFIRM_TIMEOUT = 120
+POLL_INTERVAL = 2
+
+
+class PowerSequenceError(RedfishOperations.RedfishOperationError):
+    """Raised when a reset failed or the server did not reach the requested power state in time."""
+
+
+def reset(idrac_ip, auth, reset_type):
+    """POST ComputerSystem.Reset, same as SetPowerStateREDFISH -r."""
+    response = RedfishTransport.post("https://%s%s" % (idrac_ip, RESET_URI), data=json.dumps({'ResetType': reset_type}), headers={'content-type': 'application/json'},
+                                     verify=False, auth=auth)
+    if response.status_code != 204:
+        raise PowerSequenceError("- FAIL, POST command failed for ComputerSystem.Reset %s, status code %s returned" % (reset_type, response.status_code), response.status_code)
+
+
+def wait_power_state(idrac_ip, auth, power_state, timeout, interval=POLL_INTERVAL):
+    """Poll PowerState until it is power_state. Returns the seconds it took, raises PowerSequenceError on timeout. With an event stream open for
+    the iDRAC (see RedfishEventStream) a power event triggers the next poll."""
+    start_time = time.time()
+    while True:
+        mark = RedfishEventStream.power_mark(idrac_ip)
+        current = RedfishOperations.power_state(idrac_ip, auth)["PowerState"]
+        if current == power_state:
+            return time.time() - start_time
+        if time.time() - start_time >= timeout:
+            raise PowerSequenceError("- FAIL, server did not reach power state %s within %s seconds, current power state is %s" % (power_state, timeout, current))
+        RedfishEventStream.wait_power_event(idrac_ip, mark, interval, start_time + timeout)
+
+
+def set_power_state(idrac_ip, auth, reset_type, timeout=CONFIRM_TIMEOUT, force_off=False):
+    """Send reset_type unless the server already is in the target power state, then confirm the transition.
+
+    With force_off a GracefulShutdown which did not power off the server within timeout is followed by ForceOff, same as reboot_server()."""
+    target = TARGET_POWER_STATE[reset_type]
+    current = RedfishOperations.power_state(idrac_ip, auth)["PowerState"]
+    if current == target:
+        return {"PowerState": current, "ResetType": None, "skipped": True}
+    reset(idrac_ip, auth, reset_type)
+    try:
+        seconds = wait_power_state(idrac_ip, auth, target, timeout)
+    except PowerSequenceError:
+        if not (force_off and reset_type == "GracefulShutdown"):
+            raise
+        reset(idrac_ip, auth, "ForceOff")
+        seconds = timeout + wait_power_state(idrac_ip, auth, "Off", timeout)
+        reset_type = "ForceOff"
+    return {"PowerState": target, "ResetType": reset_type, "skipped": False, "confirm_seconds": round(seconds, 1)}
+
+
+def group_hosts(hosts, group_column=GROUP_COLUMN):
+    """Return an ordered mapping of group name to list of host dicts, hosts without a value in group_column are in DEFAULT_GROUP."""
+    groups = collections.OrderedDict()
+    for host in hosts:
+        groups.setdefault(host.get(group_column) or DEFAULT_GROUP, []).append(host)
+    return groups
+
+
+def power_off(hosts, reset_type="GracefulShutdown", timeout=CONFIRM_TIMEOUT, force_off=False, workers=None, output=None, summary=None, events=False):
+    """Power off every host at once (bounded by workers) and confirm PowerState Off. Returns (FleetSummary, set of hosts confirmed off).
+    With events the event stream of each iDRAC is open while its power state is confirmed."""
+    powered_off = set()
+
+    def operation(idrac_ip, auth):
+        result = set_power_state(idrac_ip, auth, reset_type, timeout, force_off)
+        powered_off.add(idrac_ip)
+        return result
+    if events:
+        operation = RedfishEventStream.with_event_stream(operation)
+    return RedfishFleet.run(hosts, operation, reset_type, workers, output, summary), powered_off
+
+
+def sequence_power_on(hosts, reset_type="On", group_column=GROUP_COLUMN, max_per_group=MAX_PER_GROUP, stagger=STAGGER_SECONDS, timeout=CONFIRM_TIMEOUT,
+                      workers=None, output=None, summary=None, log=None, events=False):
+    """Power on every host in staggered waves per group, writing one NDJSON line per iDRAC to output. Returns the FleetSummary of the run.
+    With events the event stream of each iDRAC is open while its power state is confirmed, so its group slot frees up as soon as it is on."""
+    output = output or sys.stdout
+    summary = summary or RedfishFleet.FleetSummary(reset_type)
+    log = log or (lambda message: None)
+    workers = workers or RedfishFleet.MAX_WORKERS
+    groups = group_hosts(hosts, group_column)
+    pending = collections.OrderedDict((group, collections.deque(members)) for group, members in groups.items())
+    active = dict.fromkeys(groups, 0)
+    last_start = dict.fromkeys(groups, 0.0)
+    peak = dict.fromkeys(groups, 0)
+    in_progress = {}
+    output_lock = threading.Lock()
+
+    def operation(idrac_ip, auth):
+        return set_power_state(idrac_ip, auth, reset_type, timeout)
+    if events:
+        operation = RedfishEventStream.with_event_stream(operation, log)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while pending or in_progress:
+            now = time.time()
+            next_start = None
+            # One pass over the groups per loop so every group gets its next slot as soon as it is free
+            for group in list(pending):
+                if len(in_progress) >= workers:
+                    break
+                if active[group] >= max_per_group:
+                    continue
+                if now - last_start[group] < stagger:
+                    next_start = min(next_start or now + stagger, last_start[group] + stagger)
+                    continue
+                host = pending[group].popleft()
+                if not pending[group]:
+                    del pending[group]
+                active[group] += 1
+                peak[group] = max(peak[group], active[group])
+                last_start[group] = now
+                in_progress[executor.submit(RedfishFleet.run_host, host, operation)] = group
+            if not in_progress:
+                time.sleep(max(0.0, (next_start or now) - time.time()))
+                continue
+            wait_time = 1.0 if next_start is None else max(0.01, min(1.0, next_start - time.time()))
+            done, not_done = wait(list(in_progress), timeout=wait_time, return_when=FIRST_COMPLETED)
+            for future in done:
+                group = in_progress.pop(future)
+                active[group] -= 1
+                record = future.result()
+                record["operation"] = reset_type
+                record["group"] = group
+                summary.add(record)
+                with output_lock:
+                    output.write(json.dumps(record, sort_keys=True) + "\n")
+                    output.flush()
+    except KeyboardInterrupt:
+        for future in in_progress:
+            future.cancel()
+        sys.stderr.write("\n- WARNING, power sequence interrupted, pending iDRAC(s) were not powered on\n")
+    finally:
+        executor.shutdown(wait=True)
+        summary.finished = time.time()
+    for group, members in groups.items():
+        log("- INFO, group %s: %s iDRAC(s), at most %s powering on at the same time" % (group, len(members), peak[group]))
+    return summary
@@ -0,0 +1,170 @@
+#
+# RedfishRetry. Python module used by RedfishTransport to retry failed Redfish requests and to stop sending requests to an iDRAC which is down.
+#
+# NOTE: Retry policy. A request which failed with a timeout, a dropped connection or a 500 / 502 / 504 answer is sent again after a jittered
+# exponential backoff (random wait between 0 and REDFISH_RETRY_BACKOFF * 2^attempt seconds, capped at REDFISH_RETRY_BACKOFF_MAX), up to
+# REDFISH_RETRIES times (default 3). Only requests which are safe to send twice are retried: GET, HEAD, PUT, DELETE and OPTIONS, plus the Dell
+# OEM POST actions which only read data (for example DellLCService.GetRemoteServicesAPIStatus). Any other POST / PATCH is only retried when the
+# connection could not be opened at all, which means the iDRAC never received it. Scripts can force the policy for one call with retry=True or
+# retry=False.
+#
+# NOTE: Circuit breaker. After REDFISH_BREAKER_THRESHOLD (default 5) consecutive connection failures to an iDRAC its breaker opens and every
+# request to it fails right away with CircuitOpenError for REDFISH_BREAKER_RESET seconds (default 60). After that one request is let through as a
+# probe, success closes the breaker again, failure keeps it open for another period.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import os, random, threading, time
+
+import requests
+
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+RETRIES = int(os.environ.get("REDFISH_RETRIES", "3"))
+BACKOFF = float(os.environ.get("REDFISH_RETRY_BACKOFF", "1"))
+BACKOFF_MAX = float(os.environ.get("REDFISH_RETRY_BACKOFF_MAX", "30"))
+BREAKER_THRESHOLD = int(os.environ.get("REDFISH_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.environ.get("REDFISH_BREAKER_RESET", "60"))
+
+RETRY_STATUS_CODES = (500, 502, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+# Dell OEM actions which are sent as POST but only return information, resending them has no side effect
+SAFE_POST_ACTIONS = ("DellLCService.GetRemoteServicesAPIStatus", "DellOSDeploymentService.GetAttachStatus", "DellOSDeploymentService.GetDriverPackInfo",
+                     "DellRaidService.GetAvailableDisks", "DellRaidService.GetDHSDisks", "DellRaidService.GetRAIDLevels",
+                     "DellSoftwareInstallationService.GetRepoBasedUpdateList")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+_lock = threading.Lock()
+_breakers = {}
+_stats = {"retries": 0, "backoff_seconds": 0.0, "breaker_opened": 0, "breaker_rejected": 0}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request to an iDRAC whose circuit breaker is open."""
+
+
+def _not_sent(error):
+    # True when the connection to the iDRAC could not be opened, so the request was never received
+    if isinstance(error, (requests.exceptions.ConnectTimeout, CircuitOpenError)):
+        return True
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def _count(counter, amount=1):
+    with _lock:
+        _stats[counter] += amount
+
+
+def idempotent(method, url, retry=None):
+    """Return True when the request may be sent a second time after it possibly reached the iDRAC."""
+    if retry is not None:
+        return retry
+    if method in IDEMPOTENT_METHODS:
+        return True
+    if method == "POST":
+        path = url.split("?")[0]
+        return any(path.endswith("/Actions/%s" % action) for action in SAFE_POST_ACTIONS)
+    return False
+
+
+def should_retry(method, url, attempt, retry=None, status_code=None, error=None):
+    """Return True when a request which got status_code or raised error should be sent again, attempt is the number of retries done so far."""
+    if retry is False or attempt >= RETRIES:
+        return False
+    if error is not None:
+        if isinstance(error, (CircuitOpenError, requests.exceptions.SSLError)):
+            return False
+        if _not_sent(error):
+            return True
+        return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)) and idempotent(method, url, retry)
+    return status_code in RETRY_STATUS_CODES and idempotent(method, url, retry)
+
+
+def backoff(attempt):
+    """Sleep the jittered exponential backoff before retry number attempt + 1 (full jitter, so parallel clients do not retry in lock step)."""
+    seconds = random.uniform(0, min(BACKOFF_MAX, BACKOFF * (2 ** attempt)))
+    with _lock:
+        _stats["retries"] += 1
+        _stats["backoff_seconds"] += seconds
+    time.sleep(seconds)
+
+
+class CircuitBreaker(object):
+    """Consecutive connection failure counter for one iDRAC."""
+
+    def __init__(self, host):
+        self.host = host
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def check(self):
+        """Raise CircuitOpenError when requests to this iDRAC must not be sent right now."""
+        with self.lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.time() - self.opened_at >= BREAKER_RESET:
+                self.state = HALF_OPEN
+                self.probing = False
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return
+            remaining = max(BREAKER_RESET - (time.time() - self.opened_at), 0)
+        _count("breaker_rejected")
+        raise CircuitOpenError("- FAIL, iDRAC %s is not reachable, circuit breaker open after %s connection failures, next attempt in %.0f seconds" % (self.host, BREAKER_THRESHOLD, remaining))
+
+    def success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= BREAKER_THRESHOLD):
+                self.state = OPEN
+                self.opened_at = time.time()
+                self.probing = False
+                opened = True
+            else:
+                opened = False
+        if opened:
+            _count("breaker_opened")
+
+
+def breaker_for(host):
+    with _lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host)
+            _breakers[host] = breaker
+    return breaker
+
+
+def open_hosts():
+    """Return the iDRAC hosts whose circuit breaker is currently open, fleet tooling uses this to skip them."""
+    with _lock:
+        breakers = list(_breakers.values())
+    return sorted(breaker.host for breaker in breakers if breaker.state != CLOSED)
+
+
+def stats():
+    with _lock:
+        result = dict(_stats)
+    result["open_hosts"] = open_hosts()
+    return result
@@ -0,0 +1,356 @@
+#
+# RedfishTransport. Python module shared by all Redfish Python scripts to send Redfish requests over a pooled keep-alive HTTPS connection per iDRAC.
+#
+# NOTE: Scripts call RedfishTransport.get/post/patch/put/delete exactly like the matching requests functions. Connections to the same iDRAC are
+# reused for the life of the script so the TCP and TLS handshake is only paid once per pooled connection instead of once per request.
+#
+# NOTE: Set environment variable REDFISH_AUTH=session to authenticate with one X-Auth-Token session per iDRAC instead of basic auth on every request,
+# see RedfishAuth for the optional on-disk token cache.
+#
+# NOTE: get_select() requests only the listed properties with OData $select, for polling loops which only need a few properties (for example
+# PowerState). The first $select request to an iDRAC is the capability probe, when it is rejected the iDRAC is remembered and gets a full GET instead.
+#
+# NOTE: GET requests sent with cache=True are revalidated with If-None-Match against the persistent ETag cache in RedfishCache, a 304 answer is
+# served from the cache instead of downloading the document again. cache can also be an object with the lookup / store / cached_response
+# functions of RedfishCache, for example the per-host inventory snapshot of RedfishInventoryStore.
+#
+# NOTE: Every request waits for a slot from the RedfishGovernor of its iDRAC (token bucket plus AIMD in-flight limit). A 503 answer is resent after
+# the Retry-After time the iDRAC asked for, up to REDFISH_503_RETRIES times (default 3), before it is returned to the script.
+#
+# NOTE: Responses are requested compressed (Accept-Encoding: gzip, deflate) and every response is counted twice, bytes read from the network
+# (compressed) and payload bytes after decompression, along with the request body bytes sent. Set REDFISH_COMPRESSION=n to ask for uncompressed
+# responses, for example to measure what compression saves on a management network.
+#
+# NOTE: response.json() of every returned response decodes with RedfishJson, which uses orjson when it is installed.
+#
+# NOTE: Timeouts, dropped connections and 500 / 502 / 504 answers are retried with jittered exponential backoff and every iDRAC has a circuit
+# breaker which fails requests right away while the iDRAC is down, see RedfishRetry. REDFISH_CONNECT_TIMEOUT sets how long to wait for a
+# connection to the iDRAC (default 10 seconds), there is no read timeout unless the script passes timeout.
+#
+# NOTE: Set environment variable REDFISH_TRANSPORT_STATS=1 to print a summary of requests sent vs TLS handshakes performed when the script exits.
+# Set REDFISH_POOL_MAXSIZE to change the number of keep-alive connections kept per iDRAC (default is 10).
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import requests, sys, os, ssl, threading, atexit, warnings
+
+import RedfishAuth, RedfishCache, RedfishGovernor, RedfishJson, RedfishRetry
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.ssl_ import create_urllib3_context, resolve_cert_reqs
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+warnings.filterwarnings("ignore")
+
+POOL_MAXSIZE = int(os.environ.get("REDFISH_POOL_MAXSIZE", "10"))
+RETRIES_503 = int(os.environ.get("REDFISH_503_RETRIES", "3"))
+CONNECT_TIMEOUT = float(os.environ.get("REDFISH_CONNECT_TIMEOUT", "10"))
+COMPRESSION = os.environ.get("REDFISH_COMPRESSION", "y").lower() not in ("n", "no", "0", "false")
+ACCEPT_ENCODING = "gzip, deflate" if COMPRESSION else "identity"
+
+HOST_COUNTERS = ("requests", "handshakes", "bytes_sent", "wire_bytes", "payload_bytes")
+
+# Wait used for a 503 answer without a Retry-After header, doubled on every resend
+DEFAULT_503_WAIT = 1
+
+_lock = threading.Lock()
+_sessions = {}
+_host_stats = {}
+_select_support = {}
+_insecure_ssl_context = None
+
+
+def _count(host, counter, amount=1):
+    with _lock:
+        host_stats = _host_stats.setdefault(host, dict.fromkeys(HOST_COUNTERS, 0))
+        host_stats[counter] = host_stats.get(counter, 0) + amount
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _count(self.host, "handshakes")
+        return HTTPConnection.connect(self)
+
+
+def _get_insecure_ssl_context():
+    # One shared SSL context for verify=False connections. Without it urllib3 builds a context and loads the system CA store for every new
+    # connection, about 30ms of CPU per iDRAC, which dominates fleet runs against thousands of iDRACs
+    global _insecure_ssl_context
+    with _lock:
+        if _insecure_ssl_context is None:
+            _insecure_ssl_context = create_urllib3_context(cert_reqs=ssl.CERT_NONE)
+        return _insecure_ssl_context
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _count(self.host, "handshakes")
+        if self.ssl_context is None and resolve_cert_reqs(self.cert_reqs) == ssl.CERT_NONE:
+            self.ssl_context = _get_insecure_ssl_context()
+        return HTTPSConnection.connect(self)
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter keeping keep-alive connections open to the iDRAC and counting every new connection (TCP + TLS handshake)."""
+
+    def __init__(self, pool_maxsize=POOL_MAXSIZE):
+        HTTPAdapter.__init__(self, pool_connections=1, pool_maxsize=pool_maxsize)
+
+    def init_poolmanager(self, *args, **kwargs):
+        HTTPAdapter.init_poolmanager(self, *args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _CountingHTTPConnectionPool, "https": _CountingHTTPSConnectionPool}
+
+
+class RedfishResponse(requests.Response):
+    """requests Response whose json() decodes the body with RedfishJson."""
+
+    def json(self, **kwargs):
+        if kwargs or not self.content:
+            return requests.Response.json(self, **kwargs)
+        return RedfishJson.loads(self.content)
+
+
+def host_of(url):
+    return urlsplit(url).netloc
+
+
+def session_for(url):
+    """Return the shared requests Session for the iDRAC in url, creating it with its own connection pool on first use."""
+    host = host_of(url)
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+            adapter = PooledAdapter()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+    return session
+
+
+def _send(session, method, url, host, send_kwargs):
+    # Send one request inside a governor slot, the outcome (status or dropped connection) feeds the AIMD limit for the iDRAC
+    governor = RedfishGovernor.for_host(host)
+    governor.acquire()
+    _count(host, "requests")
+    try:
+        response = session.request(method, url, **send_kwargs)
+    except requests.exceptions.ConnectionError:
+        governor.release(error=True)
+        raise
+    except Exception:
+        governor.release()
+        raise
+    retry_after = RedfishGovernor.parse_retry_after(response.headers.get("Retry-After"))
+    governor.release(response.status_code, retry_after)
+    if not send_kwargs.get("stream"):
+        _count_bytes(host, response)
+    return response
+
+
+def _count_bytes(host, response):
+    # raw.tell() is the number of bytes read from the socket (before gzip / deflate decoding), content is the decoded payload
+    body = response.request.body if response.request is not None else None
+    try:
+        sent = len(body or b"")
+    except TypeError:
+        # Streamed upload (file object or generator), size is not known here
+        sent = 0
+    payload = len(response.content)
+    try:
+        wire = response.raw.tell()
+    except Exception:
+        wire = payload
+    response.wire_bytes = wire
+    response.payload_bytes = payload
+    _count(host, "bytes_sent", sent)
+    _count(host, "wire_bytes", wire)
+    _count(host, "payload_bytes", payload)
+
+
+def _send_with_backpressure(session, method, url, host, send_kwargs):
+    # A 503 means the iDRAC did not process the request, so it is safe to resend for every method once the governor pause has passed
+    response = _send(session, method, url, host, send_kwargs)
+    wait = DEFAULT_503_WAIT
+    for attempt in range(RETRIES_503):
+        if response.status_code != 503:
+            break
+        if not response.headers.get("Retry-After"):
+            RedfishGovernor.for_host(host).pause(wait)
+            wait *= 2
+        response = _send(session, method, url, host, send_kwargs)
+    return response
+
+
+def _send_authenticated(session, method, url, parts, kwargs):
+    send_kwargs, username, token = RedfishAuth.apply(session, parts.scheme, parts.netloc, kwargs)
+    response = _send_with_backpressure(session, method, url, parts.netloc, send_kwargs)
+    if token is not None and response.status_code == 401:
+        # Session expired or was deleted on the iDRAC, log in again and resend once
+        RedfishAuth.invalidate(parts.netloc, username, token)
+        send_kwargs, username, token = RedfishAuth.apply(session, parts.scheme, parts.netloc, kwargs)
+        response = _send_with_backpressure(session, method, url, parts.netloc, send_kwargs)
+    return response
+
+
+def request(method, url, **kwargs):
+    """Send one Redfish request over the pooled session for the iDRAC. Accepts the same keyword arguments as requests.request."""
+    kwargs.setdefault("verify", False)
+    kwargs.setdefault("timeout", (CONNECT_TIMEOUT, None))
+    retry = kwargs.pop("retry", None)
+    session = session_for(url)
+    parts = urlsplit(url)
+    cache_uri = None
+    cached = None
+    cache = kwargs.pop("cache", False)
+    if cache is True:
+        cache = RedfishCache if RedfishCache.enabled() else None
+    if cache and method == "GET":
+        cache_uri = url[len("%s://%s" % (parts.scheme, parts.netloc)):]
+        cached = cache.lookup(parts.netloc, cache_uri)
+        if cached is not None:
+            headers = dict(kwargs.get("headers") or {})
+            headers["If-None-Match"] = cached["etag"]
+            kwargs["headers"] = headers
+    breaker = RedfishRetry.breaker_for(parts.netloc)
+    attempt = 0
+    while True:
+        breaker.check()
+        try:
+            response = _send_authenticated(session, method, url, parts, kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+            breaker.failure()
+            if not RedfishRetry.should_retry(method, url, attempt, retry, error=error):
+                raise
+        else:
+            breaker.success()
+            if not RedfishRetry.should_retry(method, url, attempt, retry, status_code=response.status_code):
+                break
+        RedfishRetry.backoff(attempt)
+        attempt += 1
+    if cache_uri is not None:
+        if response.status_code == 304 and cached is not None:
+            response = cache.cached_response(parts.netloc, cache_uri, cached, response)
+        elif response.status_code == 200:
+            cache.store(parts.netloc, cache_uri, response)
+    response.__class__ = RedfishResponse
+    return response
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request("PATCH", url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+def select_supported(url):
+    """Return True / False once the iDRAC in url accepted or rejected OData $select, None while it has not been probed yet."""
+    with _lock:
+        return _select_support.get(host_of(url))
+
+
+def get_select(url, properties, **kwargs):
+    """GET only the listed properties of a resource using $select, falling back to a full GET when the iDRAC does not support $select."""
+    host = host_of(url)
+    if select_supported(url) is not False:
+        separator = "&" if "?" in url else "?"
+        response = get("%s%s$select=%s" % (url, separator, ",".join(properties)), **kwargs)
+        supported = response.status_code not in (400, 405, 501)
+        with _lock:
+            _select_support[host] = supported
+        if supported:
+            return response
+    return get(url, **kwargs)
+
+
+def stats(host=None):
+    """Return request / handshake / byte counters for one iDRAC host, or totals for every host when host is not passed in."""
+    with _lock:
+        if host is not None:
+            return dict(_host_stats.get(host, dict.fromkeys(HOST_COUNTERS, 0)))
+        totals = dict.fromkeys(HOST_COUNTERS, 0)
+        for host_stats in _host_stats.values():
+            for counter, value in host_stats.items():
+                totals[counter] = totals.get(counter, 0) + value
+        return totals
+
+
+def print_stats(stream=None):
+    stream = stream or sys.stderr
+    totals = stats()
+    if totals["requests"] == 0:
+        return
+    saved = totals["requests"] - totals["handshakes"]
+    stream.write("\n- INFO, Redfish transport: %s request(s) sent over %s TLS handshake(s), %s handshake(s) saved by keep-alive\n" % (totals["requests"], totals["handshakes"], max(saved, 0)))
+    if totals["payload_bytes"]:
+        saved = 100.0 * (totals["payload_bytes"] - totals["wire_bytes"]) / totals["payload_bytes"]
+        compression = "%.0f%% saved by compression" % max(saved, 0) if COMPRESSION else "compression disabled"
+        stream.write("- INFO, Redfish bandwidth: %s byte(s) received on the wire for %s payload byte(s) (%s), %s request body byte(s) sent\n" % (totals["wire_bytes"], totals["payload_bytes"], compression, totals["bytes_sent"]))
+    cache_stats = RedfishCache.stats()
+    if cache_stats["hits"] + cache_stats["misses"]:
+        stream.write("- INFO, Redfish ETag cache: %s hit(s), %s miss(es), hit ratio %.0f%%, %s byte(s) not downloaded\n" % (cache_stats["hits"], cache_stats["misses"], cache_stats["hit_ratio"] * 100, cache_stats["bytes_saved"]))
+    retry_stats = RedfishRetry.stats()
+    if retry_stats["retries"] or retry_stats["breaker_opened"]:
+        stream.write("- INFO, Redfish retries: %s request(s) retried after %.1f second(s) of backoff, circuit breaker opened %s time(s), %s request(s) not sent to a down iDRAC\n" % (retry_stats["retries"], retry_stats["backoff_seconds"], retry_stats["breaker_opened"], retry_stats["breaker_rejected"]))
+    for host, governor_stats in sorted(RedfishGovernor.stats().items()):
+        if governor_stats["backpressure"] or governor_stats["errors"] or governor_stats["wait_seconds"] >= 1:
+            stream.write("- INFO, Redfish governor %s: in-flight limit %s (peak %s), %s 503/429 answer(s), %s dropped connection(s), %.1f second(s) waiting for a slot\n" % (host, governor_stats["limit"], governor_stats["peak_in_flight"], governor_stats["backpressure"], governor_stats["errors"], governor_stats["wait_seconds"]))
+
+
+def close_host(host):
+    """Log out of and close the pooled connections to one iDRAC, fleet tooling calls this when it is done with a host so sockets are not kept
+    open for thousands of iDRACs. A later request to the host opens a new session."""
+    RedfishAuth.logout(host)
+    with _lock:
+        session = _sessions.pop(host, None)
+    if session is not None:
+        session.close()
+
+
+def close():
+    RedfishAuth.logout_all()
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+if os.environ.get("REDFISH_TRANSPORT_STATS", "").lower() in ("1", "y", "yes", "true"):
+    atexit.register(print_stats)
+atexit.register(close)
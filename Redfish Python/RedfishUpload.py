@@ -0,0 +1,169 @@
+#
+# RedfishUpload. Python module with a streaming multipart/form-data body for uploading firmware images to the iDRAC HttpPushUri, used by the
+# firmware update scripts instead of requests files=.
+#
+# NOTE: requests builds a files= upload in memory (the whole image plus the multipart framing), so every upload in progress costs the size of
+# the image in RAM. MultipartImage sends the image straight from a read-only mmap of the file in CHUNK_SIZE pieces, memory use stays at one
+# chunk per upload whatever the image size. Concurrent uploads of the same image (fleet updates) share one mapping, so the image is read from
+# disk once and the pages are shared through the OS page cache. The body knows its length, so it is sent with Content-Length, not chunked.
+#
+# NOTE: All uploads of the script share one bandwidth cap. Set environment variable REDFISH_UPLOAD_LIMIT to the total upload rate in MB per
+# second (default is no cap), or call set_bandwidth_limit(). Bytes sent, time spent and throughput of all uploads are counted, see stats().
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import mmap, os, sys, threading, time, uuid
+
+CHUNK_SIZE = 256 * 1024
+PROGRESS_INTERVAL = 10
+MB = 1024 * 1024
+
+_lock = threading.Lock()
+_mappings = {}
+_stats = {"uploads": 0, "bytes_sent": 0, "seconds": 0.0}
+
+
+class BandwidthLimiter(object):
+    """Upload rate cap shared by every upload. Each chunk is given the next free send time on one schedule, so parallel uploads split the
+    rate between them and no credit builds up while nothing is sent."""
+
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = float(bytes_per_second)
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def consume(self, amount):
+        with self.lock:
+            now = time.time()
+            start = max(now, self.next_time)
+            self.next_time = start + amount / self.bytes_per_second
+        if start > now:
+            time.sleep(start - now)
+
+
+def _limiter_from_environment():
+    limit = float(os.environ.get("REDFISH_UPLOAD_LIMIT", "0") or 0)
+    return BandwidthLimiter(limit * MB) if limit > 0 else None
+
+
+_limiter = _limiter_from_environment()
+
+
+def set_bandwidth_limit(mb_per_second):
+    """Cap the total upload rate of the script to mb_per_second MB per second, None or 0 removes the cap."""
+    global _limiter
+    _limiter = BandwidthLimiter(mb_per_second * MB) if mb_per_second else None
+
+
+def _acquire_mapping(path):
+    # One read-only mapping per image file, shared by every upload of it in progress
+    with _lock:
+        entry = _mappings.get(path)
+        if entry is None:
+            f = open(path, "rb")
+            size = os.fstat(f.fileno()).st_size
+            # mmap can't map an empty file
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            entry = _mappings[path] = {"file": f, "mapping": mapping, "users": 0}
+        entry["users"] += 1
+        return entry["mapping"]
+
+
+def _release_mapping(path):
+    with _lock:
+        entry = _mappings[path]
+        entry["users"] -= 1
+        if entry["users"] == 0:
+            del _mappings[path]
+            if entry["mapping"]:
+                entry["mapping"].close()
+            entry["file"].close()
+
+
+class MultipartImage(object):
+    """multipart/form-data request body with one file field, same framing as requests files={field: (filename, file, part_content_type)}.
+    Pass it as data= with headers content-type set to content_type. Use it as a context manager so the mapping is released after the upload.
+
+    progress is called with (bytes sent, total bytes, seconds) every PROGRESS_INTERVAL seconds and once when the body was sent."""
+
+    def __init__(self, path, filename=None, field="file", part_content_type="multipart/form-data", progress=None):
+        self.path = os.path.abspath(path)
+        self.progress = progress
+        self.boundary = uuid.uuid4().hex
+        self.content_type = "multipart/form-data; boundary=%s" % self.boundary
+        self.preamble = ('--%s\r\nContent-Disposition: form-data; name="%s"; filename="%s"\r\nContent-Type: %s\r\n\r\n' % (
+            self.boundary, field, filename or os.path.basename(path), part_content_type)).encode("utf-8")
+        self.epilogue = ("\r\n--%s--\r\n" % self.boundary).encode("utf-8")
+        self.mapping = _acquire_mapping(self.path)
+        self.sent = 0
+        self.seconds = 0.0
+
+    def __len__(self):
+        return len(self.preamble) + len(self.mapping) + len(self.epilogue)
+
+    def __iter__(self):
+        # Every iteration sends the whole body again, so the transport can resend it (503 backpressure, expired session)
+        total = len(self)
+        start = last_report = time.time()
+        self.sent = 0
+        yield self.preamble
+        self.sent += len(self.preamble)
+        for offset in range(0, len(self.mapping), CHUNK_SIZE):
+            chunk = self.mapping[offset:offset + CHUNK_SIZE]
+            limiter = _limiter
+            if limiter is not None:
+                limiter.consume(len(chunk))
+            yield chunk
+            self.sent += len(chunk)
+            if self.progress is not None and time.time() - last_report >= PROGRESS_INTERVAL:
+                last_report = time.time()
+                self.progress(self.sent, total, last_report - start)
+        yield self.epilogue
+        self.sent += len(self.epilogue)
+        self.seconds = time.time() - start
+        with _lock:
+            _stats["uploads"] += 1
+            _stats["bytes_sent"] += self.sent
+            _stats["seconds"] += self.seconds
+        if self.progress is not None:
+            self.progress(self.sent, total, self.seconds)
+
+    def close(self):
+        if self.mapping is not None:
+            self.mapping = None
+            _release_mapping(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def throughput(sent, seconds):
+    """MB per second of sent bytes in seconds."""
+    return sent / float(MB) / max(seconds, 0.001)
+
+
+def progress_message(sent, total, seconds):
+    return "%.1f of %.1f MB sent in %.1f seconds (%.1f MB/s)" % (sent / float(MB), total / float(MB), seconds, throughput(sent, seconds))
+
+
+def stats():
+    """Return {uploads, bytes_sent, seconds} of all image uploads sent so far, seconds adds up the time of each upload."""
+    with _lock:
+        return dict(_stats)
+
+
+def print_stats(stream=None):
+    stream = stream or sys.stderr
+    counts = stats()
+    if counts["uploads"]:
+        stream.write("- INFO, image uploads: %s upload(s), %.1f MB sent, %.1f MB/s average per upload%s\n" % (counts["uploads"], counts["bytes_sent"] / float(MB),
+                     throughput(counts["bytes_sent"], counts["seconds"]), ", total rate capped at %.1f MB/s" % (_limiter.bytes_per_second / MB) if _limiter else ""))
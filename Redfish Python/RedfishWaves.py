@@ -0,0 +1,112 @@
+#
+# RedfishWaves. Python module running a fleet operation in rolling waves: a canary wave first, then waves growing geometrically up to a size cap.
+#
+# NOTE: plan_waves() splits the hosts into waves of canary, canary x growth, canary x growth^2, ... iDRACs, no wave larger than max_wave, which is
+# also the number of iDRACs in progress at the same time. run_waves() runs one wave after the other and stops (pauses) before the next wave when
+# a canary iDRAC failed or when the failed iDRACs of all waves so far exceed the failure budget. The budget is a number of iDRACs (1 or more) or a
+# fraction of all iDRACs (below 1, for example 0.05 for 5%). Timing stats of every wave are printed as the wave finishes.
+#
+# NOTE: A paused run is continued by running the script again once the failures are understood, see FleetFirmwareUpdateREDFISH --resume.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import RedfishFleet, math, sys
+
+CANARY = 1
+GROWTH = 2.0
+FAILURE_BUDGET = 0.05
+
+
+def plan_waves(count, canary=CANARY, growth=GROWTH, max_wave=None):
+    """Return the list of wave sizes for count hosts."""
+    max_wave = max_wave or RedfishFleet.MAX_WORKERS
+    sizes = []
+    size = max(1, min(canary, max_wave))
+    remaining = count
+    while remaining > 0:
+        sizes.append(min(size, remaining))
+        remaining -= sizes[-1]
+        size = min(max_wave, max(size + 1, int(math.ceil(size * growth))))
+    return sizes
+
+
+def failure_limit(failure_budget, count):
+    """Number of failed hosts allowed for a failure budget (count when 1 or more, fraction of count below 1)."""
+    if failure_budget >= 1:
+        return int(failure_budget)
+    return int(math.floor(failure_budget * count))
+
+
+class WaveResult(object):
+    """Outcome of run_waves(): FleetSummary of each wave run, hosts not started and why the run paused (None when every wave ran)."""
+
+    def __init__(self):
+        self.waves = []
+        self.remaining = []
+        self.paused = None
+
+    @property
+    def ok(self):
+        return sum(i.ok for i in self.waves)
+
+    @property
+    def failed(self):
+        return sum(i.failed for i in self.waves)
+
+
+def run_waves(hosts, operation, operation_name, canary=CANARY, growth=GROWTH, max_wave=None, failure_budget=FAILURE_BUDGET, output=None, log=None):
+    """Run operation on hosts wave by wave, writing one NDJSON line per iDRAC to output. Returns a WaveResult."""
+    log = log or (lambda message: sys.stderr.write(message + "\n"))
+    sizes = plan_waves(len(hosts), canary, growth, max_wave)
+    limit = failure_limit(failure_budget, len(hosts))
+    result = WaveResult()
+    if not sizes:
+        return result
+    log("- INFO, %s iDRAC(s) in %s wave(s) of %s, failure budget %s iDRAC(s)" % (len(hosts), len(sizes), ", ".join(str(i) for i in sizes), limit))
+    start = 0
+    for number, size in enumerate(sizes, 1):
+        wave = hosts[start:start + size]
+        start += size
+        name = "canary" if number == 1 and canary else "wave %s" % number
+        log("- INFO, starting %s, %s iDRAC(s)" % (name, len(wave)))
+        summary = RedfishFleet.run(wave, operation, operation_name, len(wave), output, RedfishFleet.FleetSummary("%s %s" % (operation_name, name)))
+        result.waves.append(summary)
+        elapsed = summary.finished - summary.started
+        log("- INFO, %s done in %.1f seconds: %s passed, %s failed, per iDRAC p50 %.1fs, p90 %.1fs, max %.1fs, %.2f iDRAC(s)/minute" % (
+            name, elapsed, summary.ok, summary.failed, summary.percentile(50), summary.percentile(90), summary.percentile(100),
+            (summary.ok + summary.failed) * 60.0 / max(elapsed, 0.001)))
+        if summary.ok + summary.failed < len(wave):
+            result.paused = "run interrupted"
+        elif number == 1 and canary and summary.failed:
+            result.paused = "%s canary iDRAC(s) failed" % summary.failed
+        elif result.failed > limit:
+            result.paused = "%s failed iDRAC(s) exceed the failure budget of %s" % (result.failed, limit)
+        if result.paused:
+            result.remaining = hosts[start:]
+            if start < len(hosts):
+                log("- WARNING, pausing before the next wave, %s. %s iDRAC(s) not started" % (result.paused, len(result.remaining)))
+            break
+    return result
+
+
+def print_wave_stats(result, stream=None):
+    """Print one line of timing stats per wave and the totals."""
+    stream = stream or sys.stderr
+    if not result.waves:
+        return
+    stream.write("\n- INFO, wave  iDRACs  passed  failed  seconds  p50(s)  p90(s)  max(s)\n")
+    for number, summary in enumerate(result.waves, 1):
+        stream.write("- INFO, %4s  %6s  %6s  %6s  %7.1f  %6.1f  %6.1f  %6.1f\n" % (number, summary.ok + summary.failed, summary.ok, summary.failed,
+                     summary.finished - summary.started, summary.percentile(50), summary.percentile(90), summary.percentile(100)))
+    elapsed = result.waves[-1].finished - result.waves[0].started
+    done = result.ok + result.failed
+    stream.write("- INFO, %s iDRAC(s) in %s wave(s), %s passed, %s failed in %.1f seconds (%.2f iDRAC(s)/minute)\n" % (done, len(result.waves), result.ok,
+                 result.failed, elapsed, done * 60.0 / max(elapsed, 0.001)))
+    if result.paused:
+        stream.write("- WARNING, paused: %s, %s iDRAC(s) not started\n" % (result.paused, len(result.remaining)))
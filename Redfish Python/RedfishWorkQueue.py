@@ -0,0 +1,142 @@
+#
+# RedfishWorkQueue. Python module with a SQLite backed work queue of iDRAC hosts, used to split one fleet run across worker processes and machines.
+#
+# NOTE: Every host is a row of the queue. A worker leases a batch of pending hosts for lease_seconds and renews its leases while it works on them.
+# When a worker dies (crash, killed, machine down) its leases expire and another worker takes the hosts over. A host whose lease expired
+# MAX_ATTEMPTS times is marked failed so one host can't stop the run. Results of finished hosts are stored in the queue with the name of the
+# worker, each node prints the results of its own workers.
+#
+# NOTE: To spread a run across machines, put the queue file on storage every machine can open (for example an NFS share) and start the fleet
+# script on each machine with the same queue file. SQLite file locking on network file systems depends on the NFS server, the queue uses the
+# rollback journal (no WAL) and short transactions to stay safe on them.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import json, sqlite3, threading, time
+
+MAX_ATTEMPTS = 3
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class WorkQueueError(Exception):
+    """Raised when a queue file is used for a different operation than the one it was created for."""
+
+
+class WorkQueue(object):
+    """SQLite work queue of fleet hosts with leases. One instance per process, it is safe to share between the threads of the process."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=120, check_same_thread=False, isolation_level=None)
+        with self.lock:
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS work (host TEXT PRIMARY KEY, entry TEXT, state TEXT, owner TEXT, lease_expires REAL, attempts INTEGER DEFAULT 0, updated REAL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS work_state ON work (state, lease_expires)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY AUTOINCREMENT, host TEXT, owner TEXT, ok INTEGER, record TEXT, finished REAL)")
+
+    def _transaction(self, function, *args):
+        # BEGIN IMMEDIATE takes the write lock up front so two workers can't lease the same rows
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                result = function(*args)
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+            return result
+
+    def add(self, entries, operation):
+        """Add host entries (dicts with at least "host") for operation, hosts already in the queue are left as they are. Returns the number added."""
+        def _add():
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'operation'").fetchone()
+            if row is None:
+                self.db.execute("INSERT INTO meta VALUES ('operation', ?)", (operation,))
+            elif row[0] != operation:
+                raise WorkQueueError("- FAIL, queue file \"%s\" was created for operation %s, not %s" % (self.path, row[0], operation))
+            now = time.time()
+            added = 0
+            for entry in entries:
+                cursor = self.db.execute("INSERT OR IGNORE INTO work (host, entry, state, updated) VALUES (?, ?, ?, ?)", (entry["host"], json.dumps(entry), PENDING, now))
+                added += cursor.rowcount
+            return added
+        return self._transaction(_add)
+
+    def operation(self):
+        with self.lock:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'operation'").fetchone()
+        return row[0] if row else None
+
+    def lease(self, owner, count, lease_seconds):
+        """Lease up to count hosts which are pending or whose lease expired. Returns the list of host entries now owned by owner."""
+        def _lease():
+            now = time.time()
+            rows = self.db.execute("SELECT host, entry, attempts FROM work WHERE state = ? OR (state = ? AND lease_expires < ?) ORDER BY state DESC, rowid LIMIT ?",
+                                   (PENDING, LEASED, now, count)).fetchall()
+            entries = []
+            for host, entry, attempts in rows:
+                if attempts >= MAX_ATTEMPTS:
+                    record = {"host": host, "ok": False, "error": "- FAIL, worker lease expired %s times, host skipped" % attempts, "error_type": "LeaseExpired"}
+                    self.db.execute("UPDATE work SET state = ?, owner = ?, updated = ? WHERE host = ?", (FAILED, owner, now, host))
+                    self.db.execute("INSERT INTO results (host, owner, ok, record, finished) VALUES (?, ?, 0, ?, ?)", (host, owner, json.dumps(record), now))
+                    continue
+                self.db.execute("UPDATE work SET state = ?, owner = ?, lease_expires = ?, attempts = attempts + 1, updated = ? WHERE host = ?",
+                                (LEASED, owner, now + lease_seconds, now, host))
+                entries.append(json.loads(entry))
+            return entries
+        return self._transaction(_lease)
+
+    def renew(self, owner, lease_seconds, hosts=None):
+        """Extend the leases held by owner, of every host or only of hosts. Workers call this from a heartbeat thread."""
+        def _renew():
+            now = time.time()
+            if hosts is None:
+                self.db.execute("UPDATE work SET lease_expires = ?, updated = ? WHERE owner = ? AND state = ?", (now + lease_seconds, now, owner, LEASED))
+            else:
+                self.db.executemany("UPDATE work SET lease_expires = ?, updated = ? WHERE owner = ? AND state = ? AND host = ?",
+                                    [(now + lease_seconds, now, owner, LEASED, host) for host in hosts])
+        self._transaction(_renew)
+
+    def complete(self, owner, record):
+        """Store the result record of a host leased by owner. Returns False when the lease was lost to another worker, the record is dropped then."""
+        def _complete():
+            now = time.time()
+            cursor = self.db.execute("UPDATE work SET state = ?, updated = ? WHERE host = ? AND owner = ? AND state = ?",
+                                     (DONE if record["ok"] else FAILED, now, record["host"], owner, LEASED))
+            if cursor.rowcount != 1:
+                return False
+            self.db.execute("INSERT INTO results (host, owner, ok, record, finished) VALUES (?, ?, ?, ?, ?)", (record["host"], owner, int(bool(record["ok"])), json.dumps(record), now))
+            return True
+        return self._transaction(_complete)
+
+    def results_since(self, last_id, owner_prefix=""):
+        """Return [(id, record)] of results stored after id last_id by owners starting with owner_prefix."""
+        with self.lock:
+            rows = self.db.execute("SELECT id, record FROM results WHERE id > ? AND substr(owner, 1, ?) = ? ORDER BY id", (last_id, len(owner_prefix), owner_prefix)).fetchall()
+        return [(row[0], json.loads(row[1])) for row in rows]
+
+    def counts(self):
+        """Return the number of hosts in each state."""
+        with self.lock:
+            rows = self.db.execute("SELECT state, COUNT(*) FROM work GROUP BY state").fetchall()
+        counts = dict.fromkeys((PENDING, LEASED, DONE, FAILED), 0)
+        counts.update(dict(rows))
+        return counts
+
+    def remaining(self):
+        counts = self.counts()
+        return counts[PENDING] + counts[LEASED]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,160 @@
+#
+# RegistryParseBenchmarkREDFISH. Python script using Redfish API to compare parse time and peak memory of the BIOS / iDRAC attribute registry lookups.
+#
+# NOTE: Three ways of looking up attribute types in the registry are measured, each one in its own Python process so peak RSS is not shared:
+# "json full scan" is the old script code (json.loads of the standard json module on the whole registry, then a scan of every attribute for each
+# attribute name), "backend full scan" is the same code decoding with the RedfishJson backend (orjson when installed) and "registry index" is
+# RedfishJson.registry_index() which only keeps the Type field of each attribute, decoded one attribute at a time with the standard json module.
+# All three read the whole registry body into memory first, the Backend column is the JSON decoder each method used.
+#
+# NOTE: The registry is downloaded from the iDRAC (-ip, -u, -p), read from a saved file (-f) or generated (-g) when no iDRAC is available.
+# Peak RSS is only reported on Linux / Unix, the resource module is not available on Windows.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 2 (GPLv2). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv2
+# along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+#
+
+import json, sys, os, time, random, shutil, subprocess, tempfile, warnings, argparse
+
+warnings.filterwarnings("ignore")
+
+parser=argparse.ArgumentParser(description="Python script using Redfish API to compare parse time and peak memory of attribute registry lookups, full JSON decode and scan vs RedfishJson registry index")
+parser.add_argument('-ip',help='iDRAC IP address', required=False)
+parser.add_argument('-u', help='iDRAC username', required=False)
+parser.add_argument('-p', help='iDRAC password', required=False)
+parser.add_argument('script_examples',action="store_true",help='RegistryParseBenchmarkREDFISH.py -ip 192.168.0.120 -u root -p calvin -r bios, this example will download the BIOS registry and benchmark parsing it. RegistryParseBenchmarkREDFISH.py -ip 192.168.0.120 -u root -p calvin -r idrac -n 5, this example will benchmark the iDRAC attribute registry, best of 5 runs. RegistryParseBenchmarkREDFISH.py -g 20000, this example will benchmark a generated registry with 20000 attributes.')
+parser.add_argument('-r', help='Registry to download from the iDRAC, pass in \"bios\" or \"idrac\". Default is bios', required=False, default="bios")
+parser.add_argument('-f', help='Benchmark a registry JSON file saved earlier instead of downloading it, pass in the file path', required=False)
+parser.add_argument('-g', help='Benchmark a generated registry instead of downloading it, pass in the number of attributes', required=False)
+parser.add_argument('-an', help='Attribute names to look up, pass in a comma separated list. Default is 20 random attribute names from the registry', required=False)
+parser.add_argument('-n', help='Number of runs for each method, best time is reported. Default is 3', required=False, default="3")
+parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+
+args=vars(parser.parse_args())
+
+METHODS = ["json full scan", "backend full scan", "registry index"]
+
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak = peak / 1024
+    return peak
+
+
+def run_child(method, path, names_path):
+    # Runs in a fresh Python process, prints one JSON line with the parse time and peak RSS of this method
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import RedfishJson
+    with open(path, "rb") as f:
+        body = f.read()
+    with open(names_path) as f:
+        names = json.load(f)
+    rss_before = peak_rss_kb()
+    start = time.time()
+    types = {}
+    if method == "registry index":
+        registry = RedfishJson.registry_index(body, [u'Type'])
+        for name in names:
+            types[name] = registry.get(name, {}).get(u'Type')
+    else:
+        if method == "json full scan":
+            data = json.loads(body.decode("utf-8"))
+        else:
+            data = RedfishJson.loads(body)
+        for name in names:
+            for entry in data[u'RegistryEntries']['Attributes']:
+                if name in entry.values():
+                    types[name] = entry[u'Type']
+    seconds = time.time() - start
+    print(json.dumps({"method": method, "backend": RedfishJson.BACKEND if method == "backend full scan" else "json", "seconds": seconds, "rss_before_kb": rss_before, "rss_peak_kb": peak_rss_kb(), "found": len([i for i in types.values() if i])}))
+
+
+def download_registry(path):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import RedfishTransport
+    if args["r"] == "idrac":
+        uri = "/redfish/v1/Registries/ManagerAttributeRegistry/ManagerAttributeRegistry.v1_0_0.json"
+    else:
+        uri = "/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry"
+    response = RedfishTransport.get('https://%s%s' % (idrac_ip, uri),verify=False,auth=(idrac_username,idrac_password), cache=True)
+    if response.status_code != 200:
+        print("\n- FAIL, GET command failed to download registry %s, status code %s returned" % (uri, response.status_code))
+        sys.exit()
+    with open(path, "wb") as f:
+        f.write(response.content)
+    print("\n- PASS, downloaded registry %s, %s bytes" % (uri, len(response.content)))
+
+
+def generate_registry(path, count):
+    attributes = []
+    for i in range(count):
+        attributes.append({"AttributeName": "Attribute%s" % i, "DisplayName": "Generated attribute %s" % i, "DisplayOrder": i, "HelpText": "Help text for generated attribute %s. " % i * 4,
+                           "Hidden": False, "Immutable": False, "MenuPath": "./SysProfileSettingsRef", "ReadOnly": False, "ResetRequired": True,
+                           "Type": random.choice(["Enumeration", "Integer", "String"]), "Value": [{"ValueDisplayName": "Enabled", "ValueName": "Enabled"}, {"ValueDisplayName": "Disabled", "ValueName": "Disabled"}],
+                           "WarningText": None, "WriteOnly": False})
+    registry = {"@odata.id": "/redfish/v1/Systems/System.Embedded.1/Bios/BiosRegistry", "Id": "BiosAttributeRegistry", "Name": "Generated BIOS Attribute Registry",
+                "RegistryEntries": {"Attributes": attributes, "Dependencies": [], "Menus": []}, "RegistryVersion": "1.0.0"}
+    with open(path, "w") as f:
+        json.dump(registry, f)
+    print("\n- PASS, generated registry with %s attributes, %s bytes" % (count, os.path.getsize(path)))
+
+
+def benchmark():
+    workdir = tempfile.mkdtemp()
+    try:
+        run_benchmark(workdir)
+    finally:
+        shutil.rmtree(workdir)
+
+
+def run_benchmark(workdir):
+    path = args["f"] or os.path.join(workdir, "registry.json")
+    if args["g"]:
+        generate_registry(path, int(args["g"]))
+    elif not args["f"]:
+        download_registry(path)
+    if args["an"]:
+        names = args["an"].split(",")
+    else:
+        with open(path, "rb") as f:
+            all_names = [i[u'AttributeName'] for i in json.loads(f.read().decode("utf-8"))[u'RegistryEntries']['Attributes']]
+        names = random.sample(all_names, min(20, len(all_names)))
+    names_path = os.path.join(workdir, "names.json")
+    with open(names_path, "w") as f:
+        json.dump(names, f)
+    print("- INFO, looking up %s attribute name(s), best of %s run(s) for each method\n" % (len(names), args["n"]))
+    print("%-20s %-8s %12s %16s %16s %6s" % ("Method", "Backend", "Time (ms)", "Peak RSS (MB)", "RSS growth (MB)", "Found"))
+    for method in METHODS:
+        results = []
+        for run in range(int(args["n"])):
+            output = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--child", method, path, names_path])
+            results.append(json.loads(output.decode("utf-8").strip().splitlines()[-1]))
+        best = min(results, key=lambda i: i["seconds"])
+        if best["rss_peak_kb"] is None:
+            peak = growth = "n/a"
+        else:
+            peak = "%.1f" % (best["rss_peak_kb"] / 1024.0)
+            growth = "%.1f" % ((best["rss_peak_kb"] - best["rss_before_kb"]) / 1024.0)
+        print("%-20s %-8s %12.1f %16s %16s %6s" % (method, best["backend"], best["seconds"] * 1000, peak, growth, best["found"]))
+
+
+if __name__ == "__main__":
+    if args["child"]:
+        run_child(*args["child"])
+        sys.exit()
+    idrac_ip=args["ip"]
+    idrac_username=args["u"]
+    idrac_password=args["p"]
+    if not args["f"] and not args["g"] and not (idrac_ip and idrac_username and idrac_password):
+        print("- FAIL, pass in -ip, -u and -p to download the registry from the iDRAC, or -f / -g to benchmark without an iDRAC")
+        sys.exit()
+    benchmark()
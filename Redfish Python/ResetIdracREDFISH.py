@@ -17,7 +17,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -41,7 +41,7 @@ def reset_idrac():
     url = "https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Actions/Manager.Reset/" % idrac_ip
     payload={"ResetType":"GracefulRestart"}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     if statusCode == 204:
         print("\n- PASS, status code %s returned for POST command to reset iDRAC\n") % statusCode
@@ -14,7 +14,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, os, warnings, argparse
+import RedfishTransport, json, sys, re, time, os, warnings, argparse
 
 from datetime import datetime
 
@@ -40,7 +40,7 @@ except:
     pass
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellNumericSensorCollection' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/DellNumericSensorCollection' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -66,7 +66,7 @@ def get_sensor_data():
     else:
         print("- FAIL, you must pass in at least one parameter to get sensor collection data")
         sys.exit()
-    response = requests.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/%s' % (idrac_ip, sensor_key),verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/%s' % (idrac_ip, sensor_key),verify=False,auth=(idrac_username,idrac_password))
     print("\n- Data collection data for \"%s\"\n" % sensor_key) 
     data = response.json()
     if data[u'Members'] == []:
@@ -84,7 +84,7 @@ def get_sensor_data():
     if u'Members@odata.nextLink' in data:
         number_list=[i for i in range (1,100001) if i % 50 == 0]
         for seq in number_list:
-            response = requests.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/%s?$skip=%s' % (idrac_ip, sensor_key, seq) ,verify=False,auth=(idrac_username,idrac_password))
+            response = RedfishTransport.get('https://%s/redfish/v1/Dell/Systems/System.Embedded.1/%s?$skip=%s' % (idrac_ip, sensor_key, seq) ,verify=False,auth=(idrac_username,idrac_password))
             data = response.json()
             if "Members" in data:
                 pass
@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, os
+import RedfishTransport, json, sys, re, time, warnings, os
 
 from datetime import datetime
 
@@ -37,7 +37,7 @@ except:
 def set_bios_reset_to_default():
     url = "https://%s/redfish/v1/Systems/System.Embedded.1/Bios/Actions/Bios.ResetBios/" % idrac_ip
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.post(url, headers=headers, verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     statusCode = response.status_code
     if statusCode == 200:
@@ -53,14 +53,14 @@ def set_bios_reset_to_default():
 def reboot_server():
     if reboot_now == "y" or reboot_now == "yes":
         print("\n- WARNING, user selected to automatically reboot the server now")
-        response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+        response = RedfishTransport.get_select('https://%s/redfish/v1/Systems/System.Embedded.1/' % idrac_ip, ["PowerState"],verify=False,auth=(idrac_username, idrac_password))
         data = response.json()
         print("- WARNING, Current server power state is: %s\n" % data[u'PowerState'])
         if data[u'PowerState'] == "On":
             url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
             payload = {'ResetType': 'ForceOff'}
             headers = {'content-type': 'application/json'}
-            response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+            response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
             statusCode = response.status_code
             if statusCode == 204:
                 print("- PASS, Command passed to power OFF server, code return is %s\n" % statusCode)
@@ -71,7 +71,7 @@ def reboot_server():
             time.sleep(30)
             payload = {'ResetType': 'On'}
             headers = {'content-type': 'application/json'}
-            response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+            response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
             statusCode = response.status_code
             if statusCode == 204:
                 print("- PASS, Command passed to power ON server, code return is %s\n" % statusCode)
@@ -83,7 +83,7 @@ def reboot_server():
             url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
             payload = {'ResetType': 'On'}
             headers = {'content-type': 'application/json'}
-            response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+            response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
             statusCode = response.status_code
             if statusCode == 204:
                 print("- PASS, Command passed to power ON server, code return is %s\n" % statusCode)
@@ -14,7 +14,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -31,7 +31,7 @@ idrac_username=args["u"]
 idrac_password=args["p"]
 
 def get_current_chassis_indicator_LED_state():
-    response = requests.get('https://%s/redfish/v1/Chassis/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Chassis/System.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, current chassis indicator LED state is: %s" % data[u'IndicatorLED'])
 
@@ -39,7 +39,7 @@ def set_current_chassis_indicator_LED_state():
     url = 'https://%s/redfish/v1/Chassis/System.Embedded.1' % idrac_ip
     payload = {'IndicatorLED': args["s"]}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
     #print(response.__dict__)
     if response.status_code == 200:
         print("\n- PASS, PATCH command successfully completed \"%s\" request for chassis indicator LED" % args["s"])
@@ -14,7 +14,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -47,7 +47,7 @@ elif args["x"] and args["a"] and args["j"]:
 
 
 def get_storage_controllers():
-    response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- Server controller(s) detected -\n")
     controller_list=[]
@@ -56,7 +56,7 @@ def get_storage_controllers():
         print(i[u'@odata.id'][46:])
     if args["c"] == "yy":
         for i in controller_list:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get('https://%s/redfish/v1/Systems/System.Embedded.1/Storage/%s' % (idrac_ip, i),verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             print("\n - Detailed controller information for %s -\n" % i)
             for i in data.items():
@@ -64,7 +64,7 @@ def get_storage_controllers():
     
 
 def get_external_enclosures():
-    response = requests.get('https://%s/redfish/v1/Chassis/' % (idrac_ip),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Chassis/' % (idrac_ip),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     new=data.values()
     supported_enclosures=[]
@@ -83,7 +83,7 @@ def get_external_enclosures():
             print(i)
 
 def get_external_enclosure_current_asset_tag():
-    response = requests.get('https://%s/redfish/v1/Chassis/%s' % (idrac_ip, external_enclosure),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Chassis/%s' % (idrac_ip, external_enclosure),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     asset_tag = data["AssetTag"]
     if asset_tag == "":
@@ -100,7 +100,7 @@ def set_enclosure_asset_tag():
     url = 'https://%s/redfish/v1/Chassis/%s/Settings' % (idrac_ip, external_enclosure)
     payload={"AssetTag":asset_tag}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username,idrac_password))
     data = response.json()
     if response.status_code == 200:
         print("\n- PASS: PATCH command passed to set asset tag pending value to \"%s\", status code 200 returned" % asset_tag)
@@ -115,7 +115,7 @@ def create_realtime_config_job():
     
     payload = {"@Redfish.SettingsApplyTime":{"ApplyTime":"Immediate"}}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=('root','calvin'))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=('root','calvin'))
     statusCode = response.status_code
     if response.status_code == 202:
         print("\n- PASS: PATCH command passed to create real time config job, status code 202 returned")
@@ -138,7 +138,7 @@ def create_staged_config_job():
     
     payload = {"@Redfish.SettingsApplyTime":{"ApplyTime":"OnReset"}}
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=('root','calvin'))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=('root','calvin'))
     statusCode = response.status_code
     if response.status_code == 202:
         print("\n- PASS: PATCH command passed to create staged config job, status code 202 returned")
@@ -161,24 +161,22 @@ start_time=datetime.now()
 
 def loop_job_status():
     start_time = datetime.now()
+    deadline = RedfishJobState.deadline(30 * 60)
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        current_time=(datetime.now()-start_time)
-        statusCode = req.status_code
-        if statusCode == 200:
-            pass
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=1)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if str(current_time)[0:7] >= "0:30:00":
+        if RedfishJobState.expired(deadline):
             print("\n- FAIL: Timeout of 30 minutes has been hit, script stopped\n")
             sys.exit()
-        elif "Fail" in data[u'Message'] or "fail" in data[u'Message']:
+        elif RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
             print("- FAIL: %s failed" % job_id)
             sys.exit()
-        elif data[u'Message'] == "Job completed successfully.":
+        elif RedfishJobState.succeeded(data):
             print("\n--- PASS, Final Detailed Job Status Results ---\n")
             for i in data.items():
                 if "odata" in i[0] or "MessageArgs" in i[0] or "TargetSettingsURI" in i[0]:
@@ -190,23 +188,22 @@ def loop_job_status():
         else:
             print("- WARNING, JobStatus not completed, current status is: \"%s\", percent completion is: \"%s\"" % (data[u'Message'],data[u'PercentComplete']))
             print("\n- WARNING, current job execution time is: %s" % str(datetime.now()-start_time)[0:7])
-            time.sleep(1)
 
 def get_job_status():
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Jobs/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        if statusCode == 200:
-            #print("- PASS, Command passed to check job status, code 200 returned")
-            time.sleep(5)
-        else:
-            print("\n- FAIL, Command failed to check job status, return code is %s" % statusCode)
-            print("Extended Info Message: {0}".format(req.json()))
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=5)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("\n- FAIL, Command failed to check job status, return code is %s" % error.status_code)
             sys.exit()
-        data = req.json()
-        if data[u'Message'] == "Task successfully scheduled.":
+        if RedfishJobState.job_state(data) == RedfishJobState.JobState.SCHEDULED:
             print("\n- WARNING, staged config job marked as scheduled, rebooting the system\n")
             break
+        elif RedfishJobState.failed(data):
+            print("- FAIL: %s failed, failed message is: %s" % (job_id, data[u'Message']))
+            sys.exit()
         else:
             print("- WARNING: JobStatus not scheduled, current status is: %s" % data[u'Message'])
 
@@ -215,7 +212,7 @@ def reboot_server():
     url = 'https://%s/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset' % idrac_ip
     payload = {'ResetType': 'ForceOff'}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
     statusCode = response.status_code
     if statusCode == 204:
         print("\n- PASS, Command passed to power OFF server, code return is %s\n" % statusCode)
@@ -226,7 +223,7 @@ def reboot_server():
     time.sleep(10)
     payload = {'ResetType': 'On'}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=('root','calvin'))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=('root','calvin'))
     statusCode = response.status_code
     if statusCode == 204:
         print("\n- PASS, Command passed to power ON server, code return is %s\n" % statusCode)
@@ -236,7 +233,7 @@ def reboot_server():
         sys.exit()
 
 def get_new_external_enclosure_current_asset_tag():
-    response = requests.get('https://%s/redfish/v1/Chassis/%s' % (idrac_ip, external_enclosure),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Chassis/%s' % (idrac_ip, external_enclosure),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     asset_tag_new = data["AssetTag"]
     if asset_tag_new == asset_tag:
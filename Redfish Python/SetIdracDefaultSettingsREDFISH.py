@@ -16,7 +16,7 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 #
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -40,7 +40,7 @@ idrac_password=args["p"]
 # Function to get reset type values
 
 def get_reset_type_values():
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     try:
         data = response.json()
     except:
@@ -65,7 +65,7 @@ def set_idrac_default_settings():
     url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Actions/Oem/DellManager.ResetToDefaults' % (idrac_ip)
     payload = {"ResetType": args["r"]}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers,verify=False, auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     if statusCode == 200:
         print("\n- PASS, status code %s returned for POST command to reset iDRAC to default settings using reset type \"%s\"" % (statusCode, args["r"]))
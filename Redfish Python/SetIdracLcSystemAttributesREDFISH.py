@@ -19,7 +19,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, RedfishJson, json, sys, re, time, warnings, argparse
 
 from datetime import datetime
 
@@ -45,7 +45,7 @@ idrac_password=args["p"]
 
 
 def check_supported_idrac_version():
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Attributes' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Attributes' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     if response.status_code != 200:
         print("\n- WARNING, iDRAC version installed does not support this feature using Redfish API")
@@ -61,7 +61,7 @@ def get_attribute_registry():
     except:
         pass
     f=open("idrac_attribute_registry.txt","a")
-    response = requests.get('https://%s/redfish/v1/Registries/ManagerAttributeRegistry/ManagerAttributeRegistry.v1_0_0.json' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Registries/ManagerAttributeRegistry/ManagerAttributeRegistry.v1_0_0.json' % idrac_ip,verify=False,auth=(idrac_username, idrac_password), cache=True)
     data = response.json()
     for i in data[u'RegistryEntries']['Attributes']:
         for ii in i.items():
@@ -79,7 +79,7 @@ def get_attribute_registry():
 
 def attribute_registry_get_specific_attribute():
     print("\n- WARNING, searching attribute registry for attribute \"%s\"" % args["ars"])
-    response = requests.get('https://%s/redfish/v1/Registries/ManagerAttributeRegistry/ManagerAttributeRegistry.v1_0_0.json' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Registries/ManagerAttributeRegistry/ManagerAttributeRegistry.v1_0_0.json' % idrac_ip,verify=False,auth=(idrac_username,idrac_password), cache=True)
     data = response.json()
     found = ""
     for i in data[u'RegistryEntries']['Attributes']:
@@ -105,8 +105,6 @@ def set_attributes():
     else:
         print("\n- FAIL, invalid value entered for -s argument")
         sys.exit()
-    response = requests.get('%s' % (url),verify=False,auth=(idrac_username, idrac_password))
-    data = response.json()
     
     payload = {"Attributes":{}}
     attribute_names = args["an"].split(",")
@@ -114,20 +112,16 @@ def set_attributes():
     for i,ii in zip(attribute_names, attribute_values):
         payload["Attributes"][i] = ii
     print("\n- WARNING, changing \"%s\" attributes -\n" % args["s"].upper())
+    response = RedfishTransport.get('https://%s/redfish/v1/Registries/ManagerAttributeRegistry/ManagerAttributeRegistry.v1_0_0.json' % idrac_ip,verify=False,auth=(idrac_username,idrac_password), cache=True)
+    registry = RedfishJson.registry_index(response, [u'Type'])
     for i in payload["Attributes"].items():
-        response = requests.get('https://%s/redfish/v1/Registries/ManagerAttributeRegistry/ManagerAttributeRegistry.v1_0_0.json' % idrac_ip,verify=False,auth=(idrac_username,idrac_password))
-        data = response.json()
-        for ii in data[u'RegistryEntries']['Attributes']:
-            if i[0] in ii.values():
-                for iii in ii.items():
-                    if iii[0] == "Type":
-                        if iii[1] == "Integer":
-                            payload["Attributes"][i[0]] = int(i[1])
+        if registry.get(i[0], {}).get(u'Type') == "Integer":
+            payload["Attributes"][i[0]] = int(i[1])
     
     for i in payload["Attributes"].items():
         print(" Attribute Name: %s, setting new value to: %s" % (i[0], i[1]))
     headers = {'content-type': 'application/json'}
-    response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     statusCode = response.status_code
     if statusCode == 200:
         print("\n- PASS, Command passed to successfully set \"%s\" attribute(s), status code %s returned\n" % (args["s"].upper(),statusCode))
@@ -139,7 +133,7 @@ def set_attributes():
     
 def get_new_attribute_values():
     print("- WARNING, getting new attribute values - \n")
-    response = requests.get('%s' % (url),verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('%s' % (url),verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     attributes_dict=data[u'Attributes']
     for i in payload["Attributes"].items():
@@ -15,7 +15,7 @@
 #
 
 
-import requests, json, sys, re, time, warnings, argparse
+import RedfishTransport, RedfishJobWatcher, RedfishJobState, json, sys, re, warnings, argparse
 
 warnings.filterwarnings("ignore")
 
@@ -47,14 +47,14 @@ if args["M"]:
     message_id = args["M"]
 
 def get_event_service_properties():
-    response = requests.get('https://%s/redfish/v1/EventService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/EventService' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     print("\n- WARNING, GET command output for EventService URI\n")
     for i in data.items():
         print("%s: %s" % (i[0], i[1]))
 
 def get_event_service_subscriptions():
-    response = requests.get('https://%s/redfish/v1/EventService/Subscriptions' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/EventService/Subscriptions' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data=response.json()
     if data["Members"] == []:
         print("\n- WARNING, no subscriptions detected for iDRAC %s" % idrac_ip)
@@ -68,7 +68,7 @@ def get_event_service_subscriptions():
     for i in data["Members"]:
         for ii in i.items():
             if args["s"] == "yy":
-                response = requests.get('https://%s%s' % (idrac_ip, ii[1]),verify=False,auth=(idrac_username, idrac_password))
+                response = RedfishTransport.get('https://%s%s' % (idrac_ip, ii[1]),verify=False,auth=(idrac_username, idrac_password))
                 data=response.json()
                 print("\n- Detailed information for subscription %s\n" % ii[1])
                 for iii in data.items():
@@ -79,7 +79,7 @@ def get_event_service_subscriptions():
 def delete_subscriptions():
     url = "https://%s%s" % (idrac_ip, args["delete"])
     headers = {'content-type': 'application/json'}
-    response = requests.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
+    response = RedfishTransport.delete(url, headers=headers, verify=False,auth=(idrac_username,idrac_password))
     if response.__dict__["status_code"] == 200:
         print("\n- PASS, DELETE command passed to delete subscription %s" % args["delete"])
     else:
@@ -90,7 +90,7 @@ def scp_set_idrac_attribute():
     url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Actions/Oem/EID_674_Manager.ImportSystemConfiguration' % idrac_ip
     payload = {"ImportBuffer":"<SystemConfiguration><Component FQDD=\"iDRAC.Embedded.1\"><Attribute Name=\"IPMILan.1#AlertEnable\">Enabled</Attribute></Component></SystemConfiguration>","ShareParameters":{"Target":"All"}}
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False, auth=(idrac_username,idrac_password))
     d=str(response.__dict__)
     try:
         z=re.search("JID_.+?,",d).group()
@@ -109,46 +109,28 @@ def scp_set_idrac_attribute():
     job_id=response_output["headers"]["Location"]
     job_id=re.search("JID_.+",job_id).group()
 
+    job_watcher = RedfishJobWatcher.watcher_for(idrac_ip, (idrac_username, idrac_password))
+    data = None
     while True:
-        req = requests.get('https://%s/redfish/v1/TaskService/Tasks/%s' % (idrac_ip, job_id), auth=(idrac_username, idrac_password), verify=False)
-        statusCode = req.status_code
-        data = req.json()
-        message_string=data[u"Messages"]
-        final_message_string=str(message_string)
-        if statusCode == 202 or statusCode == 200:
-            pass
-            time.sleep(1)
-        else:
-            print("Query job ID command failed, error code is: %s" % statusCode)
+        try:
+            data = job_watcher.wait_for_change(job_id, data, timeout=60, interval=1)
+        except RedfishJobWatcher.JobWatchError as error:
+            print("Query job ID command failed, error code is: %s" % error.status_code)
             sys.exit()
-        if "failed" in final_message_string or "completed with errors" in final_message_string or "Not one" in final_message_string:
-            print("\n- FAIL, detailed job message is: %s" % data[u"Messages"])
+        if RedfishJobState.finished(data) and not RedfishJobState.succeeded(data):
+            print("\n- FAIL, detailed job message is: %s" % data[u"Message"])
             sys.exit()
-        elif "Successfully imported" in final_message_string or "completed with errors" in final_message_string or "Successfully imported" in final_message_string:
-            print("- Job ID = "+data[u"Id"])
-            print("- Name = "+data[u"Name"])
-            try:
-                print("- Message = \n"+message_string[0][u"Message"])
-            except:
-                print("- Message = %s\n" % message_string[len(message_string)-1][u"Message"])
-            break
-        elif "No changes" in final_message_string:
+        elif RedfishJobState.succeeded(data):
             print("- Job ID = "+data[u"Id"])
             print("- Name = "+data[u"Name"])
-            try:
-                print("- Message = "+message_string[0][u"Message"])
-            except:
-                print("- Message = %s" % message_string[len(message_string)-1][u"Message"])
-                sys.exit()
+            print("- Message = \n"+data[u"Message"])
             break
         else:
-            print("- Job not marked completed, current status is: %s" % data[u"TaskState"])
-            print("- Message: %s\n" % message_string[0][u"Message"])
-            time.sleep(1)
-            continue
+            print("- Job not marked completed, current status is: %s" % data[u"JobState"])
+            print("- Message: %s\n" % data[u"Message"])
     
 def get_set_ipmi_alert_iDRAC_setting():
-    response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Attributes' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Attributes' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
     data = response.json()
     while True:
         try:
@@ -165,14 +147,14 @@ def get_set_ipmi_alert_iDRAC_setting():
             payload = {"Attributes":{"IPMILan.1.AlertEnable":"Enabled"}}
             headers = {'content-type': 'application/json'}
             url = 'https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Attributes' % idrac_ip
-            response = requests.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.patch(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
             statusCode = response.status_code
             if statusCode == 200:
                 print("- PASS, PATCH command passed to set iDRAC attribute \"IPMILan.1.AlertEnable\" to enabled")
             else:
                 print("- FAIL, PATCH command failed to set iDRAC attribute \"IPMILan.1.AlertEnable\" to enabled")
                 sys.exit()
-            response = requests.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Attributes' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
+            response = RedfishTransport.get('https://%s/redfish/v1/Managers/iDRAC.Embedded.1/Attributes' % idrac_ip,verify=False,auth=(idrac_username, idrac_password))
             data = response.json()
             attributes_dict=data[u'Attributes']
             if attributes_dict["IPMILan.1.AlertEnable"] == "Enabled":
@@ -189,7 +171,7 @@ def create_subscription():
     url = "https://%s/redfish/v1/EventService/Subscriptions" % idrac_ip
     headers = {'content-type': 'application/json'}
     payload = {"Destination": destination,"EventTypes": [event_type],"Context": "root","Protocol": "Redfish", "EventFormatType":args["V"]}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     if response.__dict__["status_code"] == 201:
         print("- PASS, POST command passed, status code 201 returned, subscription successfully set for EventService")
     else:
@@ -200,7 +182,7 @@ def submit_test_event():
     payload = {"Destination": destination,"EventTypes": event_type,"Context": "Root","Protocol": "Redfish","MessageId":message_id}
     url = "https://%s/redfish/v1/EventService/Actions/EventService.SubmitTestEvent" % idrac_ip
     headers = {'content-type': 'application/json'}
-    response = requests.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
+    response = RedfishTransport.post(url, data=json.dumps(payload), headers=headers, verify=False,auth=(idrac_username, idrac_password))
     if response.__dict__["status_code"] == 201:
         print("\n- PASS, POST command passed, status code 201 returned, event type \"%s\" successfully sent to destination \"%s\"" % (event_type, destination))
     else: